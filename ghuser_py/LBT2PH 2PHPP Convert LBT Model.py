@@ -72,18 +72,22 @@ from System import Object
 from Grasshopper import DataTree
 from Grasshopper.Kernel.Data import GH_Path
 import Grasshopper.Kernel as ghK
+import scriptcontext as sc
 
 import LBT2PH
 import LBT2PH.__versions__
-import LBT2PH.lbt_to_phpp
-import LBT2PH.to_excel
 import LBT2PH.helpers
+import LBT2PH.conversion_cache
 
-reload( LBT2PH)
+LBT2PH.dev_reload( LBT2PH)
 reload(LBT2PH.__versions__)
-reload( LBT2PH.lbt_to_phpp)
-reload( LBT2PH.to_excel )
-reload( LBT2PH.helpers)
+
+# The conversion itself (lbt_to_phpp, to_excel and nearly every other LBT2PH
+# module) is only imported once there is a model to convert
+pipeline = LBT2PH.lazy_import('LBT2PH.pipeline')
+LBT2PH.dev_reload( pipeline)
+LBT2PH.dev_reload( LBT2PH.helpers)
+LBT2PH.dev_reload( LBT2PH.conversion_cache)
 
 ghenv.Component.Name = "LBT2PH 2PHPP Convert LBT Model"
 LBT2PH.__versions__.set_component_params(ghenv, dev='MAR_12_21')
@@ -98,122 +102,21 @@ if msg:
 
 
 #-------------------------------------------------------------------------------
-# Get all the info from the LBT Model
+# Convert the LBT Model into Excel-Ready Objects
 if _HB_model:
-    print('- '*25)
-    materials_opaque        = LBT2PH.lbt_to_phpp.get_opaque_materials_from_model(_HB_model, ghenv)
-    constructions_opaque    = LBT2PH.lbt_to_phpp.get_opaque_constructions_from_model(_HB_model, ghenv)
-    surfaces_opaque         = LBT2PH.lbt_to_phpp.get_exposed_surfaces_from_model(_HB_model, LBT2PH.lbt_to_phpp._find_north(north_), ghenv)
-    
-    materials_windows       = LBT2PH.lbt_to_phpp.get_aperture_materials_from_model(_HB_model)
-    constructions_windows   = LBT2PH.lbt_to_phpp.get_aperture_constructions_from_model(_HB_model)
-    surfaces_windows        = LBT2PH.lbt_to_phpp.get_aperture_surfaces_from_model(_HB_model, ghdoc)
-    hb_rooms                = LBT2PH.lbt_to_phpp.get_zones_from_model(_HB_model)
-    phpp_spaces             = LBT2PH.lbt_to_phpp.get_spaces_from_model(_HB_model, ghdoc)
-    ventilation_system      = LBT2PH.lbt_to_phpp.get_ventilation_systems_from_model(_HB_model, ghenv)
-    
-    ground_objs             = LBT2PH.lbt_to_phpp.get_ground_from_model(_HB_model, ghenv)
-    thermal_bridges         = LBT2PH.lbt_to_phpp.get_thermal_bridges(_HB_model, ghenv)
-    
-    dhw_systems             = LBT2PH.lbt_to_phpp.get_dhw_systems(_HB_model)
-    appliances              = LBT2PH.lbt_to_phpp.get_appliances(_HB_model)
-    lighting                = LBT2PH.lbt_to_phpp.get_lighting(_HB_model)
-    climate                 = LBT2PH.lbt_to_phpp.get_climate(_HB_model, epw_file_)
+    options = pipeline.ConversionOptions(north_, epw_file_, rooms_included_,
+                    rooms_excluded_, ud_row_starts_, estimated_tfa_, variants_, ud_custom_)
     
-    footprint               = LBT2PH.lbt_to_phpp.get_footprint(surfaces_opaque)
-    footprint_              = footprint.Footprint_surface
+    # Keep the converted windows / spaces between solves, so only the parts of
+    # the model which changed get converted again
+    cache_key = 'LBT2PH_conversion_cache_{}'.format(ghenv.Component.InstanceGuid)
+    if cache_key not in sc.sticky:
+        sc.sticky[cache_key] = LBT2PH.conversion_cache.ConversionCache()
     
-    phpp_settings           = LBT2PH.lbt_to_phpp.get_settings( _HB_model )
-    summer_vent             = LBT2PH.lbt_to_phpp.get_summ_vent( _HB_model )
-    heating_cooling         = LBT2PH.lbt_to_phpp.get_heating_cooling( _HB_model )
-    per                     = LBT2PH.lbt_to_phpp.get_PER( _HB_model )
-    occupancy               = LBT2PH.lbt_to_phpp.get_occupancy( _HB_model )
-    
-    #---------------------------------------------------------------------------
-    # Sort out the inputs
-    print('- '*25)
-    hb_room_names = LBT2PH.to_excel.include_rooms( hb_rooms, rooms_included_, rooms_excluded_, ghenv)
-    start_row_dict = LBT2PH.to_excel.start_rows( ud_row_starts_, ghenv )
-    
-    #---------------------------------------------------------------------------
-    # Create Xl Objects
-    print('- '*25)
-    uValuesList, uValueUID_Names     = LBT2PH.to_excel.build_u_values( constructions_opaque, materials_opaque )
-    winComponentsList                = LBT2PH.to_excel.build_components( surfaces_windows )
-    areasList, surfacesIncluded      = LBT2PH.to_excel.build_areas( surfaces_opaque, hb_room_names, uValueUID_Names )
-    tb_List                          = LBT2PH.to_excel.build_thermal_bridges( thermal_bridges, start_row_dict)
-    winSurfacesList                  = LBT2PH.to_excel.build_windows( surfaces_windows, surfacesIncluded, surfaces_opaque )   
-    shadingList                      = LBT2PH.to_excel.build_shading( surfaces_windows, surfacesIncluded )
-    tfa                              = LBT2PH.to_excel.build_TFA (phpp_spaces, hb_room_names, estimated_tfa_, _HB_model)
-    addnlVentRooms, ventUnitsUsed    = LBT2PH.to_excel.build_addnl_vent_rooms( phpp_spaces, ventilation_system, hb_room_names, start_row_dict )
-    vent                             = LBT2PH.to_excel.build_addnl_vent_systems( ventilation_system, ventUnitsUsed, start_row_dict )
-    airtightness                     = LBT2PH.to_excel.build_infiltration( hb_rooms, hb_room_names)
-    ground                           = LBT2PH.to_excel.build_ground( ground_objs, hb_room_names, ghenv )
-    dhw                              = LBT2PH.to_excel.build_DHW_system( dhw_systems, hb_room_names, ghenv )
-    nonRes_Elec                      = LBT2PH.to_excel.build_non_res_space_info( phpp_spaces, hb_room_names, start_row_dict )
-    location                         = LBT2PH.to_excel.build_location( climate )
-    elec_equip_appliance             = LBT2PH.to_excel.build_appliances( appliances, hb_room_names, ghenv )
-    lighting                         = LBT2PH.to_excel.build_lighting( lighting, hb_room_names )
-    footprint                        = LBT2PH.to_excel.build_footprint( footprint )
-    settings                         = LBT2PH.to_excel.build_settings( phpp_settings )
-    summer_vent                      = LBT2PH.to_excel.build_summ_vent( summer_vent )
-    heating_cooling                  = LBT2PH.to_excel.build_heating_cooling( heating_cooling, hb_room_names )
-    per                              = LBT2PH.to_excel.build_PER( per, hb_room_names, ghenv )
-    occupancy                        = LBT2PH.to_excel.build_occupancy( occupancy )
-    variants                         = LBT2PH.to_excel.build_variants( variants_ )
-    ud_custom                        = LBT2PH.to_excel.build_ud_custom( ud_custom_ )
+    result = pipeline.convert_model(_HB_model, ghenv, options, sc.sticky[cache_key])
+    footprint_ = result.footprint.Footprint_surface
     
     #---------------------------------------------------------------------------
     # Add all the Excel-Ready Objects to a master Tree for outputting / passing
-    excel_objects_.AddRange(uValuesList, GH_Path(0))
-    excel_objects_.AddRange(winComponentsList, GH_Path(1))
-    excel_objects_.AddRange(areasList, GH_Path(2))
-    excel_objects_.AddRange(winSurfacesList, GH_Path(3))
-    excel_objects_.AddRange(shadingList, GH_Path(4))
-    excel_objects_.AddRange(tfa, GH_Path(5))
-    excel_objects_.AddRange(tb_List, GH_Path(6))
-    excel_objects_.AddRange(addnlVentRooms, GH_Path(7))
-    excel_objects_.AddRange(vent, GH_Path(8))
-    excel_objects_.AddRange(airtightness, GH_Path(9))
-    excel_objects_.AddRange(ground, GH_Path(10))
-    excel_objects_.AddRange(dhw, GH_Path(11))
-    excel_objects_.AddRange(nonRes_Elec, GH_Path(12))
-    excel_objects_.AddRange(location, GH_Path(13))
-    excel_objects_.AddRange(elec_equip_appliance, GH_Path(14))
-    excel_objects_.AddRange(lighting, GH_Path(15))
-    excel_objects_.AddRange(footprint, GH_Path(16))
-    excel_objects_.AddRange(settings, GH_Path(17))
-    excel_objects_.AddRange(summer_vent, GH_Path(18))
-    excel_objects_.AddRange(heating_cooling, GH_Path(19))
-    excel_objects_.AddRange(per, GH_Path(20))
-    excel_objects_.AddRange(occupancy, GH_Path(21))
-    excel_objects_.AddRange(variants, GH_Path(22))
-    
-    # Make sure this always at the end so it overwrites anything else
-    excel_objects_.AddRange(ud_custom, GH_Path(excel_objects_.BranchCount+1))
-    
-    #---------------------------------------------------------------------------
-    # Give Warnings
-    if len(excel_objects_.Branch(GH_Path(2)))/10 > 100:
-        AreasWarning = 'Warning: It looks like you have {:.0f} surfaces in the model. By Default\n'\
-        'the PHPP can only hold 100 surfaces. Before writing out to the PHPP be sure to\n '\
-        'add more lines to the "Areas" worksheet of your excel file.\n'\
-        'After adding lines to the PHPP, be sure to input the correct Start Rows into\n'\
-        'the "udRowStarts_" of this component.'.format(len(excel_objects_.Branch(2))/10)
-        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, AreasWarning)
-    
-    if len(excel_objects_.Branch(GH_Path(7)))/17 > 30:
-        VentWarning = 'Warning: It looks like you have {:.0f} rooms in the model. By Default\n'\
-        'the PHPP can only hold 30 different rooms in the Additional Ventilation worksheet.\n'\
-        'Before writing out to the PHPP be sure to add more lines to the\n'\
-        '"Additional Ventilation" worksheet in the "Dimensionsing of Air Quantities" section.\n'\
-        'After adding lines to the PHPP, be sure to input the correct Start Rows into\n'\
-        'the "udRowStarts_" of this component.'.format(len(excel_objects_.Branch(7))/17)
-        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, VentWarning)
-    
-    if len(excel_objects_.Branch(GH_Path(12)))/8 > 22:
-        NonResWarning = 'Warning: It looks like you have {:.0f} Non-Residential Rooms in the model. By Default\n'\
-        'the PHPP can only hold 22 different rooms in the "Electricity non-res" worksheet.\n'\
-        'Before writing out to the PHPP be sure to add more lines to the \n '\
-        '"Electricity non-res" worksheet in the "Lighting/non-residential" section.'.format(len(excel_objects_.Branch(12))/8)
-        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, NonResWarning)
\ No newline at end of file
+    for i, xl_objects in enumerate(result.groups.values()):
+        excel_objects_.AddRange(xl_objects, GH_Path(i))
@@ -69,7 +69,9 @@ EM March 1, 2021
         country_: <Optional, Default = 'US-United States of America	'>
         region_: <Options, Default = 'New York'>
         climateDataSet_: <Optional, Default='DE-9999-PHPP-Standard'> The name of the 
-            PHPP climate data set to use. Just type in for now. Maybe a value-list someday...
+            PHPP climate data set to use. Either the full name (ie: 'US0055b-New York')
+            or just the ID (ie: 'US0055b'). The country_ and region_ will be set from the
+            data set, unless they are input as well.
         altitude_: <Optional, Default='=J23'> Altitude adjustment factor (m) for 
             the climate dataset. Default links to the weather station altidue loaded in the PHPP.
         
@@ -79,6 +81,7 @@ EM March 1, 2021
 """
 
 from datetime import datetime
+import Grasshopper.Kernel as ghK
 
 import LBT2PH
 import LBT2PH.__versions__
@@ -86,11 +89,11 @@ import LBT2PH.phpp_setup
 import LBT2PH.climate
 import LBT2PH.helpers
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.phpp_setup )
-reload( LBT2PH.climate )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.phpp_setup )
+LBT2PH.dev_reload( LBT2PH.climate )
+LBT2PH.dev_reload( LBT2PH.helpers )
 
 ghenv.Component.Name = "LBT2PH 2PHPP Setup"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -117,7 +120,18 @@ if country_: verification.bldg_country = country_
 #-------------------------------------------------------------------------------
 # Climate Worksheet
 climate = LBT2PH.climate.PHPP_ClimateDataSet()
-if climateDataSet_: climate.DataSet = climateDataSet_ 
+if climateDataSet_:
+    # Look up the PHPP station, so just the ID (ie: 'US0055b') can be input as well
+    station = LBT2PH.climate.climate_station_table().find( climateDataSet_ )
+    if station:
+        climate.DataSet = station['Dataset']
+        climate.Country = station['Country']
+        climate.Region = station['Region']
+    else:
+        climate.DataSet = climateDataSet_
+        msg = "Could not find the PHPP climate data set: '{}'. I will write it to\n"\
+            "the PHPP as input, but check that the name is correct?".format(climateDataSet_)
+        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, msg)
 if altitude_: climate.Altitude = altitude_
 if region_: climate.Region = region_
 if country_: climate.Country = country_
@@ -46,7 +46,7 @@ from collections import namedtuple
 import LBT2PH
 import LBT2PH.__versions__
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
 
 ghenv.Component.Name = "LBT2PH 2PHPP User Determined XL Obj"
@@ -98,9 +98,9 @@ import LBT2PH.__versions__
 import LBT2PH.variants
 from LBT2PH.helpers import preview_obj
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.variants)
+LBT2PH.dev_reload(LBT2PH.variants)
 
 ghenv.Component.Name = "LBT2PH 2PHPP Variants"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
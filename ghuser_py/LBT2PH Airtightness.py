@@ -63,13 +63,13 @@ import LBT2PH.ventilation
 import LBT2PH.airtightness
 import LBT2PH.schedules
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.helpers)
-reload(LBT2PH.spaces)
-reload(LBT2PH.ventilation)
-reload(LBT2PH.airtightness)
-reload(LBT2PH.schedules)
+LBT2PH.dev_reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.spaces)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.airtightness)
+LBT2PH.dev_reload(LBT2PH.schedules)
 
 ghenv.Component.Name = "LBT2PH Airtightness"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
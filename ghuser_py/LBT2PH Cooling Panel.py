@@ -35,10 +35,10 @@ import LBT2PH.heating_cooling
 from LBT2PH.helpers import preview_obj
 from LBT2PH.helpers import convert_value_to_metric
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.heating_cooling )
-reload(LBT2PH.helpers)
+LBT2PH.dev_reload( LBT2PH.heating_cooling )
+LBT2PH.dev_reload(LBT2PH.helpers)
 
 ghenv.Component.Name = "LBT2PH Cooling Panel"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -64,12 +64,12 @@ import LBT2PH.spaces
 import LBT2PH.ventilation
 import LBT2PH.schedules
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.helpers)
-reload(LBT2PH.spaces)
-reload(LBT2PH.ventilation)
-reload(LBT2PH.schedules)
+LBT2PH.dev_reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.spaces)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.schedules)
 
 try:
     from honeybee_energy.load.ventilation import Ventilation
@@ -132,11 +132,13 @@ rhino_tfa_objects = LBT2PH.spaces.find_all_tfa_surfaces(_TFA_surfaces, ghenv, gh
 HB_rooms_ = []
 tfa_objs = {}
 if _HB_rooms:
-    for tfa_srfc_geom, tfa_srfc_params in rhino_tfa_objects:
+    # Find all the TFA's host Rooms/Zones at once
+    room_locator = LBT2PH.spaces.RoomLocator(_HB_rooms)
+    host_rooms = room_locator.find_host_rooms( geom for geom, params, source in rhino_tfa_objects )
+    
+    for (tfa_srfc_geom, tfa_srfc_params, tfa_source), (centroid, host_room) in zip(rhino_tfa_objects, host_rooms):
         # ----------------------------------------------------------------------
-        # Find the TFA's host Room/Zone
-        centroid, host_room = LBT2PH.spaces.find_tfa_host_room(tfa_srfc_geom, _HB_rooms)
-        tfa_obj = LBT2PH.spaces.TFA_Surface(tfa_srfc_geom, host_room, tfa_srfc_params)
+        tfa_obj = LBT2PH.spaces.TFA_Surface(tfa_srfc_geom, host_room, tfa_srfc_params, _source=tfa_source)
         if host_room is None: LBT2PH.spaces.display_host_error(tfa_obj, ghenv)
         
         # Add the new TFA Object to the master dict
@@ -170,11 +172,10 @@ for hb_room in _HB_rooms:
 
 # Find all the 'touching' TFA surfaces, organize by 'neighbor' into groups
 # ------------------------------------------------------------------------------
-if tfa_objs:
-    for tfa_obj_list in tfa_objs.values():
-        LBT2PH.spaces.find_neighbors( tfa_obj_list )
+tfa_srfcs_grouped_by_neighbor = []
+for tfa_obj_list in tfa_objs.values():
+    tfa_srfcs_grouped_by_neighbor.extend( LBT2PH.spaces.find_neighbors( tfa_obj_list ) )
 
-tfa_srfcs_grouped_by_neighbor = LBT2PH.spaces.bin_tfa_srfcs_by_neighbor(tfa_objs)
 tfa_srfcs_cleaned = LBT2PH.spaces.join_touching_tfa_groups(tfa_srfcs_grouped_by_neighbor, ghenv)
 
 
@@ -69,11 +69,11 @@ import LBT2PH.dhw_IO
 from LBT2PH.helpers import convert_value_to_metric
 from LBT2PH.helpers import preview_obj
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.dhw )
-reload( LBT2PH.dhw_IO )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.dhw )
+LBT2PH.dev_reload( LBT2PH.dhw_IO )
+LBT2PH.dev_reload( LBT2PH.helpers )
 
 ghenv.Component.Name = "LBT2PH DHW Piping Recirc"
 LBT2PH.__versions__.set_component_params(ghenv, dev='APR_15_2021')
@@ -108,7 +108,7 @@ for segment in piping_inputs:
     if segment.get('insulation_thickness'): new_segment.insulation_thickness = segment.get('insulation_thickness')
     if segment.get('insulation_conductivity'): new_segment.insulation_conductivity = segment.get('insulation_conductivity')
     if segment.get('insulation_reflective'): new_segment.insulation_reflective = segment.get('insulation_reflective')
-    if segment.get('insul_quality'): new_segment.insul_quality = segment.get('insul_quality')
+    if segment.get('insul_quality'): new_segment.insulation_quality = segment.get('insul_quality')
     if segment.get('daily_period'): new_segment.daily_period = segment.get('daily_period')
     
     circulation_piping_.append(new_segment)
@@ -61,8 +61,8 @@ import LBT2PH.__versions__
 from LBT2PH.helpers import preview_obj
 import LBT2PH.dhw
 
-reload(LBT2PH)
-reload(LBT2PH.dhw)
+LBT2PH.dev_reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH.dhw)
 reload(LBT2PH.__versions__)
 
 ghenv.Component.Name = "LBT2PH DHW Solar Thermal"
@@ -70,10 +70,12 @@ from LBT2PH.helpers import add_to_HB_model, preview_obj, context_rh_doc, convert
 import LBT2PH
 import LBT2PH.dhw
 import LBT2PH.dhw_IO
+import LBT2PH.identity
 
-reload( LBT2PH )
-reload( LBT2PH.dhw )
-reload( LBT2PH.dhw_IO )
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.dhw )
+LBT2PH.dev_reload( LBT2PH.identity )
+LBT2PH.dev_reload( LBT2PH.dhw_IO )
 
 ghenv.Component.Name = "LBT2PH DHW System"
 LBT2PH.__versions__.set_component_params(ghenv, dev='APR_16_2021')
@@ -103,7 +105,7 @@ except AttributeError:
         if segment.get('insulation_thickness'):     new_segment.insulation_thickness = segment.get('insulation_thickness')
         if segment.get('insulation_conductivity'):  new_segment.insulation_conductivity = segment.get('insulation_conductivity')
         if segment.get('insulation_reflective'):    new_segment.insulation_reflective = segment.get('insulation_reflective')
-        if segment.get('insul_quality'):            new_segment.insul_quality = segment.get('insul_quality')
+        if segment.get('insul_quality'):            new_segment.insulation_quality = segment.get('insul_quality')
         if segment.get('daily_period'):             new_segment.daily_period = segment.get('daily_period')
         
         recirc_piping.append( new_segment )
@@ -157,6 +159,9 @@ dhw_system_obj.circulation_piping = recirc_piping
 dhw_system_obj.branch_piping = branch_piping
 dhw_system_obj.rooms_assigned_to = [ hb_room.display_name for hb_room in _HB_rooms ]
 
+# Same id every solve: the id tells the Convert component which rooms share a system
+dhw_system_obj.id = LBT2PH.identity.component_id(ghenv, 'PHPP_DHW_System', dhw_system_obj.system_name)
+
 if tank1_: dhw_system_obj.tank1 = tank1_
 if tank2_: dhw_system_obj.tank2 = tank2_
 if buffer_tank_: dhw_system_obj.tank_buffer = buffer_tank_
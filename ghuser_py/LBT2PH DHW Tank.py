@@ -45,11 +45,11 @@ import LBT2PH.dhw
 import LBT2PH.dhw_IO
 from LBT2PH.helpers import preview_obj
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload( LBT2PH.__versions__ )
-reload( LBT2PH.dhw )
-reload( LBT2PH.dhw_IO )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.dhw )
+LBT2PH.dev_reload( LBT2PH.dhw_IO )
+LBT2PH.dev_reload( LBT2PH.helpers )
 
 ghenv.Component.Name = "LBT2PH DHW Tank"
 LBT2PH.__versions__.set_component_params(ghenv, dev='APR_15_2021')
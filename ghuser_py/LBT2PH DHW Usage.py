@@ -40,9 +40,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.dhw
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.dhw )
+LBT2PH.dev_reload( LBT2PH.dhw )
 
 ghenv.Component.Name = "LBT2PH DHW Usage"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
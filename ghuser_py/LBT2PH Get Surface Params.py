@@ -42,11 +42,11 @@ import LBT2PH.assemblies
 import LBT2PH.surfaces
 import Grasshopper.Kernel as ghK
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.helpers)
-reload(LBT2PH.assemblies)
-reload(LBT2PH.surfaces)
+LBT2PH.dev_reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.assemblies)
+LBT2PH.dev_reload(LBT2PH.surfaces)
 
 ghenv.Component.Name = "LBT2PH Get Surface Params"
 LBT2PH.__versions__.set_component_params(ghenv, dev='MAR_3_2021')
@@ -71,7 +71,7 @@ hb_constructions = LBT2PH.assemblies.generate_all_HB_constructions(rh_doc_constr
 
 #-------------------------------------------------------------------------------
 # Create the Honeybee surface objects
-hb_surfaces = (LBT2PH.surfaces.hb_surface(srfc, hb_constructions) for srfc in input_srfcs)
+hb_surfaces = (LBT2PH.surfaces.hb_surface(srfc, hb_constructions, i, ghenv) for i, srfc in enumerate(input_srfcs))
 
 #-------------------------------------------------------------------------------
 # Outputs
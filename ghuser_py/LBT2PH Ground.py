@@ -48,10 +48,10 @@ from LBT2PH.helpers import convert_value_to_metric
 from LBT2PH.helpers import preview_obj
 from LBT2PH.helpers import add_to_HB_model
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.ground )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.ground )
+LBT2PH.dev_reload( LBT2PH.helpers )
 
 ghenv.Component.Name = "LBT2PH Ground"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
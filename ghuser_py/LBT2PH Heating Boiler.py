@@ -76,9 +76,9 @@ import LBT2PH.__versions__
 import LBT2PH.heating_cooling
 from LBT2PH.helpers import preview_obj
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.heating_cooling)
+LBT2PH.dev_reload(LBT2PH.heating_cooling)
 
 ghenv.Component.Name = "LBT2PH Heating Boiler"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
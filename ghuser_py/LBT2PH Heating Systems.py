@@ -79,10 +79,10 @@ import LBT2PH.__versions__
 import LBT2PH.helpers
 import LBT2PH.heating_cooling
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.helpers )
-reload( LBT2PH.heating_cooling )
+LBT2PH.dev_reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.heating_cooling )
 
 ghenv.Component.Name = "LBT2PH Heating Systems"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
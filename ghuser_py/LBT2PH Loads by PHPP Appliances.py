@@ -109,11 +109,11 @@ import LBT2PH.schedules
 import LBT2PH.occupancy
 from LBT2PH.helpers import preview_obj
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.appliances )
-reload( LBT2PH.schedules )
-reload( LBT2PH.occupancy )
+LBT2PH.dev_reload( LBT2PH.appliances )
+LBT2PH.dev_reload( LBT2PH.schedules )
+LBT2PH.dev_reload( LBT2PH.occupancy )
 
 ghenv.Component.Name = "LBT2PH Loads by PHPP Appliances"
 LBT2PH.__versions__.set_component_params(ghenv, dev='MAR_12_21')
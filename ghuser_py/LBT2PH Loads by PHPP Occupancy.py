@@ -66,12 +66,12 @@ import LBT2PH.helpers
 import LBT2PH.spaces
 import LBT2PH.schedules
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.occupancy )
-reload( LBT2PH.helpers )
-reload( LBT2PH.spaces )
-reload( LBT2PH.schedules )
+LBT2PH.dev_reload( LBT2PH.occupancy )
+LBT2PH.dev_reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.spaces )
+LBT2PH.dev_reload( LBT2PH.schedules )
 
 ghenv.Component.Name = "LBT2PH Loads by PHPP Occupancy"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -61,9 +61,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.appliances
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.appliances )
+LBT2PH.dev_reload( LBT2PH.appliances )
 
 ghenv.Component.Name = "LBT2PH Loads by PNNL"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -37,10 +37,10 @@ import LBT2PH.windows
 from LBT2PH.helpers import convert_value_to_metric
 from LBT2PH.helpers import preview_obj
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.windows)
-reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.windows)
+LBT2PH.dev_reload(LBT2PH.helpers)
 
 ghenv.Component.Name = "LBT2PH PHPP Aperture Glazing"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -49,11 +49,11 @@ import LBT2PH.windows
 import LBT2PH.helpers
 import LBT2PH.helpers_geometry
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.windows)
-reload(LBT2PH.helpers)
-reload(LBT2PH.helpers_geometry)
+LBT2PH.dev_reload(LBT2PH.windows)
+LBT2PH.dev_reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.helpers_geometry)
 
 ghenv.Component.Name = "LBT2PH PHPP Aperture"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -75,10 +75,10 @@ import LBT2PH.__versions__
 import LBT2PH.windows
 import LBT2PH.shading
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.windows )
-reload( LBT2PH.shading )
+LBT2PH.dev_reload( LBT2PH.windows )
+LBT2PH.dev_reload( LBT2PH.shading )
 
 ghenv.Component.Name = "LBT2PH Shading Dimensions"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -79,7 +79,8 @@ EM March 1, 2021
         -------
         legend_par_: Optional legend parameters from the "LB Legend Parameters"
             that will be used to customize the display of the results.
-        parallel_: (bool) Set to "True" to run the study using multiple CPUs. This can
+        parallel_: (bool) Set to "True" to run the study using multiple CPUs, solving
+            several windows at the same time. This can
             dramatically decrease calculation time but can interfere with
             other computational processes that might be running on your
             machine. (Default: False).
@@ -128,9 +129,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.shading_lbt
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.shading_lbt )
+LBT2PH.dev_reload( LBT2PH.shading_lbt )
 
 ghenv.Component.Name = "LBT2PH Shading Seasonal Radiation"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -167,37 +168,22 @@ if _run:
     mesh_by_window = DataTree[Object]()
     lb_window_meshes = []
     
-    for i, window_surface in enumerate(_window_surfaces):
-        pts, nrmls, win_msh, win_msh_bck, rh_msh = LBT2PH.shading_lbt.build_window_meshes(window_surface, grid_size, mesh_params)
-        lb_window_meshes.append(win_msh)
-        
-        # Solve Winter
-        # ----------------------------------------------------------------------
-        args_winter = (shade_mesh, win_msh_bck, pts, w_sky_vecs, nrmls, parallel_)
-        
-        int_matrix_s, int_matrix_u, angles_s, angles_u = LBT2PH.shading_lbt.generate_intersection_data(*args_winter)
-        w_rads_shaded, face_areas = LBT2PH.shading_lbt.calc_win_radiation(int_matrix_s, angles_s, w_total_sky_rad, win_msh)
-        w_rads_unshaded, face_areas = LBT2PH.shading_lbt.calc_win_radiation(int_matrix_u, angles_u, w_total_sky_rad, win_msh)
-        
-        winter_radiation_shaded_detailed_.AddRange(w_rads_shaded, GH_Path(i))
-        winter_radiation_shaded_.Add(sum(w_rads_shaded)/sum(face_areas), GH_Path(i))
-        winter_radiation_unshaded_.Add(sum(w_rads_unshaded)/sum(face_areas), GH_Path(i))
-        
-        
-        # Solve Summer
-        # ----------------------------------------------------------------------
-        args_summer = (shade_mesh, win_msh_bck, pts, s_sky_vecs, nrmls, parallel_)
-        
-        int_matrix_s, int_matrix_u, angles_s, angles_u = LBT2PH.shading_lbt.generate_intersection_data(*args_summer)
-        s_rads_shaded, face_areas = LBT2PH.shading_lbt.calc_win_radiation(int_matrix_s, angles_s, s_total_sky_rad, win_msh)
-        s_rads_unshaded, face_areas = LBT2PH.shading_lbt.calc_win_radiation(int_matrix_u, angles_u, s_total_sky_rad, win_msh)
+    seasons = [('Winter', w_sky_vecs, w_total_sky_rad), ('Summer', s_sky_vecs, s_total_sky_rad)]
+    window_results = LBT2PH.shading_lbt.calc_windows_seasonal_radiation(_window_surfaces,
+                        shade_mesh, grid_size, seasons, parallel_)
+    
+    for i, result in enumerate(window_results):
+        lb_window_meshes.append(result.window_mesh)
         
-        summer_radiation_shaded_detailed_.AddRange(s_rads_shaded, GH_Path(i))
-        summer_radiation_shaded_.Add(sum(s_rads_shaded)/sum(face_areas), GH_Path(i))
-        summer_radiation_unshaded_.Add(sum(s_rads_unshaded)/sum(face_areas), GH_Path(i))
+        winter_radiation_shaded_detailed_.AddRange(result.shaded['Winter'], GH_Path(i))
+        winter_radiation_shaded_.Add(result.average_shaded('Winter'), GH_Path(i))
+        winter_radiation_unshaded_.Add(result.average_unshaded('Winter'), GH_Path(i))
         
+        summer_radiation_shaded_detailed_.AddRange(result.shaded['Summer'], GH_Path(i))
+        summer_radiation_shaded_.Add(result.average_shaded('Summer'), GH_Path(i))
+        summer_radiation_unshaded_.Add(result.average_unshaded('Summer'), GH_Path(i))
         
-        mesh_by_window.Add(rh_msh, GH_Path(i) )
+        mesh_by_window.Add(result.window_rh_mesh, GH_Path(i) )
     
     
     # Create the mesh and legend outputs
@@ -58,9 +58,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.windows
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.windows )
+LBT2PH.dev_reload( LBT2PH.windows )
 
 ghenv.Component.Name = "LBT2PH Shading Window Reveals"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
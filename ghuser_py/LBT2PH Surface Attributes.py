@@ -63,9 +63,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.helpers
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.helpers)
 
 ghenv.Component.Name = "LBT2PH Surface Attributes"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -60,11 +60,13 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.tb
 import LBT2PH.helpers
+import LBT2PH.dict_codec
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload( LBT2PH.__versions__ )
-reload( LBT2PH.tb )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.tb )
+LBT2PH.dev_reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
 
 ghenv.Component.Name = "LBT2PH Thermal Bridges"
 LBT2PH.__versions__.set_component_params(ghenv, dev='APR_11_2021')
@@ -129,9 +131,8 @@ if estimated_tb_:
 if _HB_model:
     HB_model_ = _HB_model.duplicate()
     
-    tb_dict = {}
-    for tb_obj in tb_objs:
-        tb_dict.update( {tb_obj.id:tb_obj.to_dict()} )
+    # Identical TBs have the same id, so use dicts_by_id() to keep them all
+    tb_dict = LBT2PH.dict_codec.dicts_by_id( tb_objs )
     
     HB_model_ = LBT2PH.helpers.add_to_HB_model(HB_model_, 'tb', tb_dict, ghenv ) 
 
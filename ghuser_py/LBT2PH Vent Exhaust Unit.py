@@ -51,10 +51,10 @@ import LBT2PH.__versions__
 import LBT2PH.ventilation
 import LBT2PH.helpers
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.ventilation)
-reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.helpers)
 
 ghenv.Component.Name = "LBT2PH Vent Exhaust Unit"
 LBT2PH.__versions__.set_component_params(ghenv, dev='MAR_21_2021')
@@ -48,10 +48,10 @@ import LBT2PH.__versions__
 import LBT2PH.ventilation
 import LBT2PH.helpers
 
-reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH)
 reload(LBT2PH.__versions__)
-reload(LBT2PH.ventilation)
-reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.helpers)
 
 ghenv.Component.Name = "LBT2PH Vent System"
 LBT2PH.__versions__.set_component_params(ghenv, dev='MAR_21_2021')
@@ -135,6 +135,9 @@ if hrvDuct1: vent_system_.duct_01 = hrvDuct1
 if hrvDuct2: vent_system_.duct_02 = hrvDuct2
 if exhaust_vent_units_: vent_system_.exhaust_vent_objs = exhaust_vent_units_
 
+# Same id every solve, so the Spaces (and anything cached from them) don't change
+vent_system_.system_id = LBT2PH.ventilation.vent_system_id(ghenv, vent_system_.system_name)
+
 LBT2PH.helpers.preview_obj(vent_system_)
 
 
@@ -146,7 +149,14 @@ for hb_room in _HB_rooms:
     new_room = LBT2PH.helpers.add_to_HB_model( new_room, 'vent_system', vent_system_.to_dict(), ghenv )
     
     #Update the vent system name on all the spaces
-    for space in new_room.user_data.get('phpp', {}).get('spaces', {}).values():
-        space.update( { 'phpp_vent_system_id':vent_system_.system_id } )
+    # New space dicts: the existing ones are shared with the upstream component's rooms
+    new_spaces = {}
+    for space_key, space in new_room.user_data.get('phpp', {}).get('spaces', {}).items():
+        new_space = dict(space)
+        new_space.update( { 'phpp_vent_system_id':vent_system_.system_id } )
+        new_spaces[space_key] = new_space
+    
+    if new_spaces:
+        new_room = LBT2PH.helpers.add_to_HB_model( new_room, 'spaces', new_spaces, ghenv )
     
     HB_rooms_.append( new_room )
\ No newline at end of file
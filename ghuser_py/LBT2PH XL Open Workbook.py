@@ -50,9 +50,9 @@ import LBT2PH
 import LBT2PH.__versions__
 import LBT2PH.xl_connect
 
-reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH )
 reload(LBT2PH.__versions__)
-reload( LBT2PH.xl_connect )
+LBT2PH.dev_reload( LBT2PH.xl_connect )
 
 ghenv.Component.Name = "LBT2PH XL Open Workbook"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
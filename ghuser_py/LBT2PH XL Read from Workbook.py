@@ -53,7 +53,10 @@ import Grasshopper.Kernel as ghK
 from math import floor,log10
 
 import LBT2PH.__versions__
+import LBT2PH.variant_table
+
 reload(LBT2PH.__versions__)
+LBT2PH.dev_reload(LBT2PH.variant_table)
 
 ghenv.Component.Name = "LBT2PH XL Read from Workbook"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -81,21 +84,7 @@ class MyComponent(component):
                 #ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, msg1)
                 #return (None,None)
                 #Default, verification page
-                labelList=[
-                    ["TFA","Verification","I34"],
-                    ["Heating Demand","Verification","I35"],
-                    ["Heating Load","Verification","I36"],
-                    ["Cooling + Dehum Demand","Verification","I38"],
-                    ["Cooling Load","Verification","I39"],
-                    ["Frequency of Overheating","Verification","I40"],
-                    ["Frequency of excessively high humidity","Verification","I41"],
-                    ["Pressurization test result","Verification","I43"],
-                    ["Non-Renewable PE","Verification","I53"],
-                    ["PER Demand","Verification","I55"],
-                    ["PER","Verification","I56"],
-                    ["Heating Total","Heating","O27"],
-                    ["Cooling Total","Cooling","O28"]
-                    ]
+                labelList=[ list(field) for field in LBT2PH.variant_table.VERIFICATION_FIELDS ]
             else:
                 labelList=sc.sticky["displayFields"]
         
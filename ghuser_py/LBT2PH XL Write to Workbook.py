@@ -23,7 +23,9 @@
 Writes a series of objects to an excel sheet, then recalculates the sheet.
 These objects should be in a Treemap, and need a Worksheet, Range, and Value variable.
 Optionally only writes the differances from the last execution of this function, 
-to reduce writing time.
+to reduce writing time. The last values written are remembered per-workbook and
+are saved next to the PHPP file (as '..._LBT2PH_cache.json') when the workbook is
+saved, so the differences still work after restarting Rhino.
 -
 Original component design by Jack Hymowitz <https://github.com/jackhymowitz>, 
 Pinacle Scholar Summer Research Student, Stevens Institute of Technology
@@ -37,6 +39,9 @@ March 1, 2021
     Returns:
         excel: The running ExcelInterface is outputted after this function runs.
         numWrites: The number of writes that occured, for debugging purposes.
+            Writes are grouped into rectangular blocks and each block is written
+            in a single Excel call. The number of Excel (COM) calls made vs. 
+            the number a cell-by-cell write would have taken is printed out.
 """
 
 from ghpythonlib.componentbase import executingcomponent as component
@@ -54,7 +59,14 @@ clr.AddReferenceByName('Microsoft.Office.Interop.Excel')#, Culture=neutral, Publ
 from Microsoft.Office.Interop import Excel
 
 import LBT2PH.__versions__
+import LBT2PH.xl_write
+import LBT2PH.xl_diff
+import LBT2PH.sheet_block
+
 reload(LBT2PH.__versions__)
+LBT2PH.dev_reload(LBT2PH.xl_write)
+LBT2PH.dev_reload(LBT2PH.xl_diff)
+LBT2PH.dev_reload(LBT2PH.sheet_block)
 
 ghenv.Component.Name = "LBT2PH XL Write to Workbook"
 LBT2PH.__versions__.set_component_params(ghenv, dev=False)
@@ -91,53 +103,59 @@ class MyComponent(component):
             print('Using "SI" Units')
             return 'SI'
     
-    def doReadObjs(self, objects, _unitType):
-        #If useDiff is false, this is used. Simply reads all objects in
+    def getDiffStore(self, _excel):
+        """ The record of the last values written to this workbook """
         
-        diff=[]
+        workbook_path = getattr(_excel, 'filename', None) or _excel.active_workbook.FullName
+        stores = sc.sticky.setdefault('LBT2PH_xl_diff', {})
+        return LBT2PH.xl_diff.DiffStore.from_stores(workbook_path, stores)
+    
+    def getObjects(self, objects):
         for eachBranch in objects.Branches:
             for obj in eachBranch:
-                diff.append((obj.getWorksheet(_unitType),obj.Range,obj.getValue(_unitType)))
-        return diff
+                yield obj
     
-    def doDiff(self, objects, _unitType):
-        #If useDiff is true (or not set), this is used. Only objects that have changed are written
+    def getItems(self, objects, _unitType):
+        # Converts the units for each table / run of cells at once
+        return LBT2PH.sheet_block.iter_cells(self.getObjects(objects), _unitType)
+    
+    def doReadObjs(self, store, objects, _unitType):
+        #If useDiff is false, this is used. Simply reads all objects in
+        #The units are only converted once, the diff includes anything to clear out
         
-        newObj={}
-        for eachBranch in objects.Branches:
-            for obj in eachBranch:
-                newObj[(obj.getWorksheet(_unitType),obj.Range)]=obj.getValue(_unitType);
+        diff = store.diff(self.getItems(objects, _unitType), _full=True)
+        return diff, LBT2PH.xl_write.WritePlan.from_diff(diff)
+    
+    def doDiff(self, store, objects, _unitType):
+        #If useDiff is true (or not set), this is used. Only objects that have changed are written
         
-        diff=[]
-        if "XLSdata" in sc.sticky:    #We are checking diffs
-            oldObj=sc.sticky["XLSdata"]
-            for x in newObj.keys():
-                if not x in oldObj.keys() or oldObj[x]!=newObj[x]: #If the value didn't exist before or was changed, it's a change
-                    diff.append((x[0],x[1],newObj[x]))
-            for x in oldObj.keys():
-                if not x in newObj.keys():                         #If the value existed before and is now gone, it is a change
-                    diff.append((x[0],x[1],""))
-            
-        else:                                       #Not checking diffs
-            for x in newObj.keys():
-                diff.append((x[0],x[1],newObj[x]))
-        sc.sticky["newXLSdata"]=newObj
-        return diff
+        diff = store.diff(self.getItems(objects, _unitType))
+        return diff, LBT2PH.xl_write.WritePlan.from_diff(diff)
     
-    def doWrite(self, excel, border, data):
-        #Write out the data we have found
+    def doWrite(self, excel, store, border, plan):
+        #Write out the data we have found, one rectangular block at a time
+        
+        color = border == None or border
         
         with self.writingToExcel(excel):
-            for eachItem in data:
+            not_written = []
+            for block in plan.blocks:
                 try:
-                    excel.sheets_dict[eachItem[0]].Range[eachItem[1]].Value2 = eachItem[2]
-                    if(border == None or border):
-                        excel.sheets_dict[eachItem[0]].Range[eachItem[1]].Interior.ColorIndex=8
-                except:
-                    msg1 = "Sheet not found: " + eachItem[0]
+                    excel.write_block(block, 8 if color else None)
+                except KeyError:
+                    msg1 = "Sheet not found: " + block.worksheet
                     ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
-            if "newXLSdata" in sc.sticky:
-                sc.sticky["XLSdata"]=sc.sticky["newXLSdata"]
+                    not_written.extend( (block.worksheet, address) for address in block.addresses() )
+                except Exception as e:
+                    msg1 = "Could not write {}:{} - {}".format(block.worksheet, block.range_address, e)
+                    ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+                    not_written.extend( (block.worksheet, address) for address in block.addresses() )
+            
+            # Only kept in memory until the workbook is saved. Anything
+            # that failed to write is left out, so it is tried again next time
+            store.commit(_save=False, _not_written=not_written)
+        
+        print(plan.summary(color))
     
     def RunScript(self, excel, useDiff, border, XL_Objects):
         
@@ -147,13 +165,14 @@ class MyComponent(component):
             return (None,0)
         
         unitType = self.checkPHPPVersion(excel)
+        store = self.getDiffStore(excel)
         
         if useDiff is None or useDiff:
-            diff=self.doDiff(XL_Objects, unitType)
+            diff, plan=self.doDiff(store, XL_Objects, unitType)
         else:
-            diff=self.doReadObjs(XL_Objects, unitType)
+            diff, plan=self.doReadObjs(store, XL_Objects, unitType)
         
-        self.doWrite(excel, border,diff)
+        self.doWrite(excel, store, border, plan)
         excel.excel_app.Calculate()
         
         return (excel,len(diff))
@@ -0,0 +1,100 @@
+"""LBT2PH: A Plugin for creating Passive House Planning Package (PHPP) models from LadybugTools.
+
+Module loading
+--------------
+IronPython caches every module once it has been imported, so after the first
+solve none of the 'import LBT2PH.xxx' lines in the components cost anything.
+During development though, you want every change in the library to show up
+on the next solve without restarting Rhino. So the components and modules
+call dev_reload() rather than reload() directly:
+
+    import LBT2PH.spaces
+    LBT2PH.dev_reload( LBT2PH.spaces )
+
+which only reloads the module when __versions__.DEV_MODE is True.
+
+Modules which are only needed some of the time can be loaded with
+lazy_import(). The module (and everything it imports) is only imported the
+first time one of its attributes is used. ie: the '2PHPP Convert LBT Model'
+component doesn't load the whole conversion until there is a model to convert:
+
+    pipeline = LBT2PH.lazy_import('LBT2PH.pipeline')
+    LBT2PH.dev_reload( pipeline )
+"""
+
+import sys
+import importlib
+
+import LBT2PH.__versions__
+
+try:
+    _reload = reload
+except NameError:
+    _reload = importlib.reload
+
+def dev_reload(_module):
+    """Reloads the module, but only when __versions__.DEV_MODE is True
+
+    Args:
+        _module (module | LazyModule): The module to reload
+    Returns:
+        (module): The module (reloaded or not)
+    """
+
+    if not LBT2PH.__versions__.DEV_MODE:
+        return _module
+
+    if isinstance(_module, LazyModule):
+        # Not imported yet, so there's nothing old to reload
+        if _module.is_loaded:
+            _reload( _module._load() )
+        return _module
+
+    return _reload(_module)
+
+class LazyModule(object):
+    """Stands in for a module until one of its attributes is used, then imports it """
+
+    def __init__(self, _name):
+        object.__setattr__(self, '_name', _name)
+        object.__setattr__(self, '_module', None)
+
+    def _load(self):
+        module = object.__getattribute__(self, '_module')
+        if module is None:
+            module = importlib.import_module( object.__getattribute__(self, '_name') )
+            object.__setattr__(self, '_module', module)
+        return module
+
+    @property
+    def is_loaded(self):
+        return object.__getattribute__(self, '_module') is not None
+
+    def __getattr__(self, _attr):
+        return getattr(self._load(), _attr)
+
+    def __setattr__(self, _attr, _value):
+        setattr(self._load(), _attr, _value)
+
+    def __unicode__(self):
+        return u"Lazy Module: < {} >  |  Loaded: {}".format(self._name, self.is_loaded)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_name={!r})".format(
+               self.__class__.__name__,
+               self._name)
+
+def lazy_import(_name):
+    """Returns the module if it is already loaded, otherwise a LazyModule for it
+
+    Args:
+        _name (str): The full module name. ie: 'LBT2PH.pipeline'
+    Returns:
+        (module | LazyModule)
+    """
+
+    try:
+        return sys.modules[_name]
+    except KeyError:
+        return LazyModule(_name)
@@ -1,4 +1,5 @@
-DEV_MODE = True
+# Set True to reload the LBT2PH modules on every component solve (see LBT2PH.dev_reload)
+DEV_MODE = False
 RELEASE_VERSION = "LBT2PH v0.1"
 CATEGORY = "PH-Tools"
 SUB_01_MODEL = '01 | Model'
@@ -3,8 +3,8 @@ import math
 import LBT2PH
 import LBT2PH.spaces
 
-reload(LBT2PH)
-reload(LBT2PH.spaces)
+LBT2PH.dev_reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH.spaces)
 
 def get_room_infiltration_rate(_n50, _q50, _blower_pressure, _hb_room, _phpp_space_dict):
     for spave in _phpp_space_dict['spaces'].values():
@@ -1,20 +1,28 @@
 import math
-from occupancy import Occupancy
-import ghpythonlib.components as ghc
-import Grasshopper.Kernel as ghK
-import random
-from System import Object
+
+try:
+    from System import Object
+except ImportError:
+    Object = object  # CPython
+
+import LBT2PH
+import LBT2PH.identity
+import LBT2PH.dict_codec
+
+LBT2PH.dev_reload( LBT2PH.identity )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
 
 class ApplianceSet(Object):
 
+    id = LBT2PH.identity.ContentId('host_room_tfa', 'lighting_efficacy', 'appliance_list')
+
     def __init__(self, _appliance_list=[], _hb_room_ids=[]):
-        self.id = random.randint(1000,9999)
         self.appliance_list = _appliance_list
         self._host_room_tfa = None
         self._lighting_efficacy = None
 
     def __iter__(self):
-        return self.appliance_list
+        return iter(self.appliance_list)
 
     @property
     def lighting_efficacy(self):
@@ -45,9 +53,7 @@ class ApplianceSet(Object):
         d.update( {'_host_room_tfa':self.host_room_tfa} )
         d.update( {'lighting_efficacy':self.lighting_efficacy} )
                 
-        appliances = {}
-        for appliance in self.appliance_list:
-            appliances.update( {appliance.id:appliance.to_dict()} )
+        appliances = LBT2PH.dict_codec.dicts_by_id( self.appliance_list )
         d.update( {'appliance_list':appliances } )
         
         return d
@@ -59,7 +65,6 @@ class ApplianceSet(Object):
         
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._host_room_tfa = _dict.get('_host_room_tfa')    
         new_obj.lighting_efficacy = _dict.get('lighting_efficacy')      
         
@@ -114,8 +119,10 @@ class ElecEquipAppliance(Object):
         'consumerElec': {'include':1, 'demand': 80.0, 'util_frac': 1, 'freq':0.55},
     }
     
+    id = LBT2PH.identity.ContentId('name', 'include', 'nominal_demand', 'utilization_factor', 'frequency', '_type',
+                                   'hb_wattage', 'hb_avg_daily_util_frac')
+
     def __init__(self, _nm=None, _nomDem=None, _utilFac=None, _freq=None, _type=None):
-        self.id = random.randint(1000,9999)
         self.name = _nm
         self.include = 1
         self._nominal_demand = _nomDem
@@ -254,7 +261,6 @@ class ElecEquipAppliance(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj.name = _dict.get('name')
         new_obj.include = _dict.get('include')
         new_obj._nominal_demand = _dict.get('_nominal_demand')
@@ -1,10 +1,19 @@
-import helpers
 import json
-import rhinoscriptsyntax as rs
-import Grasshopper.Kernel as ghK
-import scriptcontext as sc
 from collections import namedtuple
 
+import LBT2PH
+import LBT2PH.helpers as helpers
+
+LBT2PH.dev_reload( helpers )
+
+try:
+    # Only for reading the Rhino document's UserText, not the model conversion
+    import rhinoscriptsyntax as rs
+    import Grasshopper.Kernel as ghK
+    import scriptcontext as sc
+except ImportError:
+    rs = ghK = sc = None
+
 try:  # import the honeybee dependencies
     from honeybee.typing import clean_and_id_ep_string
     from honeybee_energy.material.opaque import EnergyMaterial
@@ -0,0 +1,128 @@
+"""A cache of converted model parts, kept between solves of the model conversion.
+
+Each part of the HB Model (an aperture, a room's spaces, the footprint...) gets
+a 'fingerprint': a hash of everything that part's conversion depends on. If
+the fingerprint is the same as last time, the part converted last time is
+used again, rather than converting it again. So when only one window changes,
+only that one window gets rebuilt.
+
+Note: nothing in here uses Rhino or Honeybee. See LBT2PH.pipeline for where
+the fingerprints come from.
+"""
+
+import json
+import hashlib
+
+def _default(_obj):
+    try:
+        return _obj.to_dict()
+    except AttributeError:
+        return repr(_obj)
+
+def fingerprint(*_parts):
+    """A hash of the parts. Anything json can't handle uses its to_dict() or repr()
+
+    Args:
+        *_parts: Any dicts, lists, strings, numbers...
+    Returns:
+        (str): The hex digest. The same parts will always give the same fingerprint.
+    """
+
+    text = json.dumps(_parts, sort_keys=True, separators=(',', ':'), default=_default)
+    return hashlib.md5( text.encode('utf-8') ).hexdigest()
+
+_MISSING = object()
+
+class ConversionCache:
+    """Converted parts, by (kind, key), along with the fingerprint they were built from """
+
+    def __init__(self):
+        self._items = {}   # {(kind, key): (fingerprint, value)}
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def start_run(self):
+        """Call at the start of each conversion, before any get() """
+
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, _kind, _key, _fingerprint, _builder):
+        """Returns the cached value if the fingerprint hasn't changed, otherwise builds a new one
+
+        Args:
+            _kind (str): The type of part. ie: 'aperture'
+            _key (str): The part's unique key. ie: the HB Aperture's identifier
+            _fingerprint (str): The part's current fingerprint
+            _builder (function): f() -> value. Called to build the part if needed
+        Returns:
+            The value
+        """
+
+        value = self.lookup(_kind, _key, _fingerprint, _MISSING)
+        if value is _MISSING:
+            value = _builder()
+            self.store(_kind, _key, _fingerprint, value)
+        return value
+
+    def lookup(self, _kind, _key, _fingerprint, _default=None):
+        """Same as get(), but returns _default rather than building the part
+
+        For parts which are quicker to rebuild all together: lookup() each
+        one, build all the missing ones at once, then store() each of those.
+
+        Returns:
+            The cached value, or _default if there isn't one with the same fingerprint
+        """
+
+        item_key = (_kind, _key)
+        self._seen.add(item_key)
+
+        item = self._items.get(item_key)
+        if item is not None and item[0] == _fingerprint:
+            self.hits += 1
+            return item[1]
+
+        self.misses += 1
+        return _default
+
+    def store(self, _kind, _key, _fingerprint, _value):
+        """Adds (or replaces) a part built after a lookup() miss """
+
+        item_key = (_kind, _key)
+        self._seen.add(item_key)
+        self._items[item_key] = (_fingerprint, _value)
+
+    def prune(self):
+        """Drops everything not used since start_run(). ie: deleted rooms / windows
+
+        Returns:
+            (int): The number of items dropped
+        """
+
+        stale = [ key for key in self._items if key not in self._seen ]
+        for key in stale:
+            del self._items[key]
+        return len(stale)
+
+    def clear(self):
+        self._items.clear()
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, _item_key):
+        return _item_key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __unicode__(self):
+        return u"Conversion Cache | Items: {}  |  Reused: {}  |  Rebuilt: {}".format(
+            len(self._items), self.hits, self.misses)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
@@ -0,0 +1,297 @@
+"""Generated to_dict() / from_dict() methods from a list of fields.
+
+The PHPP objects are stored in the HB user_data as plain dicts, so every
+component solve turns them into dicts and back again. Rather than writing out
+(and keeping in step) both methods by hand, a class lists its fields once:
+
+    class PHPP_Sys_Duct_Segment(Object):
+        ...
+        _codec = DictCodec(
+            Field('id', _set_attr=False),
+            Field('length'),
+            Field('insulation_thickness', 'insul_thick'),
+            )
+        to_dict = _codec.to_dict_method()
+        from_dict = _codec.from_dict_method()
+
+and the two methods are compiled from that, the same as if they had been
+written out line by line: no loops over the fields or getattr() calls at run
+time.
+
+Anything which isn't a plain value or PHPP object (Rhino geometry, a list of
+sub-objects stored under their own keys...) gets a Field _encode / _decode
+function, and a class whose from_dict() needs more than the dict (ie: the
+ghenv) or picks the class to make from it gets a DictCodec _new function.
+
+share_unchanged() is for writing the dicts back to the user_data: any
+sub-dict which hasn't changed is replaced by the one already there, so the
+old and new user_data share everything except what actually changed.
+updated_user_data() uses it to write one 'phpp' item (copy-on-write).
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+import LBT2PH
+
+# Field kinds
+VALUE = 'value'         # stored as-is
+OBJECT = 'object'       # an object with its own to_dict() / from_dict()
+OBJECTS_BY_ID = 'by_id' # a list of objects, stored as {obj.id: obj.to_dict(), ...}. See dicts_by_id()
+OBJECTS = 'list'        # a list of objects, stored as [obj.to_dict(), ...]
+
+class Field:
+    """One key of the dict, and the attribute it comes from / goes to """
+
+    def __init__(self, _key, _attr=None, _set_attr=None, _kind=VALUE, _type=None, _skip_empty=False,
+                 _encode=None, _decode=None):
+        """
+        Args:
+            _key (str): The dict key
+            _attr (str): The attribute to read when writing the dict. Default: same as the key
+            _set_attr (str | False): The attribute to set when reading the dict. Default:
+                same as _attr. Use False for read-only values (ie: set in __init__)
+            _kind (str): VALUE, OBJECT, OBJECTS_BY_ID or OBJECTS
+            _type (class): For OBJECT / OBJECTS_BY_ID / OBJECTS: the class to read the sub-dicts with
+            _skip_empty (bool): Default=False. If True, the key is left out of the
+                dict when the (written) value is empty (None, 0, '', {}, ...)
+            _encode (function): Optional. Writes the attribute's value to the dict
+                (ie: Rhino geometry -> LBT dict) in place of the _kind's
+            _decode (function): Optional. The other way: the dict value -> the attribute
+        """
+        self.key = _key
+        self.attr = _attr or _key
+        self.set_attr = self.attr if _set_attr is None else _set_attr
+        self.kind = _kind
+        self.type = _type
+        self.skip_empty = _skip_empty
+        self.encode = _encode
+        self.decode = _decode
+
+        if self.kind in (OBJECT, OBJECTS_BY_ID, OBJECTS) and self.type is None and self.decode is None:
+            raise ValueError('Field "{}": a _type is needed for "{}" fields.'.format(_key, _kind))
+
+    def __unicode__(self):
+        return u"Field | Key: {}  |  Attr: {}  |  Kind: {}".format(self.key, self.attr, self.kind)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_key={!r}, _attr={!r}, _set_attr={!r}, _kind={!r}, _type={!r}, _skip_empty={!r}, "\
+               "_encode={!r}, _decode={!r})".format(
+               self.__class__.__name__,
+               self.key,
+               self.attr,
+               self.set_attr,
+               self.kind,
+               self.type,
+               self.skip_empty,
+               self.encode,
+               self.decode)
+
+def _to_dict_or_none(_obj):
+    return None if _obj is None else _obj.to_dict()
+
+def _to_dicts(_objs):
+    return [ obj.to_dict() for obj in _objs or [] ]
+
+def dicts_by_id(_objs):
+    """Returns {obj.id: obj.to_dict(), ...} for a list of objects
+
+    Objects with a content id (see LBT2PH.identity) have the same id when they
+    are the same, but the list might still have two of them (ie: two identical
+    thermal bridges). Any repeats get an '<id>-2', '<id>-3'... key rather than
+    overwriting the first.
+    """
+
+    d = {}
+    for obj in _objs or []:
+        key = obj.id
+        count = 1
+        while key in d:
+            count += 1
+            key = '{}-{}'.format(obj.id, count)
+        d[key] = obj.to_dict()
+    return d
+
+class DictCodec:
+    """Builds a class' to_dict() and from_dict() methods from its Fields """
+
+    def __init__(self, *_fields, **_kwargs):
+        """
+        Args:
+            *_fields (Field): The fields, in order
+            _none_if_empty (bool): Default=False. If True, from_dict() returns None
+                for an empty / None dict rather than a new default object.
+            _context (tuple): Optional. The names of any extra from_dict() args
+                (ie: '_ghenv'). They are all None by default, and only go to _new.
+            _new (function): Optional. _new(cls, _dict, *context) returns the new
+                object the fields are read into. Default: cls()
+        """
+        self.fields = list(_fields)
+        self.none_if_empty = _kwargs.get('_none_if_empty', False)
+        self.context = tuple(_kwargs.get('_context', ()))
+        self.new = _kwargs.get('_new', None)
+
+        keys = [ f.key for f in self.fields ]
+        if len(set(keys)) != len(keys):
+            raise ValueError('Duplicate keys in the fields: {}'.format(keys))
+
+    @property
+    def keys(self):
+        return [ f.key for f in self.fields ]
+
+    @staticmethod
+    def _compile(_name, _lines, _namespace):
+        source = '\n'.join(_lines) + '\n'
+        exec(compile(source, '<{}>'.format(_name), 'exec'), _namespace)
+        return _namespace[_name]
+
+    def to_dict_method(self):
+        """Returns the compiled to_dict(self) function """
+
+        namespace = {'_to_dict_or_none': _to_dict_or_none, 'dicts_by_id': dicts_by_id, '_to_dicts': _to_dicts}
+        encode = {OBJECT: '_to_dict_or_none', OBJECTS_BY_ID: 'dicts_by_id', OBJECTS: '_to_dicts'}
+
+        lines = ['def to_dict(self):', '    d = {}']
+        for i, field in enumerate(self.fields):
+            value = 'self.{}'.format(field.attr)
+            if field.encode:
+                namespace['_encode_{}'.format(i)] = field.encode
+                value = '_encode_{}({})'.format(i, value)
+            elif field.kind in encode:
+                value = '{}({})'.format(encode[field.kind], value)
+
+            if field.skip_empty:
+                lines.append('    value = {}'.format(value))
+                lines.append('    if value:')
+                lines.append('        d[{!r}] = value'.format(field.key))
+            else:
+                lines.append('    d[{!r}] = {}'.format(field.key, value))
+        lines.append('    return d')
+
+        return self._compile('to_dict', lines, namespace)
+
+    def from_dict_method(self):
+        """Returns the compiled from_dict(cls, _dict) classmethod """
+
+        namespace = {}
+        lines = ['def from_dict(cls, _dict{}):'.format(''.join(', {}=None'.format(arg) for arg in self.context))]
+        if self.none_if_empty:
+            lines.append('    if not _dict: return None')
+        if self.new:
+            namespace['_new'] = self.new
+            lines.append('    new_obj = _new(cls, _dict{})'.format(''.join(', ' + arg for arg in self.context)))
+        else:
+            lines.append('    new_obj = cls()')
+
+        for i, field in enumerate(self.fields):
+            if field.set_attr is False:
+                continue
+
+            if field.decode:
+                namespace['_decode_{}'.format(i)] = field.decode
+                value = '_decode_{}(_dict.get({!r}))'.format(i, field.key)
+            elif field.kind == VALUE:
+                value = '_dict.get({!r})'.format(field.key)
+            elif field.kind == OBJECT:
+                namespace['_type_{}'.format(i)] = field.type
+                value = '_type_{}.from_dict(_dict.get({!r}))'.format(i, field.key)
+            elif field.kind == OBJECTS:
+                namespace['_type_{}'.format(i)] = field.type
+                value = '[ _type_{}.from_dict(d) for d in (_dict.get({!r}) or []) ]'.format(i, field.key)
+            else:
+                namespace['_type_{}'.format(i)] = field.type
+                value = '[ _type_{}.from_dict(d) for d in (_dict.get({!r}) or {{}}).values() ]'.format(i, field.key)
+
+            lines.append('    new_obj.{} = {}'.format(field.set_attr, value))
+        lines.append('    return new_obj')
+
+        return classmethod( self._compile('from_dict', lines, namespace) )
+
+    def __unicode__(self):
+        return u"Dict Codec | Keys: {}".format(self.keys)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(*{!r}, _none_if_empty={!r}, _context={!r}, _new={!r})".format(
+               self.__class__.__name__,
+               self.fields,
+               self.none_if_empty,
+               self.context,
+               self.new)
+
+def share_unchanged(_new, _old):
+    """Returns _new, but with any parts equal to the same part of _old replaced by _old's
+
+    Args:
+        _new: The new value (usually a dict from to_dict())
+        _old: The value it replaces. ie: what's in the user_data now
+    Returns:
+        _old if nothing changed, otherwise a new dict / list which shares all of
+        _old's unchanged sub-dicts. Neither input is modified.
+    """
+
+    if _new is _old:
+        return _old
+
+    if type(_new) is not type(_old):
+        return _new
+
+    # Comparing whole (unchanged) sub-dicts is much quicker than walking them
+    if _new == _old:
+        return _old
+
+    if isinstance(_new, dict):
+        shared = {}
+        for key, value in _new.items():
+            shared[key] = share_unchanged(value, _old[key]) if key in _old else value
+        return shared
+
+    if isinstance(_new, list) and len(_new) == len(_old):
+        return [ share_unchanged(a, b) for a, b in zip(_new, _old) ]
+
+    return _new
+
+def updated_user_data(_user_data, _key, _dict, _write='update'):
+    """Returns a new user_data with the _dict written to ['phpp'][_key], copy-on-write
+
+    Only the dicts along the path being changed (the user_data itself, 'phpp'
+    and '_key') are new. Everything else is shared with the original user_data,
+    which this never changes. So the original HB object (HB's duplicate() only
+    makes a shallow copy of the user_data) is left as it was, as long as the
+    caller doesn't change any of the shared dicts in place either: any other
+    'phpp' items to change must be written with their own updated_user_data().
+
+    Args:
+        _user_data (dict): The HB object's current user_data. May be None
+        _key (str): The 'phpp' item to write. ie: 'spaces'. If 'phpp' and the
+            user_data is empty, the _dict becomes the whole 'phpp' item.
+        _dict (dict): The data to write
+        _write (str): Default='update'. 'update' adds the _dict's items to the
+            existing ones, 'overwrite' replaces the existing item.
+    Returns:
+        (dict): The new user_data
+    """
+
+    if not _user_data:
+        if _key == 'phpp':
+            return {'phpp': _dict}
+        return {'phpp': {_key: _dict}}
+
+    if 'phpp' not in _user_data:
+        return {'phpp': {_key: _dict}}
+
+    user_data = dict(_user_data)
+    phpp = dict(user_data['phpp'])
+    user_data['phpp'] = phpp
+
+    if _key not in phpp:
+        phpp[_key] = _dict
+    elif _write == 'update':
+        old = phpp[_key]
+        new = dict(old)
+        new.update(_dict)
+        phpp[_key] = share_unchanged(new, old)
+    elif _write == 'overwrite':
+        phpp[_key] = share_unchanged(_dict, phpp[_key])
+
+    return user_data
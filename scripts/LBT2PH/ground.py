@@ -1,17 +1,32 @@
-import ghpythonlib.components as ghc
-import rhinoscriptsyntax as rs
 import json
-import Grasshopper.Kernel as ghK
-import random
-from ladybug_rhino.fromgeometry import from_face3d 
 
-class PHPP_Ground_Floor_Element:
+try:
+    # Only there when run inside Rhino. Needed for the floor surface geometry
+    import ghpythonlib.components as ghc
+    import rhinoscriptsyntax as rs
+    import Grasshopper.Kernel as ghK
+    from ladybug_rhino.fromgeometry import from_face3d 
+except ImportError:
+    ghc = rs = ghK = from_face3d = None
+
+import LBT2PH
+import LBT2PH.identity
+import LBT2PH.dict_codec
+
+LBT2PH.dev_reload( LBT2PH.identity )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
+
+from LBT2PH.dict_codec import DictCodec, Field, OBJECT
+
+class PHPP_Ground_Floor_Element(object):
     """ A 'Floor' surface element for a ground object """
 
+    id = LBT2PH.identity.ContentId('hb_host_room_name', 'floor_area', 'floor_U_value',
+                                   'perim_len', 'perim_psi_X_len')
+
     def __init__(self, _ghenv):
         self.default_perim_psi = 0.5 #W/mk
         self.ghenv = _ghenv
-        self.id = random.randint(1000,9999)
         self.hb_host_room_name = None
         self.floor_area = None
         self.floor_U_value = None
@@ -311,30 +326,18 @@ class PHPP_Ground_Floor_Element:
         
         return srfcUvalue
 
-    def to_dict(self):
-        d = {}
-        
-        d.update( {'id':self.id} )
-        d.update( {'hb_host_room_name':self.hb_host_room_name} )
-        d.update( {'floor_area': self.floor_area} )
-        d.update( {'floor_U_value': self.floor_U_value} )
-        d.update( {'perim_len': self.perim_len} )
-        d.update( {'perim_psi_X_len': self.perim_psi_X_len} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv):
-        new_obj = cls(_ghenv)
-
-        new_obj.id = _dict.get('id')
-        new_obj.hb_host_room_name = _dict.get('hb_host_room_name')
-        new_obj.floor_area = _dict.get('floor_area')
-        new_obj.floor_U_value = _dict.get('floor_U_value')
-        new_obj.perim_len = _dict.get('perim_len')
-        new_obj.perim_psi_X_len = _dict.get('perim_psi_X_len')
-
-        return new_obj
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('hb_host_room_name'),
+        Field('floor_area'),
+        Field('floor_U_value'),
+        Field('perim_len'),
+        Field('perim_psi_X_len'),
+        _context=('_ghenv',),
+        _new=lambda cls, _dict, _ghenv: cls(_ghenv),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'A PHPP Ground Floor Element: < {} >'.format(self.id)
@@ -346,7 +349,14 @@ class PHPP_Ground_Floor_Element:
             self.ghenv)
 
 
-class PHPP_Ground():
+def _new_ground(cls, _dict, _ghenv):
+    """A new ground object, with its floor element read using the ghenv """
+
+    floor_element = PHPP_Ground_Floor_Element.from_dict(_dict.get('floor_element'), _ghenv)
+    return cls(_floor_element=floor_element)
+
+
+class PHPP_Ground(object):
     """ General 'getters' common to all Ground classes """
     
     @property
@@ -389,10 +399,12 @@ class PHPP_Ground():
 
 
 class PHPP_Ground_Slab_on_Grade( PHPP_Ground ):
+    id = LBT2PH.identity.ContentId('Type', 'floor_element', 'PerimPsiVal', 'perimInsulDepth',
+                                   'perimInsulThick', 'perimInsulConductivity', 'perimInsulOrientation')
+
     def __init__(self, _floor_element=None, _perimPsi=0.5, _depth=1.0, 
                         _thick=0.1, _cond=0.04, _orient='Vertical'):
         
-        self.id = random.randint(1000,9999)
         self.Type = '01_SlabOnGrade'
         self.soilThermalConductivity = 2.0 # MJ/m3-K
         self.soilHeatCapacity = 2.0 # W/mk
@@ -406,35 +418,21 @@ class PHPP_Ground_Slab_on_Grade( PHPP_Ground ):
         self.perimInsulConductivity = _cond
         self.perimInsulOrientation = _orient
 
-    def to_dict(self):
-        d ={}
-        
-        d.update( {'id':self.id} )
-        d.update( {'type': self.Type} )
-        d.update( {'floor_element':self.floor_element.to_dict() } )
-        d.update( {'PerimPsiVal':self.PerimPsiVal } )
-        d.update( {'perimInsulDepth':self.perimInsulDepth } )
-        d.update( {'perimInsulThick':self.perimInsulThick } )
-        d.update( {'perimInsulConductivity':self.perimInsulConductivity } )
-        d.update( {'perimInsulOrientation':self.perimInsulOrientation } )
-        
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv):
-        new_obj = cls()
-        
-        new_obj.id = _dict.get('id')
-        floor_element = PHPP_Ground_Floor_Element.from_dict(_dict.get('floor_element'), _ghenv)
-        new_obj.floor_element = floor_element
-        new_obj.PerimPsiVal = _dict.get('PerimPsiVal')
-        new_obj.perimInsulDepth = _dict.get('perimInsulDepth')
-        new_obj.perimInsulThick = _dict.get('perimInsulThick')
-        new_obj.perimInsulConductivity = _dict.get('perimInsulConductivity')
-        new_obj.perimInsulOrientation = _dict.get('perimInsulOrientation')
-
-        return new_obj
-
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('type', 'Type', _set_attr=False),
+        Field('floor_element', _kind=OBJECT, _type=PHPP_Ground_Floor_Element, _set_attr=False),
+        Field('PerimPsiVal'),
+        Field('perimInsulDepth'),
+        Field('perimInsulThick'),
+        Field('perimInsulConductivity'),
+        Field('perimInsulOrientation'),
+        _context=('_ghenv',),
+        _new=_new_ground,
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
+    
     def __unicode__(self):
         return u'A PHPP Ground Slab-On-Grade Object: < {} >'.format(self.id)
     def __str__(self):
@@ -452,10 +450,11 @@ class PHPP_Ground_Slab_on_Grade( PHPP_Ground ):
 
 
 class PHPP_Ground_Heated_Basement( PHPP_Ground ):
+    id = LBT2PH.identity.ContentId('Type', 'floor_element', 'PerimPsiVal', 'WallHeight_BG', 'WallU_BG')
+
     def __init__(self, _floor_element=None, _perimPsi=0.5,
                         _wallHeight_BG=1.0, _wallU_BG=1.0):
         
-        self.id = random.randint(1000,9999)
         self.Type = '02_HeatedBasement'
         self.soilThermalConductivity = 2.0 # MJ/m3-K
         self.soilHeatCapacity = 2.0 # W/mk
@@ -467,31 +466,19 @@ class PHPP_Ground_Heated_Basement( PHPP_Ground ):
         self.WallHeight_BG = _wallHeight_BG
         self.WallU_BG = _wallU_BG
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'id':self.id} )
-        d.update( {'type': self.Type} )
-        d.update( {'floor_element':self.floor_element.to_dict() } )
-        d.update( {'PerimPsiVal':self.PerimPsiVal } )
-        d.update( {'WallHeight_BG':self.WallHeight_BG } )
-        d.update( {'WallU_BG':self.WallU_BG } )
-        
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv):
-        new_obj = cls()
-        
-        new_obj.id = _dict.get('id')
-        floor_element = PHPP_Ground_Floor_Element.from_dict(_dict.get('floor_element'), _ghenv)
-        new_obj.floor_element = floor_element
-        new_obj.PerimPsiVal = _dict.get('PerimPsiVal')
-        new_obj.WallHeight_BG = _dict.get('WallHeight_BG')
-        new_obj.WallU_BG = _dict.get('WallU_BG')
-
-        return new_obj
-
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('type', 'Type', _set_attr=False),
+        Field('floor_element', _kind=OBJECT, _type=PHPP_Ground_Floor_Element, _set_attr=False),
+        Field('PerimPsiVal'),
+        Field('WallHeight_BG'),
+        Field('WallU_BG'),
+        _context=('_ghenv',),
+        _new=_new_ground,
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
+    
     def __unicode__(self):
         return u'A PHPP Ground Heated Basement Object: < {} >'.format(self.id)
     def __str__(self):
@@ -507,11 +494,13 @@ class PHPP_Ground_Heated_Basement( PHPP_Ground ):
 
 
 class PHPP_Ground_Unheated_Basement( PHPP_Ground ):
+    id = LBT2PH.identity.ContentId('Type', 'floor_element', 'PerimPsiVal', 'WallHeight_BG', 'WallU_BG',
+                                   'WallHeight_AG', 'WallU_AG', 'FloorU', 'ACH', 'Volume')
+
     def __init__(self, _floor_element=None, _perimPsi=0.5, _wallHeight_AG=1.0,
                         _wallU_AG=1.0, _wallHeight_BG=1.0, _wallU_BG=1.0, 
                         _flrU=1.0, _ach=1.0, _vol=1.0):
         
-        self.id = random.randint(1000,9999)
         self.Type = '03_UnheatedBasement'
         self.soilThermalConductivity = 2.0 # MJ/m3-K
         self.soilHeatCapacity = 2.0 # W/mk
@@ -528,40 +517,23 @@ class PHPP_Ground_Unheated_Basement( PHPP_Ground ):
         self.ACH = _ach
         self.Volume = _vol
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'id':self.id} )
-        d.update( {'type': self.Type} )
-        d.update( {'floor_element':self.floor_element.to_dict() } )
-        d.update( {'PerimPsiVal':self.PerimPsiVal } )
-        d.update( {'WallHeight_BG':self.WallHeight_BG } )
-        d.update( {'WallU_BG':self.WallU_BG } )
-        d.update( {'WallHeight_AG':self.WallHeight_AG } )
-        d.update( {'WallU_AG':self.WallU_AG } )
-        d.update( {'FloorU':self.FloorU } )
-        d.update( {'ACH':self.ACH } )
-        d.update( {'Volume':self.Volume } )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv):
-        new_obj = cls()
-
-        new_obj.id = _dict.get('id')
-        floor_element = PHPP_Ground_Floor_Element.from_dict(_dict.get('floor_element'), _ghenv)
-        new_obj.floor_element = floor_element
-        new_obj.PerimPsiVal = _dict.get('PerimPsiVal')
-        new_obj.WallHeight_BG = _dict.get('WallHeight_BG')
-        new_obj.WallU_BG = _dict.get('WallU_BG')
-        new_obj.WallHeight_AG = _dict.get('WallHeight_AG')
-        new_obj.WallU_AG = _dict.get('WallU_AG')
-        new_obj.FloorU = _dict.get('FloorU')
-        new_obj.ACH = _dict.get('ACH')
-        new_obj.Volume = _dict.get('Volume')
-
-        return new_obj
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('type', 'Type', _set_attr=False),
+        Field('floor_element', _kind=OBJECT, _type=PHPP_Ground_Floor_Element, _set_attr=False),
+        Field('PerimPsiVal'),
+        Field('WallHeight_BG'),
+        Field('WallU_BG'),
+        Field('WallHeight_AG'),
+        Field('WallU_AG'),
+        Field('FloorU'),
+        Field('ACH'),
+        Field('Volume'),
+        _context=('_ghenv',),
+        _new=_new_ground,
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
     
     def __unicode__(self):
         return u'A PHPP Ground Un-heated Basement Object: < {} >'.format(self.id)
@@ -584,10 +556,12 @@ class PHPP_Ground_Unheated_Basement( PHPP_Ground ):
 
 
 class PHPP_Ground_Crawl_Space( PHPP_Ground ):
+    id = LBT2PH.identity.ContentId('Type', 'floor_element', 'PerimPsiVal', 'WallHeight', 'WallU',
+                                   'CrawlU', 'VentOpeningArea', 'windVelocity', 'windFactor')
+
     def __init__(self, _floor_element=None, _perimPsi=0.5, _wallHeight=1.0, _wallU=1.0,
                     _crawlU=1.0, _ventOpen=1.0, _windVel=4.0, _windFac=0.05):
         
-        self.id = random.randint(1000,9999)
         self.Type = '04_SuspenedFlrOverCrawl'
         self.soilThermalConductivity = 2.0 # MJ/m3-K
         self.soilHeatCapacity = 2.0 # W/mk
@@ -603,38 +577,22 @@ class PHPP_Ground_Crawl_Space( PHPP_Ground ):
         self.windVelocity = _windVel
         self.windFactor = _windFac
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'id':self.id} )
-        d.update( {'type': self.Type} )
-        d.update( {'floor_element':self.floor_element.to_dict() } )
-        d.update( {'PerimPsiVal':self.PerimPsiVal } )
-        d.update( {'WallHeight':self.WallHeight } )
-        d.update( {'WallU':self.WallU } )
-        d.update( {'CrawlU':self.CrawlU } )
-        d.update( {'VentOpeningArea':self.VentOpeningArea } )
-        d.update( {'windVelocity':self.windVelocity } )
-        d.update( {'windFactor':self.windFactor } )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv):
-        new_obj = cls()
-
-        new_obj.id = _dict.get('id')
-        floor_element = PHPP_Ground_Floor_Element.from_dict(_dict.get('floor_element'), _ghenv)
-        new_obj.floor_element = floor_element
-        new_obj.PerimPsiVal = _dict.get('PerimPsiVal')
-        new_obj.WallHeight = _dict.get('WallHeight')
-        new_obj.WallU = _dict.get('WallU')
-        new_obj.CrawlU = _dict.get('CrawlU')
-        new_obj.VentOpeningArea = _dict.get('VentOpeningArea')
-        new_obj.windVelocity = _dict.get('windVelocity')
-        new_obj.windFactor = _dict.get('windFactor')
-
-        return new_obj
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('type', 'Type', _set_attr=False),
+        Field('floor_element', _kind=OBJECT, _type=PHPP_Ground_Floor_Element, _set_attr=False),
+        Field('PerimPsiVal'),
+        Field('WallHeight'),
+        Field('WallU'),
+        Field('CrawlU'),
+        Field('VentOpeningArea'),
+        Field('windVelocity'),
+        Field('windFactor'),
+        _context=('_ghenv',),
+        _new=_new_ground,
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
     
     def __unicode__(self):
         return u'A PHPP Ground Crawl-Space Object: < {} >'.format(self.id)
@@ -1,10 +1,18 @@
-from System import Object
-import random
+try:
+    from System import Object
+except ImportError:
+    Object = object  # CPython
+
+import LBT2PH
+import LBT2PH.identity
+
+LBT2PH.dev_reload( LBT2PH.identity )
 
 class PHPP_PER(Object):
+    id = LBT2PH.identity.ContentId('primary_heat', 'secondary_heat', 'primary_heat_frac', 'dhw_frac', 'mech_cooling')
+
     def __init__(self, _htPrim='5-Direct electricity', _htSec=None,
                 _ht_frac=1, _dhw_frac=1, _mechClg=False):
-        self.id = random.randint(1000,9999)
         self._primary_heat = _htPrim
         self._secondary_heat = _htSec
         self._primary_heat_frac = _ht_frac
@@ -170,8 +178,9 @@ class PHPP_Boiler(object):
         50: {'name': '50-Pellets'},
     }
 
+    id = LBT2PH.identity.ContentId('name', 'type', 'fuel', 'params')
+
     def __init__(self, _name="Default Boiler", _type='1-None', _fuel='None', _params=False):
-        self.id = random.randint(1000,9999)
         self.name = _name
         self._type = _type
         self._type_num = 1
@@ -271,7 +280,6 @@ class PHPP_Boiler(object):
     def from_dict(cls, _dict):
         new_obj = cls()
         
-        new_obj.id = _dict.get('id')
         new_obj.name = _dict.get('name')
         new_obj.type = _dict.get('type')
         new_obj.fuel = _dict.get('fuel')
@@ -295,8 +303,9 @@ class PHPP_Boiler(object):
         return str(self)
 
 class PHPP_Cooling_SupplyAir(Object):
+    id = LBT2PH.identity.ContentId('on_off', 'max_capacity', 'seer')
+
     def __init__(self, _on_off=None, _maxCap=1000, _seer=3):
-        self.id = random.randint(1000,9999)
         self._on_off = _on_off
         self._max_capacity = _maxCap
         self._seer = _seer
@@ -345,7 +354,6 @@ class PHPP_Cooling_SupplyAir(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._on_off = _dict.get('on_off')
         new_obj._max_capacity = _dict.get('max_capacity')
         new_obj._seer = _dict.get('seer')
@@ -366,8 +374,9 @@ class PHPP_Cooling_SupplyAir(Object):
         return str(self)
 
 class PHPP_Cooling_RecircAir(Object):
+    id = LBT2PH.identity.ContentId('on_off', 'max_capacity', 'nominal_vol', 'variable_vol', 'seer')
+
     def __init__(self, _on_off=None, _maxCap=1000, _nomVol=100, _varVol='x', _seer=3):
-        self.id = random.randint(1000,9999)
         self._on_off = _on_off
         self._max_capacity = _maxCap
         self._nominal_vol = _nomVol
@@ -442,7 +451,6 @@ class PHPP_Cooling_RecircAir(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._on_off = _dict.get('on_off')
         new_obj._max_capacity = _dict.get('max_capacity')
         new_obj._nominal_vol = _dict.get('nominal_vol')
@@ -464,8 +472,9 @@ class PHPP_Cooling_RecircAir(Object):
         return str(self)
 
 class PHPP_Cooling_Dehumid(Object):
+    id = LBT2PH.identity.ContentId('waste_to_room', 'seer')
+
     def __init__(self, _wst2Rm=None, _seer=3):
-        self.id = random.randint(1000,9999)
         self._waste_to_room = _wst2Rm
         self._seer = _seer
     
@@ -504,7 +513,6 @@ class PHPP_Cooling_Dehumid(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._waste_to_room = _dict.get('waste_to_room')
         new_obj._seer = _dict.get('seer')
 
@@ -521,8 +529,9 @@ class PHPP_Cooling_Dehumid(Object):
         return str(self)
 
 class PHPP_Cooling_Panel(Object):
+    id = LBT2PH.identity.ContentId('seer',)
+
     def __init__(self, _seer=3):
-        self.id = random.randint(1000,9999)
         self._seer = _seer
     
     @property
@@ -545,7 +554,6 @@ class PHPP_Cooling_Panel(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj.seer = _dict.get('seer')
 
         return new_obj
@@ -561,13 +569,15 @@ class PHPP_Cooling_Panel(Object):
         return str(self)
 
 class PHPP_HP_AirSource(Object):
+    id = LBT2PH.identity.ContentId('name', 'source', 'temps_sources', 'temps_sinks', 'heating_capacities',
+                                   'cops', 'sink_dt')
+
     def __init__(self, _nm='Default Heat Pump', _src='1-Outdoor air', 
             _tsrcs=[-7.0, 2.0, 7.0, 15.0, 20.0, -7.0, 2.0, 7.0, 15.0, 20.0],
             _tsnks=[35.0, 35.0, 35.0, 35.0, 35.0, 50.0, 50.0, 50.0, 50.0, 50.0], 
             _hcs=[2.16, 2.64, 3.12, 3.75, 4.08, 2.04, 2.52, 3.00, 3.72, 3.87], 
             _cops=[2.70, 3.10, 3.70, 4.30, 4.90, 2.00, 2.30, 2.80, 3.30, 3.50], 
             _dtSnks=5.00, _warnings=[]):
-        self.id = random.randint(1000,9999)
         self.name = _nm
         self._source = _src
         self._T_sources = _tsrcs
@@ -678,7 +688,6 @@ class PHPP_HP_AirSource(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj.name = _dict.get('name')
         new_obj._source = _dict.get('_source')
         new_obj._T_sources = _dict.get('_T_sources')
@@ -703,10 +712,12 @@ class PHPP_HP_AirSource(Object):
         return str(self)
 
 class PHPP_HP_Options(Object):
+    id = LBT2PH.identity.ContentId('hp_distribution', 'backup_type', 'hp_priority', 'hp_control', 'frwd_temp',
+                                   'nom_power', 'rad_exponent', 'dT_elec_flow', 'depth_groundwater', 'power_groundwater')
+
     def __init__(self, _fwdT=35, _ph_dist='3-Supply air heating', _nPwr=None,
     _radExp=None, _bckpType='1-Elec. Immersion heater', _dTelec=None, _hpPrior='1-DHW-priority',
     _hpCntrl='1-On/Off', _dGrndWtr=None, _pGrndWtr=None ):
-        self.id = random.randint(1000,9999)
 
         self._hp_dist = _ph_dist
         self._backup_type = _bckpType
@@ -799,7 +810,6 @@ class PHPP_HP_Options(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._hp_dist = _dict.get('hp_distribution')
         new_obj._backup_type = _dict.get('backup_type')
         new_obj._hp_priority = _dict.get('hp_priority')
@@ -1,13 +1,25 @@
 from contextlib import contextmanager
-from copy import deepcopy
-import scriptcontext as sc
-import Rhino
-from copy import deepcopy
 import re
-import Grasshopper.Kernel as ghK
-import rhinoscriptsyntax as rs
 from timeit import default_timer
 
+try:
+    # Only there when run inside Rhino. Without them (ie: CPython) only the
+    # Rhino document / GH helpers don't work
+    import scriptcontext as sc
+    import Rhino
+    import Grasshopper.Kernel as ghK
+    import rhinoscriptsyntax as rs
+except ImportError:
+    sc = Rhino = ghK = rs = None
+
+import LBT2PH
+import LBT2PH.unit_conversion
+import LBT2PH.dict_codec
+
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.unit_conversion )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
+
 def get_warning_level(_warning_level):
     """Takes warning level as text, returns ghK object """
     
@@ -19,33 +31,25 @@ def get_warning_level(_warning_level):
         return ghK.GH_RuntimeMessageLevel.Remark
 
 def add_to_HB_model( _hb_model, _key, _dict, _ghenv, _write='update' ):
-
-    user_data = deepcopy( _hb_model.user_data )
-    if not user_data:
-        if _key == 'phpp':
-            _hb_model.user_data = {'phpp': _dict }
-            return _hb_model
-        else:
-            _hb_model.user_data = {'phpp': { _key: _dict} }
-            return _hb_model
+    """Writes the _dict to the HB object's user_data['phpp'][_key]
     
-    try:
-        if _write == 'update':
-            user_data['phpp'][_key].update( _dict )
-        elif _write == 'overwrite':
-            user_data['phpp'][_key] = _dict
-    except KeyError as e:
-        try:
-            user_data['phpp'].update( {_key:_dict } )
-        except KeyError:
-            try:
-                user_data = {'phpp':{_key:_dict }}
-            except Exception as e:
-                msg = e
-                msg += 'Error writing data to the model user_data?'
-                _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Error, msg )
-
-    _hb_model.user_data = user_data
+    Copy-on-write: only the 'phpp' and '_key' dicts are copied, the rest of
+    the user_data is shared with the original object. See dict_codec.updated_user_data()
+    So never change a dict read from the user_data in place (it is probably
+    still part of an upstream component's output): make a new one and write
+    it back with this function.
+    
+    Args:
+        _hb_model: The HB Model, Room, Face or Aperture to write to
+        _key (str): The 'phpp' item to write. ie: 'spaces'
+        _dict (dict): The data to write
+        _ghenv: The GH component's 'ghenv'
+        _write (str): Default='update'. 'update' or 'overwrite' any existing item
+    Returns:
+        The HB object
+    """
+    
+    _hb_model.user_data = LBT2PH.dict_codec.updated_user_data( _hb_model.user_data, _key, _dict, _write )
     return _hb_model
 
 @contextmanager
@@ -120,6 +124,28 @@ def find_input_string(_in):
    
     return input_unit
 
+# {Unit you want: {unit user input}, {..}, ...}
+METRIC_SCHEMA = {
+    'F':    {'SI':'*(9.0/5.0)+32.0', 'C':'*(9.0/5.0)+32.0', 'F':1, 'IP':1},
+    'C':    {'SI':1, 'C':1, 'K':1, 'F':'-32.0)*(5.0/9.0', 'IP':'-32.0)*(5.0/9.0'},
+    'M':    {'SI': 1, 'M':1, 'CM':0.01, 'MM':0.001, 'FT':0.3048, "'":0.3048, 'IN':0.0254, '"':0.0254},
+    'CM':   {'SI': 1, 'M':100, 'CM':1, 'MM':0.1, 'FT':30.48, "'":30.48, 'IN':2.54, '"':2.54},
+    'MM':   {'SI': 1, 'M':1000, 'CM':10, 'MM':1, 'FT':304.8, "'":304.8, 'IN':25.4, '"':25.4},
+    'W/M2K':{'SI':1, 'W/M2K':1, 'IP':5.678264134, 'BTU/HR-FT2-F':5.678264134, 'HR-FT2-F/BTU':'**-1*5.678264134'},
+    'W/MK': {'SI':1, 'W/MK':1, 'IP':1.730734908, 'BTU/HR-FT-F':1.730734908, 'R/IN':'**-1*0.144227909'},
+    'W/K':  {'SI':1, 'W/K':1, 'BTU/HR-F':1.895633976, 'IP':1.895633976},
+    'M3':   {'SI':1, 'FT3':0.028316847},
+    '-' :   {'SI':1, '-':1},
+    'M3/H': {'SI':1, 'CFM':1.699010796, 'IP':1.699010796, 'CFH':101.9406477},
+    'L':    {'SI':1, 'L':1, 'GALLON':3.78541, "GA":3.78541, "GAL":3.78541},
+    'KW':   {'SI':1, 'KW':1, 'W':1000, 'BTUH':3412.141156, 'KBTUH':3.412141156, 'TON':0.284345096},
+    'W':    {'SI':1, 'W':1, 'KW':0.001, 'BTUH':3.412141156, 'KBTUH':0.003412141, 'TON':0.000284345},
+    'W/W':  {'SI':1, 'BTU/WH':0.293071111, 'IP':0.293071111}
+}
+
+# Each METRIC_SCHEMA entry is compiled once, the first time it's used
+METRIC_CONVERTERS = LBT2PH.unit_conversion.ConversionRegistry( METRIC_SCHEMA, '({}{})' )
+
 def convert_value_to_metric(_inputString, _outputUnit):
     """ Will convert a string such as "12 FT" into the corresponding Metric unit
     
@@ -128,25 +154,6 @@ def convert_value_to_metric(_inputString, _outputUnit):
         _outputUnit: String: ('M', 'CM', 'MM', 'W/M2K', 'W/MK', 'M3') The desired unit
     """
 
-    # {Unit you want: {unit user input}, {..}, ...}
-    schema = {
-                'F':    {'SI':'*(9.0/5.0)+32.0', 'C':'*(9.0/5.0)+32.0', 'F':1, 'IP':1},
-                'C':    {'SI':1, 'C':1, 'K':1, 'F':'-32.0)*(5.0/9.0', 'IP':'-32.0)*(5.0/9.0'},
-                'M':    {'SI': 1, 'M':1, 'CM':0.01, 'MM':0.001, 'FT':0.3048, "'":0.3048, 'IN':0.0254, '"':0.0254},
-                'CM':   {'SI': 1, 'M':100, 'CM':1, 'MM':0.1, 'FT':30.48, "'":30.48, 'IN':2.54, '"':2.54},
-                'MM':   {'SI': 1, 'M':1000, 'CM':10, 'MM':1, 'FT':304.8, "'":304.8, 'IN':25.4, '"':25.4},
-                'W/M2K':{'SI':1, 'W/M2K':1, 'IP':5.678264134, 'BTU/HR-FT2-F':5.678264134, 'HR-FT2-F/BTU':'**-1*5.678264134'},
-                'W/MK': {'SI':1, 'W/MK':1, 'IP':1.730734908, 'BTU/HR-FT-F':1.730734908, 'R/IN':'**-1*0.144227909'},
-                'W/K':  {'SI':1, 'W/K':1, 'BTU/HR-F':1.895633976, 'IP':1.895633976},
-                'M3':   {'SI':1, 'FT3':0.028316847},
-                '-' :   {'SI':1, '-':1},
-                'M3/H': {'SI':1, 'CFM':1.699010796, 'IP':1.699010796, 'CFH':101.9406477},
-                'L':    {'SI':1, 'L':1, 'GALLON':3.78541, "GA":3.78541, "GAL":3.78541},
-                'KW':   {'SI':1, 'KW':1, 'W':1000, 'BTUH':3412.141156, 'KBTUH':3.412141156, 'TON':0.284345096},
-                'W':    {'SI':1, 'W':1, 'KW':0.001, 'BTUH':3.412141156, 'KBTUH':0.003412141, 'TON':0.000284345},
-                'W/W':  {'SI':1, 'BTU/WH':0.293071111, 'IP':0.293071111}
-              }
-                 
     inputValue = _inputString
     
     if _inputString is None:
@@ -177,13 +184,12 @@ def convert_value_to_metric(_inputString, _outputUnit):
             
             if string_found or value_found:
                 input_unit = find_input_string(string_found)
-                conversion_factor = schema.get(_outputUnit, {}).get(input_unit, 1)
+                conversion_factor = METRIC_SCHEMA.get(_outputUnit, {}).get(input_unit, 1)
+                output_val = float( METRIC_CONVERTERS.get(_outputUnit, input_unit)( float(value_found) ) )
 
-                try:
-                    output_val = float(value_found) * float(conversion_factor)
+                if isinstance(conversion_factor, (int, float)):
                     print('Converting input "{}" >>> {} * {} = {} {}'.format(inputValue, value_found, conversion_factor, output_val, _outputUnit)) 
-                except ValueError as e:
-                    output_val = float(eval('({}{})'.format(value_found, conversion_factor)))   
+                else:
                     print('Converting input "{}" >>> ({}{}) = {} {}'.format(inputValue, value_found, conversion_factor, output_val, _outputUnit))
                                      
                 return output_val
@@ -1,9 +1,13 @@
-import ghpythonlib.components as ghc
-import rhinoscriptsyntax as rs
-import Rhino
-
-from ladybug_rhino.fromgeometry import from_face3d
-from ladybug_rhino.togeometry import to_face3d 
+try:
+    # All Rhino geometry: only there when run inside Rhino
+    import ghpythonlib.components as ghc
+    import rhinoscriptsyntax as rs
+    import Rhino
+
+    from ladybug_rhino.fromgeometry import from_face3d
+    from ladybug_rhino.togeometry import to_face3d 
+except ImportError:
+    ghc = rs = Rhino = from_face3d = to_face3d = None
 
 def avg_normal_vectors(_vectors):
     x, y, z = 0, 0, 0
@@ -0,0 +1,110 @@
+"""Histogram / binning of schedule values, for the PHPP-style schedule reductions.
+
+Used to turn an hourly (8760) HB schedule into a PHPP 3-speed ventilation
+schedule: how much of the time (fraction) is spent in each bin, and what the
+average value is in each bin.
+
+Schedules are usually made up of only a few different values (0, 0.5, 1.0...)
+so the values are counted in a single pass, and then only the different
+values need to be sorted into bins.
+"""
+
+from collections import Counter
+
+class Histogram:
+    """The number of values in each bin, and the sum of the values in each bin
+
+    Bins are numbered 0 to nbins (so there are nbins + 1 of them) the same as
+    the original ventilation.generate_histogram(): each value goes in bin
+    int(nbins * (value - min) / (max - min)), so the top bin only holds the
+    values equal to the max.
+    """
+
+    def __init__(self, _nbins, _min, _max, _counts, _sums):
+        self.nbins = _nbins
+        self.min = _min
+        self.max = _max
+        self.counts = _counts  # {bin: number of values in the bin}
+        self.sums = _sums      # {bin: sum of the values in the bin}
+
+    @classmethod
+    def from_values(cls, _values, _nbins):
+        """Bins the values
+
+        If all the values are the same (a constant schedule) they all go in the top
+        bin (nbins). Any bins with nothing in them have a count and sum of 0.
+
+        Args:
+            _values (iterable): The values to bin. ie: an hourly schedule
+            _nbins (int): The bins will be numbered 0 to _nbins
+        Returns:
+            (Histogram)
+        """
+
+        value_counts = Counter(_values)
+
+        counts = dict( (k, 0) for k in range(_nbins + 1) )
+        sums = dict( (k, 0) for k in range(_nbins + 1) )
+
+        if not value_counts:
+            return cls(_nbins, None, None, counts, sums)
+
+        min_val = min(value_counts)
+        max_val = max(value_counts)
+        span = max_val - min_val
+
+        for value, count in value_counts.items():
+            if span:
+                bin_number = int(_nbins * ((value - min_val) / span))
+            else:
+                bin_number = _nbins
+
+            counts[bin_number] += count
+            sums[bin_number] += value * count
+
+        return cls(_nbins, min_val, max_val, counts, sums)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def fractions(self):
+        """{bin: the fraction (0-1) of all the values which are in the bin} """
+
+        total = self.total
+        return dict( (k, float(count) / total if total else 0.0) for k, count in self.counts.items() )
+
+    @property
+    def means(self):
+        """{bin: the average of the values in the bin}. Empty bins are 0.0 """
+
+        return dict( (k, float(self.sums[k]) / count if count else 0.0) for k, count in self.counts.items() )
+
+    def __unicode__(self):
+        return u"Histogram | Bins: {}  |  Min: {}  |  Max: {}  |  Values: {}".format(
+            self.nbins + 1, self.min, self.max, self.total)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_nbins={!r}, _min={!r}, _max={!r}, _counts={!r}, _sums={!r})".format(
+               self.__class__.__name__,
+               self.nbins,
+               self.min,
+               self.max,
+               self.counts,
+               self.sums)
+
+def histogram(_values, _nbins):
+    """Bins the values, returning the same dicts as ventilation.generate_histogram()
+
+    Args:
+        _values (iterable): The values to bin. ie: an hourly schedule
+        _nbins (int): The bins will be numbered 0 to _nbins
+    Returns: (tuple)
+        fractions (dict): {bin: the fraction (0-1) of the values in the bin}
+        means (dict): {bin: the average value in the bin}
+    """
+
+    hist = Histogram.from_values(_values, _nbins)
+    return hist.fractions, hist.means
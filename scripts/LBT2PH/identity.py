@@ -0,0 +1,187 @@
+"""Ids for the PHPP objects, without random numbers.
+
+The PHPP objects used to get a random.randint() id. Those could repeat (two
+Thermal Bridges had a 1-in-9000 chance of the same id) and a solve never gave
+the same ids twice. Now every id is a content_id(): a hash of whatever defines
+the object. The same inputs give the same id on every solve and in every Rhino
+session, so anything cached or diffed by id keeps matching until something
+actually changes. There are three kinds:
+
+Values: for objects which are just a set of values (a climate, a vent unit, a
+thermal bridge, a pipe segment...) the id is a hash of those values:
+
+    class PHPP_ClimateDataSet(object):
+        id = LBT2PH.identity.ContentId('DataSet', 'Altitude', 'Country', 'Region')
+
+interned() returns one shared object for all the objects with the same content.
+Two of the same item in a list have the same id (see dict_codec.dicts_by_id()).
+
+Hosted: objects made from a piece of geometry (TFA surfaces, space volumes...)
+use the identifier of what they came from (the HB Room / Face, the Rhino object)
+and their index in it. Their values can change and keep the same id.
+
+Systems: objects which other objects point to by id (the ventilation and DHW
+systems) use component_id(): the GH component which made them, and their name.
+
+Hosted and system ids read back from the HB user_data are kept as they were
+saved. Value ids are worked out again from the values.
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+import json
+import hashlib
+import weakref
+
+# ------------------------------------------------------------------------------
+# Content ids
+
+CONTENT_ID_LENGTH = 12
+
+def _part(_obj):
+    """How an object inside the hashed values is stored: its own content id if it
+    has one, otherwise its to_dict()
+
+    Anything else (geometry, .NET objects...) raises a TypeError: its repr() can
+    hold a memory address, which would give it a new id in every session.
+    """
+
+    obj_id = get_content_id(_obj)
+    if obj_id is not None:
+        return obj_id
+
+    to_dict = getattr(_obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError('Cannot make a content id from a {} (no id or to_dict()): {!r}'.format(
+                        type(_obj).__name__, _obj))
+    return to_dict()
+
+def content_id(*_parts):
+    """A stable hash of the parts
+
+    Args:
+        *_parts: Any strings, numbers, lists, dicts or PHPP objects
+    Returns:
+        (str): The first CONTENT_ID_LENGTH characters of the hex digest. Always
+            the same for the same parts, in any session.
+    """
+
+    text = json.dumps(_parts, sort_keys=True, separators=(',', ':'), default=_part)
+    return hashlib.md5( text.encode('utf-8') ).hexdigest()[:CONTENT_ID_LENGTH]
+
+def component_id(_ghenv, *_parts):
+    """A content_id() of the GH component's InstanceGuid and the parts
+
+    The same component gives the same id on every solve, and in every session
+    (the GUID is saved with the GH file), whatever its inputs are. Two
+    components with the same inputs still give two different ids.
+
+    Args:
+        _ghenv: The GH component's 'ghenv'. May be None (ie: headless)
+        *_parts: Anything else which tells the objects from one component apart
+    Returns:
+        (str)
+    """
+
+    try:
+        component_guid = str(_ghenv.Component.InstanceGuid)
+    except AttributeError:
+        component_guid = None
+
+    return content_id(component_guid, *_parts)
+
+class ContentId(object):
+    """A read-only id attribute: the content_id() of the class name and the attributes' values """
+
+    def __init__(self, *_attrs):
+        """
+        Args:
+            *_attrs (str): The attributes (or properties) which define the object
+        """
+        self.attrs = _attrs
+
+    def __get__(self, _obj, _type=None):
+        if _obj is None:
+            return self
+        return content_id(type(_obj).__name__, [ getattr(_obj, attr) for attr in self.attrs ])
+
+    def __set__(self, _obj, _value):
+        raise AttributeError('The {} id comes from its values, it cannot be set.'.format(type(_obj).__name__))
+
+    def __repr__(self):
+        return "{}(*{!r})".format(self.__class__.__name__, self.attrs)
+
+# {class: name of its ContentId attribute, or None}
+_CONTENT_ID_ATTRS = {}
+
+def _content_id_attr(_type):
+    try:
+        return _CONTENT_ID_ATTRS[_type]
+    except KeyError:
+        pass
+
+    attr_name = None
+    for klass in getattr(_type, '__mro__', ()):
+        for name, value in vars(klass).items():
+            if isinstance(value, ContentId):
+                attr_name = name
+                break
+        if attr_name:
+            break
+
+    _CONTENT_ID_ATTRS[_type] = attr_name
+    return attr_name
+
+def get_content_id(_obj):
+    """The object's content id, or None if its class doesn't have a ContentId """
+
+    attr_name = _content_id_attr(type(_obj))
+    if attr_name is None:
+        return None
+    return getattr(_obj, attr_name)
+
+class InternTable:
+    """One shared object for each (class, content id) """
+
+    def __init__(self):
+        # Weak, so nothing is kept alive just by being in here
+        self._items = weakref.WeakValueDictionary()
+
+    def interned(self, _obj):
+        """Returns the object already in the table with the same class and content
+        id, if there is one, otherwise adds _obj and returns it.
+
+        Objects without a ContentId are returned as-is.
+        """
+
+        obj_id = get_content_id(_obj)
+        if obj_id is None:
+            return _obj
+
+        key = (type(_obj), obj_id)
+        existing = self._items.get(key)
+
+        # The one in the table might have been changed since it was added
+        if existing is not None and get_content_id(existing) == obj_id:
+            return existing
+
+        self._items[key] = _obj
+        return _obj
+
+    def __len__(self):
+        return len(self._items)
+
+    def __unicode__(self):
+        return u"Intern Table | Objects: {}".format(len(self._items))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
+
+try:
+    _INTERNED
+except NameError:
+    _INTERNED = InternTable()
+
+def interned(_obj):
+    return _INTERNED.interned(_obj)
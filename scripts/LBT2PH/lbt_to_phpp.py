@@ -1,8 +1,3 @@
-import Grasshopper.Kernel as ghK
-import ghpythonlib.components as ghc
-import Rhino
-import Rhino.Geometry.Vector2d
-import rhinoscriptsyntax as rs
 import math
 from collections import OrderedDict
 from collections import namedtuple
@@ -12,6 +7,9 @@ import LBT2PH.assemblies
 import LBT2PH.windows
 import LBT2PH.spaces
 import LBT2PH.ground
+import LBT2PH.tb
+import LBT2PH.ventilation
+import LBT2PH.phpp_setup
 import LBT2PH.dhw
 import LBT2PH.appliances
 import LBT2PH.climate
@@ -19,24 +17,34 @@ import LBT2PH.summer_vent
 import LBT2PH.heating_cooling
 import LBT2PH.occupancy
 import LBT2PH.surfaces
-
-reload(LBT2PH.materials)
-reload(LBT2PH.assemblies)
-reload(LBT2PH.windows)
-reload(LBT2PH.spaces)
-reload(LBT2PH.ground)
-reload(LBT2PH.dhw)
-reload(LBT2PH.appliances)
-reload(LBT2PH.climate)
-reload(LBT2PH.summer_vent)
-reload(LBT2PH.heating_cooling)
-reload(LBT2PH.occupancy)
-reload(LBT2PH.surfaces)
+import LBT2PH.identity
+import LBT2PH.surface_orientation
+import LBT2PH.messages
+
+LBT2PH.dev_reload(LBT2PH.materials)
+LBT2PH.dev_reload(LBT2PH.assemblies)
+LBT2PH.dev_reload(LBT2PH.windows)
+LBT2PH.dev_reload(LBT2PH.spaces)
+LBT2PH.dev_reload(LBT2PH.ground)
+LBT2PH.dev_reload(LBT2PH.tb)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.phpp_setup)
+LBT2PH.dev_reload(LBT2PH.dhw)
+LBT2PH.dev_reload(LBT2PH.appliances)
+LBT2PH.dev_reload(LBT2PH.climate)
+LBT2PH.dev_reload(LBT2PH.summer_vent)
+LBT2PH.dev_reload(LBT2PH.heating_cooling)
+LBT2PH.dev_reload(LBT2PH.occupancy)
+LBT2PH.dev_reload(LBT2PH.surfaces)
+LBT2PH.dev_reload(LBT2PH.identity)
+LBT2PH.dev_reload(LBT2PH.surface_orientation)
+LBT2PH.dev_reload(LBT2PH.messages)
 
 try:
     import ladybug.epw as epw  
-    from ladybug_rhino.fromgeometry import from_face3d
-    from ladybug_rhino.togeometry import to_vector2d
+    from ladybug_geometry.geometry2d.pointvector import Vector2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.face import Face3D
 except ImportError as e:
     raise ImportError('\nFailed to import ladybug:\n\t{}'.format(e))
 
@@ -109,45 +117,25 @@ class PHPP_Zone:
        return "{}(_room={!r})".format(
             self.__class__.__name__, self.hb_room)
 
-def rhino_vector2d_from_angle(_angle=0):
-    """ Get a Rhino Vector2d from a numeric angle
+def _find_north( _north ):
+    """ The north as a ladybug Vector2D
 
         Arguments:
-            _angle (float): Angle in degrees. Note, this should
-            be a positive value representing the degree of
-            rotation (about the Z axis) from Y. North 0=0
-            West=90, South=180, East=270
+            _north: A Rhino or ladybug vector, or an angle in degrees. The angle
+            should be a positive value representing the degree of rotation
+            (about the Z axis) from Y. North 0=0 West=90, South=180, East=270
     """
 
-    if not _angle:
-        return None
-
-    # Use the Grasshopper rotate to create the new vector
-    # according to the numeric angle
-    origin = Rhino.Geometry.Point3d(0,0,0)
-    north_axis = Rhino.Geometry.Vector3d(0,1,0) 
-    angle = ghc.Radians(_angle)
-    rotation_axis_vec = Rhino.Geometry.Vector3d(0,0,1)
-    rotation_axis_line = ghc.LineSDL(origin, rotation_axis_vec, 1)
-    north_vec = ghc.RotateAxis(north_axis, angle, rotation_axis_line).geometry
+    if not _north:
+        return Vector2D(0, 1)
 
-    return north_vec
-
-def _find_north( _north ):
-    if _north:
-        try:
-            # If the input is a vector, convert to ladybug vector2d
-            return to_vector2d( _north )
-        except AttributeError as e:  
-            # If its not an error, must be a number. So first create a Rhino vector
-            try:
-                rh_vec = rhino_vector2d_from_angle(float(_north))
-                return to_vector2d( rh_vec )
-            except Exception as e:
-                print(e)
-                raise e
-    else:
-        return to_vector2d( Rhino.Geometry.Vector2d(0,1) )
+    if hasattr(_north, 'X'):
+        return Vector2D(_north.X, _north.Y)  # A Rhino vector
+    elif hasattr(_north, 'x'):
+        return Vector2D(_north.x, _north.y)  # A ladybug vector
+    
+    # If its not a vector, must be a number. Rotate the Y axis about Z
+    return Vector2D(0, 1).rotate( math.radians(float(_north)) )
 
 def get_zones_from_model(_model):
     zones = []
@@ -159,8 +147,12 @@ def get_zones_from_model(_model):
     return zones
 
 def get_exposed_surfaces_from_model(_model, _north, _ghenv):
-    exposed_surfaces = []
+    return build_exposed_surfaces(get_exposed_faces(_model), _north, _ghenv)
 
+def get_exposed_faces(_model):
+    """All the faces without a 'Surface' boundary condition, as (face, room name, room id) """
+
+    exposed_faces = []
     for room in _model.rooms: 
         room_name = room.display_name
         room_id = room.identifier
@@ -169,17 +161,31 @@ def get_exposed_surfaces_from_model(_model, _north, _ghenv):
             bc = str(face.boundary_condition)
 
             if bc == 'Surface': continue
-            phpp_srfc = LBT2PH.surfaces.PHPP_Surface(face, room_name, room_id, _north, _ghenv )
-            
-            # Pull out any custom attributes set within the GH scene
-            # Set Object Attributes using the Key / Value
-            if face.user_data:
-                custom_attributes = face.user_data.get('phpp', {})
+            exposed_faces.append( (face, room_name, room_id) )
+
+    return exposed_faces
+
+def build_exposed_surfaces(_exposed_faces, _north, _ghenv):
+    """A PHPP_Surface for each of the (face, room name, room id) from get_exposed_faces() """
+
+    # The orientations (normals, angles, areas...) are all worked out together in one pass
+    orientations = LBT2PH.surface_orientation.SurfaceOrientations.from_faces(
+        [face for face, _, _ in _exposed_faces], _north)
+
+    exposed_surfaces = []
+    for i, (face, room_name, room_id) in enumerate(_exposed_faces):
+        phpp_srfc = LBT2PH.surfaces.PHPP_Surface(face, room_name, room_id, _north, _ghenv, orientations, i)
+        
+        # Pull out any custom attributes set within the GH scene
+        # Set Object Attributes using the Key / Value
+        if face.user_data:
+            custom_attributes = face.user_data.get('phpp', {})
+        
+            for k in LBT2PH.surfaces.PHPP_Surface.USER_DATA_ATTRS:
+                if k in custom_attributes:
+                    setattr(phpp_srfc, k, custom_attributes[k])
             
-                for k, v in custom_attributes.items():
-                    setattr(phpp_srfc, k, v)
-                
-            exposed_surfaces.append(phpp_srfc)
+        exposed_surfaces.append(phpp_srfc)
 
     return exposed_surfaces
 
@@ -239,35 +245,41 @@ def get_aperture_surfaces_from_model(_model, _ghenv):
     phpp_apertures = []
     
     for hb_aperture in _model.apertures:
-        try:
-            window_dict = hb_aperture.user_data.get('phpp', {})
-            if not window_dict:
-                raise AttributeError
-
-            new_phpp_aperture = LBT2PH.windows.PHPP_Window.from_dict( window_dict )
-            new_phpp_aperture.aperture = hb_aperture
-            
+        new_phpp_aperture = get_aperture_surface(hb_aperture, _ghenv)
+        if new_phpp_aperture is not None:
             phpp_apertures.append(new_phpp_aperture)
-        except AttributeError as e:
-            try:
-                msg = 'I did not find any user-determined info for window: < {} >.\n'\
-                    'I will use the basic Honeybee Aperture info for now, but to customize\n'\
-                    'this window you can use a PH-Tools "Create PHPP Aperture" Component\n'\
-                    'to apply specific PHPP style information to this element.'.format(hb_aperture.display_name)
-                _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Remark, msg)
-                
-                # Build a basic aperture from the Honeybee only
-                new_phpp_aperture = LBT2PH.windows.PHPP_Window.from_aperture(hb_aperture)
-                
-                phpp_apertures.append(new_phpp_aperture)
-            except Exception as e:
-                msg = 'Error trying to create the PHPP window for < {} >.\n'\
-                    'Make sure that you use a PH-Tools "Create PHPP Aperture" Component\n'\
-                    'to apply the PHPP style information to this element.'.format(hb_aperture.display_name)
-                _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Warning, msg)
 
     return phpp_apertures
 
+def get_aperture_surface(_hb_aperture, _ghenv):
+    ''' Returns the PHPP_Window for a single HB Aperture, or None if it can't be built '''
+    
+    try:
+        window_dict = _hb_aperture.user_data.get('phpp', {})
+        if not window_dict:
+            raise AttributeError
+
+        new_phpp_aperture = LBT2PH.windows.PHPP_Window.from_dict( window_dict )
+        new_phpp_aperture.aperture = _hb_aperture
+        
+        return new_phpp_aperture
+    except AttributeError as e:
+        try:
+            msg = 'I did not find any user-determined info for window: < {} >.\n'\
+                'I will use the basic Honeybee Aperture info for now, but to customize\n'\
+                'this window you can use a PH-Tools "Create PHPP Aperture" Component\n'\
+                'to apply specific PHPP style information to this element.'.format(_hb_aperture.display_name)
+            LBT2PH.messages.add_message(_ghenv, 'Remark', msg)
+            
+            # Build a basic aperture from the Honeybee only
+            return LBT2PH.windows.PHPP_Window.from_aperture(_hb_aperture)
+        except Exception as e:
+            msg = 'Error trying to create the PHPP window for < {} >.\n'\
+                'Make sure that you use a PH-Tools "Create PHPP Aperture" Component\n'\
+                'to apply the PHPP style information to this element.'.format(_hb_aperture.display_name)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+            return None
+
 def get_spaces_from_model(_model, _ghdoc):
     ''' Returns a list of PHPP_Space objects found in the HB Model '''
     rooms = [] 
@@ -278,13 +290,16 @@ def get_spaces_from_model(_model, _ghdoc):
             'Ignoring any Space/Room/TFA/Volume info for now.'.format(room.display_name))
             return []
         
-        spaces_dict = room.user_data.get('phpp', {}).get('spaces', {})
-        for space_data in spaces_dict.values():
-            space_obj = LBT2PH.spaces.Space.from_dict( space_data )
-            rooms.append(space_obj)
+        rooms.extend( get_room_spaces(room) )
     
     return rooms
 
+def get_room_spaces(_room):
+    ''' Returns a list of the PHPP_Space objects for a single HB Room '''
+
+    spaces_dict = (_room.user_data or {}).get('phpp', {}).get('spaces', {})
+    return [ LBT2PH.spaces.Space.from_dict( space_data ) for space_data in spaces_dict.values() ]
+
 def get_ventilation_systems_from_model(_model, _ghenv):
     model_vent_systems = set()
     
@@ -305,44 +320,55 @@ def get_ground_from_model(_model, _ghenv):
     ground_objs = []
     
     for hb_room in _model.rooms:      
-        if not hb_room.user_data:
-            continue
-
-        ground_dict = hb_room.user_data.get('phpp', {}).get('ground', {})
-        if not ground_dict:
-            continue
-
-        ground_type = ground_dict.get('type', {})
-        if '1' in ground_type:
-            obj = LBT2PH.ground.PHPP_Ground_Slab_on_Grade.from_dict( ground_dict, _ghenv )
-        elif '2' in ground_type:
-            obj = LBT2PH.ground.PHPP_Ground_Heated_Basement.from_dict( ground_dict, _ghenv )
-        elif '3' in ground_type:
-            obj = LBT2PH.ground.PHPP_Ground_Unheated_Basement.from_dict( ground_dict, _ghenv )
-        elif '4' in ground_type:
-            obj = LBT2PH.ground.PHPP_Ground_Crawl_Space.from_dict( ground_dict, _ghenv )
-        else:
-            obj = None
-    
+        obj = get_room_ground(hb_room, _ghenv)
         if obj:
             ground_objs.append( obj )
 
     return ground_objs
 
+def get_room_ground(_hb_room, _ghenv):
+    """The room's PHPP Ground object, or None if it doesn't have one """
+
+    if not _hb_room.user_data:
+        return None
+
+    ground_dict = _hb_room.user_data.get('phpp', {}).get('ground', {})
+    if not ground_dict:
+        return None
+
+    ground_type = ground_dict.get('type', {})
+    if '1' in ground_type:
+        obj = LBT2PH.ground.PHPP_Ground_Slab_on_Grade.from_dict( ground_dict, _ghenv )
+    elif '2' in ground_type:
+        obj = LBT2PH.ground.PHPP_Ground_Heated_Basement.from_dict( ground_dict, _ghenv )
+    elif '3' in ground_type:
+        obj = LBT2PH.ground.PHPP_Ground_Unheated_Basement.from_dict( ground_dict, _ghenv )
+    elif '4' in ground_type:
+        obj = LBT2PH.ground.PHPP_Ground_Crawl_Space.from_dict( ground_dict, _ghenv )
+    else:
+        return None
+
+    if not obj:
+        return None
+    return LBT2PH.identity.interned(obj)
+
 def get_dhw_systems(_model):
     dhw_systems = []
 
     for hb_room in _model.rooms:
-        if not hb_room.user_data:
-            continue
-
-        dhw_dict = hb_room.user_data.get('phpp', {}).get('dhw_systems', {})
-        for system in dhw_dict.values():
-            new_system = LBT2PH.dhw.PHPP_DHW_System.from_dict( system )
-            dhw_systems.append( new_system )
+        dhw_systems.extend( get_room_dhw_systems(hb_room) )
 
     return dhw_systems
 
+def get_room_dhw_systems(_hb_room):
+    """The PHPP DHW Systems in the room's user_data """
+
+    if not _hb_room.user_data:
+        return []
+
+    dhw_dict = _hb_room.user_data.get('phpp', {}).get('dhw_systems', {})
+    return [ LBT2PH.dhw.PHPP_DHW_System.from_dict( system ) for system in dhw_dict.values() ]
+
 def get_appliances(_model):
     appliance_objs = []
 
@@ -426,26 +452,7 @@ def find_nearest_phpp_climate(_epw_file):
 
     #---------------------------------------------------------------------------
     # Find the closest PHPP Climate/Location
-    climate_data = LBT2PH.climate.phpp_climate_data()
-    for each in climate_data:
-        eachLat = float(each.get('Latitude', 0))
-        eachLong = float(each.get('Longitude', 0))
-
-        a = math.sin(math.pi/180*eachLat)
-        b = math.sin(math.pi/180*latitude)
-        c = math.cos(math.pi/180*eachLat)
-        d = math.cos(math.pi/180*latitude)
-        e = math.cos(math.pi/180*(eachLong-longitude))
-        f = a * b + c * d * e
-        g = max([-1, f])
-        h = min([1, g])
-        j = math.acos(h)
-        kmFromEPWLocation = 6378 * j
-        
-        each['distToEPW'] = kmFromEPWLocation
-    
-    climate_data.sort(key=lambda e: e['distToEPW'])
-    climate_set_to_use = climate_data[0]
+    climate_set_to_use, distance_km = LBT2PH.climate.climate_station_table().nearest(latitude, longitude)[0]
     
     dataSet = climate_set_to_use.get('Dataset', 'US0055b-New York')
     alt = '=J23'
@@ -458,7 +465,7 @@ def find_nearest_phpp_climate(_epw_file):
 
 def get_footprint( _surfaces ):
     # Finds the 'footprint' of the building for 'Primary Energy Renewable' reference
-    # 1) Re-build the Opaque Surfaces
+    # 1) Re-build the Opaque Surfaces (from their stored vertices)
     # 2) Join all the surface Breps into a single brep
     # 3) Find the 'box' for the single joined brep
     # 4) Find the lowest Z points on the box, offset another 10 units 'down'
@@ -468,8 +475,21 @@ def get_footprint( _surfaces ):
     
     Footprint = namedtuple('Footprint', ['Footprint_surface', 'Footprint_area'])
     
+    # The footprint is the only thing in here which uses Rhino and the Grasshopper
+    # components. They load without a GH canvas, but need the Grasshopper
+    # plugin to be there (ie: in Rhino, not a plain RhinoCommon host or CPython).
+    try:
+        import Rhino
+        import rhinoscriptsyntax as rs
+        import ghpythonlib.components as ghc
+        from ladybug_rhino.fromgeometry import from_face3d
+    except ImportError as e:
+        print('Cannot build the building footprint without Rhino and the Grasshopper components: {}'.format(e))
+        return Footprint(None, None)
+    
     #----- Build brep
-    surfaces = [from_face3d(surface.Srfc) for surface in _surfaces]
+    surfaces = [from_face3d(Face3D([Point3D(*pt) for pt in surface.Vertices]))
+                for surface in _surfaces]
     bldg_mass = ghc.BrepJoin( surfaces ).breps
     
     if isinstance(bldg_mass, list): # returns a list of breps if its 'open' sometimes
@@ -570,7 +590,7 @@ def get_thermal_bridges(_model, _ghenv):
     except TypeError as e:
         msg = 'Error getting the PHPP/tb dict from the model.user_data?'
         msg += str(e)
-        _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Warning, msg)
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
     except ValueError:
         print('No User_Data dict found on the model. Ignoring Thermal Bridging for now.')
 
@@ -0,0 +1,126 @@
+"""Pluggable message loggers, so the model conversion can run outside of Grasshopper.
+
+All through the conversion functions, warnings and errors are sent to the
+user with:
+
+    LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+
+which passes them on to _ghenv.Component.AddRuntimeMessage(). When running
+without Grasshopper, a HeadlessGhenv can be passed in as the '_ghenv'. It
+looks enough like the real ghenv for those calls, and sends the messages on to
+whichever logger it was given.
+"""
+
+import sys
+
+class MessageLogger:
+    """Base logger. Keeps a list of all the (level, message) items it is sent """
+
+    def __init__(self):
+        self.messages = []
+
+    def log(self, _level, _msg):
+        self.messages.append( (_level, _msg) )
+
+    def warning(self, _msg):
+        self.log('Warning', _msg)
+
+    def error(self, _msg):
+        self.log('Error', _msg)
+
+    def remark(self, _msg):
+        self.log('Remark', _msg)
+
+    @property
+    def errors(self):
+        return [ msg for level, msg in self.messages if level == 'Error' ]
+
+    @property
+    def warnings(self):
+        return [ msg for level, msg in self.messages if level == 'Warning' ]
+
+    def __unicode__(self):
+        return u"{} | Messages: {}".format(self.__class__.__name__, len(self.messages))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
+
+class StreamLogger(MessageLogger):
+    """Also writes each message out to a stream (sys.stderr by default) as it comes in """
+
+    def __init__(self, _stream=None, _prefix=''):
+        MessageLogger.__init__(self)
+        self.stream = _stream
+        self.prefix = _prefix
+
+    def log(self, _level, _msg):
+        MessageLogger.log(self, _level, _msg)
+        stream = self.stream or sys.stderr
+        stream.write( u'{}{}: {}\n'.format(self.prefix, _level, _msg) )
+
+def add_message(_ghenv, _level, _msg):
+    """Sends a message to the ghenv's component: a real GH one or a HeadlessGhenv
+
+    Use instead of ghK.GH_RuntimeMessageLevel in any code which also runs
+    headless: Grasshopper is only imported here, and only if it is there. A
+    HeadlessGhenv takes either the GH levels or plain strings.
+
+    Args:
+        _ghenv: The GH component's 'ghenv', or a HeadlessGhenv
+        _level (str): 'Warning', 'Error' or 'Remark'
+        _msg (str): The message
+    """
+
+    try:
+        import Grasshopper.Kernel as ghK
+    except ImportError:
+        # No Grasshopper, so it must be a HeadlessGhenv: those take plain strings
+        _ghenv.Component.AddRuntimeMessage(_level, _msg)
+        return
+
+    level = getattr(ghK.GH_RuntimeMessageLevel, _level, ghK.GH_RuntimeMessageLevel.Remark)
+    _ghenv.Component.AddRuntimeMessage(level, _msg)
+
+class GhenvLogger(MessageLogger):
+    """Sends the messages on to a real Grasshopper component """
+
+    def __init__(self, _ghenv):
+        MessageLogger.__init__(self)
+        self.ghenv = _ghenv
+
+    def log(self, _level, _msg):
+        MessageLogger.log(self, _level, _msg)
+        add_message(self.ghenv, _level, _msg)
+
+class _HeadlessComponent:
+    def __init__(self, _logger, _name):
+        self.logger = _logger
+        self.Name = _name
+        self.NickName = _name
+        self.Message = ''
+
+    def AddRuntimeMessage(self, _level, _msg):
+        # Works with the ghK.GH_RuntimeMessageLevel values, or plain strings
+        self.logger.log( str(_level).split('.')[-1], _msg )
+
+class HeadlessGhenv:
+    """A stand-in for the Grasshopper 'ghenv', for running the conversion without a GH canvas
+
+    Only supports ghenv.Component.AddRuntimeMessage() (and a Name), which is all
+    the conversion functions use. Messages go to the logger given.
+    """
+
+    def __init__(self, _logger=None, _name='LBT2PH Headless'):
+        self.logger = _logger or StreamLogger()
+        self.Component = _HeadlessComponent(self.logger, _name)
+
+    def __unicode__(self):
+        return u"Headless ghenv | Logger: {}".format(self.logger)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_logger={!r}, _name={!r})".format(
+               self.__class__.__name__,
+               self.logger,
+               self.Component.Name)
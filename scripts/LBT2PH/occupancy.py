@@ -1,13 +1,22 @@
 import math
-from System import Object
-import random
-import Grasshopper.Kernel as ghK
+try:
+    from System import Object
+except ImportError:
+    Object = object  # CPython
+
+import LBT2PH
+import LBT2PH.identity
+import LBT2PH.messages
+
+LBT2PH.dev_reload( LBT2PH.identity )
+LBT2PH.dev_reload( LBT2PH.messages )
 
 class Occupancy(Object):
 
+    id = LBT2PH.identity.ContentId('num_units', 'tfa', '_occupancy', 'building_type', 'ihg_type', 'ihg_values')
+
     def __init__(self, _num_uits=1, _occ=None, _tfa=None, 
         _typ="1-Residential building", _ighT="10-Dwelling", ighV="2-Standard"):
-        self.id = random.randint(1000,9999)
         self._num_units = _num_uits
         self._tfa = _tfa
         self._occupancy = _occ
@@ -117,18 +126,18 @@ class Occupancy(Object):
         if 'Non' in self.building_type and not self._occupancy:
             warning = "For Non-Residential buildings, please be sure to input\n"\
             "the occupancy for the building."
-            _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', warning)
         
         if 'Non' in self.building_type and '10' in self.ihg_type:
             warning = "For Non-Residential buildings, please select a valid\n"\
             "ihgType_ Enter either: '20-Office / Admin. buildin', '21-School', or '22-Other'"
-            _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', warning)
     
         if 'Non' not in self.building_type and self._occupancy:
             warning = "For Residential buildings, please leave the occupancy blank.\n"\
             "Occupancy will be determined by the PHPP automatically. Only input an occupancy if\n"\
             "you are certain and that the Certifier will allow it."
-            _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', warning)
         
     def to_dict(self):
         d = {}
@@ -147,7 +156,6 @@ class Occupancy(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
         
-        new_obj.id = _dict.get('id')
         new_obj._num_units = _dict.get('num_units')
         new_obj._tfa = _dict.get('tfa')
         new_obj._occupancy = _dict.get('occupancy')
@@ -181,7 +189,7 @@ def get_model_occupancy(_model, _ghenv):
         msg = "Error getting Occupancy from the Honeybee Model? Please use an LBT2PH 'Occupancy'\n"\
         "component before using this one in order to set the number of units and the occupancy level of the\n"\
         "building. For now, I will assume 1-Unit and calculate the occupancy based on the model's gross floor area"
-        _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Warning, msg  )
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
         
         occ_obj = Occupancy( _tfa=_model.floor_area  )
         return occ_obj
\ No newline at end of file
@@ -1,13 +1,22 @@
-import random
-from System import Object
+try:
+    from System import Object
+except ImportError:
+    Object = object  # CPython
+
+import LBT2PH
+import LBT2PH.identity
+
+LBT2PH.dev_reload( LBT2PH.identity )
 
 class PHPP_Verification(Object):
+    id = LBT2PH.identity.ContentId('spec_capacity', 'bldg_name', 'bldg_country', 'cert_standard', 'cert_class',
+                                   'pe', 'enerPHit', 'retrofit')
+
     def __init__(self, _specCapacity=60, _bldgName=None,
                 _bldgCountry='US-United States of America', 
                 _cert_stndard='1-Passive House', _cert_class="1-Classic", 
                 _pe="1-PE (non-renewable)",
                 _enerPHit="2-Energy demand method", _retrofit="1-New building"):
-        self.id = random.randint(1000,9999)
         self._spec_capacity = _specCapacity
         self.bldg_name = _bldgName
         self.bldg_country = _bldgCountry
@@ -118,7 +127,6 @@ class PHPP_Verification(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
 
-        new_obj.id = _dict.get('id')
         new_obj._spec_capacity = _dict.get('spec_capacity')
         new_obj.bldg_name = _dict.get('bldg_name')
         new_obj.bldg_country = _dict.get('bldg_country')
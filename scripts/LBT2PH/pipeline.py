@@ -0,0 +1,444 @@
+"""The full HB Model -> PHPP cells conversion, as run by the '2PHPP Convert LBT Model' component.
+
+Can also be run 'headless' (no Grasshopper canvas) on a Honeybee Model
+.hbjson file, writing out the PHPP cells as JSON or CSV. Any messages which
+would normally show up on the GH component go to a pluggable logger (see
+LBT2PH.messages). ie: from Rhino's IronPython (-RunPythonScript, Rhino.Inside...)
+
+    LBT2PH.pipeline.main(['MyModel.hbjson', 'MyModel_PHPP.json', '--epw', 'MyClimate.epw'])
+
+Nothing here, or in lbt_to_phpp / to_excel, needs a Grasshopper component or
+canvas: all the messages go through LBT2PH.messages.add_message(). Nor does it
+need Rhino: a plain CPython with honeybee-energy installed can convert a model.
+Rhino (RhinoCommon, rhinoscriptsyntax and the GH plugin's ghpythonlib) is only
+imported where there is Rhino geometry to work with, and without it:
+    - The building footprint (lbt_to_phpp.get_footprint()) is left empty.
+    - Anything read from PHPP geometry saved in the HB user_data (the TFA
+      surfaces, the window glazing surfaces, ground floor surfaces...) can't
+      be turned back into Rhino geometry. The spaces still convert (their
+      areas, TFA factors and volumes are all stored values), they just
+      have no Rhino surfaces to preview.
+The north, and the surfaces' normals, angles and areas, are all ladybug_geometry.
+"""
+
+import sys
+import json
+import argparse
+from collections import OrderedDict
+
+import LBT2PH
+import LBT2PH.lbt_to_phpp
+import LBT2PH.to_excel
+import LBT2PH.messages
+import LBT2PH.xl_export
+import LBT2PH.conversion_cache
+import LBT2PH.sheet_block
+import LBT2PH.surface_index
+import LBT2PH.tb
+
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.lbt_to_phpp )
+LBT2PH.dev_reload( LBT2PH.to_excel )
+LBT2PH.dev_reload( LBT2PH.messages )
+LBT2PH.dev_reload( LBT2PH.xl_export )
+LBT2PH.dev_reload( LBT2PH.conversion_cache )
+LBT2PH.dev_reload( LBT2PH.sheet_block )
+LBT2PH.dev_reload( LBT2PH.surface_index )
+LBT2PH.dev_reload( LBT2PH.tb )
+
+from LBT2PH.conversion_cache import fingerprint
+
+class ConversionOptions:
+    """All the optional inputs to the conversion. Same as the GH component's inputs """
+
+    def __init__(self, _north=None, _epw_file=None, _rooms_included=None, _rooms_excluded=None,
+                 _ud_row_starts=None, _estimated_tfa=False, _variants=None, _ud_custom=None):
+        self.north = _north
+        self.epw_file = _epw_file
+        self.rooms_included = _rooms_included or []
+        self.rooms_excluded = _rooms_excluded or []
+        self.ud_row_starts = _ud_row_starts or []
+        self.estimated_tfa = _estimated_tfa
+        self.variants = _variants
+        self.ud_custom = _ud_custom or []
+
+    def __unicode__(self):
+        return u"Conversion Options | EPW: {}  |  Rooms Included: {}  |  Excluded: {}".format(
+            self.epw_file, self.rooms_included, self.rooms_excluded)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_north={!r}, _epw_file={!r}, _rooms_included={!r}, _rooms_excluded={!r}, "\
+               "_ud_row_starts={!r}, _estimated_tfa={!r}, _variants={!r}, _ud_custom={!r})".format(
+               self.__class__.__name__,
+               self.north,
+               self.epw_file,
+               self.rooms_included,
+               self.rooms_excluded,
+               self.ud_row_starts,
+               self.estimated_tfa,
+               self.variants,
+               self.ud_custom)
+
+class ConversionResult:
+    """The PHPP_XL_Objs from a model conversion, by group """
+
+    def __init__(self, _groups, _footprint=None):
+        self.groups = _groups  # OrderedDict {group name: [PHPP_XL_Obj | SheetBlock, ...], ...}
+        self.footprint = _footprint
+
+    @property
+    def xl_objects(self):
+        return [ obj for group in self.groups.values() for obj in group ]
+
+    def to_records(self, _unit='SI'):
+        return LBT2PH.xl_export.xl_objects_to_records(self.groups, _unit)
+
+    def save(self, _path, _unit='SI'):
+        """Saves the cells as JSON or CSV, depending on the file extension """
+
+        LBT2PH.xl_export.write_records( self.to_records(_unit), _path )
+
+    def __unicode__(self):
+        return u"Conversion Result | Groups: {}  |  Cells: {}".format(
+            len(self.groups), sum(LBT2PH.sheet_block.count_cells(g) for g in self.groups.values()))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_groups={!r}, _footprint={!r})".format(
+               self.__class__.__name__,
+               self.groups,
+               self.footprint)
+
+def _capacity_warnings(_groups, _ghenv):
+    """Warns if there are more items than a standard PHPP has rows for """
+
+    num_surfaces = LBT2PH.sheet_block.count_rows(_groups['Areas'])
+    if num_surfaces > 100:
+        msg = 'Warning: It looks like you have {:.0f} surfaces in the model. By Default\n'\
+        'the PHPP can only hold 100 surfaces. Before writing out to the PHPP be sure to\n '\
+        'add more lines to the "Areas" worksheet of your excel file.\n'\
+        'After adding lines to the PHPP, be sure to input the correct Start Rows into\n'\
+        'the "udRowStarts_" of this component.'.format(num_surfaces)
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+
+    num_rooms = len(_groups['Additional Vent Rooms'])/17
+    if num_rooms > 30:
+        msg = 'Warning: It looks like you have {:.0f} rooms in the model. By Default\n'\
+        'the PHPP can only hold 30 different rooms in the Additional Ventilation worksheet.\n'\
+        'Before writing out to the PHPP be sure to add more lines to the\n'\
+        '"Additional Ventilation" worksheet in the "Dimensionsing of Air Quantities" section.\n'\
+        'After adding lines to the PHPP, be sure to input the correct Start Rows into\n'\
+        'the "udRowStarts_" of this component.'.format(num_rooms)
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+
+    num_non_res = len(_groups['Electricity non-res'])/8
+    if num_non_res > 22:
+        msg = 'Warning: It looks like you have {:.0f} Non-Residential Rooms in the model. By Default\n'\
+        'the PHPP can only hold 22 different rooms in the "Electricity non-res" worksheet.\n'\
+        'Before writing out to the PHPP be sure to add more lines to the \n '\
+        '"Electricity non-res" worksheet in the "Lighting/non-residential" section.'.format(num_non_res)
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+
+#-------------------------------------------------------------------------------
+# Incremental conversion: the slow parts are only rebuilt if they've changed
+def get_exposed_surfaces(_HB_model, _north, _ghenv, _cache=None):
+    """Same as lbt_to_phpp.get_exposed_surfaces_from_model(), reusing unchanged surfaces from the cache
+
+    A PHPP_Surface's orientation comes from the face's geometry (and the north)
+    and its shading / absorptivity / emissivity from the face's 'phpp'
+    user_data, so those (and the host room) are its fingerprint. Everything
+    else (the name, construction, boundary condition...) is read from the HB
+    Face when it is needed. Any changed faces are all rebuilt together, so
+    their orientations are still worked out in one pass.
+    """
+
+    lbt_to_phpp = LBT2PH.lbt_to_phpp
+    if _cache is None:
+        return lbt_to_phpp.get_exposed_surfaces_from_model(_HB_model, _north, _ghenv)
+
+    exposed_faces = lbt_to_phpp.get_exposed_faces(_HB_model)
+    fingerprints = [ fingerprint(face.geometry, face.user_data, room_name, room_id, _north)
+                     for face, room_name, room_id in exposed_faces ]
+
+    exposed_surfaces = []
+    changed = []
+    for i, (face, _, _) in enumerate(exposed_faces):
+        phpp_srfc = _cache.lookup('surface', face.identifier, fingerprints[i])
+        if phpp_srfc is None:
+            changed.append(i)
+        else:
+            # Always point at the current HB Face. The UD name is set again by build_areas()
+            phpp_srfc.lbt_srfc = face
+            phpp_srfc.ghenv = _ghenv
+            phpp_srfc.UD_Srfc_Name = None
+        exposed_surfaces.append(phpp_srfc)
+
+    rebuilt = lbt_to_phpp.build_exposed_surfaces([ exposed_faces[i] for i in changed ], _north, _ghenv)
+    for i, phpp_srfc in zip(changed, rebuilt):
+        _cache.store('surface', exposed_faces[i][0].identifier, fingerprints[i], phpp_srfc)
+        exposed_surfaces[i] = phpp_srfc
+
+    return exposed_surfaces
+
+def get_aperture_surfaces(_HB_model, _ghenv, _cache=None):
+    """Same as lbt_to_phpp.get_aperture_surfaces_from_model(), reusing unchanged windows from the cache
+
+    A PHPP_Window is built from the aperture's 'phpp' user_data and geometry, so
+    those are its fingerprint. Apertures without any (the basic HB-only windows) are quick
+    to build and add a message to the component, so are always rebuilt.
+    """
+
+    if _cache is None:
+        return LBT2PH.lbt_to_phpp.get_aperture_surfaces_from_model(_HB_model, _ghenv)
+
+    phpp_apertures = []
+    for hb_aperture in _HB_model.apertures:
+        window_dict = (hb_aperture.user_data or {}).get('phpp')
+        if window_dict:
+            phpp_aperture = _cache.get('aperture', hb_aperture.identifier, fingerprint(window_dict, hb_aperture.geometry),
+                lambda: LBT2PH.lbt_to_phpp.get_aperture_surface(hb_aperture, _ghenv) )
+            # Always point at the current HB Aperture
+            phpp_aperture.aperture = hb_aperture
+        else:
+            phpp_aperture = LBT2PH.lbt_to_phpp.get_aperture_surface(hb_aperture, _ghenv)
+
+        if phpp_aperture is not None:
+            phpp_apertures.append(phpp_aperture)
+
+    return phpp_apertures
+
+def get_spaces(_HB_model, _cache=None):
+    """Same as lbt_to_phpp.get_spaces_from_model(), reusing each room's unchanged spaces from the cache """
+
+    if _cache is None:
+        return LBT2PH.lbt_to_phpp.get_spaces_from_model(_HB_model, None)
+
+    spaces = []
+    for room in _HB_model.rooms:
+        if not room.user_data:
+            print('No User_Data dict found for room < {} >.\n'\
+            'Ignoring any Space/Room/TFA/Volume info for now.'.format(room.display_name))
+            return []
+
+        spaces_dict = room.user_data.get('phpp', {}).get('spaces', {})
+        spaces.extend( _cache.get('room spaces', room.identifier, fingerprint(spaces_dict),
+            lambda: LBT2PH.lbt_to_phpp.get_room_spaces(room) ) )
+
+    return spaces
+
+def get_ground(_HB_model, _ghenv, _cache=None):
+    """Same as lbt_to_phpp.get_ground_from_model(), reusing each room's unchanged ground from the cache """
+
+    if _cache is None:
+        return LBT2PH.lbt_to_phpp.get_ground_from_model(_HB_model, _ghenv)
+
+    ground_objs = []
+    for room in _HB_model.rooms:
+        ground_dict = (room.user_data or {}).get('phpp', {}).get('ground', {})
+        if not ground_dict:
+            continue
+
+        obj = _cache.get('room ground', room.identifier, fingerprint(ground_dict),
+            lambda: LBT2PH.lbt_to_phpp.get_room_ground(room, _ghenv) )
+        if obj:
+            ground_objs.append(obj)
+
+    return ground_objs
+
+def get_dhw_systems(_HB_model, _cache=None):
+    """Same as lbt_to_phpp.get_dhw_systems(), reusing each room's unchanged DHW systems from the cache """
+
+    if _cache is None:
+        return LBT2PH.lbt_to_phpp.get_dhw_systems(_HB_model)
+
+    dhw_systems = []
+    for room in _HB_model.rooms:
+        dhw_dict = (room.user_data or {}).get('phpp', {}).get('dhw_systems', {})
+        if not dhw_dict:
+            continue
+
+        dhw_systems.extend( _cache.get('room dhw systems', room.identifier, fingerprint(dhw_dict),
+            lambda: LBT2PH.lbt_to_phpp.get_room_dhw_systems(room) ) )
+
+    return dhw_systems
+
+def get_thermal_bridges(_HB_model, _ghenv, _cache=None):
+    """Same as lbt_to_phpp.get_thermal_bridges(), reusing each unchanged thermal bridge from the cache """
+
+    if _cache is None or not _HB_model.user_data:
+        return LBT2PH.lbt_to_phpp.get_thermal_bridges(_HB_model, _ghenv)
+
+    try:
+        tb_dict = _HB_model.user_data.get('phpp', {}).get('tb', {})
+        return [ _cache.get('thermal bridge', key, fingerprint(tb_obj_dict),
+                    lambda: LBT2PH.tb.PHPP_ThermalBridge.from_dict(tb_obj_dict) )
+                 for key, tb_obj_dict in tb_dict.items() ]
+    except TypeError:
+        # A bad thermal bridge is never cached: let the uncached version report it
+        return LBT2PH.lbt_to_phpp.get_thermal_bridges(_HB_model, _ghenv)
+
+def get_footprint(_surfaces, _cache=None):
+    """Same as lbt_to_phpp.get_footprint(), only rebuilt if any of the exposed surfaces' geometry changed """
+
+    if _cache is None:
+        return LBT2PH.lbt_to_phpp.get_footprint(_surfaces)
+
+    # The vertices were already read once, along with the surfaces' orientations
+    geometry = [ (srfc.identifier, srfc.Vertices) for srfc in _surfaces ]
+    return _cache.get('footprint', 'model', fingerprint(geometry),
+        lambda: LBT2PH.lbt_to_phpp.get_footprint(_surfaces) )
+
+def convert_model(_HB_model, _ghenv, _options=None, _cache=None):
+    """Converts a Honeybee Model into all the PHPP_XL_Objs needed to write it to a PHPP
+
+    Args:
+        _HB_model (honeybee.model.Model): The model to convert
+        _ghenv: The GH component's 'ghenv', or a LBT2PH.messages.HeadlessGhenv
+            when running without Grasshopper. Used for all warning / error messages.
+        _options (ConversionOptions): Optional.
+        _cache (conversion_cache.ConversionCache): Optional. If supplied, the
+            surfaces, windows, spaces, ground, DHW systems, thermal bridges and
+            footprint which haven't changed since the last conversion with the
+            same cache are reused rather than rebuilt.
+    Returns:
+        (ConversionResult)
+    """
+
+    opts = _options or ConversionOptions()
+    lbt_to_phpp = LBT2PH.lbt_to_phpp
+    to_excel = LBT2PH.to_excel
+
+    if _cache is not None:
+        _cache.start_run()
+
+    #---------------------------------------------------------------------------
+    # Get all the info from the LBT Model
+    print('- '*25)
+    materials_opaque        = lbt_to_phpp.get_opaque_materials_from_model(_HB_model, _ghenv)
+    constructions_opaque    = lbt_to_phpp.get_opaque_constructions_from_model(_HB_model, _ghenv)
+    surfaces_opaque         = get_exposed_surfaces(_HB_model, lbt_to_phpp._find_north(opts.north), _ghenv, _cache)
+
+    materials_windows       = lbt_to_phpp.get_aperture_materials_from_model(_HB_model)
+    constructions_windows   = lbt_to_phpp.get_aperture_constructions_from_model(_HB_model)
+    surfaces_windows        = get_aperture_surfaces(_HB_model, _ghenv, _cache)
+    hb_rooms                = lbt_to_phpp.get_zones_from_model(_HB_model)
+    phpp_spaces             = get_spaces(_HB_model, _cache)
+    ventilation_system      = lbt_to_phpp.get_ventilation_systems_from_model(_HB_model, _ghenv)
+
+    ground_objs             = get_ground(_HB_model, _ghenv, _cache)
+    thermal_bridges         = get_thermal_bridges(_HB_model, _ghenv, _cache)
+
+    dhw_systems             = get_dhw_systems(_HB_model, _cache)
+    appliances              = lbt_to_phpp.get_appliances(_HB_model)
+    lighting                = lbt_to_phpp.get_lighting(_HB_model)
+    climate                 = lbt_to_phpp.get_climate(_HB_model, opts.epw_file)
+
+    footprint               = get_footprint(surfaces_opaque, _cache)
+
+    phpp_settings           = lbt_to_phpp.get_settings( _HB_model )
+    summer_vent             = lbt_to_phpp.get_summ_vent( _HB_model )
+    heating_cooling         = lbt_to_phpp.get_heating_cooling( _HB_model )
+    per                     = lbt_to_phpp.get_PER( _HB_model )
+    occupancy               = lbt_to_phpp.get_occupancy( _HB_model )
+
+    #---------------------------------------------------------------------------
+    # Sort out the inputs
+    print('- '*25)
+    hb_room_names = to_excel.include_rooms( hb_rooms, opts.rooms_included, opts.rooms_excluded, _ghenv)
+    start_row_dict = to_excel.start_rows( opts.ud_row_starts, _ghenv )
+
+    #---------------------------------------------------------------------------
+    # Create Xl Objects
+    print('- '*25)
+    groups = OrderedDict()
+    groups['U-Values'], uValueUID_Names = to_excel.build_u_values( constructions_opaque, materials_opaque )
+    groups['Components']                = to_excel.build_components( surfaces_windows )
+    surface_index                       = LBT2PH.surface_index.SurfaceIndex( surfaces_opaque )
+    groups['Areas']                     = to_excel.build_areas( surface_index, hb_room_names, uValueUID_Names )
+    groups['Windows']                   = to_excel.build_windows( surfaces_windows, surface_index, _ghenv )
+    groups['Shading']                   = to_excel.build_shading( surfaces_windows, surface_index )
+    groups['TFA']                       = to_excel.build_TFA( phpp_spaces, hb_room_names, opts.estimated_tfa, _HB_model )
+    groups['Thermal Bridges']           = to_excel.build_thermal_bridges( thermal_bridges, start_row_dict )
+    groups['Additional Vent Rooms'], ventUnitsUsed = to_excel.build_addnl_vent_rooms( phpp_spaces, ventilation_system, hb_room_names, start_row_dict )
+    groups['Vent Systems']              = to_excel.build_addnl_vent_systems( ventilation_system, ventUnitsUsed, start_row_dict )
+    groups['Airtightness']              = to_excel.build_infiltration( hb_rooms, hb_room_names )
+    groups['Ground']                    = to_excel.build_ground( ground_objs, hb_room_names, _ghenv )
+    groups['DHW']                       = to_excel.build_DHW_system( dhw_systems, hb_room_names, _ghenv )
+    groups['Electricity non-res']       = to_excel.build_non_res_space_info( phpp_spaces, hb_room_names, start_row_dict )
+    groups['Location']                  = to_excel.build_location( climate )
+    groups['Appliances']                = to_excel.build_appliances( appliances, hb_room_names, _ghenv )
+    groups['Lighting']                  = to_excel.build_lighting( lighting, hb_room_names )
+    groups['Footprint']                 = to_excel.build_footprint( footprint )
+    groups['Settings']                  = to_excel.build_settings( phpp_settings )
+    groups['Summer Vent']               = to_excel.build_summ_vent( summer_vent )
+    groups['Heating Cooling']           = to_excel.build_heating_cooling( heating_cooling, hb_room_names )
+    groups['PER']                       = to_excel.build_PER( per, hb_room_names, _ghenv )
+    groups['Occupancy']                 = to_excel.build_occupancy( occupancy )
+    groups['Variants']                  = to_excel.build_variants( opts.variants )
+
+    # Make sure this always at the end so it overwrites anything else
+    groups['UD Custom']                 = to_excel.build_ud_custom( opts.ud_custom )
+
+    _capacity_warnings(groups, _ghenv)
+
+    if _cache is not None:
+        _cache.prune()
+
+    return ConversionResult(groups, footprint)
+
+#-------------------------------------------------------------------------------
+# Headless
+def load_model(_model_path):
+    """Loads a Honeybee Model from an .hbjson file """
+
+    from honeybee.model import Model
+
+    with open(_model_path) as f:
+        data = json.load(f)
+
+    return Model.from_dict(data)
+
+def convert_model_file(_model_path, _output_path, _options=None, _unit='SI', _logger=None):
+    """Loads a Honeybee Model .hbjson file, converts it and saves the PHPP cells (JSON or CSV)
+
+    Args:
+        _model_path (str): The Honeybee Model .hbjson file
+        _output_path (str): Where to save the cells. '.csv' for CSV, anything else for JSON
+        _options (ConversionOptions): Optional.
+        _unit (str): Default='SI'. The PHPP's units. 'SI' or 'IP'
+        _logger (LBT2PH.messages.MessageLogger): Optional. Where to send all the
+            warnings and errors. Default is a StreamLogger (to stderr)
+    Returns:
+        (ConversionResult)
+    """
+
+    ghenv = LBT2PH.messages.HeadlessGhenv(_logger)
+    model = load_model(_model_path)
+    result = convert_model(model, ghenv, _options)
+    result.save(_output_path, _unit)
+
+    return result
+
+def main(_args=None):
+    parser = argparse.ArgumentParser(description='Convert a Honeybee Model (.hbjson) into PHPP cells (JSON or CSV)')
+    parser.add_argument('model', help='The Honeybee Model .hbjson file')
+    parser.add_argument('output', help='The file to save the PHPP cells to (.json or .csv)')
+    parser.add_argument('--epw', default=None, help='EPW file, for finding the nearest PHPP climate')
+    parser.add_argument('--north', type=float, default=None, help='Degrees counter-clockwise from the Y-axis')
+    parser.add_argument('--include', action='append', default=[], help='Room name to include (repeat for more)')
+    parser.add_argument('--exclude', action='append', default=[], help='Room name to exclude (repeat for more)')
+    parser.add_argument('--row-start', action='append', default=[], help="ie: 'Areas, Surfaces: 41'")
+    parser.add_argument('--estimated-tfa', action='store_true', help='Use the estimated TFA')
+    parser.add_argument('--unit', default='SI', choices=['SI', 'IP'], help="The PHPP's units")
+    args = parser.parse_args(_args)
+
+    options = ConversionOptions(args.north, args.epw, args.include, args.exclude,
+                                args.row_start, args.estimated_tfa)
+    logger = LBT2PH.messages.StreamLogger()
+    convert_model_file(args.model, args.output, options, args.unit, logger)
+
+    return 1 if logger.errors else 0
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,129 @@
+"""A shared cache of HB Schedules expanded to their hourly (8760) values.
+
+Lots of rooms in a model usually share the same handful of occupancy and
+ventilation schedules, so rather than expanding the same schedule to a
+full year of values for every room (and every space in the room), each
+schedule is expanded once and handed out to everyone who needs it. Any
+reductions of the values (annual average, histograms...) are also only
+done once per schedule.
+
+Note: nothing in here uses Honeybee. The 'loader' function passed in does
+the actual expansion. See LBT2PH.ventilation for the one used for the HB Rooms.
+"""
+
+from array import array
+from collections import OrderedDict
+
+class ScheduleData:
+    """The hourly values for one schedule, with its reductions worked out only once """
+
+    def __init__(self, _identifier, _values, _timestep=1):
+        self.identifier = _identifier
+        self.timestep = _timestep
+        self.values = array('d', _values)
+        self._reductions = {}
+
+    @property
+    def average(self):
+        """The average of all the values (ie: the annual average) """
+
+        return self.reduce('average', lambda values: sum(values) / len(values) if values else 0.0)
+
+    def reduce(self, _name, _function):
+        """Returns the result of _function(values), only calling it the first time for each _name
+
+        Args:
+            _name (str): A unique name for the reduction. ie: 'histogram_2'
+            _function (function): f(values) -> result. Should not change the values.
+        Returns:
+            The result of the function
+        """
+
+        try:
+            return self._reductions[_name]
+        except KeyError:
+            result = _function(self.values)
+            self._reductions[_name] = result
+            return result
+
+    def __len__(self):
+        return len(self.values)
+
+    def __unicode__(self):
+        return u"Schedule Data | {}  |  Values: {}".format(self.identifier, len(self.values))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_identifier={!r}, _values={!r}, _timestep={!r})".format(
+               self.__class__.__name__,
+               self.identifier,
+               self.values,
+               self.timestep)
+
+class ScheduleCache:
+    """Least-recently-used cache of ScheduleData, keyed by schedule and timestep """
+
+    def __init__(self, _loader, _max_size=128, _key=None):
+        """
+        Args:
+            _loader (function): f(schedule, timestep) -> a list of the schedule's
+                values, or None if the schedule can't be expanded
+            _max_size (int): Default=128. The most schedules to keep at once. The
+                least recently used ones are dropped first.
+            _key (function): Optional. f(schedule) -> the cache key for the
+                schedule. ie: something which changes when the schedule is
+                edited. Default: the schedule itself (ie: an identifier)
+        """
+
+        self.loader = _loader
+        self.max_size = _max_size
+        self.key = _key or (lambda _schedule: _schedule)
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, _schedule, _timestep=1):
+        """Returns the ScheduleData for the schedule, expanding it only if it isn't already in the cache
+
+        Returns None if the loader couldn't expand the schedule.
+        """
+
+        schedule_key = self.key(_schedule)
+        key = (schedule_key, _timestep)
+        try:
+            data = self._items.pop(key)
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            values = self.loader(_schedule, _timestep)
+            data = ScheduleData(schedule_key, values, _timestep) if values is not None else None
+
+        # Most recently used goes to the end
+        self._items[key] = data
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+        return data
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, _key):
+        return _key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __unicode__(self):
+        return u"Schedule Cache | Schedules: {}  |  Hits: {}  |  Misses: {}".format(
+            len(self._items), self.hits, self.misses)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_loader={!r}, _max_size={!r}, _key={!r})".format(
+               self.__class__.__name__,
+               self.loader,
+               self.max_size,
+               self.key)
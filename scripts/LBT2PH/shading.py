@@ -1,8 +1,13 @@
 from collections import namedtuple
 import math
-import ghpythonlib.components as ghc
-from System import Object
-from ladybug_rhino.fromgeometry import from_linesegment3d
+try:
+    # Only there when run inside Rhino. Needed for the shading geometry
+    import ghpythonlib.components as ghc
+    from System import Object
+    from ladybug_rhino.fromgeometry import from_linesegment3d
+except ImportError:
+    ghc = from_linesegment3d = None
+    Object = object
 
 
 class PHPP_Shading_Dims(Object):
@@ -2,6 +2,13 @@ from itertools import izip
 import math
 import Rhino
 import Grasshopper.Kernel as ghK
+import System.Threading.Tasks as tasks
+
+import LBT2PH
+import LBT2PH.shading_matrix
+
+LBT2PH.dev_reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH.shading_matrix)
 
 try:
     from ladybug.viewsphere import view_sphere
@@ -106,19 +113,21 @@ def deconstruct_sky_matrix(_sky_mtx):
 
     return sky_vecs, total_sky_rad
 
-def build_window_meshes(_window_surface, _grid_size, _mesh_params ):
+def build_window_meshes(_window_surface, _grid_size):
     """Create the Ladybug Mesh3D grided mesh for the window being analysed
     
+    Note: there used to also be a window 'back' mesh here, for ray-casting the
+    'unshaded' case. The unshaded radiation is now calculated directly, see
+    LBT2PH.shading_matrix.unshaded_radiation()
+
     Arguments:
         _window_surface: (Brep) A single window Brep from the scene
         _grid_size: (float)
-        _mesh_params: (Rhino.Geometry.MeshingParameters)
     Returns: (tuple)
         points: (list: Ladybug Point3D) All the analysis points on the window
         normals: (list: Ladybug Normal) All the normals for the analysis points
         window_mesh: (ladybug_geometry.geometry3d.Mesh3D) The window
-        window_back_mesh: (ladybug_geometry.geometry3d.Mesh3D) A copy of the window shifted 'back'
-        just a little bit (0.1 units). Used when solving the 'unshaded' situation.
+        window_rh_mesh: (Rhino Mesh) The window
     """
     
     # create the gridded mesh for the window surface
@@ -127,46 +136,24 @@ def build_window_meshes(_window_surface, _grid_size, _mesh_params ):
     window_mesh = to_joined_gridded_mesh3d([_window_surface], _grid_size, offset_dist)
     window_rh_mesh = from_mesh3d(window_mesh)
     points = [from_point3d(pt) for pt in window_mesh.face_centroids]
-    
-    # Create a 'back' for the window
-    #---------------------------------------------------------------------------
-    # Mostly this is done so it can be passed to the ladybug_rhino.intersect.intersect_mesh_rays()
-    # solver as a surfce which is certain to *not* shade the window at all
-    window_back_mesh = None
-    for sr in _window_surface.Surfaces:
-        window_normal = sr.NormalAt(0.5, 0.5)
-        window_normal.Unitize()
-        window_normal = window_normal * -1 * 0.1
-    
-        window_back = _window_surface.Duplicate()
-        window_back.Translate(window_normal)
-        window_back_mesh = Rhino.Geometry.Mesh.CreateFromBrep(window_back, _mesh_params)[0]
-    
     normals = [from_vector3d(vec) for vec in window_mesh.face_normals]
 
-    return points, normals, window_mesh, window_back_mesh, window_rh_mesh
+    return points, normals, window_mesh, window_rh_mesh
 
-def generate_intersection_data(_shade_mesh, _win_mesh_back, _points, _sky_vecs, _normals, _parallel):
-    """Creates all the Intersection Matrix data for both the Shaded and the UNShaded conditions
+def generate_intersection_data(_shade_mesh, _points, _sky_vecs, _normals, _parallel):
+    """Creates the Intersection Matrix data for the Shaded condition
 
-    Note that for the 'Unshaded' case you still have to pass the solver *something*, so 
-    the _win_mesh_back is used for this case. This surface should block out any radiation coming from
-    'behind' and also not interfer with the front-side radition calculation.
-    
     Adapted from Ladybug 'IncidentRadiation' Component
     
     Arguments:
         _shade_mesh: (Mesh) The context shading joined mesh
-        _win_mesh_back: (Mesh) The window surface pushed 'back' a little.
         _points: (_)     
         _sky_vecs: (_)
         _normals: (list: Ladybug Normals)
         _parallel: (bool)
     Returns: (tuple)
         int_matrix_init_shaded: Intersection Matrix for window WITH shading
-        int_matrix_init_unshaded: Intersection Matrix for window WITHOUT shading
         angles_s: Shaded
-        angles_u: UN-Shaded
     """
 
     # intersect the rays with the mesh
@@ -174,39 +161,118 @@ def generate_intersection_data(_shade_mesh, _win_mesh_back, _points, _sky_vecs,
     int_matrix_init_shaded, angles_s = intersect_mesh_rays(
         _shade_mesh, _points, _sky_vecs, _normals, parallel=_parallel)
 
-    int_matrix_init_unshaded, angles_u = intersect_mesh_rays(
-        _win_mesh_back, _points, _sky_vecs, _normals, parallel=_parallel)
+    return int_matrix_init_shaded, angles_s
 
-    return int_matrix_init_shaded, int_matrix_init_unshaded, angles_s, angles_u
 
-def calc_win_radiation(_int_matrix_init, _angles, _total_sky_rad, _window_mesh):
-    """Computes total kWh per window based on the int_matrix and sky vec angles 
-    
+# Window Jobs
+#-------------------------------------------------------------------------------
+class WindowRadiation:
+    """The shaded and unshaded radiation results for a single window, for each season """
+
+    def __init__(self, _window_mesh, _window_rh_mesh, _face_areas):
+        self.window_mesh = _window_mesh
+        self.window_rh_mesh = _window_rh_mesh
+        self.face_areas = _face_areas
+        self.shaded = {}    # {'Winter': [kWh, kWh, ...], ...} One value per mesh face
+        self.unshaded = {}
+
+    def average_shaded(self, _season):
+        """The area-weighted average shaded kWh/m2 for the season """
+        return sum(self.shaded[_season]) / sum(self.face_areas)
+
+    def average_unshaded(self, _season):
+        """The area-weighted average un-shaded kWh/m2 for the season """
+        return sum(self.unshaded[_season]) / sum(self.face_areas)
+
+    def __unicode__(self):
+        return u"Window Radiation | Seasons: {}  |  Faces: {}".format(sorted(self.shaded.keys()), len(self.face_areas))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_window_mesh={!r}, _window_rh_mesh={!r}, _face_areas={!r})".format(
+               self.__class__.__name__,
+               self.window_mesh,
+               self.window_rh_mesh,
+               self.face_areas)
+
+def calc_window_seasonal_radiation(_window_surface, _shade_mesh, _grid_size, _seasons, _parallel=False):
+    """Calculates the shaded and unshaded radiation on one window for all the seasons
+
+    The sky vectors for all the seasons are intersected in a single pass, with
+    any seasons which use the same sky dome (ie: both Tregenza) only intersected
+    once, and then weighted by each season's sky radiation. The unshaded
+    radiation doesn't need any ray-casting at all.
+
     Arguments:
-        _int_matrix_init: (_)
-        _angles: (_)
-        _total_sky_rad: (_)
-        _window_mesh: (ladybug_geometry.geometry3d.Mesh3D)
-    Returns: (tuple)
-        average_window_kWh: (float) The area-weighted average total kWh radiation
-        for the window over the analysis period specified.
+        _window_surface: (Brep) A single window Brep from the scene
+        _shade_mesh: (Mesh) The context shading joined mesh. Only read from, so
+            it can be shared by windows being solved at the same time.
+        _grid_size: (float)
+        _seasons: (list: tuple) (season name, sky_vecs, total_sky_rad) for each season
+        _parallel: (bool) Passed along to the ray-intersection solver
+    Returns:
+        (WindowRadiation)
     """
-    
-    results_kWh = []
-    window_face_areas = []
-    int_matrix = []
-    
-    count = (k for k in range(len(_angles)*2 )) # just a super large counter
-    
-    for c, int_vals, angs in izip(count, _int_matrix_init, _angles):
-        pt_rel = (ival * math.cos(ang) for ival, ang in izip(int_vals, angs))
-        rad_result = sum(r * w for r, w in izip(pt_rel, _total_sky_rad))
-        
-        int_matrix.append(pt_rel)
-        results_kWh.append( rad_result * _window_mesh.face_areas[c] )
-        window_face_areas.append( _window_mesh.face_areas[c] )
-    
-    return results_kWh, window_face_areas
+
+    pts, nrmls, win_msh, rh_msh = build_window_meshes(_window_surface, _grid_size)
+    sky_vecs, slices = LBT2PH.shading_matrix.share_sky_domes(_seasons)
+
+    int_matrix_s, angles_s = generate_intersection_data(_shade_mesh, pts, sky_vecs, nrmls, _parallel)
+
+    face_areas = list(win_msh.face_areas)
+    result = WindowRadiation(win_msh, rh_msh, face_areas)
+    result.shaded = LBT2PH.shading_matrix.seasonal_radiation(int_matrix_s, angles_s, _seasons, slices, face_areas)
+    result.unshaded = LBT2PH.shading_matrix.unshaded_radiation(win_msh.face_normals, _seasons, face_areas)
+
+    return result
+
+def run_window_jobs(_job, _items, _parallel=False):
+    """Runs the job on each item, using a pool of worker threads if _parallel
+
+    Arguments:
+        _job: (function) f(item) -> result. Must not change any shared objects.
+        _items: (list) The items to run the job on (ie: window surfaces)
+        _parallel: (bool) Set True to run the jobs at the same time on all CPUs
+    Returns:
+        results: (list) The result for each item, in the same order as the items
+    """
+
+    items = list(_items)
+    results = [None] * len(items)
+
+    def run_job(i):
+        results[i] = _job(items[i])
+
+    if _parallel and len(items) > 1:
+        tasks.Parallel.ForEach(range(len(items)), run_job)
+    else:
+        for i in range(len(items)):
+            run_job(i)
+
+    return results
+
+def calc_windows_seasonal_radiation(_window_surfaces, _shade_mesh, _grid_size, _seasons, _parallel=False):
+    """Calculates the shaded and unshaded radiation for each window, for all the seasons
+
+    If _parallel, the windows are solved at the same time (one job per window)
+    rather than each window's ray-intersection being split up, which keeps all
+    the CPUs busy even for windows with only a few analysis points.
+
+    Arguments:
+        _window_surfaces: (list: Brep) The window Breps from the scene
+        _shade_mesh: (Mesh) The context shading joined mesh
+        _grid_size: (float)
+        _seasons: (list: tuple) (season name, sky_vecs, total_sky_rad) for each season
+        _parallel: (bool)
+    Returns:
+        results: (list: WindowRadiation) One for each window, in the same order
+    """
+
+    def job(_window_surface):
+        return calc_window_seasonal_radiation(_window_surface, _shade_mesh,
+                    _grid_size, _seasons, _parallel=False)
+
+    return run_window_jobs(job, _window_surfaces, _parallel)
 
 
 # Graphics / Mesh
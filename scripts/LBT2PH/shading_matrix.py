@@ -0,0 +1,222 @@
+"""Radiation math for the window shading studies ('LBT2PH Shading Seasonal Radiation')
+
+Works only on the intersection / angle matrices from the ray-intersection
+(one row per analysis point, one column per sky patch) and the sky-patch
+radiation values, so nothing in here uses Rhino or Ladybug.
+
+Note: the intersection matrix only depends on the geometry and the sky dome
+vectors, not on the radiation values. So seasons which use the same sky dome
+can share a single intersection pass and just be weighted differently.
+
+If numpy is available (ie: headless CPython) it is used for the matrix
+products, otherwise (IronPython) the same math is done in plain python.
+"""
+
+import math
+from array import array
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _xyz(_vec):
+    """Works with both Ladybug (.x) and Rhino (.X) vectors """
+
+    try:
+        return _vec.x, _vec.y, _vec.z
+    except AttributeError:
+        return _vec.X, _vec.Y, _vec.Z
+
+def dome_key(_sky_vecs, _digits=6):
+    """A hashable key for a set of sky vectors, so identical domes can be found """
+
+    return tuple( tuple(round(c, _digits) for c in _xyz(vec)) for vec in _sky_vecs )
+
+def share_sky_domes(_seasons):
+    """Joins the sky vectors for the seasons into one list, with each different dome only once.
+
+    Args:
+        _seasons (list): (season name, sky_vecs, total_sky_rad) for each season
+    Returns: (tuple)
+        sky_vecs (list): The vectors for each different sky dome, one after another
+        slices (dict): {season name: (start, end)} The position of each season's
+            vectors in the sky_vecs list. Seasons with the same dome share a slice.
+    """
+
+    sky_vecs = []
+    slices = {}
+    domes = {}
+    for season, season_sky_vecs, total_sky_rad in _seasons:
+        key = dome_key(season_sky_vecs)
+        if key not in domes:
+            domes[key] = ( len(sky_vecs), len(sky_vecs) + len(season_sky_vecs) )
+            sky_vecs.extend( season_sky_vecs )
+        slices[season] = domes[key]
+
+    return sky_vecs, slices
+
+class IntersectionMatrix:
+    """Each analysis point's relevance to each sky patch: intersection (1|0) * cos(angle)
+
+    Stored as a single flat array of floats (points x patches), rather than as
+    nested lists, so it is compact and can be handed to numpy without copying.
+    """
+
+    def __init__(self, _values, _num_points, _num_patches):
+        self.values = _values
+        self.num_points = _num_points
+        self.num_patches = _num_patches
+
+    @classmethod
+    def from_rows(cls, _int_matrix, _angles, _start=0, _end=None):
+        """Builds the matrix from the intersection solver's output
+
+        Args:
+            _int_matrix (list): One row per point, one value (1|0) per sky patch
+            _angles (list): One row per point, one angle (radians) per sky patch
+            _start (int): Default=0. The first sky patch column to use
+            _end (int): Default=None. The sky patch column to stop at (all if None)
+        Returns:
+            (IntersectionMatrix)
+        """
+
+        cos = math.cos
+        values = array('d')
+        num_points = 0
+        num_patches = 0
+        for int_vals, angs in zip(_int_matrix, _angles):
+            row = [ ival * cos(ang) if ival else 0.0
+                    for ival, ang in zip(int_vals[_start:_end], angs[_start:_end]) ]
+            values.fromlist( row )
+            num_points += 1
+            num_patches = len(row)
+
+        return cls(values, num_points, num_patches)
+
+    def row(self, _i):
+        return self.values[_i * self.num_patches : (_i + 1) * self.num_patches]
+
+    def radiation(self, _sky_rads, _face_areas, _use_numpy=True):
+        """Calculates the radiation (kWh) on each face for each set of sky patch radiation values
+
+        Args:
+            _sky_rads (list): A list of the total_sky_rad values (one per sky patch)
+                for each season
+            _face_areas (list): The area of the face for each point
+            _use_numpy (bool): Default=True. Use numpy, if it is available. The
+                plain python version gives exactly the same results as adding
+                up intersection * cos(angle) * sky patch radiation * face area
+                for each point, patch by patch.
+        Returns:
+            (list): A list of [kWh, kWh, ...] (one per face) for each of the _sky_rads
+        """
+
+        if not self.num_points:
+            return [ [] for rad in _sky_rads ]
+
+        if _use_numpy and np is not None:
+            relevance = np.frombuffer(self.values, dtype=float).reshape(self.num_points, self.num_patches)
+            weights = np.array(_sky_rads, dtype=float).reshape(len(_sky_rads), self.num_patches).T
+            areas = np.array(_face_areas[:self.num_points], dtype=float)
+            results = relevance.dot(weights) * areas[:, None]
+            return [ results[:, k].tolist() for k in range(len(_sky_rads)) ]
+
+        rows = [ self.row(i) for i in range(self.num_points) ]
+        results = []
+        for total_sky_rad in _sky_rads:
+            results.append( [ sum(map(mul, row, total_sky_rad)) * area
+                              for row, area in zip(rows, _face_areas) ] )
+
+        return results
+
+    def __unicode__(self):
+        return u"Intersection Matrix | Points: {}  |  Sky Patches: {}".format(self.num_points, self.num_patches)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_values={!r}, _num_points={!r}, _num_patches={!r})".format(
+               self.__class__.__name__,
+               self.values,
+               self.num_points,
+               self.num_patches)
+
+def seasonal_radiation(_int_matrix, _angles, _seasons, _slices, _face_areas, _use_numpy=True):
+    """Calculates the radiation (kWh) on each face for every season
+
+    Each point's relevance to each sky patch (intersection * cos(angle)) is
+    only calculated once per dome. All the seasons which share that dome are
+    then weighted together, as a single (points x patches) x (patches x seasons) product.
+
+    Args:
+        _int_matrix (list): One row per point, one value (1|0) per sky patch
+        _angles (list): One row per point, one angle (radians) per sky patch
+        _seasons (list): (season name, sky_vecs, total_sky_rad) for each season
+        _slices (dict): {season name: (start, end)} The season's columns in the matrices
+        _face_areas (list): The area of the face for each point
+        _use_numpy (bool): Default=True. Use numpy, if it is available.
+    Returns:
+        (dict): {season name: [kWh, kWh, ...]} One value for each face
+    """
+
+    seasons_by_slice = {}
+    for season, sky_vecs, total_sky_rad in _seasons:
+        seasons_by_slice.setdefault(_slices[season], []).append( (season, total_sky_rad) )
+
+    results = {}
+    for (start, end), season_rads in seasons_by_slice.items():
+        matrix = IntersectionMatrix.from_rows(_int_matrix, _angles, start, end)
+        season_results = matrix.radiation([rad for season, rad in season_rads], _face_areas, _use_numpy)
+        results.update( zip([season for season, rad in season_rads], season_results) )
+
+    return results
+
+def _unit(_vec):
+    x, y, z = _xyz(_vec)
+    length = math.sqrt(x * x + y * y + z * z)
+    if not length:
+        return 0.0, 0.0, 0.0
+    return x / length, y / length, z / length
+
+def unshaded_radiation(_normals, _seasons, _face_areas, _digits=6):
+    """Calculates the radiation (kWh) on each face for every season, with no shading at all
+
+    With nothing in the way, every sky patch in front of the face counts, so
+    this is just the sum of each patch's radiation * cos(angle to the face normal)
+    for the patches with an angle less than 90 degrees. No ray-casting needed.
+    It only needs to be calculated once for each different normal, and a flat
+    window only has one.
+
+    Args:
+        _normals (list): The normal vector for each face
+        _seasons (list): (season name, sky_vecs, total_sky_rad) for each season
+        _face_areas (list): The area of each face
+        _digits (int): Default=6. Normals which round to the same values are treated as the same.
+    Returns:
+        (dict): {season name: [kWh, kWh, ...]} One value for each face
+    """
+
+    results = {}
+    for season, sky_vecs, total_sky_rad in _seasons:
+        unit_sky_vecs = [ _unit(vec) for vec in sky_vecs ]
+        rad_by_normal = {}
+
+        season_results = []
+        for normal, area in zip(_normals, _face_areas):
+            nx, ny, nz = _unit(normal)
+            key = ( round(nx, _digits), round(ny, _digits), round(nz, _digits) )
+
+            if key not in rad_by_normal:
+                total = 0.0
+                for (vx, vy, vz), rad in zip(unit_sky_vecs, total_sky_rad):
+                    cos_angle = nx * vx + ny * vy + nz * vz
+                    if cos_angle > 0:
+                        total += cos_angle * rad
+                rad_by_normal[key] = total
+
+            season_results.append( rad_by_normal[key] * area )
+
+        results[season] = season_results
+
+    return results
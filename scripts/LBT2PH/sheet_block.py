@@ -0,0 +1,233 @@
+"""Column-based PHPP tables: one object per table instead of one per cell.
+
+Most of the PHPP worksheets the model is written to are tables: one row per
+item (surface, window, room...) starting at a fixed row, with the same
+columns on every row. A SheetBlock stores just that: the worksheet, the start
+row, the column letters (with their units) and a list of values for each
+column. Cell addresses like 'AC41' are only made when something actually needs
+them (the diff, the .xlsx writer) and the block can be written to Excel as a
+few rectangular ranges without ever going cell-by-cell.
+
+    block = SheetBlock('Areas', 41, [ 'L', 'M', ('V', 'M2', 'FT2') ])
+    block.add_row('Wall North', 8, 12.5)
+
+A list of cells for writing can hold SheetBlocks mixed in with plain
+to_excel.PHPP_XL_Obj items. Use iter_cells() / count_cells() to read them.
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+from itertools import groupby
+
+import LBT2PH.unit_conversion
+import LBT2PH.xl_write
+
+# Some worksheets have a different name in the IP version of the PHPP
+IP_WORKSHEET_NAMES = {
+    'U-Values': 'R-Values',
+    'Additional Vent': 'Addl vent',
+}
+
+def worksheet_name(_worksheet, _units='SI'):
+    """The worksheet's name in the SI or IP PHPP """
+
+    if _units == 'SI':
+        return _worksheet
+    return IP_WORKSHEET_NAMES.get(_worksheet, _worksheet)
+
+class SheetColumn:
+    """One column of a SheetBlock: the column letter, its units and its values """
+
+    def __init__(self, _letter, _unit_si=None, _unit_ip='SI'):
+        """
+        Args:
+            _letter (str): The Excel column letter(s). ie: 'AC'
+            _unit_si (str): The SI unit of the values, or None for no unit conversion
+            _unit_ip (str): The IP unit to convert the values to in an IP PHPP
+        """
+        self.letter = _letter
+        self.unit_si = _unit_si
+        self.unit_ip = _unit_ip
+        self.values = []
+
+    @classmethod
+    def from_spec(cls, _spec):
+        """Build from a column letter, or a (letter, SI unit, IP unit) tuple """
+
+        if isinstance(_spec, cls):
+            return _spec
+        if isinstance(_spec, (tuple, list)):
+            return cls(*_spec)
+        return cls(_spec)
+
+    def target_unit(self, _units='SI'):
+        if _units == 'IP':
+            return self.unit_ip
+        elif _units == 'SI':
+            return self.unit_si
+        else:
+            return _units
+
+    def get_values(self, _units='SI', _converters=None):
+        """All the values, converted to the PHPP's units """
+
+        if not self.unit_si:
+            return self.values
+
+        converters = _converters or LBT2PH.unit_conversion.PHPP_XL_CONVERTERS
+        return converters.convert_column(self.values, self.unit_si, self.target_unit(_units))
+
+    def __unicode__(self):
+        return u"Sheet Column | Column: {}  |  Unit: {}  |  Values: {}".format(
+            self.letter, self.unit_si, len(self.values))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_letter={!r}, _unit_si={!r}, _unit_ip={!r})".format(
+               self.__class__.__name__,
+               self.letter,
+               self.unit_si,
+               self.unit_ip)
+
+class SheetBlock:
+    """A PHPP table: rows of values on one worksheet, stored column-by-column """
+
+    def __init__(self, _worksheet, _start_row, _columns):
+        """
+        Args:
+            _worksheet (str): The name of the worksheet (SI PHPP name)
+            _start_row (int): The row the first item goes on
+            _columns (list): The column letters. Use a (letter, SI unit, IP unit)
+                tuple for any columns which need unit conversion.
+        """
+        self.Worksheet = _worksheet
+        self.start_row = _start_row
+        self.columns = [ SheetColumn.from_spec(spec) for spec in _columns ]
+        self.num_rows = 0
+
+    def add_row(self, *_values):
+        """Adds one item, with a value for each column (in order) """
+
+        if len(_values) != len(self.columns):
+            raise ValueError('The "{}" table has {} columns, got {} values.'.format(
+                self.Worksheet, len(self.columns), len(_values)))
+
+        for column, value in zip(self.columns, _values):
+            column.values.append(value)
+        self.num_rows += 1
+
+    def getWorksheet(self, _units='SI'):
+        return worksheet_name(self.Worksheet, _units)
+
+    @property
+    def rows(self):
+        return range(self.start_row, self.start_row + self.num_rows)
+
+    @property
+    def cell_count(self):
+        return self.num_rows * len(self.columns)
+
+    def cells(self, _units='SI'):
+        """Yields (worksheet, range address, value) for every cell, row by row """
+
+        worksheet = self.getWorksheet(_units)
+        columns = [ (col.letter, col.get_values(_units)) for col in self.columns ]
+        for i, row in enumerate(self.rows):
+            for letter, values in columns:
+                yield (worksheet, '{}{}'.format(letter, row), values[i])
+
+    def write_blocks(self, _units='SI'):
+        """The table as xl_write.WriteBlocks: one per run of neighbouring columns
+
+        Returns:
+            (list): WriteBlock objects, ready for a bulk 'Value2' write
+        """
+
+        if not self.num_rows:
+            return []
+
+        worksheet = self.getWorksheet(_units)
+
+        # Last value wins if the same column is used twice, same as writing cell-by-cell
+        by_number = {}
+        for col in self.columns:
+            by_number[LBT2PH.xl_write.column_to_number(col.letter)] = col.get_values(_units)
+
+        blocks = []
+        numbers = sorted(by_number.keys())
+        for _, run in groupby(enumerate(numbers), lambda item: item[1] - item[0]):
+            run = [ number for _, number in run ]
+            values = [ [ by_number[n][i] for n in run ] for i in range(self.num_rows) ]
+            blocks.append( LBT2PH.xl_write.WriteBlock(worksheet, self.start_row, run[0], values) )
+
+        return blocks
+
+    def __unicode__(self):
+        return u"Sheet Block | Worksheet: {}  |  Start Row: {}  |  Rows: {}  |  Columns: {}".format(
+            self.Worksheet, self.start_row, self.num_rows, len(self.columns))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_worksheet={!r}, _start_row={!r}, _columns={!r})".format(
+               self.__class__.__name__,
+               self.Worksheet,
+               self.start_row,
+               self.columns)
+
+def iter_cells(_items, _units='SI'):
+    """Yields (worksheet, range address, value) for a list of SheetBlocks and / or PHPP_XL_Objs
+
+    Runs of PHPP_XL_Objs have their units converted together, the same as
+    PHPP_XL_Obj.getValues()
+
+    Args:
+        _items (iterable): SheetBlock and / or to_excel.PHPP_XL_Obj items
+        _units (str): The PHPP's units. 'SI' or 'IP'
+    """
+
+    for is_block, group in groupby(_items, lambda item: isinstance(item, SheetBlock)):
+        if is_block:
+            for block in group:
+                for cell in block.cells(_units):
+                    yield cell
+        else:
+            xl_objects = list(group)
+            values = xl_objects[0].getValues(xl_objects, _units)
+            for obj, value in zip(xl_objects, values):
+                yield (obj.getWorksheet(_units), obj.Range, value)
+
+def count_cells(_items):
+    """The number of cells in a list of SheetBlocks and / or PHPP_XL_Objs """
+
+    return sum( item.cell_count if isinstance(item, SheetBlock) else 1 for item in _items )
+
+def count_rows(_items):
+    """The number of table rows (items) in a list of SheetBlocks """
+
+    return sum( item.num_rows for item in _items if isinstance(item, SheetBlock) )
+
+def write_plan(_items, _units='SI'):
+    """An xl_write.WritePlan for the items, without going cell-by-cell for the SheetBlocks
+
+    The SheetBlocks' ranges are written first, then any PHPP_XL_Objs (grouped
+    into blocks the same as WritePlan.from_diff())
+
+    Args:
+        _items (iterable): SheetBlock and / or to_excel.PHPP_XL_Obj items
+        _units (str): The PHPP's units. 'SI' or 'IP'
+    Returns:
+        (xl_write.WritePlan)
+    """
+
+    blocks = []
+    num_cells = 0
+    xl_objects = []
+    for item in _items:
+        if isinstance(item, SheetBlock):
+            blocks.extend( item.write_blocks(_units) )
+            num_cells += item.cell_count
+        else:
+            xl_objects.append(item)
+
+    plan = LBT2PH.xl_write.WritePlan.from_diff( list(iter_cells(xl_objects, _units)) )
+    return LBT2PH.xl_write.WritePlan(blocks + plan.blocks, num_cells + plan.num_cells)
@@ -1,36 +1,99 @@
-import rhinoscriptsyntax as rs
-import random
-import ghpythonlib.components as ghc
-import Grasshopper.Kernel as ghK
-import Rhino
-from System import Object
-from ladybug_rhino.fromgeometry import from_face3d
-
-
-try:  # import the core honeybee dependencies
+try:
+    # Only there when run inside Rhino. Needed for the TFA surface and
+    # volume geometry, not for Spaces read back from the HB user_data
+    import rhinoscriptsyntax as rs
+    import ghpythonlib.components as ghc
+    import Grasshopper.Kernel as ghK
+    import Rhino
+    from System import Object
     from ladybug_rhino.togeometry import to_face3d
     from ladybug_rhino.fromgeometry import from_face3d
+except ImportError:
+    rs = ghc = ghK = Rhino = to_face3d = from_face3d = None
+    Object = object
+
+try:  # import the core honeybee dependencies
     from ladybug_geometry.geometry3d import Point3D, Face3D
 except ImportError as e:
     raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
 
 import LBT2PH
 import LBT2PH.ventilation
-
-reload(LBT2PH)
-reload(LBT2PH.ventilation)
+import LBT2PH.spatial_index
+import LBT2PH.identity
+import LBT2PH.dict_codec
+
+LBT2PH.dev_reload(LBT2PH)
+LBT2PH.dev_reload(LBT2PH.ventilation)
+LBT2PH.dev_reload(LBT2PH.spatial_index)
+LBT2PH.dev_reload(LBT2PH.identity)
+LBT2PH.dev_reload(LBT2PH.dict_codec)
+
+from LBT2PH.dict_codec import DictCodec, Field, OBJECT
+
+def _face3d_dict(_rhino_srfc):
+    # Remeber, to_face3d returns a LIST of surfaces incase it triangulates
+    # so for now, just getitng the first one in that list to pass along
+    # Someday this'll break everything...
+    if not _rhino_srfc:
+        return None
+    return to_face3d(_rhino_srfc)[0].to_dict()
+
+def _rhino_surface(_dict):
+    if not _dict or from_face3d is None:
+        return None  # Or no Rhino (ie: CPython)
+    return from_face3d( Face3D.from_dict(_dict) )
+
+def _new_tfa_surface(cls, _dict, _dict_sub_surfaces):
+    """A new TFA_Surface, with its sub-surfaces (stored next to it, see Volume) """
+
+    sub_surfaces = [ cls.from_dict(sub_surface, {}) for sub_surface in (_dict_sub_surfaces or {}).values() ]
+    new_tfa_obj = cls(_sub_surfaces=sub_surfaces)
+    new_tfa_obj._inset = 0.1
+    return new_tfa_obj
+
+def _sub_surface_dicts(_tfa_surface):
+    d = {}
+    for sub_surface in _tfa_surface.sub_surfaces:
+        key = '{}_{}'.format(sub_surface.dict_key, str(sub_surface.id) )
+        d.update( { key:sub_surface.to_dict() } )
+    return d
+
+def _volume_dicts(_volumes):
+    d = {}
+    for volume in _volumes:
+        key = '{}_{}'.format(volume.dict_key, volume.id)
+        d.update( { key : volume.to_dict() } )
+    return d
+
+def _volumes_from_dicts(_dict):
+    return [ Volume.from_dict(volume) for volume in (_dict or {}).values() ]
 
 class TFA_Surface(Object):
     ''' Represents an individual TFA Surface floor element '''
     
+    __slots__ = ('_inset', '_neighbors', '_area_gross', '_depth',
+                 'id', 'surface', 'host_room_name', 'params', 'sub_surfaces')
+
     def __init__(self, _surface=None, _host_room_name=None, 
-                _params={}, _sub_surfaces=[]):
+                _params={}, _sub_surfaces=[], _source=None):
+        """
+        Args:
+            _surface: The Rhino surface
+            _host_room_name (str): The HB Room's display_name
+            _params (dict): The surface's params (name, number, TFA factor...)
+            _sub_surfaces (list): The TFA_Surfaces joined to make this one, if any
+            _source: Where the surface came from: the Rhino object's GUID, the
+                HB Floor face's identifier, the ids of the surfaces joined to
+                make it... Different for each surface in the host room, and
+                the same on every solve. The id is made from this.
+        """
         self._inset = 0.150
         self._neighbors = None
         self._area_gross = None
         self._depth = None
 
-        self.id = random.randint(0,99999)
+        self.id = LBT2PH.identity.content_id('TFA_Surface', _host_room_name, _source)
         self.surface = _surface
         self.host_room_name = _host_room_name
         self.params = _params
@@ -295,57 +358,20 @@ class TFA_Surface(Object):
         
         return tfa_dict_key
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'id':self.id} )
-        d.update( {'space_number':self.space_number} )
-        d.update( {'space_name':self.space_name} )
-        d.update( {'host_room_name':self.host_room_name} )
-        d.update( {'params':self.params} )
-        d.update( {'area_gross':self.area_gross} )
-        d.update( {'depth':self.depth} )
-
-        if self.surface:
-            # Remeber, to_face3d returns a LIST of surfaces incase it triangulates
-            # so for now, just getitng the first one in that list to pass along
-            # Someday this'll break everything...
-
-            lbt_surface = to_face3d(self.surface)
-            
-            d.update( {'surface_list': lbt_surface[0].to_dict()  } )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict_tfa, _dict_sub_surfaces):
-        
-        sub_surfaces = []
-        for sub_surface in _dict_sub_surfaces.values():
-            new_sub_surface = cls.from_dict( sub_surface, {} )
-            sub_surfaces.append( new_sub_surface )
-
-        new_tfa_obj = cls()
-        new_tfa_obj.id = _dict_tfa.get('id')        
-        new_tfa_obj.host_room_name = _dict_tfa.get('host_room_name')
-        new_tfa_obj.params = _dict_tfa.get('params')
-        new_tfa_obj.sub_surfaces = sub_surfaces
-        new_tfa_obj._inset = 0.1
-        new_tfa_obj._neighbors = None
-        new_tfa_obj._area_gross = _dict_tfa.get('area_gross')
-        new_tfa_obj._depth = _dict_tfa.get('depth', None)
-
-        srfc_list = _dict_tfa.get('surface_list')
-        if srfc_list:
-            # Remeber, to_face3d returns a LIST of surfaces incase it triangulates
-            # so for now, just getitng the first one in that list to pass along
-            # Someday this'll break everything...
-
-            lbt_surface = Face3D.from_dict( srfc_list )
-            rh_surface = from_face3d( lbt_surface )
-            new_tfa_obj.surface = rh_surface
-
-        return new_tfa_obj
+    _codec = DictCodec(
+        Field('id'),
+        Field('space_number', _set_attr=False),
+        Field('space_name', _set_attr=False),
+        Field('host_room_name'),
+        Field('params'),
+        Field('area_gross', _set_attr='_area_gross'),
+        Field('depth', _set_attr='_depth'),
+        Field('surface_list', 'surface', _encode=_face3d_dict, _decode=_rhino_surface, _skip_empty=True),
+        _context=('_dict_sub_surfaces',),
+        _new=_new_tfa_surface,
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     @classmethod
     def from_hb_room(cls, _hb_room, _ghenv):
@@ -356,7 +382,7 @@ class TFA_Surface(Object):
         floor_surfaces = cls._find_hb_room_floor_surfaces(_hb_room, _ghenv)
         
         for srfc in floor_surfaces:
-            new_obj = cls()
+            new_obj = cls(_host_room_name=_hb_room.display_name, _source=srfc.identifier)
         
             tfa_surface = new_obj._inset_floor_surfaces( srfc, new_obj.inset, _ghenv )
             new_obj.tfa_factor = 1.0
@@ -388,7 +414,8 @@ class Volume:
     ''' Represents an individual volume / part of a larger Space '''
 
     def __init__(self, _tfa_surface=None, _space_geometry=None, _space_height=2.5):
-        self.id = random.randint(0,99999)
+        # One Volume per TFA surface
+        self.id = LBT2PH.identity.content_id('Volume', getattr(_tfa_surface, 'id', None))
         self.tfa_surface = _tfa_surface
         self._space_geom = _space_geometry
         self._space_height = _space_height
@@ -525,39 +552,24 @@ class Volume:
         self.tfa_surface.set_vent_flow_rate('V_eta', _dict['V_eta'])
         self.tfa_surface.set_vent_flow_rate('V_trans', _dict['V_trans'])
 
-    def to_dict(self):
-        d = {}
-        d.update( {'id': self.id} )
-        d.update( {'volume_height': self.volume_height})
-        d.update( {'tfa_surface': self.tfa_surface.to_dict() } )
-        d.update( {'_space_vn50': self.vn50 } )
-
-        tfa_sub_surfaces = {}
-        for sub_surface in self.tfa_surface.sub_surfaces:
-            key = '{}_{}'.format(sub_surface.dict_key, str(sub_surface.id) )
-            tfa_sub_surfaces.update( { key:sub_surface.to_dict() } )
-        d.update( {'tfa_sub_surfaces': tfa_sub_surfaces } )
-    
-        vent_rates = {}
-        vent_rates.update( {'V_sup':self._get_vent_flow_rate('V_sup') })
-        vent_rates.update( {'V_eta':self._get_vent_flow_rate('V_eta') })
-        vent_rates.update( {'V_trans':self._get_vent_flow_rate('V_trans') })
-        d.update( {'_phpp_vent_flow_rates':vent_rates} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-        
-        new_volume = cls()
-        new_volume.tfa_surface = TFA_Surface.from_dict( _dict['tfa_surface'], _dict['tfa_sub_surfaces'] )
-        new_volume._space_geom = None
-        new_volume.volume_height = _dict['volume_height']
-        new_volume.id = _dict['id']
-        new_volume._space_vn50 = _dict['_space_vn50']
-        new_volume._phpp_vent_flow_rates = _dict['_phpp_vent_flow_rates']
-    
-        return new_volume
+    @property
+    def phpp_vent_flow_rates(self):
+        return { 'V_sup':self._get_vent_flow_rate('V_sup'),
+                 'V_eta':self._get_vent_flow_rate('V_eta'),
+                 'V_trans':self._get_vent_flow_rate('V_trans') }
+
+    _codec = DictCodec(
+        Field('id'),
+        # The height is read back as the height to extrude the floor surface by, see volume_brep
+        Field('volume_height', _set_attr='_space_height'),
+        Field('tfa_surface', _kind=OBJECT, _type=TFA_Surface, _set_attr=False),
+        Field('_space_vn50', 'vn50', '_space_vn50'),
+        Field('tfa_sub_surfaces', 'tfa_surface', _set_attr=False, _encode=_sub_surface_dicts),
+        Field('_phpp_vent_flow_rates', 'phpp_vent_flow_rates', '_phpp_vent_flow_rates'),
+        _new=lambda cls, _dict: cls( TFA_Surface.from_dict(_dict.get('tfa_surface'), _dict.get('tfa_sub_surfaces')) ),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'A PHPP Space Volume Object: < {} >'.format(self.id)
@@ -576,7 +588,7 @@ class Space:
     ''' A 'Space' or Room in a Zone. Made up of one or more Volumes/parts '''
     
     def __init__(self, _volumes=None, _vent_sched=LBT2PH.ventilation.PHPP_Sys_VentSchedule() ):
-        self.id = random.randint(0,99999)
+        self.id = LBT2PH.identity.content_id('Space', sorted(volume.id for volume in _volumes or []))
         self.volumes = _volumes
         self.phpp_vent_system_id = 'default'
         self._phpp_vent_flow_rates = {'V_sup':0, 'V_eta':0, 'V_trans':0}
@@ -780,45 +792,22 @@ class Space:
         for vol in self.volumes:
             vol.set_phpp_vent_rates( _dict )
 
-    def to_dict(self):
-
-        d = {}
-        d.update( {'id': self.id} )
-        d.update( {'_tfa':self.space_tfa} )
-        d.update( {'phpp_vent_system_id': self.phpp_vent_system_id} )
-        d.update( {'volumes' : {} } )
-
-        for volume in self.volumes:
-            key = '{}_{}'.format(volume.dict_key, volume.id)
-            d['volumes'].update( { key : volume.to_dict() } )
-        
-        vent_rates = {}
-        vent_rates.update( {'V_sup': self.space_vent_supply_air} )
-        vent_rates.update( {'V_eta': self.space_vent_extract_air} )
-        vent_rates.update( {'V_trans': self.space_vent_transfer_air} )
-        d.update( {'_phpp_vent_flow_rates': vent_rates} )
-        d.update( {'vent_sched': self.vent_sched.to_dict()} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-
-        dict_volumes = _dict['volumes']
-        volumes = []
-        for volume in dict_volumes.values():
-            new_volume = Volume.from_dict(volume)
-            volumes.append(new_volume)
-
-        new_space =  cls()
-        new_space._tfa = _dict.get('_tfa')
-        new_space.id = _dict.get('id')
-        new_space.phpp_vent_system_id = _dict.get('phpp_vent_system_id')
-        new_space._phpp_vent_flow_rates = _dict.get('_phpp_vent_flow_rates')
-        new_space.volumes = volumes
-        new_space.vent_sched = LBT2PH.ventilation.PHPP_Sys_VentSchedule.from_dict( _dict.get('vent_sched') )
-
-        return new_space
+    @property
+    def phpp_vent_flow_rates(self):
+        return { 'V_sup': self.space_vent_supply_air,
+                 'V_eta': self.space_vent_extract_air,
+                 'V_trans': self.space_vent_transfer_air }
+
+    _codec = DictCodec(
+        Field('id'),
+        Field('_tfa', 'space_tfa', '_tfa'),
+        Field('phpp_vent_system_id'),
+        Field('volumes', _encode=_volume_dicts, _decode=_volumes_from_dicts),
+        Field('_phpp_vent_flow_rates', 'phpp_vent_flow_rates', '_phpp_vent_flow_rates'),
+        Field('vent_sched', _kind=OBJECT, _type=LBT2PH.ventilation.PHPP_Sys_VentSchedule),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'A PHPP Space Object: < {} > {}-{}'.format(self.id, self.space_number, self.space_name)
@@ -830,6 +819,13 @@ class Space:
                self.volumes, self.vent_sched)
 
 def find_all_tfa_surfaces( _tfa_surfaces, _ghenv, _ghdoc ):
+    """ The geometry and params of each TFA surface input
+    
+    Returns:
+        (list): (geometry, params, source) for each surface. The source (the
+            Rhino object's GUID, or the input index for GH geometry) is for
+            the TFA_Surface's id.
+    """
     input_num = _TFA_surfaces_input_number(_ghenv)
     
     rhino_tfa_objects = []
@@ -840,8 +836,8 @@ def find_all_tfa_surfaces( _tfa_surfaces, _ghenv, _ghdoc ):
         if rhino_obj:
             # Input is a Rhino surface
             with LBT2PH.helpers.context_rh_doc(_ghdoc):
-                tfa_obj = get_tfa_surface_data_from_Rhino( rhino_guid )
-                rhino_tfa_objects.append( tfa_obj )
+                geom, params = get_tfa_surface_data_from_Rhino( rhino_guid )
+                rhino_tfa_objects.append( (geom, params, str(rhino_guid)) )
         else:
             # Input is a Grasshoppper-generated surface
             geom = rs.coercegeometry( tfa_input )
@@ -852,7 +848,7 @@ def find_all_tfa_surfaces( _tfa_surfaces, _ghenv, _ghdoc ):
             #params['Object Name'] = 'Unnamed Room' #<--- make this 'turn on-able'
             #params['Room_Number'] = i
 
-            tfa_obj = ( geom, params )
+            tfa_obj = ( geom, params, 'input-{}'.format(i) )
             rhino_tfa_objects.append( tfa_obj )
     
     return rhino_tfa_objects
@@ -880,45 +876,98 @@ def get_tfa_surface_data_from_Rhino(_guid):
 
     return (geom, params)
 
-def find_tfa_host_room(_tfa_srfc_geom, _hb_rooms):
-    """Evaluates the Centoid of a TFA srf to see if it is inside an HB-Room """
-    
-    srfc_centroid_a = Rhino.Geometry.AreaMassProperties.Compute(_tfa_srfc_geom).Centroid
-    
-    # Note: move the centroid 'up' just a tiny bit, otherwise 'is_point_inside'
-    # test will return False. Must not work if point is 'on' a surface...
-    move_distance = 0.1
-    srfc_centroid_b = Rhino.Geometry.Point3d(srfc_centroid_a.X, srfc_centroid_a.Y, srfc_centroid_a.Z + move_distance)
+class RoomLocator:
+    """ Finds which HB-Room a TFA surface is 'in'. Build once for all the rooms, then reuse.
 
-    # Also, to use 'is_point_inside' need to convert the Point to a Ladybug Point3D
-    srfc_centroid_c = Point3D(srfc_centroid_b.X, srfc_centroid_b.Y, srfc_centroid_b.Z)
-    
-    host_room = None
-    for room in _hb_rooms:
+    Rooms are indexed by their bounding box so each surface is only tested
+    against the few rooms it could possibly be inside of. The Rhino Brep used
+    for the fallback inside-test is only built for a room if it is needed, and
+    then kept for any other surfaces.
+    """
+
+    def __init__(self, _hb_rooms, _tolerance=0.01):
+        self.rooms = list(_hb_rooms)
+        self._breps = {}
+
+        boxes = {}
+        for i, room in enumerate(self.rooms):
+            mn, mx = room.geometry.min, room.geometry.max
+            boxes[i] = (mn.x - _tolerance, mn.y - _tolerance, mn.z - _tolerance,
+                        mx.x + _tolerance, mx.y + _tolerance, mx.z + _tolerance)
+        self.index = LBT2PH.spatial_index.GridIndex.from_boxes(boxes)
+
+    @staticmethod
+    def tfa_centroid(_tfa_srfc_geom):
+        """ Returns the TFA surface centroid, as a Rhino Point3d and a Ladybug Point3D """
+
+        srfc_centroid_a = Rhino.Geometry.AreaMassProperties.Compute(_tfa_srfc_geom).Centroid
+        
+        # Note: move the centroid 'up' just a tiny bit, otherwise 'is_point_inside'
+        # test will return False. Must not work if point is 'on' a surface...
+        move_distance = 0.1
+        srfc_centroid_b = Rhino.Geometry.Point3d(srfc_centroid_a.X, srfc_centroid_a.Y, srfc_centroid_a.Z + move_distance)
+
+        # Also, to use 'is_point_inside' need to convert the Point to a Ladybug Point3D
+        srfc_centroid_c = Point3D(srfc_centroid_b.X, srfc_centroid_b.Y, srfc_centroid_b.Z)
+
+        return srfc_centroid_b, srfc_centroid_c
+
+    def _room_breps(self, _i):
+        """ The room's faces joined into Rhino Brep(s). Only built once per room. """
+
+        if _i not in self._breps:
+            surfaces = [ from_face3d(face.geometry) for face in self.rooms[_i].faces ]
+            self._breps[_i] = ghc.BrepJoin(surfaces).breps
+
+        return self._breps[_i]
+
+    def _is_inside(self, _i, _point_rh, _point_lbt):
+        if self.rooms[_i].geometry.is_point_inside( _point_lbt ):
+            return True
         
-        if room.geometry.is_point_inside( srfc_centroid_c ):
-            host_room = room.display_name
-            break
+        # Incase the Ladybug test doesn't work (seems to fail on some complex geom)
+        # Try doing a test using real Rhino Geometry as well...
+        joined_breps = self._room_breps(_i)
+        if isinstance(joined_breps, list):
+            return bool( ghc.PointInBreps(joined_breps, _point_rh, True) )
         else:
-            
-            # Incase the Ladybug test doesn't work (seems to fail on some complex geom)
-            # Try doing a test using real Rhino Geometry as well...
-            
-            surfaces = []
-            for face in room.faces:
-                surfaces.append( from_face3d(face.geometry) )
-            
-            joined_breps = ghc.BrepJoin(surfaces).breps
-            if isinstance(joined_breps, list):
-                if ghc.PointInBreps(joined_breps, srfc_centroid_b, True):
-                    host_room = room.display_name
-                    break
-            else:
-                if ghc.PointInBrep(joined_breps, srfc_centroid_b, True):
-                    host_room = room.display_name
-                    break
+            return bool( ghc.PointInBrep(joined_breps, _point_rh, True) )
+
+    def find_host_room(self, _tfa_srfc_geom):
+        """Evaluates the Centoid of a TFA srf to see if it is inside an HB-Room
+
+        Returns:
+            (Rhino.Geometry.Point3d, str): The centroid tested and the host room's
+                display_name (None if no host room is found)
+        """
+
+        centroid_rh, centroid_lbt = self.tfa_centroid(_tfa_srfc_geom)
+
+        for i in self.index.query_point(centroid_rh.X, centroid_rh.Y, centroid_rh.Z):
+            if self._is_inside(i, centroid_rh, centroid_lbt):
+                return centroid_rh, self.rooms[i].display_name
+
+        return centroid_rh, None
+
+    def find_host_rooms(self, _tfa_srfc_geoms):
+        """ Finds the host room for every TFA surface in one go. Same order as the input. """
+
+        return [ self.find_host_room(geom) for geom in _tfa_srfc_geoms ]
+
+def find_tfa_host_room(_tfa_srfc_geom, _hb_rooms):
+    """Evaluates the Centoid of a TFA srf to see if it is inside an HB-Room 
+    
+    Note: for more than one surface, build a RoomLocator once and use that instead.
 
-    return srfc_centroid_b, host_room
+    Args:
+        _tfa_srfc_geom: The Rhino TFA surface
+        _hb_rooms: (list | RoomLocator) The Honeybee Rooms to test
+    """
+
+    if not isinstance(_hb_rooms, RoomLocator):
+        _hb_rooms = RoomLocator(_hb_rooms)
+
+    return _hb_rooms.find_host_room(_tfa_srfc_geom)
 
 def get_hb_room_floor_surfaces(_room):
     hb_floor_surfaces = []
@@ -928,17 +977,55 @@ def get_hb_room_floor_surfaces(_room):
 
     return hb_floor_surfaces
 
-def find_neighbors(_dict_of_TFA_objs):
-    for tfa_a in _dict_of_TFA_objs.values():
-        for tfa_b in _dict_of_TFA_objs.values():
-            if ghc.BrepXBrep(tfa_a.surface, tfa_b.surface).curves:
-                tfa_a.set_neighbors(tfa_b.neighbors)
-                tfa_b.set_neighbors(tfa_a.neighbors)
+def find_neighbors(_dict_of_TFA_objs, _tolerance=0.01):
+    """ Finds all the TFA surfaces which touch one another, and groups them.
 
-    return None
+    Surfaces are indexed by their bounding box (which includes their elevation)
+    so the Brep intersection test is only run on pairs which could touch. Each
+    surface's 'neighbors' is set to the ids of every surface in its group.
+
+    Args:
+        _dict_of_TFA_objs: (dict) {id: TFA_Surface, ...}
+        _tolerance: (float) Default=0.01. Added to each bounding box
+    Returns:
+        groups: (list) A list of the connected groups, each a list of TFA_Surfaces
+    """
+
+    tfa_objs = list(_dict_of_TFA_objs.values())
+
+    boxes = {}
+    for i, tfa_obj in enumerate(tfa_objs):
+        bbox = tfa_obj.surface.GetBoundingBox(True)
+        boxes[i] = (bbox.Min.X - _tolerance, bbox.Min.Y - _tolerance, bbox.Min.Z - _tolerance,
+                    bbox.Max.X + _tolerance, bbox.Max.Y + _tolerance, bbox.Max.Z + _tolerance)
+    
+    index = LBT2PH.spatial_index.GridIndex.from_boxes(boxes)
+    groups = LBT2PH.spatial_index.UnionFind( range(len(tfa_objs)) )
+
+    for i, tfa_a in enumerate(tfa_objs):
+        for j in index.query_box(boxes[i]):
+            if j <= i or groups.find(i) == groups.find(j):
+                continue
+            
+            if ghc.BrepXBrep(tfa_a.surface, tfa_objs[j].surface).curves:
+                groups.union(i, j)
+    
+    tfa_groups = []
+    for group in groups.groups():
+        group_objs = [ tfa_objs[i] for i in group ]
+        group_ids = set( tfa_obj.id for tfa_obj in group_objs )
+        for tfa_obj in group_objs:
+            tfa_obj.set_neighbors(group_ids)
+        tfa_groups.append( group_objs )
+
+    return tfa_groups
 
 def bin_tfa_srfcs_by_neighbor(_dict_of_tfa_surfaces_by_room_id):
-    """ I honestly don't remember what this is doing. Gotta write better comments...
+    """ Collects the TFA surfaces into groups of 'neighbors' (ones that touch each other)
+
+    Uses each TFA surface's 'neighbors' (set by find_neighbors) so surfaces are
+    grouped by the connected-group they are in.
+
     Args:
         _dict_of_tfa_surfaces_by_room_id: (dict): Looks like ->
                 {'19-Kitchen': {5775: TFA_Surface...},
@@ -956,33 +1043,35 @@ def bin_tfa_srfcs_by_neighbor(_dict_of_tfa_surfaces_by_room_id):
 
     srfcSets = {}
     for _tfa_srfc_room_id, _tfa_srfc_dict in _dict_of_tfa_surfaces_by_room_id.items():
+        group_keys = {}
         for tfa_id, tfa_surface_obj in _tfa_srfc_dict.items():
-
-            if len(tfa_surface_obj.neighbors) == 1:
-                srfcSets[tfa_surface_obj.id] = [ tfa_surface_obj ]
+            neighbors = frozenset(tfa_surface_obj.neighbors)
             
-            else:
-                for id_num in tfa_surface_obj.neighbors:
-                    if id_num in srfcSets.keys():
-                        srfcSets[id_num].append( tfa_surface_obj )
-                        continue
-                else:
-                    srfcSets[tfa_surface_obj.id] = [ tfa_surface_obj ]
+            if neighbors not in group_keys:
+                group_keys[neighbors] = tfa_surface_obj.id
+                srfcSets[tfa_surface_obj.id] = []
+            
+            srfcSets[group_keys[neighbors]].append( tfa_surface_obj )
 
     return srfcSets
 
 def join_touching_tfa_groups(_tfa_surface_groups, _ghenv=None):
-    """ Do not really rememember how it works....
+    """ Joins each group of touching TFA surfaces into a single new TFA surface
 
         Args:
-            _tfa_surface_groups: (?)
+            _tfa_surface_groups: (list | dict) The groups of touching TFA surfaces,
+                either the list of groups from find_neighbors() or the dict from
+                bin_tfa_srfcs_by_neighbor()
         Returns:
-            tfa_srfcs_joined: (?)
+            tfa_srfcs_joined: (list) The TFA surfaces. Groups with one surface pass through as-is.
     """
     
     tfa_srfcs_joined = []
     
-    for group in _tfa_surface_groups.values():
+    if isinstance(_tfa_surface_groups, dict):
+        _tfa_surface_groups = _tfa_surface_groups.values()
+
+    for group in _tfa_surface_groups:
         # if there is only a single element in the group, add it to the list
         # otherwise, try and join together the elements in the group
 
@@ -1033,7 +1122,8 @@ def join_touching_tfa_groups(_tfa_surface_groups, _ghenv=None):
 
             host_room_name = group[0].host_room_name
             params = group[0].params
-            unionedTFAObj = TFA_Surface(unioned_surface, host_room_name, params, sub_surfaces)
+            joined_ids = sorted(tfa_srfc.id for tfa_srfc in group)
+            unionedTFAObj = TFA_Surface(unioned_surface, host_room_name, params, sub_surfaces, joined_ids)
 
             #---- Set the new TFA Surface's param properties
             unionedTFAObj.area_gross = sum(areas_gross)
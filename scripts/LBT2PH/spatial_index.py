@@ -0,0 +1,254 @@
+"""Simple spatial lookups for matching up geometry without testing every pair.
+
+Boxes are plain tuples: (min_x, min_y, min_z, max_x, max_y, max_z)
+
+Note: nothing in here uses Rhino, so it is only used to find 'candidates'. The
+exact geometric tests (point-in-Brep, Brep intersections...) are still done
+by the caller, just on far fewer items.
+"""
+
+import heapq
+from collections import defaultdict
+
+def _xyz(_pt):
+    """Works with both Ladybug (.x) and Rhino (.X) points """
+
+    try:
+        return _pt.x, _pt.y, _pt.z
+    except AttributeError:
+        return _pt.X, _pt.Y, _pt.Z
+
+def box_from_points(_points, _tolerance=0.0):
+    """Returns the bounding box of a set of points, grown by the tolerance """
+
+    xs, ys, zs = zip( *[_xyz(pt) for pt in _points] )
+
+    return (min(xs) - _tolerance, min(ys) - _tolerance, min(zs) - _tolerance,
+            max(xs) + _tolerance, max(ys) + _tolerance, max(zs) + _tolerance)
+
+def box_contains_point(_box, _x, _y, _z):
+    return (_box[0] <= _x <= _box[3] and
+            _box[1] <= _y <= _box[4] and
+            _box[2] <= _z <= _box[5])
+
+def boxes_overlap(_box_a, _box_b):
+    return (_box_a[0] <= _box_b[3] and _box_b[0] <= _box_a[3] and
+            _box_a[1] <= _box_b[4] and _box_b[1] <= _box_a[4] and
+            _box_a[2] <= _box_b[5] and _box_b[2] <= _box_a[5])
+
+class GridIndex:
+    """A uniform grid 'bucket' index of bounding boxes, in plan (XY)
+
+    Each item is added to every grid cell its box touches, so a query only
+    needs to look at the items in the cells it touches. Works well when the
+    items are all about the same size (rooms, floor surfaces...).
+    """
+
+    def __init__(self, _cell_size):
+        self.cell_size = float(_cell_size) if _cell_size and _cell_size > 0 else 1.0
+        self.boxes = {}
+        self._cells = defaultdict(list)
+
+    @classmethod
+    def from_boxes(cls, _boxes):
+        """Builds a new index sized to suit the boxes given
+
+        Args:
+            _boxes (dict): {key: box, ...}
+        Returns:
+            (GridIndex)
+        """
+
+        sizes = sorted( max(b[3] - b[0], b[4] - b[1]) for b in _boxes.values() )
+        cell_size = sizes[len(sizes) // 2] if sizes else 1.0
+
+        index = cls(cell_size)
+        for key, box in _boxes.items():
+            index.insert(key, box)
+
+        return index
+
+    def _cell_range(self, _min, _max):
+        return range( int(_min // self.cell_size), int(_max // self.cell_size) + 1 )
+
+    def insert(self, _key, _box):
+        self.boxes[_key] = _box
+        for i in self._cell_range(_box[0], _box[3]):
+            for j in self._cell_range(_box[1], _box[4]):
+                self._cells[(i, j)].append(_key)
+
+    def query_point(self, _x, _y, _z):
+        """Returns the keys of all the boxes which contain the point, in the order they were added """
+
+        cell = ( int(_x // self.cell_size), int(_y // self.cell_size) )
+        return [ k for k in self._cells.get(cell, []) if box_contains_point(self.boxes[k], _x, _y, _z) ]
+
+    def query_box(self, _box):
+        """Returns the keys of all the boxes which overlap the box given """
+
+        found = set()
+        for i in self._cell_range(_box[0], _box[3]):
+            for j in self._cell_range(_box[1], _box[4]):
+                for k in self._cells.get((i, j), []):
+                    if k not in found and boxes_overlap(self.boxes[k], _box):
+                        found.add(k)
+
+        return found
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __unicode__(self):
+        return u"Grid Index | Items: {}  |  Cell Size: {}".format(len(self.boxes), self.cell_size)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_cell_size={!r})".format(
+               self.__class__.__name__,
+               self.cell_size)
+
+class UnionFind:
+    """Disjoint-sets, for collecting items into connected groups (ie: touching surfaces) """
+
+    def __init__(self, _keys=()):
+        self._parent = {}
+        self._rank = {}
+        self._order = []
+        for key in _keys:
+            self.add(key)
+
+    def add(self, _key):
+        if _key not in self._parent:
+            self._parent[_key] = _key
+            self._rank[_key] = 0
+            self._order.append(_key)
+
+    def find(self, _key):
+        """Returns the 'root' key of the group the key is in """
+
+        root = _key
+        while self._parent[root] != root:
+            root = self._parent[root]
+
+        # Path compression
+        while self._parent[_key] != root:
+            self._parent[_key], _key = root, self._parent[_key]
+
+        return root
+
+    def union(self, _key_a, _key_b):
+        root_a, root_b = self.find(_key_a), self.find(_key_b)
+        if root_a == root_b:
+            return
+
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+
+    def groups(self):
+        """Returns a list of the groups (each a list of keys), in the order the keys were added """
+
+        groups = {}
+        ordered = []
+        for key in self._order:
+            root = self.find(key)
+            if root not in groups:
+                groups[root] = []
+                ordered.append(groups[root])
+            groups[root].append(key)
+
+        return ordered
+
+    def __len__(self):
+        return len(self._parent)
+
+    def __unicode__(self):
+        return u"Union Find | Items: {}".format(len(self._parent))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_keys={!r})".format(
+               self.__class__.__name__,
+               self._order)
+
+class KDTree:
+    """A static k-d tree of points, for finding the nearest points to a location
+
+    Points are plain tuples, all of the same length (ie: (x, y, z)). Distances
+    are squared straight-line distances. Ties are broken by the order the points
+    were given in, the same as a stable sort of all the distances would.
+    """
+
+    def __init__(self, _points):
+        self.points = [ tuple(pt) for pt in _points ]
+        self.dims = len(self.points[0]) if self.points else 0
+        self._root = self._build( list(range(len(self.points))), 0 )
+
+    def _build(self, _indexes, _depth):
+        """Returns nested nodes: (point index, axis, left node, right node) """
+
+        if not _indexes:
+            return None
+
+        axis = _depth % self.dims
+        _indexes.sort( key=lambda i: (self.points[i][axis], i) )
+        middle = len(_indexes) // 2
+
+        return ( _indexes[middle], axis,
+                 self._build(_indexes[:middle], _depth + 1),
+                 self._build(_indexes[middle + 1:], _depth + 1) )
+
+    def _dist_sq(self, _index, _point):
+        return sum( (a - b) ** 2 for a, b in zip(self.points[_index], _point) )
+
+    def nearest(self, _point, _k=1):
+        """Finds the k nearest points
+
+        Args:
+            _point (tuple): The location to search from
+            _k (int): Default=1. The number of points to find
+        Returns:
+            (list): (squared distance, point index) for each point found, nearest first
+        """
+
+        if _k < 1 or not self.points:
+            return []
+
+        heap = []   # the best found so far, as (-distance, -index) so the worst is on top
+        nodes = [ (self._root, 0.0) ]
+        while nodes:
+            node, min_dist = nodes.pop()
+            if node is None:
+                continue
+
+            # Nothing on this side of the split can be closer than the worst found so far
+            if len(heap) == _k and min_dist > -heap[0][0]:
+                continue
+
+            index, axis, left, right = node
+            dist = self._dist_sq(index, _point)
+            if len(heap) < _k:
+                heapq.heappush(heap, (-dist, -index))
+            elif (dist, index) < (-heap[0][0], -heap[0][1]):
+                heapq.heapreplace(heap, (-dist, -index))
+
+            diff = _point[axis] - self.points[index][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            nodes.append( (far, max(min_dist, diff ** 2)) )
+            nodes.append( (near, min_dist) )
+
+        return sorted( (-dist, -index) for dist, index in heap )
+
+    def __len__(self):
+        return len(self.points)
+
+    def __unicode__(self):
+        return u"KD Tree | Points: {}  |  Dimensions: {}".format(len(self.points), self.dims)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_points={!r})".format(
+               self.__class__.__name__,
+               self.points)
@@ -1,9 +1,17 @@
-from System import Object
-import random
+try:
+    from System import Object
+except ImportError:
+    Object = object  # CPython
+
+import LBT2PH
+import LBT2PH.identity
+
+LBT2PH.dev_reload( LBT2PH.identity )
 
 class PHPP_SummVent(Object):
+    id = LBT2PH.identity.ContentId('day_ach', 'night_ach')
+
     def __init__(self, _day_ach=None, _night_ach=None):
-        self.id = random.randint(1000,9999)
         self._day_ach = _day_ach
         self._night_ach = _night_ach
 
@@ -42,7 +50,6 @@ class PHPP_SummVent(Object):
     def from_dict(cls, _dict):
         new_obj = cls()
         
-        new_obj.id = _dict.get('id')
         new_obj.day_ach = _dict.get('day_ach')
         new_obj.night_ach = _dict.get('night_ach')
 
@@ -0,0 +1,50 @@
+"""The model's opaque surfaces, looked up by identifier.
+
+Used by to_excel's Areas, Windows and Shading builders.
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+class SurfaceIndex:
+    """ The model's opaque surfaces by identifier, shared by the Areas, Windows and Shading builders 
+    
+    build_areas() marks which surfaces are included in the PHPP (and so get a
+    row on the 'Areas' worksheet). The window builders then look up each 
+    window's host surface here, rather than searching the surface lists.
+    """
+    
+    def __init__(self, _surfaces):
+        """
+        Args:
+            _surfaces (list): The PHPP_Surface objects
+        """
+        self.surfaces = list(_surfaces)
+        self._by_identifier = {}
+        self._included = set()
+        
+        for surface in self.surfaces:
+            self._by_identifier[surface.identifier] = surface
+    
+    def get(self, _identifier):
+        return self._by_identifier.get(_identifier)
+    
+    def include(self, _surface):
+        self._included.add(_surface.identifier)
+    
+    def is_included(self, _identifier):
+        return _identifier in self._included
+    
+    def __contains__(self, _identifier):
+        return _identifier in self._by_identifier
+    
+    def __len__(self):
+        return len(self.surfaces)
+    
+    def __unicode__(self):
+        return u"Surface Index | Surfaces: {}  |  Included: {}".format(len(self.surfaces), len(self._included))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+       return "{}( _surfaces={!r} )".format(
+               self.__class__.__name__,
+               self.surfaces)
@@ -0,0 +1,149 @@
+"""The orientation and size of all the exposed surfaces, computed in one pass.
+
+The 'Areas' table needs each surface's angle off North, angle off horizontal
+and area. Rather than working those out again from the LBT Face every time
+one is read, SurfaceOrientations works them out once for all of the model's
+faces and stores them as columns (one array per value), in the same order as
+the faces:
+
+    orientations = SurfaceOrientations.from_faces(faces, north_vector)
+    orientations.azimuth[3]     # Angle off North of faces[3]
+
+The normals, tilts, azimuths, areas and centroids are all plain floats.
+Each face's vertices are kept as (x, y, z) tuples: the footprint is re-built
+from those, and they also tell if the geometry has changed.
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+import math
+from array import array
+
+def xy(_vector):
+    """Works with both Ladybug (.x) and Rhino (.X) vectors """
+
+    try:
+        return _vector.x, _vector.y
+    except AttributeError:
+        return _vector.X, _vector.Y
+
+def xyz(_vector):
+    """Works with both Ladybug (.x) and Rhino (.X) vectors / points """
+
+    try:
+        return _vector.x, _vector.y, _vector.z
+    except AttributeError:
+        return _vector.X, _vector.Y, _vector.Z
+
+def angle_from_north(_normal_x, _normal_y, _north_x, _north_y):
+    """The clockwise angle (0--360) from the North vector to the surface normal
+
+    http://frasergreenroyd.com/obtaining-the-angle-between-two-vectors-for-360-degrees/
+    Results 0=north, 90=east, 180=south, 270=west
+
+    Returns:
+        angle: the angle off North for the surface (Degrees) clockwise from 0
+    """
+
+    angle = math.atan2(_north_y, _north_x) - math.atan2(_normal_y, _normal_x)
+    angle = angle * 360 / (2 * math.pi)
+
+    if angle < 0:
+        angle = angle + 360
+
+    return angle
+
+def angle_from_horiz(_normal_x, _normal_y, _normal_z):
+    """The angle (0--180) between the surface normal and straight up (Degrees).
+    Walls are 90, roofs 0 and floors 180. Same as rs.VectorAngle() """
+
+    length = math.sqrt(_normal_x**2 + _normal_y**2 + _normal_z**2)
+    if not length:
+        return 0.0
+
+    cos_angle = max(-1.0, min(1.0, _normal_z / length))
+    return math.degrees(math.acos(cos_angle))
+
+class SurfaceOrientations:
+    """The orientation and size of a list of LBT Faces, as aligned columns """
+
+    COLUMNS = ('normal_x', 'normal_y', 'normal_z', 'tilt', 'azimuth', 'area',
+               'centroid_x', 'centroid_y', 'centroid_z')
+
+    def __init__(self, _north_vector=None):
+        """
+        Args:
+            _north_vector: The scene's North (Ladybug Vector2D, Rhino Vector2d...)
+                or an angle (Degrees, counter-clockwise from +Y, the same as
+                lbt_to_phpp._find_north()). Default: +Y
+        """
+        if _north_vector is None:
+            self.north_x, self.north_y = 0.0, 1.0
+        else:
+            try:
+                self.north_x, self.north_y = xy(_north_vector)
+            except AttributeError:
+                angle = math.radians(float(_north_vector))
+                self.north_x, self.north_y = -math.sin(angle), math.cos(angle)
+
+        for column in self.COLUMNS:
+            setattr(self, column, array('d'))
+        self.vertices = []
+
+    @classmethod
+    def from_faces(cls, _faces, _north_vector=None):
+        """
+        Args:
+            _faces (list): LBT Faces (anything with a .normal, .area and
+                .geometry with a .centroid and .vertices)
+            _north_vector: The scene's North. Default: +Y
+        """
+
+        new_obj = cls(_north_vector)
+        for face in _faces:
+            new_obj.add_face(face)
+        return new_obj
+
+    def add_face(self, _face):
+        """Adds the face's values to the end of each column
+
+        Returns:
+            (int): The face's index in the columns
+        """
+
+        nx, ny, nz = xyz(_face.normal)
+        geometry = _face.geometry
+        cx, cy, cz = xyz(geometry.centroid)
+
+        self.normal_x.append(nx)
+        self.normal_y.append(ny)
+        self.normal_z.append(nz)
+        self.tilt.append( angle_from_horiz(nx, ny, nz) )
+        self.azimuth.append( angle_from_north(nx, ny, self.north_x, self.north_y) )
+        self.area.append(_face.area)
+        self.centroid_x.append(cx)
+        self.centroid_y.append(cy)
+        self.centroid_z.append(cz)
+        self.vertices.append( tuple(xyz(pt) for pt in geometry.vertices) )
+
+        return len(self.vertices) - 1
+
+    def normal(self, _i):
+        return (self.normal_x[_i], self.normal_y[_i], self.normal_z[_i])
+
+    def centroid(self, _i):
+        return (self.centroid_x[_i], self.centroid_y[_i], self.centroid_z[_i])
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __unicode__(self):
+        return u"Surface Orientations | Faces: {}  |  North: ({}, {})".format(
+            len(self), self.north_x, self.north_y)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_north_vector=({!r}, {!r}))".format(
+               self.__class__.__name__,
+               self.north_x,
+               self.north_y)
@@ -1,17 +1,31 @@
-import System
-import rhinoscriptsyntax as rs
-import helpers
-import Grasshopper.Kernel as ghK
-import Rhino
 import math
-import random
 from collections import namedtuple
 
+try:
+    # Only there when run inside Rhino. Needed for the Rhino surfaces (the
+    # 'Get Surface Params' component), not for the HB Model's faces
+    import System
+    import rhinoscriptsyntax as rs
+    import Rhino
+except ImportError:
+    System = rs = Rhino = None
+
+import LBT2PH
+import LBT2PH.helpers as helpers
+import LBT2PH.identity
+import LBT2PH.surface_orientation
+import LBT2PH.messages
+
+LBT2PH.dev_reload(helpers)
+LBT2PH.dev_reload(LBT2PH.identity)
+LBT2PH.dev_reload(LBT2PH.surface_orientation)
+LBT2PH.dev_reload(LBT2PH.messages)
+
 try:  # import the core honeybee dependencies
     from honeybee.boundarycondition import Surface, Outdoors, Ground, Adiabatic
     from honeybee.facetype import Wall, RoofCeiling, Floor
-    import ladybug_geometry
-    from ladybug_rhino.togeometry import to_face3d
+    from ladybug_geometry.geometry2d.pointvector import Vector2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D, Vector3D
 except ImportError as e:
     raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
 
@@ -38,6 +52,7 @@ class hb_surface:
     Args:
         _srfc: <Surface> A single 'Surface' object with .geom and .param properties
         _constructions: <Dict> A dict of all the EP Constructions
+        _index: <int> The surface's position in the component's input list
         _ghenv: The Grasshopper 'ghenv' object from the active scene
     Properties:
         * geometry
@@ -68,8 +83,9 @@ class hb_surface:
         'SHADING': {'legacy': 6, 'lbt1': 'Wall'}
         }
         
-    def __init__(self, _srfc, _constructions):
-        self.id = random.randint(1000,9999)
+    def __init__(self, _srfc, _constructions, _index=0, _ghenv=None):
+        # Used for the default name, so must be the same every solve
+        self.id = LBT2PH.identity.component_id(_ghenv, 'hb_surface', _index)
         self.geometry = _srfc.geom
         self.params = _srfc.params
         self.constructions = _constructions
@@ -148,8 +164,22 @@ class hb_surface:
 
         return self.constructions.get(ud_value, ud_value)
 
-class PHPP_Surface:
-    def __init__(self, _lbt_face, _rm_name, _rm_id, _scene_north_vec, _ghenv):
+class PHPP_Surface(object):
+    # The attributes which can be set from the face's 'phpp' user_data
+    USER_DATA_ATTRS = ('Factor_Shading', 'Factor_Absorptivity', 'Factor_Emissivity')
+
+    __slots__ = ('lbt_srfc', 'HostZoneName', 'HostZoneID', 'scene_north_vector', 'ghenv',
+                 'UD_Srfc_Name', 'orientations', 'orientation_index') + USER_DATA_ATTRS
+
+    def __init__(self, _lbt_face, _rm_name, _rm_id, _scene_north_vec, _ghenv,
+                 _orientations=None, _orientation_index=None):
+        '''
+        Arguments:
+            _orientations: Optional. A surface_orientation.SurfaceOrientations
+                which already has this face in it (ie: for the whole model).
+                If None, the face's orientation is worked out here.
+            _orientation_index: The face's index in the _orientations
+        '''
         self.lbt_srfc = _lbt_face
         self.HostZoneName = _rm_name
         self.HostZoneID = _rm_id
@@ -157,7 +187,14 @@ class PHPP_Surface:
         self.ghenv = _ghenv
         self.Factor_Shading = 0.5
         self.Factor_Absorptivity = 0.6
-        self.Factor_Emissivity = 0.9        
+        self.Factor_Emissivity = 0.9
+        self.UD_Srfc_Name = None
+
+        if _orientations is None:
+            _orientations = LBT2PH.surface_orientation.SurfaceOrientations(self.scene_north_vector)
+            _orientation_index = _orientations.add_face(_lbt_face)
+        self.orientations = _orientations
+        self.orientation_index = _orientation_index
 
     def calc_scene_north_vector(self, _input_vector):
         ''' 
@@ -167,15 +204,15 @@ class PHPP_Surface:
             north_vector:
         '''
 
-        default_north_vector = Rhino.Geometry.Vector2d(0,1)
+        default_north_vector = Vector2D(0,1)
         
         if _input_vector is None:
             return default_north_vector
         
-        if isinstance(_input_vector, ladybug_geometry.geometry2d.pointvector.Vector2D):
+        if isinstance(_input_vector, Vector2D):
             return _input_vector
 
-        if isinstance(_input_vector, Rhino.Geometry.Vector2d):
+        if Rhino and isinstance(_input_vector, Rhino.Geometry.Vector2d):
             return _input_vector
         
         # If its an angle input, create the vector from the angle
@@ -266,26 +303,18 @@ class PHPP_Surface:
             groupWarning = "Couldn't figure out the Group Number for surface '{self.Name}'?\n"\
                 "It appears to have an exposure of: '{self.exposure}' and a type of: '{self.type}'?\n"\
                 "I will give this surface a group type of 13. You may want to overwrite that in PHPP.".format(self=self)
-            self.ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, groupWarning)
+            LBT2PH.messages.add_message(self.ghenv, 'Warning', groupWarning)
             return 13
 
     @property
     def SurfaceArea(self):
-        try:
-            lbt_val = self.lbt_srfc.area
-            return lbt_val
-        except Exception as e:
-            print('Error getting the LBT Surface Area?', e)
-            return None
+        return self.orientations.area[self.orientation_index]
 
     @property
     def NormalVector(self):
-        try:
-            lbt_val = self.lbt_srfc.normal
-            return lbt_val
-        except Exception as e:
-            print('Error getting the LBT Surface Normal?', e)
-            return None
+        ''' The face's normal, as a Ladybug Vector3D '''
+
+        return Vector3D( *self.orientations.normal(self.orientation_index) )
 
     @property
     def Srfc(self):
@@ -298,55 +327,29 @@ class PHPP_Surface:
 
     @property
     def AngleFromHoriz(self):
-        up_vec = Rhino.Geometry.Vector3d(0,0,1)
-        face_normal_vec = self.NormalVector
-        
-        angle = rs.VectorAngle(up_vec, face_normal_vec)
-        return angle 
+        return self.orientations.tilt[self.orientation_index]
 
     @property
     def AngleFromNorth(self):
-        ''' Uses the Surface's Normal Vector and the project's north angle
-        vector and computes the clockwise orientation angle 0--360 between them
+        ''' The clockwise orientation angle 0--360 between the Surface's Normal
+        Vector and the project's north vector. 0=north, 90=east, 180=south, 270=west
         
-        http://frasergreenroyd.com/obtaining-the-angle-between-two-vectors-for-360-degrees/
-        Results 0=north, 90=east, 180=south, 270=west
-        Arguments:
-            None
-        Returns: 
-            angle: the angle off North for the surface (Degrees) clockwise from 0
+        See surface_orientation.angle_from_north()
         '''
 
-        # Get the input Vector's X and Y parts
-        x1 = self.NormalVector.x
-        y1 = self.NormalVector.y
-        
-        # Note: ladybug_geometry vectors use lowercase 'x', Rhino uses uppercase 'X'
-        try:
-            x2 = self.scene_north_vector.X
-            y2 = self.scene_north_vector.Y
-        except AttributeError as e:
-            x2 = self.scene_north_vector.x
-            y2 = self.scene_north_vector.y
-
-        # Calc the angle between the vectors
-        angle = math.atan2(y2, x2) - math.atan2(y1, x1)
-        angle = angle * 360 / (2 * math.pi)
-        
-        if angle < 0:
-            angle = angle + 360
-        
-        # Return Angle in Degrees
-        return angle
+        return self.orientations.azimuth[self.orientation_index]
+
+    @property
+    def Vertices(self):
+        ''' The face's vertices, as (x, y, z) tuples '''
+
+        return self.orientations.vertices[self.orientation_index]
 
     @property
     def Centroid(self):
-        try:
-            lbt_val = self.lbt_srfc.geometry.centroid
-            return lbt_val
-        except Exception as e:
-            print('Error getting the LBT Surface Centroid?', e)
-            return None
+        ''' The face's centroid, as a Ladybug Point3D '''
+
+        return Point3D( *self.orientations.centroid(self.orientation_index) )
 
     def __unicode__(self):
         return u'A PHPP-Style Surface Object: < {} >'.format(self.Name)
@@ -513,7 +516,7 @@ def _get_surface_rh_userText(_srfc_GUID, _ghdoc, _ghenv):
         remark = "Unable to get parameter data for the surface? If trying to pull data\n"\
         "from Rhino, be sure the '_srfc' input Type Hint is set to 'Guid'\n"\
         "For now, using default values for all surface parameter values."
-        _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, remark)
+        LBT2PH.messages.add_message(_ghenv, 'Remark', remark)
         return output_dict
     
     with helpers.context_rh_doc(_ghdoc):
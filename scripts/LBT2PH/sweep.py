@@ -0,0 +1,353 @@
+"""Batch 'sweep' of design variants: one PHPP per variant, plus a summary of the results.
+
+Starts from a base Honeybee Model and a table of variants (see
+LBT2PH.variant_table for the table format). For each variant:
+
+    1) The overrides are applied to a copy of the base model and it is converted
+       to PHPP cells (LBT2PH.pipeline). Variants which only change PHPP cells
+       (n50, cell:...) all share a single conversion of the base model.
+    2) The cells are written into a copy of the source PHPP (LBT2PH.xlsx_writer).
+       This is done across a pool of worker threads.
+    3) Each PHPP is opened in a single Excel instance, recalculated and saved,
+       and the 'Verification' results are read back into one summary table.
+
+Steps 1) and 3) stay on the calling thread: the conversion uses RhinoCommon
+and Grasshopper geometry components, and Excel (COM) is not safe to call from
+more than one thread. Run it from Rhino's IronPython, same as the pipeline:
+
+    LBT2PH.sweep.main(['MyModel.hbjson', 'PHPP_Template.xlsx', 'Variants.csv', 'C:\\Sweep'])
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+import LBT2PH
+import LBT2PH.pipeline
+import LBT2PH.messages
+import LBT2PH.xl_export
+import LBT2PH.xlsx_writer
+import LBT2PH.variant_table
+import LBT2PH.worker_pool
+
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.pipeline )
+LBT2PH.dev_reload( LBT2PH.messages )
+LBT2PH.dev_reload( LBT2PH.xl_export )
+LBT2PH.dev_reload( LBT2PH.xlsx_writer )
+LBT2PH.dev_reload( LBT2PH.variant_table )
+LBT2PH.dev_reload( LBT2PH.worker_pool )
+
+from LBT2PH.variant_table import VariantTableError, VERIFICATION_FIELDS
+
+class VariantLibrary:
+    """The constructions, glazing and vent units the variants can swap in, by name """
+
+    def __init__(self, _constructions=None, _glazing=None, _vent_units=None):
+        """
+        Args:
+            _constructions (dict): {name: HB Construction (opaque or window)}
+            _glazing (dict): {name: PHPP_Glazing dict} ie: {'name':.., 'gValue':.., 'uValue':..}
+            _vent_units (dict): {name: PHPP_Sys_VentUnit dict}
+        """
+
+        self.constructions = _constructions or {}
+        self.glazing = _glazing or {}
+        self.vent_units = _vent_units or {}
+
+    @classmethod
+    def from_dict(cls, _dict):
+        """From {'constructions': [HB Construction dicts], 'glazing': [..], 'vent_units': [..]} """
+
+        from honeybee_energy.construction.dictutil import dict_to_construction
+
+        constructions = {}
+        for d in _dict.get('constructions', []):
+            construction = dict_to_construction(d)
+            constructions[construction.display_name] = construction
+
+        glazing = dict( (d['name'], d) for d in _dict.get('glazing', []) )
+        vent_units = dict( (d['_name'], d) for d in _dict.get('vent_units', []) )
+
+        return cls(constructions, glazing, vent_units)
+
+    @classmethod
+    def from_file(cls, _path):
+        with open(_path) as f:
+            return cls.from_dict( json.load(f) )
+
+    def _get(self, _items, _type, _name):
+        try:
+            return _items[_name]
+        except KeyError:
+            raise VariantTableError('Cannot find the {} < {} > in the variant library. '\
+                'Available: {}'.format(_type, _name, sorted(_items.keys())))
+
+    def construction(self, _name):
+        return self._get(self.constructions, 'construction', _name)
+
+    def glazing_dict(self, _name):
+        return dict( self._get(self.glazing, 'glazing', _name) )
+
+    def vent_unit_dict(self, _name):
+        return dict( self._get(self.vent_units, 'vent unit', _name) )
+
+    def __unicode__(self):
+        return u"Variant Library | Constructions: {}  |  Glazing: {}  |  Vent Units: {}".format(
+            len(self.constructions), len(self.glazing), len(self.vent_units))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_constructions={!r}, _glazing={!r}, _vent_units={!r})".format(
+               self.__class__.__name__,
+               self.constructions,
+               self.glazing,
+               self.vent_units)
+
+def _replace_in(_user_data, _path, _value):
+    """Returns a copy of the user_data with the item at _path replaced
+
+    Only the dicts along the path are copied. Model.duplicate() only makes a
+    shallow copy of each object's user_data, so the base model's dicts must
+    never be changed in place.
+    """
+
+    new_data = dict(_user_data or {})
+    key = _path[0]
+    if len(_path) == 1:
+        new_data[key] = _value
+    else:
+        new_data[key] = _replace_in(new_data.get(key), _path[1:], _value)
+
+    return new_data
+
+def apply_variant(_HB_model, _variant, _library):
+    """Returns a copy of the HB Model with the variant's overrides applied
+
+    Args:
+        _HB_model (honeybee.model.Model): The base model. Is not changed.
+        _variant (variant_table.Variant): The overrides to apply
+        _library (VariantLibrary): Where to find the new constructions, glazing, vent units
+    Returns:
+        (honeybee.model.Model)
+    """
+
+    model = _HB_model.duplicate()
+
+    if _variant.constructions:
+        for hb_obj in list(model.faces) + list(model.apertures):
+            name = hb_obj.properties.energy.construction.display_name
+            if name in _variant.constructions:
+                hb_obj.properties.energy.construction = _library.construction( _variant.constructions[name] )
+
+    if _variant.glazing:
+        for aperture in model.apertures:
+            glazing = (aperture.user_data or {}).get('phpp', {}).get('_glazing')
+            if glazing and glazing.get('name') in _variant.glazing:
+                new_glazing = _library.glazing_dict( _variant.glazing[ glazing['name'] ] )
+                aperture.user_data = _replace_in(aperture.user_data, ('phpp', '_glazing'), new_glazing)
+
+    if _variant.vent_unit:
+        for room in model.rooms:
+            vent_system = (room.user_data or {}).get('phpp', {}).get('vent_system')
+            if not vent_system:
+                continue
+
+            new_unit = _library.vent_unit_dict( _variant.vent_unit )
+            new_unit.setdefault( 'id', vent_system.get('vent_unit', {}).get('id') )
+            room.user_data = _replace_in(room.user_data, ('phpp', 'vent_system', 'vent_unit'), new_unit)
+
+    return model
+
+def phpp_file_name(_variant_name):
+    """A safe file name for the variant's PHPP """
+
+    return u'{}.xlsx'.format( re.sub(r'[^\w\-. ]', '_', _variant_name).strip() or 'Variant' )
+
+def convert_variant(_HB_model, _variant, _library, _options, _unit, _logger=None):
+    """Converts the variant's model into a (worksheet, range, value) list for the PHPP """
+
+    ghenv = LBT2PH.messages.HeadlessGhenv(_logger, u'Sweep: {}'.format(_variant.name))
+    model = apply_variant(_HB_model, _variant, _library) if _variant.changes_model else _HB_model
+    result = LBT2PH.pipeline.convert_model(model, ghenv, _options)
+
+    return LBT2PH.xl_export.records_to_diff( result.to_records(_unit) )
+
+def write_phpps(_jobs, _source_phpp, _max_workers=None):
+    """Writes each (target path, diff) job into a copy of the source PHPP, across a pool of threads
+
+    Returns:
+        (list): None for each job which wrote OK, or the error
+    """
+
+    def write(_job):
+        target_path, diff = _job
+        try:
+            LBT2PH.xlsx_writer.XlsxWorkbook(_source_phpp).write(diff, target_path)
+        except Exception as e:
+            return e
+        return None
+
+    return LBT2PH.worker_pool.run_pool(write, _jobs, _max_workers)
+
+def read_results(_phpp_paths, _fields=VERIFICATION_FIELDS):
+    """Opens each PHPP in Excel, recalculates and saves it, and reads back the fields
+
+    Args:
+        _phpp_paths (list): The PHPP files to read
+        _fields (list): The (label, worksheet, range) items to read
+    Returns:
+        (list): A list of values (one per field) for each PHPP, or the error if
+            the file could not be read.
+    """
+
+    # Only import this here so that the rest of the sweep can run without Excel
+    import LBT2PH.xl_connect
+    LBT2PH.dev_reload( LBT2PH.xl_connect )
+
+    excel = LBT2PH.xl_connect.ExcelInstance()
+    excel.start_new_instance(None)
+    excel.excel_app.Visible = False
+
+    results = []
+    try:
+        for path in _phpp_paths:
+            try:
+                excel.filename = path
+                excel.open_workbook()
+                excel.load_sheets()
+                excel.excel_app.CalculateFull()
+
+                values = []
+                for label, worksheet, address in _fields:
+                    sheet = excel.sheets_dict.get(worksheet)
+                    values.append( sheet.Range[address].Value2 if sheet else None )
+                results.append(values)
+
+                excel.active_workbook.Close(True)
+            except Exception as e:
+                results.append(e)
+            finally:
+                excel.active_workbook = None
+                excel.sheets_dict = {}
+    finally:
+        excel.excel_app.Quit()
+
+    return results
+
+def run_sweep(_HB_model, _variants, _source_phpp, _output_folder, _library=None, _options=None,
+              _fields=VERIFICATION_FIELDS, _max_workers=None, _read_results=True, _logger=None):
+    """Builds a PHPP for each variant and collects the results into a summary
+
+    Args:
+        _HB_model (honeybee.model.Model): The base model
+        _variants (list): The variant_table.Variants to run
+        _source_phpp (str): The PHPP file to use as the template for each variant
+        _output_folder (str): Where to save the new PHPPs
+        _library (VariantLibrary): Optional. The constructions, glazing and vent
+            units the variants refer to.
+        _options (pipeline.ConversionOptions): Optional. Used for every variant.
+        _fields (list): The (label, worksheet, range) results to read from each PHPP
+        _max_workers (int): Optional. The most threads to use for writing the PHPPs
+        _read_results (bool): Default=True. Set False to skip opening the PHPPs
+            in Excel (the summary will only show which PHPPs were written)
+        _logger (messages.MessageLogger): Optional. Where to send the messages
+    Returns:
+        (variant_table.SweepSummary)
+    """
+
+    library = _library or VariantLibrary()
+    logger = _logger or LBT2PH.messages.StreamLogger()
+    unit = LBT2PH.xlsx_writer.XlsxWorkbook(_source_phpp).unit_type()
+
+    if not os.path.isdir(_output_folder):
+        os.makedirs(_output_folder)
+
+    paths = dict( (v.name, os.path.join(_output_folder, phpp_file_name(v.name))) for v in _variants )
+    errors = {}
+
+    #---------------------------------------------------------------------------
+    # Convert. Variants which only change cells share the base model's conversion
+    jobs = []
+    base_diff = None
+    for variant in _variants:
+        print('- '*25)
+        print(u'Converting Variant: < {} >'.format(variant.name))
+        try:
+            if variant.changes_model:
+                diff = convert_variant(_HB_model, variant, library, _options, unit, logger)
+            else:
+                if base_diff is None:
+                    base_diff = convert_variant(_HB_model, variant, library, _options, unit, logger)
+                diff = base_diff
+
+            diff = LBT2PH.variant_table.apply_cell_overrides(diff, variant.cell_overrides)
+            jobs.append( (variant.name, paths[variant.name], diff) )
+        except Exception as e:
+            logger.error( u'Variant < {} >: {}'.format(variant.name, e) )
+            errors[variant.name] = e
+
+    #---------------------------------------------------------------------------
+    # Write the PHPPs
+    print('- '*25)
+    print('Writing {} PHPP files...'.format(len(jobs)))
+    write_errors = write_phpps( [ (path, diff) for name, path, diff in jobs ], _source_phpp, _max_workers )
+    written = []
+    for (name, path, diff), error in zip(jobs, write_errors):
+        if error is None:
+            written.append(name)
+        else:
+            logger.error( u'Variant < {} >: {}'.format(name, error) )
+            errors[name] = error
+
+    #---------------------------------------------------------------------------
+    # Read back the results
+    results = {}
+    if _read_results and written:
+        print('Reading the results from {} PHPP files...'.format(len(written)))
+        for name, values in zip(written, read_results([ paths[n] for n in written ], _fields)):
+            if isinstance(values, Exception):
+                logger.error( u'Variant < {} >: {}'.format(name, values) )
+                errors[name] = values
+            else:
+                results[name] = values
+
+    summary = LBT2PH.variant_table.SweepSummary(_fields)
+    for variant in _variants:
+        if variant.name in errors:
+            summary.add_error(variant.name, errors[variant.name], paths[variant.name])
+        else:
+            summary.add(variant.name, results.get(variant.name), paths[variant.name])
+
+    return summary
+
+def main(_args=None):
+    parser = argparse.ArgumentParser(description='Build a PHPP for each design variant and summarize the results')
+    parser.add_argument('model', help='The base Honeybee Model .hbjson file')
+    parser.add_argument('phpp', help='The source (template) PHPP .xlsx file')
+    parser.add_argument('variants', help='The variant table .csv file')
+    parser.add_argument('output', help='The folder to save the PHPPs and summary to')
+    parser.add_argument('--library', default=None, help='JSON file of the constructions, glazing and vent units to use')
+    parser.add_argument('--epw', default=None, help='EPW file, for finding the nearest PHPP climate')
+    parser.add_argument('--north', type=float, default=None, help='Degrees counter-clockwise from the Y-axis')
+    parser.add_argument('--workers', type=int, default=None, help='The most threads to use for writing the PHPPs')
+    parser.add_argument('--no-read', action='store_true', help="Don't open the PHPPs in Excel to read the results")
+    parser.add_argument('--summary', default=None, help='Where to save the summary .csv (default: <output>/Summary.csv)')
+    args = parser.parse_args(_args)
+
+    variants = LBT2PH.variant_table.read_variant_table(args.variants)
+    library = VariantLibrary.from_file(args.library) if args.library else VariantLibrary()
+    options = LBT2PH.pipeline.ConversionOptions(args.north, args.epw)
+    logger = LBT2PH.messages.StreamLogger()
+
+    model = LBT2PH.pipeline.load_model(args.model)
+    summary = run_sweep(model, variants, args.phpp, args.output, library, options,
+                        _max_workers=args.workers, _read_results=not args.no_read, _logger=logger)
+    summary.write_csv( args.summary or os.path.join(args.output, 'Summary.csv') )
+
+    return 1 if logger.errors else 0
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -1,19 +1,32 @@
 import json
-import rhinoscriptsyntax as rs
-import Grasshopper.Kernel as ghK
-import Rhino
-import random
 from collections import namedtuple
 
+try:
+    # Only there when run inside Rhino. Needed for the Psi-Values in the Rhino document
+    import rhinoscriptsyntax as rs
+    import Grasshopper.Kernel as ghK
+    import Rhino
+except ImportError:
+    rs = ghK = Rhino = None
+
 import LBT2PH.helpers
+import LBT2PH.dict_codec
+import LBT2PH.identity
+
+LBT2PH.dev_reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
+LBT2PH.dev_reload( LBT2PH.identity )
+
+from LBT2PH.dict_codec import DictCodec, Field
 
-reload( LBT2PH.helpers )
 
+class PHPP_ThermalBridge(object):
+    __slots__ = ('typename', 'length', '_group_number', '_fRsi', '_psi_value', '__weakref__')
+
+    id = LBT2PH.identity.ContentId('typename', 'length', '_group_number', '_fRsi', '_psi_value')
 
-class PHPP_ThermalBridge:
     def __init__(self, _nm=None, _len=1, _psi=0.01,
                 _groupNo=15, _fRsi=None):
-        self.id = random.randint(1000,9999)
         self.typename = _nm
         self.length = float(_len)        
         self._group_number = _groupNo
@@ -24,12 +37,20 @@ class PHPP_ThermalBridge:
     def group_number(self):
         return str(self._group_number).split(':')[0]
 
+    @group_number.setter
+    def group_number(self, _input):
+        self._group_number = _input
+
     @property
     def psi_value(self):
         return self._psi_value
     
     @psi_value.setter
     def psi_value(self, _input):
+        if _input is None:
+            self._psi_value = None
+            return
+
         try:
             self._psi_value = float(_input)
         except ValueError as e:
@@ -46,35 +67,25 @@ class PHPP_ThermalBridge:
     
     @fRsi.setter
     def fRsi(self, _input):
+        if _input is None:
+            self._fRsi = None
+            return
+
         try:
             self._fRsi = float(_input)
         except ValueError as e:
             print('Cannot set fRsi to "{}". Should be a number.'.format(_input))
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'id':self.id} )
-        d.update( {'typename':self.typename} )
-        d.update( {'length':self.length} )
-        d.update( {'_group_number':self._group_number} )
-        d.update( {'_fRsi':self.fRsi} )
-        d.update( {'_psi_value':self.psi_value} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-        new_obj = cls()
-
-        new_obj.id = _dict.get('id')
-        new_obj.typename = _dict.get('typename')
-        new_obj.length = _dict.get('length')
-        new_obj._group_number = _dict.get('_group_number')
-        new_obj._fRsi = _dict.get('_fRsi')
-        new_obj._psi_value = _dict.get('_psi_value')
-
-        return new_obj
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('typename'),
+        Field('length'),
+        Field('_group_number'),
+        Field('_fRsi', 'fRsi', '_fRsi'),
+        Field('_psi_value', 'psi_value', '_psi_value'),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'A PHPP Thermal-Bridge Object: < {}-{} >'.format(self.id, self.typename)
@@ -0,0 +1,84 @@
+import os
+import math
+import random
+import shutil
+import tempfile
+import unittest
+import climate
+
+def nearest_brute_force(_latitude, _longitude):
+    # The original find_nearest_phpp_climate() search
+    climate_data = climate.phpp_climate_data()
+    for each in climate_data:
+        eachLat = float(each.get('Latitude', 0))
+        eachLong = float(each.get('Longitude', 0))
+        a = math.sin(math.pi/180*eachLat)
+        b = math.sin(math.pi/180*_latitude)
+        c = math.cos(math.pi/180*eachLat)
+        d = math.cos(math.pi/180*_latitude)
+        e = math.cos(math.pi/180*(eachLong-_longitude))
+        each['distToEPW'] = 6378 * math.acos(min([1, max([-1, a * b + c * d * e])]))
+    climate_data.sort(key=lambda e: e['distToEPW'])
+    return climate_data
+
+class Test_climate(unittest.TestCase):
+    def test_nearest_matches_brute_force(self):
+        index = climate.climate_station_index()
+        random.seed(0)
+        for i in range(200):
+            lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+            station, dist = index.nearest(lat, lon)[0]
+            expected = nearest_brute_force(lat, lon)[0]
+            self.assertEqual(station['Dataset'], expected['Dataset'])
+            self.assertAlmostEqual(dist, expected['distToEPW'])
+
+    def test_k_nearest_many(self):
+        index = climate.climate_station_index()
+        results = index.nearest_many([(40.0, -74.0), (47.85, 16.53)], 3)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual([len(r) for r in results], [3, 3])
+        self.assertEqual(results[1][0][0]['Dataset'], 'AT0001a-Eisenstadt')
+        self.assertTrue(results[0][0][1] <= results[0][1][1] <= results[0][2][1])
+
+    def test_table_queries(self):
+        table = climate.climate_station_table()
+
+        self.assertEqual(len(table), 558)
+        self.assertEqual(table.find('US0055b-New York')['Region'], 'New York')
+        self.assertEqual(table.find('us0055b')['Dataset'], 'US0055b-New York')
+        self.assertIsNone(table.find('XX9999z'))
+
+        us_stations = table.by_country('US-United States of America')
+        self.assertTrue(us_stations)
+        self.assertTrue(all(s['Country'] == 'US' for s in us_stations))
+        self.assertIn('New York', table.regions('US'))
+        self.assertTrue(all(s['Region'] == 'Burgenland' for s in table.by_region('Burgenland', 'AT')))
+        self.assertEqual([s['Dataset'] for s in table.by_code('0001a', 'AT')], ['AT0001a-Eisenstadt'])
+        self.assertEqual(table.station(0)['Latitude'], 42.51)
+
+    def test_table_file_round_trip(self):
+        table = climate.climate_station_table()
+        path = os.path.join(tempfile.mkdtemp(), 'stations.json')
+        try:
+            table.save(path)
+            loaded = climate.ClimateStationTable.load(path)
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+        self.assertEqual(loaded.stations(), table.stations())
+        self.assertEqual(climate.ClimateStationTable.from_stations(table.stations()).stations(), table.stations())
+
+    def test_dataset_id(self):
+        dataset = climate.PHPP_ClimateDataSet('US0055b-New York', '=J23', 'US-United States of America', 'New York')
+        read_back = climate.PHPP_ClimateDataSet.from_dict(dataset.to_dict())
+
+        # Same values, same id: in any session, and after a to_dict() / from_dict()
+        self.assertEqual(read_back.id, dataset.id)
+        self.assertEqual(dataset.to_dict()['id'], dataset.id)
+
+        read_back.Altitude = 10
+        self.assertNotEqual(read_back.id, dataset.id)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import conversion_cache
+
+class Test_fingerprint(unittest.TestCase):
+    def test_same_parts_same_fingerprint(self):
+        a = conversion_cache.fingerprint({'b': 1, 'a': [1.0, 2.0]}, 'x')
+        b = conversion_cache.fingerprint({'a': [1.0, 2.0], 'b': 1}, 'x')
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, conversion_cache.fingerprint({'a': [1.0, 2.5], 'b': 1}, 'x'))
+
+    def test_uses_to_dict(self):
+        class Geom(object):
+            def __init__(self, _v):
+                self.v = _v
+            def to_dict(self):
+                return {'v': self.v}
+
+        self.assertEqual(conversion_cache.fingerprint(Geom(1)), conversion_cache.fingerprint({'v': 1}))
+        self.assertNotEqual(conversion_cache.fingerprint(Geom(1)), conversion_cache.fingerprint(Geom(2)))
+
+class Test_ConversionCache(unittest.TestCase):
+    def test_only_changed_parts_rebuilt(self):
+        cache = conversion_cache.ConversionCache()
+        built = []
+        def build(_name):
+            built.append(_name)
+            return _name.upper()
+
+        cache.start_run()
+        for name in ('a', 'b', 'c'):
+            self.assertEqual(cache.get('window', name, '1', lambda: build(name)), name.upper())
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+        del built[:]
+        cache.start_run()
+        cache.get('window', 'a', '1', lambda: build('a'))
+        cache.get('window', 'b', '2', lambda: build('b'))
+        cache.get('window', 'c', '1', lambda: build('c'))
+        self.assertEqual(built, ['b'])
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_lookup_store(self):
+        cache = conversion_cache.ConversionCache()
+        cache.start_run()
+        self.assertIsNone(cache.lookup('surface', 'a', '1'))
+        cache.store('surface', 'a', '1', 'A')
+
+        cache.start_run()
+        self.assertEqual(cache.lookup('surface', 'a', '1'), 'A')
+        self.assertEqual(cache.lookup('surface', 'a', '2', 'changed'), 'changed')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # A cached None is still a hit
+        cache.get('room ground', 'a', '1', lambda: None)
+        self.assertIsNone(cache.get('room ground', 'a', '1', lambda: 'rebuilt'))
+
+    def test_prune(self):
+        cache = conversion_cache.ConversionCache()
+        cache.start_run()
+        cache.get('window', 'a', '1', lambda: 1)
+        cache.get('room spaces', 'a', '1', lambda: [])
+
+        cache.start_run()
+        cache.get('window', 'a', '1', lambda: 1)
+        self.assertEqual(cache.prune(), 1)
+        self.assertIn(('window', 'a'), cache)
+        self.assertNotIn(('room spaces', 'a'), cache)
+        self.assertEqual(len(cache), 1)
+
+if __name__ == '__main__':
+    unittest.main()
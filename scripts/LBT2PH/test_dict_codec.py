@@ -0,0 +1,207 @@
+import unittest
+import dict_codec
+import dhw
+from dict_codec import DictCodec, Field, OBJECT, OBJECTS_BY_ID, OBJECTS
+
+class Part:
+    def __init__(self, _id=None, _size=1):
+        self.id = _id
+        self.size = _size
+
+    _codec = DictCodec(Field('id'), Field('size'), _none_if_empty=True)
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
+
+class Assembly:
+    def __init__(self):
+        self.name = 'default'
+        self._kind = 'A'
+        self.main = None
+        self.parts = []
+        self.note = None
+
+    @property
+    def kind(self):
+        return self._kind
+
+    _codec = DictCodec(
+        Field('name'),
+        Field('_kind', 'kind', '_kind'),
+        Field('main', _kind=OBJECT, _type=Part),
+        Field('parts', _kind=OBJECTS_BY_ID, _type=Part),
+        Field('note', _skip_empty=True),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
+
+class Hosted:
+    def __init__(self, _host=None):
+        self.host = _host
+        self.shape = None
+        self.parts = []
+
+    _codec = DictCodec(
+        Field('shape', _encode=lambda v: ','.join(v), _decode=lambda v: v.split(',') if v else None, _skip_empty=True),
+        Field('parts', _kind=OBJECTS, _type=Part),
+        _context=('_host',),
+        _new=lambda cls, _dict, _host: cls(_host),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
+
+class Test_DictCodec(unittest.TestCase):
+    def test_round_trip(self):
+        obj = Assembly()
+        obj.name = 'Wall'
+        obj.main = Part('m', 3)
+        obj.parts = [Part('a', 1), Part('b', 2)]
+
+        d = obj.to_dict()
+        self.assertEqual(d, {'name': 'Wall', '_kind': 'A', 'main': {'id': 'm', 'size': 3},
+                             'parts': {'a': {'id': 'a', 'size': 1}, 'b': {'id': 'b', 'size': 2}}})
+
+        new_obj = Assembly.from_dict(d)
+        self.assertEqual(new_obj.main.size, 3)
+        self.assertEqual(sorted(p.id for p in new_obj.parts), ['a', 'b'])
+        self.assertEqual(new_obj.to_dict(), d)
+
+    def test_empty(self):
+        self.assertIsNone(Part.from_dict({}))
+        new_obj = Assembly.from_dict({})
+        self.assertIsNone(new_obj.main)
+        self.assertEqual(new_obj.parts, [])
+
+    def test_hooks(self):
+        obj = Hosted('room-1')
+        obj.shape = ['a', 'b']
+        obj.parts = [Part('a'), Part('a')]
+
+        d = obj.to_dict()
+        self.assertEqual(d, {'shape': 'a,b', 'parts': [{'id': 'a', 'size': 1}, {'id': 'a', 'size': 1}]})
+
+        new_obj = Hosted.from_dict(d, 'room-2')
+        self.assertEqual(new_obj.host, 'room-2')
+        self.assertEqual(new_obj.shape, ['a', 'b'])
+        self.assertEqual(len(new_obj.parts), 2)
+
+        # Skipped when the written value is empty, and the context defaults to None
+        obj.shape = []
+        self.assertNotIn('shape', obj.to_dict())
+        self.assertIsNone(Hosted.from_dict({}).host)
+
+    def test_bad_fields(self):
+        with self.assertRaises(ValueError):
+            DictCodec(Field('a'), Field('a'))
+        with self.assertRaises(ValueError):
+            Field('main', _kind=OBJECT)
+
+    def test_dhw_round_trip(self):
+        tank = dhw.PHPP_DHW_tank('2-DHW only', True, 2.1, 200)
+        self.assertEqual(dhw.PHPP_DHW_tank.from_dict(tank.to_dict()).to_dict()['vol'], 200)
+        self.assertIsNone(dhw.PHPP_DHW_tank.from_dict(None))
+
+        tap = dhw.PHPP_DHW_Tap_Point()
+        tap.openings_per_day = 4
+        self.assertEqual(dhw.PHPP_DHW_Tap_Point.from_dict(tap.to_dict()).to_dict(), tap.to_dict())
+
+    def test_id_field(self):
+        # The id follows the values, and an id stored in a dict is only read (not set)
+        pipe = dhw.PHPP_DHW_Pipe_Segment.from_dict({'id': '900000', 'length': 5, 'diameter': 0.02})
+        self.assertNotEqual(pipe.id, '900000')
+        self.assertEqual(pipe.to_dict()['id'], pipe.id)
+
+        same = dhw.PHPP_DHW_Pipe_Segment.from_dict({'length': 5, 'diameter': 0.02})
+        self.assertEqual(same.id, pipe.id)
+        same.length = 6
+        self.assertNotEqual(same.id, pipe.id)
+
+        with self.assertRaises(AttributeError):
+            pipe.id = '900000'
+        with self.assertRaises(AttributeError):
+            pipe.insul_quality = '2-Moderate'
+
+    def test_dhw_system(self):
+        system = dhw.PHPP_DHW_System()
+        system.tap_points = [dhw.PHPP_DHW_Tap_Point(), dhw.PHPP_DHW_Tap_Point()]
+        system.branch_piping = [dhw.PHPP_DHW_Pipe_Segment()]
+        system.usage = dhw.PHPP_DHW_usage_NonRes()
+
+        d = system.to_dict()
+        self.assertNotIn('tank1', d)
+
+        new_system = dhw.PHPP_DHW_System.from_dict(d)
+        self.assertIsInstance(new_system.usage, dhw.PHPP_DHW_usage_NonRes)
+        self.assertEqual(len(new_system.tap_points), 2)
+        self.assertIsNone(new_system.tank1)
+        self.assertEqual(new_system.to_dict(), d)
+
+    def test_dicts_by_id_repeats(self):
+        # Two of the same (content id) item are both kept
+        d = dict_codec.dicts_by_id([Part('a', 1), Part('a', 2), Part('b'), Part('a', 3)])
+
+        self.assertEqual(sorted(d.keys()), ['a', 'a-2', 'a-3', 'b'])
+        self.assertEqual(d['a-3']['size'], 3)
+        self.assertEqual(dict_codec.dicts_by_id(None), {})
+
+class Test_share_unchanged(unittest.TestCase):
+    def test_sharing(self):
+        old = {'spaces': {'a': {'vol': 1.0}, 'b': {'vol': 2.0}}, 'list': [1, 2], 'n': 1}
+        new = {'spaces': {'a': {'vol': 1.0}, 'b': {'vol': 3.0}}, 'list': [1, 2], 'n': 1}
+
+        shared = dict_codec.share_unchanged(new, old)
+        self.assertEqual(shared, new)
+        self.assertIsNot(shared, old)
+        self.assertIs(shared['spaces']['a'], old['spaces']['a'])
+        self.assertIs(shared['list'], old['list'])
+        self.assertIsNot(shared['spaces']['b'], old['spaces']['b'])
+        self.assertEqual(old['spaces']['b'], {'vol': 2.0})
+
+    def test_unchanged(self):
+        old = {'a': {'b': [1, {'c': None}]}}
+        self.assertIs(dict_codec.share_unchanged({'a': {'b': [1, {'c': None}]}}, old), old)
+        self.assertEqual(dict_codec.share_unchanged({'a': 1}, old), {'a': 1})
+        self.assertEqual(dict_codec.share_unchanged(1.0, 1), 1.0)
+
+class Test_updated_user_data(unittest.TestCase):
+    def setUp(self):
+        self.old = {'phpp': {'spaces': {'a': {'vol': 1}}, 'tb': {'x': 1}}, 'other': {'k': 1}}
+
+    def test_copy_on_write(self):
+        new = dict_codec.updated_user_data(self.old, 'spaces', {'b': {'vol': 2}})
+
+        self.assertEqual(new['phpp']['spaces'], {'a': {'vol': 1}, 'b': {'vol': 2}})
+        self.assertEqual(self.old['phpp']['spaces'], {'a': {'vol': 1}})
+        self.assertIs(new['phpp']['spaces']['a'], self.old['phpp']['spaces']['a'])
+        self.assertIs(new['phpp']['tb'], self.old['phpp']['tb'])
+        self.assertIs(new['other'], self.old['other'])
+
+    def test_second_item(self):
+        # ie: the Vent System component: writes the system, then new space dicts with its id
+        new = dict_codec.updated_user_data(self.old, 'vent_system', {'system_id': 'NEW'})
+        spaces = {}
+        for key, space in new['phpp']['spaces'].items():
+            spaces[key] = dict(space, phpp_vent_system_id='NEW')
+        new = dict_codec.updated_user_data(new, 'spaces', spaces)
+
+        self.assertEqual(new['phpp']['spaces']['a'], {'vol': 1, 'phpp_vent_system_id': 'NEW'})
+        self.assertEqual(self.old['phpp']['spaces']['a'], {'vol': 1})
+        self.assertNotIn('vent_system', self.old['phpp'])
+
+    def test_overwrite(self):
+        new = dict_codec.updated_user_data(self.old, 'spaces', {'b': {'vol': 2}}, 'overwrite')
+        self.assertEqual(new['phpp']['spaces'], {'b': {'vol': 2}})
+
+        same = dict_codec.updated_user_data(self.old, 'spaces', {'a': {'vol': 1}}, 'overwrite')
+        self.assertIs(same['phpp']['spaces'], self.old['phpp']['spaces'])
+
+    def test_new_keys(self):
+        self.assertEqual(dict_codec.updated_user_data(None, 'tb', {'x': 1}), {'phpp': {'tb': {'x': 1}}})
+        self.assertEqual(dict_codec.updated_user_data({}, 'phpp', {'x': 1}), {'phpp': {'x': 1}})
+        self.assertEqual(dict_codec.updated_user_data({'other': 1}, 'tb', {}), {'phpp': {'tb': {}}})
+
+        new = dict_codec.updated_user_data(self.old, 'climate', {'id': 'US01'})
+        self.assertEqual(new['phpp']['climate'], {'id': 'US01'})
+        self.assertNotIn('climate', self.old['phpp'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import histogram
+
+def original_histogram(_data, _nbins):
+    # The original ventilation.generate_histogram()
+    min_val, max_val = min(_data), max(_data)
+    hist_bins = dict( (k, 0) for k in range(_nbins+1) )
+    hist_vals = dict( (k, 0) for k in range(_nbins+1) )
+    total = 0
+    for d in _data:
+        bin_number = int(_nbins * ((d - min_val) / (max_val - min_val)))
+        hist_bins[bin_number] += 1
+        hist_vals[bin_number] += d
+        total += 1
+    for n in hist_vals.keys():
+        hist_vals[n] = hist_vals[n] / hist_bins[n]
+    for h in hist_bins.keys():
+        hist_bins[h] = float(hist_bins[h]) / total
+    return hist_bins, hist_vals
+
+class Test_histogram(unittest.TestCase):
+    def test_matches_original(self):
+        data = [0.0, 0.1, 0.25, 0.5, 0.5, 0.75, 0.9, 1.0, 1.0, 0.1] * 876
+        fractions, means = histogram.histogram(data, 2)
+        old_fractions, old_means = original_histogram(data, 2)
+
+        self.assertEqual(fractions, old_fractions)
+        for k in old_means:
+            self.assertAlmostEqual(means[k], old_means[k])
+
+    def test_constant_schedule(self):
+        fractions, means = histogram.histogram([0.6] * 8760, 2)
+
+        self.assertEqual(fractions, {0: 0.0, 1: 0.0, 2: 1.0})
+        self.assertEqual(means, {0: 0.0, 1: 0.0, 2: 0.6})
+
+    def test_empty_bin(self):
+        fractions, means = histogram.histogram([0.0, 0.0, 1.0, 1.0], 2)
+
+        self.assertEqual(fractions, {0: 0.5, 1: 0.0, 2: 0.5})
+        self.assertEqual(means[1], 0.0)
+
+    def test_no_values(self):
+        fractions, means = histogram.histogram([], 2)
+
+        self.assertEqual(fractions, {0: 0.0, 1: 0.0, 2: 0.0})
+
+if __name__ == '__main__':
+    unittest.main()
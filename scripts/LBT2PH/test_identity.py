@@ -0,0 +1,84 @@
+import unittest
+import identity
+
+class Value(object):
+    id = identity.ContentId('a', 'b')
+
+    def __init__(self, _a=1, _b=None):
+        self.a = _a
+        self.b = _b
+
+class Test_ContentId(unittest.TestCase):
+    def test_same_values_same_id(self):
+        self.assertEqual(Value(1, 'x').id, Value(1, 'x').id)
+        self.assertNotEqual(Value(1, 'x').id, Value(2, 'x').id)
+        self.assertEqual(len(Value().id), identity.CONTENT_ID_LENGTH)
+
+        # Known value: must never change between versions / sessions
+        self.assertEqual(Value(1, 'x').id, identity.content_id('Value', [1, 'x']))
+
+    def test_follows_changes(self):
+        obj = Value(1, 'x')
+        old_id = obj.id
+        obj.a = 2
+        self.assertNotEqual(obj.id, old_id)
+
+    def test_read_only(self):
+        with self.assertRaises(AttributeError):
+            Value().id = 5
+
+    def test_nested(self):
+        self.assertEqual(Value(1, Value(2)).id, Value(1, Value(2)).id)
+        self.assertNotEqual(Value(1, Value(2)).id, Value(1, Value(3)).id)
+        self.assertEqual(identity.get_content_id(Value(3)), Value(3).id)
+        self.assertIsNone(identity.get_content_id(object()))
+
+    def test_unsupported_type(self):
+        # No id and no to_dict(): its repr() may hold a memory address
+        with self.assertRaises(TypeError):
+            identity.content_id('a', object())
+        with self.assertRaises(TypeError):
+            Value(1, object()).id
+
+class FakeComponent(object):
+    def __init__(self, _guid):
+        self.InstanceGuid = _guid
+
+class FakeGhenv(object):
+    def __init__(self, _guid):
+        self.Component = FakeComponent(_guid)
+
+class Test_component_id(unittest.TestCase):
+    def test_component_id(self):
+        ghenv = FakeGhenv('0f8e6d2c-5a1b-4c3d-9e7f-112233445566')
+        self.assertEqual(identity.component_id(ghenv, 'Vent', 'Sys 1'), identity.component_id(ghenv, 'Vent', 'Sys 1'))
+        self.assertNotEqual(identity.component_id(ghenv, 'Vent', 'Sys 1'), identity.component_id(ghenv, 'Vent', 'Sys 2'))
+        self.assertNotEqual(identity.component_id(ghenv, 'Vent', 'Sys 1'),
+                            identity.component_id(FakeGhenv('another-guid'), 'Vent', 'Sys 1'))
+
+        # No Grasshopper (ie: headless): just the parts
+        self.assertEqual(identity.component_id(None, 'Vent', 'Sys 1'), identity.content_id(None, 'Vent', 'Sys 1'))
+
+class Test_InternTable(unittest.TestCase):
+    def test_interned(self):
+        table = identity.InternTable()
+        first = Value(1, 'x')
+
+        self.assertIs(table.interned(first), first)
+        self.assertIs(table.interned(Value(1, 'x')), first)
+        self.assertIsNot(table.interned(Value(2, 'x')), first)
+
+        # Anything without a content id is left alone
+        other = object()
+        self.assertIs(table.interned(other), other)
+
+    def test_changed_after_interning(self):
+        table = identity.InternTable()
+        first = table.interned(Value(1, 'x'))
+        first.a = 5
+
+        second = Value(1, 'x')
+        self.assertIs(table.interned(second), second)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import unittest
+import LBT2PH
+import LBT2PH.__versions__
+
+class Test_lazy_import(unittest.TestCase):
+    def setUp(self):
+        self.dev_mode = LBT2PH.__versions__.DEV_MODE
+        sys.modules.pop('LBT2PH.histogram', None)
+
+    def tearDown(self):
+        LBT2PH.__versions__.DEV_MODE = self.dev_mode
+
+    def test_imported_on_first_use(self):
+        histogram = LBT2PH.lazy_import('LBT2PH.histogram')
+        self.assertIsInstance(histogram, LBT2PH.LazyModule)
+        self.assertFalse(histogram.is_loaded)
+        self.assertNotIn('LBT2PH.histogram', sys.modules)
+
+        self.assertTrue(callable(histogram.Histogram))
+        self.assertTrue(histogram.is_loaded)
+        self.assertIn('LBT2PH.histogram', sys.modules)
+
+    def test_already_loaded(self):
+        import LBT2PH.histogram
+        self.assertIs(LBT2PH.lazy_import('LBT2PH.histogram'), LBT2PH.histogram)
+
+    def test_dev_reload(self):
+        LBT2PH.__versions__.DEV_MODE = True
+
+        # Nothing to reload yet, so it isn't imported just to be reloaded
+        histogram = LBT2PH.lazy_import('LBT2PH.histogram')
+        self.assertIs(LBT2PH.dev_reload(histogram), histogram)
+        self.assertFalse(histogram.is_loaded)
+
+        histogram.Histogram
+        self.assertIs(LBT2PH.dev_reload(histogram), histogram)
+        self.assertTrue(histogram.is_loaded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import unittest
+from messages import MessageLogger, HeadlessGhenv, add_message
+
+class Test_add_message(unittest.TestCase):
+    def test_headless(self):
+        logger = MessageLogger()
+        ghenv = HeadlessGhenv(logger)
+
+        add_message(ghenv, 'Warning', 'Too many surfaces')
+        add_message(ghenv, 'Error', 'No model')
+        add_message(ghenv, 'Remark', 'Using the defaults')
+
+        self.assertEqual(logger.warnings, ['Too many surfaces'])
+        self.assertEqual(logger.errors, ['No model'])
+        self.assertEqual(logger.messages[2], ('Remark', 'Using the defaults'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+try:
+    from honeybee.room import Room
+    from honeybee.model import Model
+except ImportError:
+    Room = Model = None
+
+if Model is not None:
+    from honeybee_energy.lib.programtypes import office_program
+    import pipeline
+    import conversion_cache
+    import messages
+    import spaces
+    import tb
+
+def box_model():
+    """One room with a window, and no PHPP user_data (so no PHPP geometry) """
+
+    room = Room.from_box('Room_1', 5, 4, 3)
+    room.display_name = 'Room 1'
+    room[1].apertures_by_ratio(0.4)
+    return Model('Test_Model', [room])
+
+@unittest.skipIf(Model is None, 'Needs honeybee-energy')
+class Test_convert_model(unittest.TestCase):
+    def test_convert_model(self):
+        # No Rhino / Grasshopper here: only the footprint is left out
+        logger = messages.MessageLogger()
+        result = pipeline.convert_model(box_model(), messages.HeadlessGhenv(logger))
+
+        self.assertIsNone(result.footprint.Footprint_surface)
+        self.assertEqual(logger.errors, [])
+
+        cells = { (r['worksheet'], r['range']): r['value'] for r in result.to_records() }
+        self.assertEqual(cells[('Windows', 'M24')], 'Room_1_Front_Glz0')
+        self.assertTrue(any(sheet == 'Areas' for sheet, _ in cells))
+        self.assertTrue(any(sheet == 'U-Values' for sheet, _ in cells))
+
+    def test_convert_model_with_spaces(self):
+        # The PHPP spaces' stored values convert without any Rhino surfaces
+        tfa = spaces.TFA_Surface(None, 'Room 1', {'Object Name': 'Kitchen', 'Room_Number': '101', 'TFA_Factor': 1.0}, _source='floor')
+        tfa.area_gross = 18.0
+        tfa._depth = 4.0
+        space = spaces.Space([spaces.Volume(tfa)])
+
+        model = box_model()
+        model.rooms[0].properties.energy.program_type = office_program
+        model.rooms[0].user_data = {'phpp': {'spaces': {space.id: space.to_dict()}}}
+
+        logger = messages.MessageLogger()
+        result = pipeline.convert_model(model, messages.HeadlessGhenv(logger))
+
+        cells = { (r['group'], r['range']): r['value'] for r in result.to_records() }
+        self.assertEqual(logger.errors, [])
+        self.assertEqual(cells[('TFA', 'V34')], 18.0)
+
+    def test_convert_model_with_thermal_bridges(self):
+        thermal_bridge = tb.PHPP_ThermalBridge('Corner', 3.0, 0.05)
+        model = box_model()
+        model.user_data = {'phpp': {'tb': {thermal_bridge.id: thermal_bridge.to_dict()}}}
+
+        logger = messages.MessageLogger()
+        result = pipeline.convert_model(model, messages.HeadlessGhenv(logger))
+
+        cells = { (r['group'], r['range']): r['value'] for r in result.to_records() }
+        self.assertEqual(logger.errors, [])
+        self.assertEqual(cells[('Thermal Bridges', 'L146')], 'Corner')
+        self.assertEqual(cells[('Thermal Bridges', 'X146')], 0.05)
+
+    def test_convert_model_cached(self):
+        model = box_model()
+        cache = conversion_cache.ConversionCache()
+        ghenv = messages.HeadlessGhenv(messages.MessageLogger())
+        first = pipeline.convert_model(model, ghenv, None, cache).to_records()
+        self.assertIn(('surface', model.rooms[0][2].identifier), cache)
+
+        # Same model: every exposed surface is reused
+        self.assertEqual(pipeline.convert_model(model, ghenv, None, cache).to_records(), first)
+        self.assertEqual(cache.misses, 0)
+
+        # Only the changed face is rebuilt. Its geometry didn't change, so nor does the footprint
+        model.rooms[0][2].user_data = {'phpp': {'Factor_Shading': 0.25}}
+        result = pipeline.convert_model(model, ghenv, None, cache)
+        self.assertEqual((cache.hits, cache.misses), (5 + 1, 1))
+
+        shading = [ r['value'] for r in result.to_records() if r['group'] == 'Areas' and r['range'].startswith('AJ') ]
+        self.assertEqual(shading, [0.5, 0.5, 0.25, 0.5, 0.5, 0.5])
+
+    def test_main(self):
+        folder = tempfile.mkdtemp()
+        try:
+            model_path = os.path.join(folder, 'model.hbjson')
+            output_path = os.path.join(folder, 'cells.json')
+            with open(model_path, 'w') as f:
+                json.dump(box_model().to_dict(), f)
+
+            self.assertEqual(pipeline.main([model_path, output_path, '--north', '90']), 0)
+
+            with open(output_path) as f:
+                self.assertTrue(json.load(f))
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import schedule_cache
+
+class Test_schedule_cache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        def loader(_identifier, _timestep):
+            self.calls.append( (_identifier, _timestep) )
+            if _identifier == 'missing':
+                return None
+            return [0.5, 1.0, 0.0, 0.5] * _timestep
+        self.cache = schedule_cache.ScheduleCache(loader, _max_size=2)
+
+    def test_expanded_once(self):
+        a = self.cache.get('Occ')
+        b = self.cache.get('Occ')
+
+        self.assertIs(a, b)
+        self.assertEqual(self.calls, [('Occ', 1)])
+        self.assertEqual(a.average, 0.5)
+
+    def test_least_recently_used_dropped(self):
+        self.cache.get('A')
+        self.cache.get('B')
+        self.cache.get('A')
+        self.cache.get('C')
+
+        self.assertIn(('A', 1), self.cache)
+        self.assertNotIn(('B', 1), self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_missing_schedule(self):
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_key(self):
+        # ie: keyed by the schedule's contents, so an edited schedule is expanded again
+        schedule = {'id': 'Occ', 'values': [1.0]}
+        cache = schedule_cache.ScheduleCache(lambda _sched, _timestep: _sched['values'],
+            _key=lambda _sched: (_sched['id'], tuple(_sched['values'])))
+
+        self.assertEqual(list(cache.get(schedule).values), [1.0])
+        self.assertIs(cache.get(dict(schedule)), cache.get(schedule))
+
+        schedule['values'] = [0.5]
+        self.assertEqual(list(cache.get(schedule).values), [0.5])
+        self.assertEqual(cache.get(schedule).identifier, ('Occ', (0.5,)))
+
+    def test_reduction_only_run_once(self):
+        data = self.cache.get('Occ')
+        runs = []
+        def reduction(values):
+            runs.append(1)
+            return max(values)
+
+        self.assertEqual(data.reduce('max', reduction), 1.0)
+        self.assertEqual(data.reduce('max', reduction), 1.0)
+        self.assertEqual(len(runs), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import math
+import unittest
+from collections import namedtuple
+import shading_matrix
+
+Vec = namedtuple('Vec', ['x', 'y', 'z'])
+
+def original_calc(_int_matrix, _angles, _total_sky_rad, _face_areas):
+    # The plain per-point math, patch by patch
+    results = []
+    for int_vals, angs, area in zip(_int_matrix, _angles, _face_areas):
+        pt_rel = (ival * math.cos(ang) for ival, ang in zip(int_vals, angs))
+        results.append( sum(r * w for r, w in zip(pt_rel, _total_sky_rad)) * area )
+    return results
+
+class Test_shading_matrix(unittest.TestCase):
+    def setUp(self):
+        self.dome = [Vec(0, 0, 1), Vec(1, 0, 0), Vec(0, 1, 0)]
+        self.int_matrix = [[1, 0, 1], [1, 1, 1]]
+        self.angles = [[0.2, 1.1, 0.7], [0.5, 0.3, 1.4]]
+        self.face_areas = [0.25, 0.5]
+
+    def test_same_dome_is_shared(self):
+        seasons = [('Winter', self.dome, [1.0, 2.0, 3.0]), ('Summer', list(self.dome), [4.0, 5.0, 6.0])]
+        sky_vecs, slices = shading_matrix.share_sky_domes(seasons)
+
+        self.assertEqual(len(sky_vecs), 3)
+        self.assertEqual(slices['Winter'], slices['Summer'])
+
+    def test_different_domes_are_stacked(self):
+        rotated = [Vec(-v.y, v.x, v.z) for v in self.dome]
+        seasons = [('Winter', self.dome, [1.0, 2.0, 3.0]), ('Summer', rotated, [4.0, 5.0, 6.0])]
+        sky_vecs, slices = shading_matrix.share_sky_domes(seasons)
+
+        self.assertEqual(len(sky_vecs), 6)
+        self.assertEqual(slices, {'Winter': (0, 3), 'Summer': (3, 6)})
+
+    def test_seasonal_radiation_matches_original(self):
+        w_rad, s_rad = [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]
+        seasons = [('Winter', self.dome, w_rad), ('Summer', self.dome, s_rad)]
+        sky_vecs, slices = shading_matrix.share_sky_domes(seasons)
+        results = shading_matrix.seasonal_radiation(self.int_matrix, self.angles, seasons, slices, self.face_areas, _use_numpy=False)
+
+        self.assertEqual(results['Winter'], original_calc(self.int_matrix, self.angles, w_rad, self.face_areas))
+        self.assertEqual(results['Summer'], original_calc(self.int_matrix, self.angles, s_rad, self.face_areas))
+
+    def test_matrix_radiation(self):
+        matrix = shading_matrix.IntersectionMatrix.from_rows(self.int_matrix, self.angles)
+        rads = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        results = matrix.radiation(rads, self.face_areas, _use_numpy=False)
+
+        # Known values: sum( intersection * cos(angle) * sky patch rad ) * face area
+        expected = [[0.818648285, 1.649078484], [2.127329859, 4.653407775]]
+        for season, expected_season in zip(results, expected):
+            for a, b in zip(season, expected_season):
+                self.assertAlmostEqual(a, b, places=8)
+
+    @unittest.skipIf(shading_matrix.np is None, 'Needs numpy')
+    def test_matrix_numpy_matches_python(self):
+        matrix = shading_matrix.IntersectionMatrix.from_rows(self.int_matrix, self.angles)
+        rads = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        python_results = matrix.radiation(rads, self.face_areas, _use_numpy=False)
+        numpy_results = matrix.radiation(rads, self.face_areas)
+
+        self.assertEqual(python_results[0], original_calc(self.int_matrix, self.angles, rads[0], self.face_areas))
+        for python_season, numpy_season in zip(python_results, numpy_results):
+            for a, b in zip(python_season, numpy_season):
+                self.assertAlmostEqual(a, b)
+
+    def test_unshaded_radiation(self):
+        # A south-facing window: only the patches in front of it count
+        dome = [Vec(0, 0, 1), Vec(0, -1, 0), Vec(0, 1, 0), Vec(0, -0.6, 0.8)]
+        rad = [10.0, 20.0, 30.0, 40.0]
+        normals = [Vec(0, -1, 0), Vec(0, -1, 0)]
+        results = shading_matrix.unshaded_radiation(normals, [('Winter', dome, rad)], [0.5, 2.0])
+
+        self.assertAlmostEqual(results['Winter'][0], (20.0 + 40.0 * 0.6) * 0.5)
+        self.assertAlmostEqual(results['Winter'][1], (20.0 + 40.0 * 0.6) * 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sheet_block
+import xl_write
+
+class FakeXlObj:
+    """Stands in for to_excel.PHPP_XL_Obj """
+    def __init__(self, _sheet, _range, _value):
+        self.Worksheet, self.Range, self.Value = _sheet, _range, _value
+    def getWorksheet(self, _unit='SI'):
+        return sheet_block.worksheet_name(self.Worksheet, _unit)
+    @classmethod
+    def getValues(cls, _objs, _unit='SI'):
+        return [ obj.Value for obj in _objs ]
+
+class Test_SheetBlock(unittest.TestCase):
+    def setUp(self):
+        self.block = sheet_block.SheetBlock('Areas', 41, ['L', 'M', ('V', 'M2', 'FT2'), 'AC'])
+        self.block.add_row('Wall', 8, 10.0, 'Ext Wall')
+        self.block.add_row('Roof', 10, 2.0, 'Roof')
+
+    def test_cells(self):
+        cells = list(self.block.cells())
+        self.assertEqual(len(cells), self.block.cell_count)
+        self.assertEqual(cells[:4], [('Areas', 'L41', 'Wall'), ('Areas', 'M41', 8),
+                                     ('Areas', 'V41', 10.0), ('Areas', 'AC41', 'Ext Wall')])
+        self.assertEqual(cells[-1], ('Areas', 'AC42', 'Roof'))
+
+        ip_area = [ value for _, address, value in self.block.cells('IP') if address == 'V42' ][0]
+        self.assertAlmostEqual(ip_area, 21.52782084)
+
+    def test_bad_row(self):
+        with self.assertRaises(ValueError):
+            self.block.add_row('Floor', 9)
+
+    def test_write_blocks(self):
+        blocks = self.block.write_blocks()
+
+        self.assertEqual([ b.range_address for b in blocks ], ['L41:M42', 'V41:V42', 'AC41:AC42'])
+        self.assertEqual(blocks[0].values, [['Wall', 8], ['Roof', 10]])
+        self.assertEqual(sheet_block.SheetBlock('Areas', 41, ['L']).write_blocks(), [])
+
+    def test_same_cells_as_write_plan(self):
+        items = [ self.block, FakeXlObj('Areas', 'L19', 'Suspended Floor') ]
+        by_block = sheet_block.write_plan(items)
+        by_cell = xl_write.WritePlan.from_diff( list(sheet_block.iter_cells(items)) )
+
+        def cells(_plan):
+            found = {}
+            for block in _plan.blocks:
+                for r, row in enumerate(block.values):
+                    for c, value in enumerate(row):
+                        found[(block.worksheet, block.first_row + r, block.first_col + c)] = value
+            return found
+
+        self.assertEqual(cells(by_block), cells(by_cell))
+        self.assertEqual(by_block.num_cells, 9)
+
+    def test_mixed_items(self):
+        items = [ FakeXlObj('U-Values', 'M12', 1), self.block, FakeXlObj('Areas', 'L19', 'x') ]
+
+        cells = list(sheet_block.iter_cells(items, 'IP'))
+        self.assertEqual(cells[0], ('R-Values', 'M12', 1))
+        self.assertEqual(cells[-1], ('Areas', 'L19', 'x'))
+        self.assertEqual(sheet_block.count_cells(items), 10)
+        self.assertEqual(sheet_block.count_rows(items), 2)
+
+if __name__ == '__main__':
+    unittest.main()
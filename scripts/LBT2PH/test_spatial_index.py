@@ -0,0 +1,32 @@
+import unittest
+import spatial_index
+
+class Test_spatial_index(unittest.TestCase):
+    def test_grid_point_query(self):
+        # A row of 10 rooms, 5m x 5m x 3m each, plus a 2nd floor over the first one
+        boxes = {i: (i * 5.0, 0.0, 0.0, i * 5.0 + 5.0, 5.0, 3.0) for i in range(10)}
+        boxes[10] = (0.0, 0.0, 3.0, 5.0, 5.0, 6.0)
+        index = spatial_index.GridIndex.from_boxes(boxes)
+
+        self.assertEqual(index.query_point(12.0, 2.0, 0.1), [2])
+        self.assertEqual(index.query_point(2.0, 2.0, 3.1), [10])
+        self.assertEqual(index.query_point(100.0, 2.0, 0.1), [])
+
+    def test_grid_box_query(self):
+        boxes = {i: (i * 5.0, 0.0, 0.0, i * 5.0 + 5.0, 5.0, 3.0) for i in range(10)}
+        index = spatial_index.GridIndex.from_boxes(boxes)
+
+        self.assertEqual(index.query_box((9.0, 1.0, 0.0, 11.0, 2.0, 0.0)), set([1, 2]))
+
+    def test_union_find_groups(self):
+        groups = spatial_index.UnionFind(range(6))
+        groups.union(0, 2)
+        groups.union(4, 2)
+        groups.union(3, 5)
+
+        self.assertEqual(groups.find(0), groups.find(4))
+        self.assertNotEqual(groups.find(0), groups.find(1))
+        self.assertEqual(groups.groups(), [[0, 2, 4], [1], [3, 5]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from surface_index import SurfaceIndex
+
+class _Surface:
+    def __init__(self, _identifier):
+        self.identifier = _identifier
+
+class Test_SurfaceIndex(unittest.TestCase):
+    def test_lookup(self):
+        wall, roof = _Surface('wall'), _Surface('roof')
+        index = SurfaceIndex([wall, roof])
+        index.include(roof)
+
+        self.assertIs(index.get('wall'), wall)
+        self.assertIn('wall', index)
+        self.assertNotIn('floor', index)
+        self.assertIsNone(index.get('floor'))
+        self.assertFalse(index.is_included('wall'))
+        self.assertTrue(index.is_included('roof'))
+        self.assertEqual(len(index), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+from collections import namedtuple
+from surface_orientation import SurfaceOrientations, angle_from_north, angle_from_horiz
+
+Vec = namedtuple('Vec', ['x', 'y', 'z'])
+RhinoVec = namedtuple('RhinoVec', ['X', 'Y'])
+Geometry = namedtuple('Geometry', ['centroid', 'vertices'])
+Face = namedtuple('Face', ['normal', 'area', 'geometry'])
+
+def face(_normal, _area=10.0, _centroid=(0, 0, 0)):
+    vertices = [Vec(0, 0, 0), Vec(1, 0, 0), Vec(1, 1, 0)]
+    return Face(Vec(*_normal), _area, Geometry(Vec(*_centroid), vertices))
+
+class Test_angles(unittest.TestCase):
+    def test_angle_from_north(self):
+        self.assertAlmostEqual(angle_from_north(0, 1, 0, 1), 0)
+        self.assertAlmostEqual(angle_from_north(1, 0, 0, 1), 90)
+        self.assertAlmostEqual(angle_from_north(0, -1, 0, 1), 180)
+        self.assertAlmostEqual(angle_from_north(-1, 0, 0, 1), 270)
+
+        # North pointing +X: a +X normal is now facing North
+        self.assertAlmostEqual(angle_from_north(1, 0, 1, 0), 0)
+
+    def test_angle_from_horiz(self):
+        self.assertAlmostEqual(angle_from_horiz(0, 0, 1), 0)
+        self.assertAlmostEqual(angle_from_horiz(1, 0, 0), 90)
+        self.assertAlmostEqual(angle_from_horiz(0, 0, -2), 180)
+        self.assertAlmostEqual(angle_from_horiz(0, 1, 1), 45)
+        self.assertEqual(angle_from_horiz(0, 0, 0), 0)
+
+class Test_SurfaceOrientations(unittest.TestCase):
+    def test_columns_line_up(self):
+        faces = [face((0, -1, 0), 12.5, (1, 2, 3)), face((0, 0, 1), 40.0), face((0, 0, -1), 40.0)]
+        orientations = SurfaceOrientations.from_faces(faces, Vec(0, 1, 0))
+
+        self.assertEqual(len(orientations), 3)
+        self.assertEqual(list(orientations.area), [12.5, 40.0, 40.0])
+        self.assertEqual([round(a) for a in orientations.azimuth][0], 180)
+        self.assertEqual([round(a) for a in orientations.tilt], [90, 0, 180])
+        self.assertEqual(orientations.normal(0), (0, -1, 0))
+        self.assertEqual(orientations.centroid(0), (1, 2, 3))
+        self.assertEqual(orientations.vertices[1], ((0, 0, 0), (1, 0, 0), (1, 1, 0)))
+
+        self.assertEqual(orientations.add_face(face((1, 0, 0))), 3)
+        self.assertAlmostEqual(orientations.azimuth[3], 90)
+
+    def test_north(self):
+        east_wall = face((1, 0, 0))
+
+        self.assertAlmostEqual(SurfaceOrientations.from_faces([east_wall]).azimuth[0], 90)
+        self.assertAlmostEqual(SurfaceOrientations.from_faces([east_wall], RhinoVec(1, 0)).azimuth[0], 0)
+
+        # An angle: counter-clockwise from +Y, so 90 points North at -X
+        orientations = SurfaceOrientations(90)
+        self.assertAlmostEqual(orientations.north_x, -1)
+        self.assertAlmostEqual(orientations.north_y, 0)
+
+if __name__ == '__main__':
+    unittest.main()
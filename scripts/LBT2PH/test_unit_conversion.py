@@ -0,0 +1,27 @@
+import unittest
+import unit_conversion
+
+class Test_unit_conversion(unittest.TestCase):
+    def test_phpp_xl_converters(self):
+        registry = unit_conversion.PHPP_XL_CONVERTERS
+
+        self.assertAlmostEqual(registry.convert(1.0, 'M', 'FT'), 3.280839895)
+        self.assertAlmostEqual(registry.convert(20, 'C', 'F'), 68.0)
+        self.assertAlmostEqual(registry.convert(0.2, 'W/M2K', 'HR-FT2-F/BTU'), 5.678264134 / 0.2)
+        self.assertEqual(registry.convert('24', 'M', 'SI'), 24)
+        self.assertEqual(registry.convert('=SUM(A1:A3)', 'M', 'FT'), '=SUM(A1:A3)')
+        self.assertEqual(registry.convert(0, 'W/M2K', 'HR-FT2-F/BTU'), 0)
+        self.assertEqual(registry.convert(5, 'NOT A UNIT', 'SI'), 5)
+
+    def test_column(self):
+        registry = unit_conversion.PHPP_XL_CONVERTERS
+        values = [1.0, '2', None, 'text']
+        self.assertEqual(registry.convert_column(values, 'M2', 'FT2'),
+                         [registry.convert(v, 'M2', 'FT2') for v in values])
+
+    def test_metric_template(self):
+        registry = unit_conversion.ConversionRegistry({'C': {'F': '-32.0)*(5.0/9.0'}}, '({}{})')
+        self.assertAlmostEqual(registry.convert(212, 'C', 'F'), 100.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import variant_table
+import worker_pool
+
+class Test_variant_table(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_read_table(self):
+        path = os.path.join(self.tmp, 'variants.csv')
+        with open(path, 'w') as f:
+            f.write('variant,construction:Ext Wall,glazing:Default Glazing,vent_unit,n50,cell:Verification!R78\n')
+            f.write('Base,,,,,\n')
+            f.write('Wall R40, Ext Wall R40 ,,,,\n')
+            f.write('Triple,,Triple Low-e,Zehnder Q450,0.6,x\n')
+            f.write(',,,,,\n')
+
+        base, wall, triple = variant_table.read_variant_table(path)
+
+        self.assertEqual(base.name, 'Base')
+        self.assertFalse(base.changes_model)
+        self.assertEqual(base.cell_overrides, [])
+        self.assertEqual(wall.constructions, {'Ext Wall': 'Ext Wall R40'})
+        self.assertTrue(wall.changes_model)
+        self.assertEqual(triple.glazing, {'Default Glazing': 'Triple Low-e'})
+        self.assertEqual(triple.vent_unit, 'Zehnder Q450')
+        self.assertEqual(triple.cell_overrides, [('Ventilation', 'N27', 0.6), ('Verification', 'R78', 'x')])
+
+    def test_bad_tables(self):
+        with self.assertRaises(variant_table.VariantTableError):
+            variant_table.variants_from_rows([['variant', 'u_value'], ['A', '0.1']])
+        with self.assertRaises(variant_table.VariantTableError):
+            variant_table.variants_from_rows([['variant', 'n50'], ['A', 'tight']])
+        with self.assertRaises(variant_table.VariantTableError):
+            variant_table.variants_from_rows([['variant', 'n50'], ['A', '1'], ['A', '2']])
+
+    def test_apply_cell_overrides(self):
+        diff = [('Ventilation', 'N25', 0.07), ('Ventilation', 'N27', 1.2)]
+        new_diff = variant_table.apply_cell_overrides(diff, [('Ventilation', 'N27', 0.6), ('Areas', 'L41', 3)])
+
+        self.assertEqual(new_diff, [('Ventilation', 'N25', 0.07), ('Ventilation', 'N27', 0.6), ('Areas', 'L41', 3)])
+        self.assertEqual(diff[1], ('Ventilation', 'N27', 1.2))
+
+    def test_summary(self):
+        summary = variant_table.SweepSummary([('Heating Demand', 'Verification', 'I35')])
+        summary.add('Base', [14.2], 'Base.xlsx')
+        summary.add_error('Broken', 'No such construction')
+
+        self.assertEqual(summary.value('Base', 'Heating Demand'), 14.2)
+        self.assertEqual(summary.as_table(), [
+            ['variant', 'Heating Demand', 'status', 'file'],
+            ['Base', 14.2, 'OK', 'Base.xlsx'],
+            ['Broken', None, 'Error: No such construction', None]])
+
+        path = os.path.join(self.tmp, 'summary.csv')
+        summary.write_csv(path)
+        with open(path) as f:
+            self.assertEqual(f.read().splitlines()[1], 'Base,14.2,OK,Base.xlsx')
+
+class Test_worker_pool(unittest.TestCase):
+    def test_results_in_order(self):
+        threads = set()
+        def job(_item):
+            threads.add(threading.current_thread().name)
+            return _item * 2
+
+        self.assertEqual(worker_pool.run_pool(job, range(50), 4), [ i * 2 for i in range(50) ])
+        self.assertEqual(worker_pool.run_pool(job, [], 4), [])
+
+    def test_errors(self):
+        done = []
+        def job(_item):
+            if _item in (3, 7):
+                raise ValueError('bad item')
+            done.append(_item)
+
+        for workers in (1, 4):
+            del done[:]
+            with self.assertRaises(worker_pool.WorkerError) as context:
+                worker_pool.run_pool(job, range(10), workers)
+            self.assertEqual(context.exception.item, 3)
+            self.assertEqual(sorted(done), [0, 1, 2, 4, 5, 6, 8, 9])
+
+if __name__ == '__main__':
+    unittest.main()
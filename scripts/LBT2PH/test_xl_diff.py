@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import xl_diff
+
+class Test_xl_diff(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.workbook = os.path.join(self.dir, 'phpp.xlsx')
+        with open(self.workbook, 'wb') as f:
+            f.write(b'workbook')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_diff_across_sessions(self):
+        items = [('Areas', 'L41', 'Wall'), ('Areas', 'V41', 12.5), ('Windows', 'M24', 'Win')]
+
+        store = xl_diff.DiffStore.load(self.workbook)
+        self.assertEqual(len(store.diff(items)), 3)
+        store.commit()
+
+        # New session, one changed value and one removed item
+        store = xl_diff.DiffStore.load(self.workbook)
+        new_items = [('Areas', 'L41', 'Wall'), ('Areas', 'V41', 14.0)]
+        self.assertEqual(sorted(store.diff(new_items)),
+                         [('Areas', 'V41', 14.0), ('Windows', 'M24', '')])
+
+    def test_workbook_changed(self):
+        items = [('Areas', 'L41', 'Wall')]
+        store = xl_diff.DiffStore.load(self.workbook)
+        store.diff(items)
+        store.commit()
+
+        with open(self.workbook, 'wb') as f:
+            f.write(b'edited by hand')
+
+        store = xl_diff.DiffStore.load(self.workbook)
+        self.assertEqual(store.diff(items), items)
+
+    def test_not_written(self):
+        store = xl_diff.DiffStore.load(self.workbook)
+        store.diff([('Areas', 'L41', 'Wall'), ('Areas', 'V41', 12.5), ('Windows', 'M24', 'Win')])
+        store.commit()
+
+        # The new value for V41, the clear of M24 and the new 'Nope' sheet all fail
+        items = [('Areas', 'L41', 'Roof'), ('Areas', 'V41', 14.0), ('Nope', 'A1', 1)]
+        self.assertEqual(len(store.diff(items)), 4)
+        store.commit(_not_written=[('Areas', 'V41'), ('Windows', 'M24'), ('Nope', 'A1')])
+
+        # Only those are tried again
+        store = xl_diff.DiffStore.load(self.workbook)
+        self.assertEqual(sorted(store.diff(items)),
+                         [('Areas', 'V41', 14.0), ('Nope', 'A1', 1), ('Windows', 'M24', '')])
+
+    def test_original_values(self):
+        # Anything not json-native is only stored as a string, it is still written as-is
+        value = Decimal('1.5')
+        store = xl_diff.DiffStore.load(self.workbook)
+        self.assertIs(store.diff([('Areas', 'V41', value)])[0][2], value)
+        store.commit()
+
+        store = xl_diff.DiffStore.load(self.workbook)
+        self.assertEqual(store.diff([('Areas', 'V41', value)]), [])
+
+        new_value = Decimal('2.5')
+        self.assertIs(store.diff([('Areas', 'V41', new_value)])[0][2], new_value)
+
+if __name__ == '__main__':
+    unittest.main()
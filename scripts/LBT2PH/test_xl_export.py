@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+import xl_export
+import messages
+
+class FakeXlObj:
+    """Stands in for to_excel.PHPP_XL_Obj """
+    def __init__(self, _sheet, _range, _value):
+        self.Worksheet, self.Range, self.Value = _sheet, _range, _value
+    def getWorksheet(self, _unit='SI'):
+        return self.Worksheet
+    @classmethod
+    def getValues(cls, _objs, _unit='SI'):
+        return [ obj.Value for obj in _objs ]
+
+class Test_xl_export(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        groups = OrderedDict()
+        groups['Areas'] = [ FakeXlObj('Areas', 'L41', 12.5), FakeXlObj('Areas', 'M41', u'Wall Süd') ]
+        groups['Empty'] = []
+        groups['Windows'] = [ FakeXlObj('Windows', 'E24', '007'), FakeXlObj('Windows', 'F24', None),
+                              FakeXlObj('Windows', 'G24', 3), FakeXlObj('Windows', 'H24', '=G24') ]
+        self.records = xl_export.xl_objects_to_records(groups)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_records(self):
+        self.assertEqual(len(self.records), 6)
+        self.assertEqual(self.records[0], {'group':'Areas', 'worksheet':'Areas', 'range':'L41', 'value':12.5})
+        self.assertEqual(xl_export.records_to_diff(self.records)[-1], ('Windows', 'H24', '=G24'))
+
+    def test_json_round_trip(self):
+        path = os.path.join(self.tmp, 'cells.json')
+        xl_export.write_records(self.records, path)
+        self.assertEqual(xl_export.read_records(path), self.records)
+
+    def test_csv_round_trip(self):
+        path = os.path.join(self.tmp, 'cells.csv')
+        xl_export.write_records(self.records, path)
+        self.assertEqual(xl_export.read_records(path), self.records)
+
+    def test_headless_ghenv_logger(self):
+        logger = messages.MessageLogger()
+        ghenv = messages.HeadlessGhenv(logger)
+        ghenv.Component.AddRuntimeMessage('GH_RuntimeMessageLevel.Warning', 'Check the TFA')
+        ghenv.Component.AddRuntimeMessage('Error', 'No Zones')
+
+        self.assertEqual(logger.warnings, ['Check the TFA'])
+        self.assertEqual(logger.errors, ['No Zones'])
+
+if __name__ == '__main__':
+    unittest.main()
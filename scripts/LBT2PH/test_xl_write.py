@@ -0,0 +1,39 @@
+import unittest
+import xl_write
+
+class Test_xl_write(unittest.TestCase):
+    def test_column_letters(self):
+        self.assertEqual(xl_write.column_to_number('AC'), 29)
+        self.assertEqual(xl_write.number_to_column(29), 'AC')
+        self.assertEqual(xl_write.split_address('$IE15'), (15, xl_write.column_to_number('IE')))
+        self.assertIsNone(xl_write.split_address('A1:B2'))
+
+    def test_blocks(self):
+        diff = []
+        for row in range(41, 51):
+            diff.append(('Areas', 'L{}'.format(row), 'name {}'.format(row)))
+            diff.append(('Areas', 'M{}'.format(row), 1))
+            diff.append(('Areas', 'V{}'.format(row), 12.5))
+        diff.append(('Areas', 'L19', 'Suspended Floor'))
+        diff.append(('Windows', 'F24', 'a'))
+
+        plan = xl_write.WritePlan.from_diff(diff)
+        addresses = sorted((b.worksheet, b.range_address) for b in plan.blocks)
+
+        self.assertEqual(addresses, [('Areas', 'L19'), ('Areas', 'L41:M50'),
+                                     ('Areas', 'V41:V50'), ('Windows', 'F24')])
+        self.assertEqual(plan.num_cells, 32)
+        self.assertEqual(plan.com_calls(), 8)
+        self.assertEqual(plan.com_calls_per_cell(), 64)
+
+    def test_addresses(self):
+        plan = xl_write.WritePlan.from_diff([('Areas', 'L41', 1), ('Areas', 'M41', 2),
+                                             ('Areas', 'L42', 3), ('Areas', 'M42', 4)])
+        self.assertEqual(plan.blocks[0].addresses(), ['L41', 'M41', 'L42', 'M42'])
+
+    def test_last_value_wins(self):
+        plan = xl_write.WritePlan.from_diff([('Areas', 'A1', 1), ('Areas', 'A1', 2)])
+        self.assertEqual(plan.blocks[0].values, [[2]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import xlsx_writer
+
+CONTENT_TYPES = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'\
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'\
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'\
+    '<Override PartName="/xl/calcChain.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/>'\
+    '</Types>'
+WORKBOOK = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'\
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '\
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'\
+    '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/><sheet name="Areas" sheetId="2" r:id="rId2"/></sheets>'\
+    '<calcPr calcId="191029"/></workbook>'
+WORKBOOK_RELS = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'\
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'\
+    '<Relationship Id="rId1" Type="worksheet" Target="worksheets/sheet1.xml"/>'\
+    '<Relationship Id="rId2" Type="worksheet" Target="worksheets/sheet2.xml"/>'\
+    '<Relationship Id="rId3" Type="calcChain" Target="calcChain.xml"/>'\
+    '</Relationships>'
+SHARED_STRINGS = '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><si><t>PHPP 9.6 IP</t></si></sst>'
+SHEET_DATA = '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'\
+    '<row r="3"><c r="B3" t="s"><v>0</v></c></row></sheetData></worksheet>'
+SHEET_AREAS = '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'\
+    '<row r="19" spans="1:30"><c r="L19" s="4"/><c r="V19"><f>SUM(V41:V50)</f><v>12</v></c></row>'\
+    '<row r="41"><c r="L41" s="2" t="s"><v>0</v></c><c r="M41" s="3"><f t="shared" ref="M41:M50" si="0">1+1</f><v>2</v></c></row>'\
+    '</sheetData></worksheet>'
+
+class Test_xlsx_writer(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.dir, 'source.xlsx')
+        with zipfile.ZipFile(self.source, 'w') as zf:
+            zf.writestr('[Content_Types].xml', CONTENT_TYPES)
+            zf.writestr('xl/workbook.xml', WORKBOOK)
+            zf.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+            zf.writestr('xl/sharedStrings.xml', SHARED_STRINGS)
+            zf.writestr('xl/calcChain.xml', '<calcChain/>')
+            zf.writestr('xl/worksheets/sheet1.xml', SHEET_DATA)
+            zf.writestr('xl/worksheets/sheet2.xml', SHEET_AREAS)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_read(self):
+        workbook = xlsx_writer.XlsxWorkbook(self.source)
+        self.assertEqual(sorted(workbook.sheet_names), ['Areas', 'Data'])
+        self.assertEqual(workbook.unit_type(), 'IP')
+        self.assertEqual(workbook.read_value('Areas', 'V19'), 12.0)
+
+    def test_write(self):
+        target = os.path.join(self.dir, 'out', 'target.xlsx')
+        diff = [('Areas', 'L19', 'Suspended Floor'),
+                ('Areas', 'V19', 40.5),
+                ('Areas', 'M41', 3),
+                ('Areas', 'C30', '=A1 & "x"'),
+                ('Areas', 'A41', '24'),
+                ('Nope', 'A1', 1)]
+        skipped = xlsx_writer.XlsxWorkbook(self.source).write(diff, target)
+        self.assertEqual(sorted(skipped), [('Areas', 'M41'), ('Nope', 'A1')])
+
+        workbook = xlsx_writer.XlsxWorkbook(target)
+        self.assertEqual(workbook.read_value('Areas', 'L19'), 'Suspended Floor')
+        self.assertEqual(workbook.read_value('Areas', 'V19'), 40.5)
+        self.assertEqual(workbook.read_value('Areas', 'A41'), 24.0)
+
+        with zipfile.ZipFile(target) as zf:
+            sheet = zf.read('xl/worksheets/sheet2.xml').decode('utf-8')
+            self.assertIn('<c r="L19" s="4" t="inlineStr">', sheet)
+            self.assertIn('<row r="30"><c r="C30"><f>A1 &amp; "x"</f></c></row>', sheet)
+            self.assertIn('<f t="shared" ref="M41:M50" si="0">1+1</f>', sheet)
+            self.assertIn('fullCalcOnLoad="1"', zf.read('xl/workbook.xml').decode('utf-8'))
+            self.assertNotIn('xl/calcChain.xml', zf.namelist())
+            self.assertNotIn('calcChain', zf.read('[Content_Types].xml').decode('utf-8'))
+
+    def test_write_over_source(self):
+        skipped = xlsx_writer.XlsxWorkbook(self.source).write([('Areas', 'V19', 7)], self.source)
+
+        self.assertEqual(skipped, [])
+        self.assertEqual(xlsx_writer.XlsxWorkbook(self.source).read_value('Areas', 'V19'), 7.0)
+        self.assertFalse(os.path.exists(self.source + '.tmp'))
+
+    def test_non_finite_values(self):
+        target = os.path.join(self.dir, 'target.xlsx')
+        diff = [('Areas', 'V19', float('nan')),
+                ('Areas', 'L19', float('inf')),
+                ('Areas', 'A41', '1e999'),
+                ('Areas', 'B41', 2.5)]
+        skipped = xlsx_writer.XlsxWorkbook(self.source).write(diff, target)
+
+        self.assertEqual(sorted(skipped), [('Areas', 'A41'), ('Areas', 'L19'), ('Areas', 'V19')])
+        workbook = xlsx_writer.XlsxWorkbook(target)
+        self.assertEqual(workbook.read_value('Areas', 'V19'), 12.0)
+        self.assertEqual(workbook.read_value('Areas', 'B41'), 2.5)
+        with zipfile.ZipFile(target) as zf:
+            sheet = zf.read('xl/worksheets/sheet2.xml').decode('utf-8')
+            self.assertNotIn('nan', sheet)
+            self.assertNotIn('inf<', sheet)
+
+class Test_SheetPatch(unittest.TestCase):
+    def patch(self, _xml, _chunk_size):
+        updates = {(19, 12): u'S\u00fcd', (30, 3): 1.5, (41, 13): 3, (42, 1): 'x'}
+        target = io.BytesIO()
+        xlsx_writer._SheetPatch(updates).apply_stream(io.BytesIO(_xml.encode('utf-8')), target, _chunk_size)
+        return target.getvalue().decode('utf-8')
+
+    def test_chunk_size(self):
+        # Tags, rows and multi-byte characters split across the chunks give the same result
+        xml = SHEET_AREAS.replace('</sheetData>', u'<row r="42"/></sheetData><rowBreaks count="0"/><t>\u00c4</t>')
+        expected = self.patch(xml, 1024 * 1024)
+        self.assertIn(u'<t xml:space="preserve">S\u00fcd</t>', expected)
+        self.assertIn(u'<row r="42"><c r="A42" t="inlineStr">', expected)
+        self.assertTrue(expected.endswith(u'</sheetData><rowBreaks count="0"/><t>\u00c4</t></worksheet>'))
+
+        for chunk_size in (1, 2, 3, 7, 64):
+            self.assertEqual(self.patch(xml, chunk_size), expected)
+
+    def test_empty_sheet_data(self):
+        xml = u'<worksheet><sheetData/><pageMargins/></worksheet>'
+        self.assertEqual(self.patch(xml, 5),
+            u'<worksheet><sheetData><row r="19"><c r="L19" t="inlineStr"><is><t xml:space="preserve">S\u00fcd</t></is></c></row>'
+            u'<row r="30"><c r="C30"><v>1.5</v></c></row><row r="41"><c r="M41"><v>3</v></c></row>'
+            u'<row r="42"><c r="A42" t="inlineStr"><is><t xml:space="preserve">x</t></is></c></row>'
+            u'</sheetData><pageMargins/></worksheet>')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,40 +1,31 @@
 import statistics
 from collections import defaultdict
 
-import Grasshopper.Kernel as ghK
-from Grasshopper import DataTree
-from Grasshopper.Kernel.Data import GH_Path
-from System import Object
-
 import LBT2PH
 import LBT2PH.dhw
+import LBT2PH.unit_conversion
+import LBT2PH.sheet_block
+import LBT2PH.messages
+
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.dhw )
+LBT2PH.dev_reload( LBT2PH.unit_conversion )
+LBT2PH.dev_reload( LBT2PH.sheet_block )
+LBT2PH.dev_reload( LBT2PH.messages )
 
-reload( LBT2PH )
-reload( LBT2PH.dhw )
+from LBT2PH.sheet_block import SheetBlock
 
-class PHPP_XL_Obj:
+class PHPP_XL_Obj(object):
     """ A holder for an Excel writable datapoint with a worksheet, range and value """
     
+    # There are many thousands of these on a large model, no need for a __dict__ on each
+    __slots__ = ('Worksheet', 'Range', 'Value', 'Unit_SI', 'Unit_IP')
+    
     # {Unit You have: {Unit you Want}, {...}, ...}
-    conversionSchema = {
-            'C'    : {'SI':'*1', 'C':'*1', 'F':'*1.8+32'},
-            'LITER': {'SI':'*1', 'LITER':'*1', 'GALLON':'*0.264172'},
-            'MM'   : {'SI':'*1', 'MM':'*1', 'FT':'*0.00328084', 'IN':'*0.0394'},
-            'M'    : {'SI':'*1', 'M':'*1', 'FT':'*3.280839895', 'IN':'*39.3701'},
-            'M/DAY': {'SI':'*1', 'M/DAY':'*1', 'FT/DAY':'*3.280839895'},
-            'M2'   : {'SI':'*1', 'M2':'*1', 'FT2':'*10.76391042'},
-            'M3'   : {'SI':'*1', 'M3':'*1', 'FT3':'*35.31466672'},
-            'M3/H' : {'SI':'*1', 'M3/H':'*1', 'CFM':'*0.588577779'},
-            'WH/M3': {'SI':'*1', 'WH/M3':'*1', 'W/CFM':'*1.699010796'},
-            'WH/KM2':{'SI':'*1', 'WH/KM2':'*1', 'BTU/FT2':'*0.176110159'},
-            'MJ/M3K':{'SI':'*1', 'MJ/M3K':'*1', 'BTU/FT3-F':'*14.91066014'},
-            'W/M2K': {'SI':'*1', 'W/M2K':'*1', 'BTU/HR-FT2-F':'*0.176110159','HR-FT2-F/BTU':'**-1*5.678264134' },
-            'M2K/W': {'SI':'*1', 'M2K/W':'*1', 'HR-FT2-F/BTU':'*5.678264134'},
-            'W/MK' : {'SI':'*1', 'W/MK':'*1', 'HR-FT2-F/BTU-IN':'**-1*0.144227909', 'BTU/HR-FT-F':'*0.577789236'},
-            'W/K'  : {'SI':'*1', 'W/K':'*1', 'BTU/HR-F':'*1.895633976'},
-            'KW'   : {'SI':'*1', 'KW':'*1','BTU/H':'*3412.141156', 'KBTU/H':'*3.412141156'},
-            'W/W'  : {'SI':'*1', 'W/W':'*1', 'BTU/HW':'*3.412141156'} # SEER
-            }
+    conversionSchema = LBT2PH.unit_conversion.PHPP_XL_SCHEMA
+    
+    # Each conversionSchema entry is compiled once, the first time it's used
+    converters = LBT2PH.unit_conversion.PHPP_XL_CONVERTERS
     
     def __init__(self, _shtNm, _rangeAddress, _val, _unitSI=None, _unitIP='SI'):
         """
@@ -52,16 +43,16 @@ class PHPP_XL_Obj:
         self.Unit_IP = _unitIP
     
     def getWorksheet(self, _units='SI'):
-        if _units == 'SI':
-            return self.Worksheet
-        
-        if self.Worksheet == 'U-Values':
-            return 'R-Values'
-        elif self.Worksheet == 'Additional Vent':
-            return 'Addl vent'
-        else:
-            return self.Worksheet
+        return LBT2PH.sheet_block.worksheet_name(self.Worksheet, _units)
     
+    def getTargetUnit(self, _targetUnit='SI'):
+        if _targetUnit == 'IP':
+            return self.Unit_IP
+        elif _targetUnit == 'SI':
+            return self.Unit_SI
+        else:
+            return _targetUnit
+
     def getValue(self, _targetUnit='SI'):
         """ Get the Item Value properly. Allows for unit conversion.
         
@@ -78,23 +69,38 @@ class PHPP_XL_Obj:
         if not self.Unit_SI:
             return self.Value
         
-        if _targetUnit == 'IP':
-            targetUnit = self.Unit_IP
-        elif _targetUnit == 'SI':
-            targetUnit = self.Unit_SI
-        else:
-            targetUnit = _targetUnit
+        return self.converters.convert(self.Value, self.Unit_SI, self.getTargetUnit(_targetUnit))
+    
+    @classmethod
+    def getValues(cls, _xl_objects, _targetUnit='SI'):
+        """ Get the Values for a whole list of PHPP_XL_Objs at once.
         
-        try:
-            schema = self.conversionSchema.get(self.Unit_SI, {'SI':1})
-            conversionFactor = schema.get(targetUnit, 1)
-
-            expression = str(self.Value)+str(conversionFactor)
-            result = eval( expression )
-
-            return result
-        except:
-            return self.Value
+        Objects are grouped by their units and each group is converted as a 
+        single 'column', rather than one-by-one. Same results as getValue()
+        
+        Args:
+            _xl_objects: (list) The PHPP_XL_Obj items
+            _targetUnit: (str) The unit to convert the values to. 'SI' or 'IP'
+        Returns:
+            (list) The values, in the same order as the objects
+        """
+        
+        values = [None] * len(_xl_objects)
+        columns = defaultdict(list)
+        
+        for i, obj in enumerate(_xl_objects):
+            if not obj.Unit_SI:
+                values[i] = obj.Value
+            else:
+                columns[(obj.Unit_SI, obj.getTargetUnit(_targetUnit))].append(i)
+        
+        for (unit_si, target_unit), indexes in columns.items():
+            column = [ _xl_objects[i].Value for i in indexes ]
+            converted = cls.converters.convert_column(column, unit_si, target_unit)
+            for i, value in zip(indexes, converted):
+                values[i] = value
+        
+        return values
     
     def __unicode__(self):
         return u"PHPP Obj | Worksheet: {self.Worksheet}  |  Cell: {self.Range}  |  Value: {self.Value}".format(self=self)
@@ -118,11 +124,11 @@ def include_rooms(_hb_rooms, _rooms_to_include, _rooms_to_exclude, _ghenv ):
             hb_room_names = [name for name in hb_room_names if name in _rooms_to_include]
         if _rooms_to_exclude:
             hb_room_names = [name for name in hb_room_names if name not in _rooms_to_exclude]
-        print('Inlcuding Zones {} in the Export').format(hb_room_names)
+        print('Inlcuding Zones {} in the Export'.format(hb_room_names))
     
     if not hb_room_names:
         msg = 'Error: No Zones inluced in the export?'
-        _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, msg)
+        LBT2PH.messages.add_message(_ghenv, 'Error', msg)
     
     return hb_room_names
 
@@ -176,7 +182,7 @@ def start_rows( _udIn, _ghenv ):
                 default_start_rows[worksheet.lstrip().rstrip()][startItem.lstrip().rstrip()] = newRowStart
         except:
             msg = "Couldn't read the udRowStarts_ input? Make sure it has dict keys separated by a comma and a semicolon before the value."
-            _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
         
         return default_start_rows
     else:
@@ -349,140 +355,102 @@ def build_components(_inputBranch):
     
     return winComponentsList
 
-def build_areas(_surfaces, _hb_room_names, _uValueUIDs):
-       
-    areasRowStart = 41
-    areaCount = 0
+def build_areas(_surface_index, _hb_room_names, _uValueUIDs):
+    
     uID_Count = 1
-    areasList = []
-    surfacesIncluded = []
+    areas = SheetBlock('Areas', 41, [
+        'L',                # Surface Name
+        'M',                # Surface Group Number
+        'P',                # Surface Quantity
+        ('V', 'M2', 'FT2'), # Surface Area (m2)
+        'AC',               # Assembly Type Name
+        'AG',               # Orientation Off North
+        'AH',               # Orientation Off Horizontal
+        'AJ',               # Shading Factor
+        'AK',               # Absorptivity
+        'AL',               # Emmissivity
+        ])
     
     print("Creating the 'Areas' Objects...")
-    for surface in _surfaces:
+    for surface in _surface_index.surfaces:
         if surface.HostZoneName not in _hb_room_names:
             continue
-
+        
         # Get the Surface Parameters
         nm = surface.Name
-        identifier = surface.identifier
-        groupNum = surface.GroupNum
-        quantity = 1
-        surfaceArea = surface.SurfaceArea
-        assemblyName = surface.AssemblyName.replace('_', ' ')  
-        angleFromNorth = surface.AngleFromNorth
-        angleFromHoriz = surface.AngleFromHoriz
-        shading = surface.Factor_Shading
-        abs = surface.Factor_Absorptivity
-        emmis = surface.Factor_Emissivity
-        assemblyName = _uValueUIDs.get( surface.AssemblyName )
-        
-        # Setup the Excel Address Locations
-        Address_Name = '{}{}'.format('L', areasRowStart + areaCount)
-        Address_GroupNum = '{}{}'.format('M', areasRowStart + areaCount)
-        Address_Quantity = '{}{}'.format('P', areasRowStart + areaCount)
-        Address_Area = '{}{}'.format('V', areasRowStart + areaCount)
-        Address_Assembly = '{}{}'.format('AC', areasRowStart + areaCount)
-        Address_AngleNorth = '{}{}'.format('AG', areasRowStart + areaCount)
-        Address_AngleHoriz = '{}{}'.format('AH', areasRowStart + areaCount)
-        Address_ShadingFac = '{}{}'.format('AJ', areasRowStart + areaCount)
-        Address_Abs = '{}{}'.format('AK', areasRowStart + areaCount)
-        Address_Emmis = '{}{}'.format('AL', areasRowStart + areaCount)
-        
-        areasList.append( PHPP_XL_Obj('Areas', Address_Name, nm))# Surface Name
-        areasList.append( PHPP_XL_Obj('Areas', Address_GroupNum, groupNum))# Surface Group Number
-        areasList.append( PHPP_XL_Obj('Areas', Address_Quantity, quantity))# Surface Quantity
-        areasList.append( PHPP_XL_Obj('Areas', Address_Area, surfaceArea, 'M2', 'FT2'))# Surface Area (m2)
-        areasList.append( PHPP_XL_Obj('Areas', Address_Assembly, assemblyName))# Assembly Type Name
-        areasList.append( PHPP_XL_Obj('Areas', Address_AngleNorth, angleFromNorth))# Orientation Off North
-        areasList.append( PHPP_XL_Obj('Areas', Address_AngleHoriz, angleFromHoriz))# Orientation Off Horizontal
-        areasList.append( PHPP_XL_Obj('Areas', Address_ShadingFac, shading))# Shading Factor
-        areasList.append( PHPP_XL_Obj('Areas', Address_Abs, abs))# Absorptivity
-        areasList.append( PHPP_XL_Obj('Areas', Address_Emmis, emmis))# Emmissivity
+        areas.add_row(
+            nm,
+            surface.GroupNum,
+            1,
+            surface.SurfaceArea,
+            _uValueUIDs.get( surface.AssemblyName ),
+            surface.AngleFromNorth,
+            surface.AngleFromHoriz,
+            surface.Factor_Shading,
+            surface.Factor_Absorptivity,
+            surface.Factor_Emissivity,
+            )
         
         # Add the PHPP UD Surface Name to the Surface Object
         setattr(surface, 'UD_Srfc_Name', '{:d}-{}'.format(uID_Count, nm) )
         
         # Keep track of which Surfaces are included in the output
-        surfacesIncluded.append(identifier)
+        _surface_index.include(surface)
         
         uID_Count += 1
-        areaCount += 1
     
-    areasList.append( PHPP_XL_Obj('Areas', 'L19', 'Suspended Floor') )
-    return areasList, surfacesIncluded
-
-def build_windows(_inputBranch, _surfacesIncluded, _srfcBranch):
-    windowsRowStart = 24
-    windowsCount = 0
-    winSurfacesList = []
+    return [ areas, PHPP_XL_Obj('Areas', 'L19', 'Suspended Floor') ]
+
+def build_windows(_inputBranch, _surface_index, _ghenv):
+    windows = SheetBlock('Windows', 24, [
+        'F',                # Variant Type
+        'L',                # Quantity
+        'M',                # Name
+        ('Q', 'M', 'FT'),   # Width
+        ('R', 'M', 'FT'),   # Height
+        'S',                # Host Name
+        'T',                # Glass UD Name
+        'U',                # Frame UD Name
+        'AA',               # Install Condition Left
+        'AB',               # Install Condition Right
+        'AC',               # Install Condition Bottom
+        'AD',               # Install Condition Top
+        ])
 
     print("Creating the 'Windows' Objects...")
     for window in _inputBranch:
         # for each Window Surface Object in the model....
-        # Get the window's basic params
-        # print '>>>', window
-        # import json
-        # print json.dumps(window.to_dict(), indent=4)
-        quant = window.quantity
-        nm = window.name
-        w = window.width
-        h = window.height
         host = window.host_surface
-        glassType = window.glazing
-        frameType = window.frame
-        glassTypeUD = getattr(window, 'UD_glass_Name')
-        frameTypeUD = getattr(window, 'UD_frame_Name')
-        variantType = getattr(window, 'variant_type', 'a')
-        Inst_L, Inst_R, Inst_B, Inst_T = window.installs
         
         # See if the Window should be included in the output
-        includeWindow = False
-        for eachSurfaceName in _surfacesIncluded:
-            if eachSurfaceName == host:
-                includeWindow = True
-                break
-            else:
-                includeWindow = False
-        
-        if includeWindow:
-            # Find the Window's Host Surface UD
-            for srfc in _srfcBranch:
-                if host == srfc.identifier:
-                    hostUD = srfc.UD_Srfc_Name
-           
-           # Get the Window Range Addresses
-            Address_varType = '{}{}'.format('F', windowsRowStart + windowsCount)
-            Address_winQuantity = '{}{}'.format('L', windowsRowStart + windowsCount)
-            Address_winName = '{}{}'.format('M', windowsRowStart + windowsCount)
-            Address_w = '{}{}'.format('Q', windowsRowStart + windowsCount)
-            Address_h = '{}{}'.format('R', windowsRowStart + windowsCount)
-            Address_hostName = '{}{}'.format('S', windowsRowStart + windowsCount)
-            Address_glassType = '{}{}'.format('T', windowsRowStart + windowsCount)
-            Address_frameType = '{}{}'.format('U', windowsRowStart + windowsCount)
-            Address_install_Left = '{}{}'.format('AA', windowsRowStart + windowsCount)
-            Address_install_Right = '{}{}'.format('AB', windowsRowStart + windowsCount)
-            Address_install_Bottom = '{}{}'.format('AC', windowsRowStart + windowsCount)
-            Address_install_Top = '{}{}'.format('AD', windowsRowStart + windowsCount)
-            
-            # Create the PHPP Window Object
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_varType, variantType)) # Quantity
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winQuantity, quant)) # Quantity
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winName, nm)) # Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_w, w, 'M', 'FT')) # Width
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_h, h, 'M', 'FT')) # Height
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_hostName, hostUD)) # Host Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_glassType, glassTypeUD)) # Glass UD Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_frameType, frameTypeUD)) # Frame UD Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Left, Inst_L)) # Install Condition Left
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Right, Inst_R)) # Install Condition Right
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Bottom, Inst_B)) # Install Condition Bottom
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Top, Inst_T)) # Install Condition Top
-            
-            windowsCount += 1
-            
-    return winSurfacesList
+        if host not in _surface_index:
+            msg = 'Could not find the host surface < {} > for window < {} > in the model.\n'\
+                'This window will not be included in the PHPP.'.format(host, window.name)
+            LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
+            continue
+        
+        if not _surface_index.is_included(host):
+            continue
+        
+        Inst_L, Inst_R, Inst_B, Inst_T = window.installs
+        windows.add_row(
+            getattr(window, 'variant_type', 'a'),
+            window.quantity,
+            window.name,
+            window.width,
+            window.height,
+            _surface_index.get(host).UD_Srfc_Name,
+            getattr(window, 'UD_glass_Name'),
+            getattr(window, 'UD_frame_Name'),
+            Inst_L,
+            Inst_R,
+            Inst_B,
+            Inst_T,
+            )
+    
+    return [ windows ]
 
-def build_shading(_inputBranch, _surfacesIncluded):
+def build_shading(_inputBranch, _surface_index):
     print("Creating the 'Shading' Objects...")
     row_start = 17
     row_count = 0
@@ -494,7 +462,7 @@ def build_shading(_inputBranch, _surfacesIncluded):
     for window in _inputBranch:
         
         
-        if window.host_surface not in _surfacesIncluded:
+        if not _surface_index.is_included(window.host_surface):
             continue
         
         row = row_start + row_count
@@ -560,11 +528,17 @@ def build_addnl_vent_rooms(_inputBranch, _vent_systems, _zones, _startRows):
         if not _vent_systems:
             continue
         
+        vent_system = None
         for s in _vent_systems:
             if phpp_space.phpp_vent_system_id == s.system_id:
                 vent_system = s
                 break
         
+        if vent_system is None:
+            print('No ventilation system found for the space < {} >. '\
+                'Ignoring its ventilation for now.'.format(phpp_space.space_name))
+            continue
+        
         if phpp_space.host_room_name in _zones:
             # ------------------------------------------------------------------
             # Try and sort out the Room's Ventilation airflow and schedule if there is any
@@ -882,7 +856,7 @@ def build_ground(_ground_objs, _zones, _ghenv):
         'ground contact Floor Elements. Please simplify / consolidate your Floor Elements\n'\
         'before proceeding with export. For now only the first three Floor Elements\n'\
         'will be exported to PHPP.'
-        _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, FloorElementsWarning)
+        LBT2PH.messages.add_message(_ghenv, 'Warning', FloorElementsWarning)
         _ground_objs = _ground_objs[0:3]
     
     for i, ground_obj in enumerate(_ground_objs):
@@ -1037,7 +1011,7 @@ def build_DHW_system(_list_of_dhw_systems, _hb_rooms, _ghenv):
                 dhwSystem.append( PHPP_XL_Obj('DHW+Distribution', '{}{}'.format(col, 159), recirc_pipe_set.daily_period ) )
             else:
                 dhwRecircWarning = "Too many recirculation loops. PHPP only allows up to 5 loops to be entered.\nConsolidate the loops before moving forward"
-                _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, dhwRecircWarning)
+                LBT2PH.messages.add_message(_ghenv, 'Warning', dhwRecircWarning)
         
         #-----------------------------------------------------------------------
         # Branch Piping
@@ -1052,7 +1026,7 @@ def build_DHW_system(_list_of_dhw_systems, _hb_rooms, _ghenv):
                 dhwSystem.append( PHPP_XL_Obj('DHW+Distribution', '{}{}'.format(col, 172), dhw_.tap_utilisation_days))
             else:
                 dhwRecircWarning = "Too many branch piping sets. PHPP only allows up to 5 sets to be entered.\nConsolidate the piping sets before moving forward"
-                _ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, dhwRecircWarning)
+                LBT2PH.messages.add_message(_ghenv, 'Warning', dhwRecircWarning)
         
         #-----------------------------------------------------------------------
         # Tanks
@@ -1501,7 +1475,7 @@ def build_PER( _per_objs, _hb_room_names, _ghenv ):
     else:
         msg = 'Error: Multiple "Mech Cooling" values found? Check the Heating/Cooling'\
             'settings? Mech Cooling is either on or off for the whole model.'
-        _ghenv.Component.AddRuntimeMessage( ghK.GH_RuntimeMessageLevel.Warning, msg )
+        LBT2PH.messages.add_message(_ghenv, 'Warning', msg)
     
     return per_
 
@@ -0,0 +1,160 @@
+"""Precompiled unit converters for the PHPP conversion schemas.
+
+The schemas (see PHPP_XL_SCHEMA below and helpers.METRIC_SCHEMA)
+store each conversion as a small expression to be appended to the value,
+ie: '*3.28', '*1.8+32', '**-1*5.678' (inverse, for U-Value -> R-Value). Rather
+than building a string and calling eval() for every value, each expression is
+turned into a plain function the first time it is needed and then reused.
+"""
+
+import re
+
+FLOAT = r'(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)'
+SCALE_RE = re.compile(r'^\*{}$'.format(FLOAT))                    # '*3.28'
+SCALE_OFFSET_RE = re.compile(r'^\*{}([-+]){}$'.format(FLOAT, FLOAT)) # '*1.8+32'
+INVERSE_RE = re.compile(r'^\*\*-1\*{}$'.format(FLOAT))            # '**-1*5.678'
+
+def _identity(_x):
+    return _x
+
+def compile_expression(_expression, _template='{}{}'):
+    """Turns a schema conversion expression into a function of a single value
+
+    Args:
+        _expression (str | float | int): The conversion. Either a number (the
+            factor to multiply by) or a string to append to the value. ie: '*3.28'
+        _template (str): Default='{}{}'. How the value and the expression go
+            together, the same as for the original eval(). ie: '({}{})' for
+            expressions like '-32.0)*(5.0/9.0'
+    Returns:
+        (function): f(x) -> converted x
+    """
+
+    if isinstance(_expression, (int, float)) and not isinstance(_expression, bool):
+        factor = float(_expression)
+        if factor == 1:
+            return _identity
+        return lambda x: x * factor
+
+    expression = str(_expression).replace(' ', '')
+
+    if _template == '{}{}':
+        match = SCALE_RE.match(expression)
+        if match:
+            factor = float(match.group(1))
+            if factor == 1:
+                return _identity
+            return lambda x: x * factor
+
+        match = SCALE_OFFSET_RE.match(expression)
+        if match:
+            factor = float(match.group(1))
+            offset = float(match.group(3)) * (1 if match.group(2) == '+' else -1)
+            return lambda x: x * factor + offset
+
+        match = INVERSE_RE.match(expression)
+        if match:
+            factor = float(match.group(1))
+            return lambda x: x ** -1 * factor
+
+    # Anything else, only compile it once.
+    return eval( 'lambda x: ' + _template.format('x', expression) )
+
+def to_number(_value):
+    """Numbers pass through, numeric strings are converted the way eval() would have """
+
+    if isinstance(_value, (int, float)):
+        return _value
+
+    text = str(_value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+class ConversionRegistry:
+    """All the compiled converters for one conversion schema
+
+    The schema is a dict of dicts: {'Unit A': {'Unit B': expression, ...}, ...}
+    """
+
+    def __init__(self, _schema, _template='{}{}'):
+        self.schema = _schema
+        self.template = _template
+        self._converters = {}
+
+    def get(self, _unit_a, _unit_b):
+        """Returns the converter function for the schema's [_unit_a][_unit_b] entry.
+
+        Any units not found in the schema return an 'identity' function.
+        """
+
+        key = (_unit_a, _unit_b)
+        try:
+            return self._converters[key]
+        except KeyError:
+            expression = self.schema.get(_unit_a, {}).get(_unit_b)
+            if expression is None:
+                converter = _identity
+            else:
+                converter = compile_expression(expression, self.template)
+            self._converters[key] = converter
+            return converter
+
+    def convert(self, _value, _unit_a, _unit_b):
+        """Convert a single value. If the value cannot be converted, it is returned as-is """
+
+        try:
+            return self.get(_unit_a, _unit_b)( to_number(_value) )
+        except Exception:
+            return _value
+
+    def convert_column(self, _values, _unit_a, _unit_b):
+        """Convert a whole list of values which all share the same units in one call
+
+        Values which cannot be converted (text, formulas, None...) are returned as-is.
+        """
+
+        converter = self.get(_unit_a, _unit_b)
+        if converter is _identity:
+            return [ self.convert(v, _unit_a, _unit_b) for v in _values ]
+
+        try:
+            # Fast path: all numbers
+            return [ converter(v) for v in _values ]
+        except Exception:
+            return [ self.convert(v, _unit_a, _unit_b) for v in _values ]
+
+    def __unicode__(self):
+        return u"Conversion Registry | Units: {}  |  Compiled: {}".format(len(self.schema), len(self._converters))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_schema={!r}, _template={!r})".format(
+               self.__class__.__name__,
+               self.schema,
+               self.template)
+
+# Used by to_excel.PHPP_XL_Obj to convert SI values into the PHPP's units
+# {Unit You have: {Unit you Want}, {...}, ...}
+PHPP_XL_SCHEMA = {
+    'C'    : {'SI':'*1', 'C':'*1', 'F':'*1.8+32'},
+    'LITER': {'SI':'*1', 'LITER':'*1', 'GALLON':'*0.264172'},
+    'MM'   : {'SI':'*1', 'MM':'*1', 'FT':'*0.00328084', 'IN':'*0.0394'},
+    'M'    : {'SI':'*1', 'M':'*1', 'FT':'*3.280839895', 'IN':'*39.3701'},
+    'M/DAY': {'SI':'*1', 'M/DAY':'*1', 'FT/DAY':'*3.280839895'},
+    'M2'   : {'SI':'*1', 'M2':'*1', 'FT2':'*10.76391042'},
+    'M3'   : {'SI':'*1', 'M3':'*1', 'FT3':'*35.31466672'},
+    'M3/H' : {'SI':'*1', 'M3/H':'*1', 'CFM':'*0.588577779'},
+    'WH/M3': {'SI':'*1', 'WH/M3':'*1', 'W/CFM':'*1.699010796'},
+    'WH/KM2':{'SI':'*1', 'WH/KM2':'*1', 'BTU/FT2':'*0.176110159'},
+    'MJ/M3K':{'SI':'*1', 'MJ/M3K':'*1', 'BTU/FT3-F':'*14.91066014'},
+    'W/M2K': {'SI':'*1', 'W/M2K':'*1', 'BTU/HR-FT2-F':'*0.176110159','HR-FT2-F/BTU':'**-1*5.678264134' },
+    'M2K/W': {'SI':'*1', 'M2K/W':'*1', 'HR-FT2-F/BTU':'*5.678264134'},
+    'W/MK' : {'SI':'*1', 'W/MK':'*1', 'HR-FT2-F/BTU-IN':'**-1*0.144227909', 'BTU/HR-FT-F':'*0.577789236'},
+    'W/K'  : {'SI':'*1', 'W/K':'*1', 'BTU/HR-F':'*1.895633976'},
+    'KW'   : {'SI':'*1', 'KW':'*1','BTU/H':'*3412.141156', 'KBTU/H':'*3.412141156'},
+    'W/W'  : {'SI':'*1', 'W/W':'*1', 'BTU/HW':'*3.412141156'} # SEER
+}
+
+PHPP_XL_CONVERTERS = ConversionRegistry( PHPP_XL_SCHEMA )
@@ -0,0 +1,269 @@
+"""The table of design variants for a batch PHPP 'sweep', and the table of results.
+
+Each variant is one row of a CSV file. The first column is the variant's
+name, and each of the other columns is one parameter override. Leave a cell
+empty to use the base model's value.
+
+    variant,  construction:Ext Wall,  glazing:Default Glazing,  vent_unit,   n50
+    Base,     ,                       ,                         ,            ,
+    Wall R40, Ext Wall R40,           ,                         ,            ,
+    Triple,   ,                       Triple Low-e,             Zehnder Q450, 0.6
+
+Override columns:
+    construction:<Name>     Swap the HB Construction (opaque or window) named <Name>
+                            for the one named in the cell (from the variant library)
+    glazing:<Name>          Swap the PHPP glazing named <Name> for the one named in
+                            the cell (from the variant library)
+    vent_unit               Use the vent unit named in the cell (from the variant
+                            library) for all the ventilation systems
+    n50                     The building's airtightness (ACH @ 50Pa)
+    cell:<Worksheet>!<Range> Write the cell's value straight into the PHPP
+
+Note: nothing in here uses Rhino, Honeybee or Excel. See LBT2PH.sweep
+for running the variants.
+"""
+
+import io
+import csv
+import sys
+from collections import OrderedDict
+
+# The default results to collect from each PHPP. The same cells the
+# 'XL Read from Workbook' component reads by default: (label, worksheet, range)
+VERIFICATION_FIELDS = (
+    ('TFA', 'Verification', 'I34'),
+    ('Heating Demand', 'Verification', 'I35'),
+    ('Heating Load', 'Verification', 'I36'),
+    ('Cooling + Dehum Demand', 'Verification', 'I38'),
+    ('Cooling Load', 'Verification', 'I39'),
+    ('Frequency of Overheating', 'Verification', 'I40'),
+    ('Frequency of excessively high humidity', 'Verification', 'I41'),
+    ('Pressurization test result', 'Verification', 'I43'),
+    ('Non-Renewable PE', 'Verification', 'I53'),
+    ('PER Demand', 'Verification', 'I55'),
+    ('PER', 'Verification', 'I56'),
+    ('Heating Total', 'Heating', 'O27'),
+    ('Cooling Total', 'Cooling', 'O28'),
+)
+
+# Where the building's n50 goes in the PHPP. See to_excel.build_infiltration()
+N50_CELL = ('Ventilation', 'N27')
+
+class VariantTableError(Exception):
+    def __init__(self, _msg):
+        self.message = _msg
+        super(VariantTableError, self).__init__(self.message)
+
+class Variant:
+    """One design variant: a name, and the overrides to apply to the base model """
+
+    def __init__(self, _name, _constructions=None, _glazing=None, _vent_unit=None, _n50=None, _cells=None):
+        """
+        Args:
+            _name (str): The variant's name. Also used for the PHPP file name.
+            _constructions (dict): Optional. {existing construction name: new construction name}
+            _glazing (dict): Optional. {existing glazing name: new glazing name}
+            _vent_unit (str): Optional. The name of the vent unit to use
+            _n50 (float): Optional. The building's airtightness (ACH @ 50Pa)
+            _cells (dict): Optional. {(worksheet, range): value} to write straight to the PHPP
+        """
+
+        self.name = _name
+        self.constructions = _constructions or {}
+        self.glazing = _glazing or {}
+        self.vent_unit = _vent_unit
+        self.n50 = _n50
+        self.cells = _cells or {}
+
+    @property
+    def cell_overrides(self):
+        """(worksheet, range, value) items to write over the top of the converted model's cells """
+
+        overrides = []
+        if self.n50 is not None:
+            overrides.append( (N50_CELL[0], N50_CELL[1], self.n50) )
+
+        for (worksheet, address), value in sorted(self.cells.items()):
+            overrides.append( (worksheet, address, value) )
+
+        return overrides
+
+    @property
+    def changes_model(self):
+        """True if the HB Model needs changing. False if only PHPP cells change """
+
+        return bool(self.constructions or self.glazing or self.vent_unit)
+
+    def __unicode__(self):
+        return u"Variant: < {} >  |  Constructions: {}  |  Glazing: {}  |  Vent Unit: {}  |  n50: {}".format(
+            self.name, len(self.constructions), len(self.glazing), self.vent_unit, self.n50)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_name={!r}, _constructions={!r}, _glazing={!r}, _vent_unit={!r}, _n50={!r}, _cells={!r})".format(
+               self.__class__.__name__,
+               self.name,
+               self.constructions,
+               self.glazing,
+               self.vent_unit,
+               self.n50,
+               self.cells)
+
+def _parse_number(_text, _column, _variant_name):
+    try:
+        return float(_text)
+    except ValueError:
+        raise VariantTableError('Variant < {} >: the {} value < {} > is not a number?'.format(
+            _variant_name, _column, _text))
+
+def _parse_cell_value(_text):
+    try:
+        return float(_text)
+    except ValueError:
+        return _text
+
+def variant_from_row(_header, _row):
+    """Builds a Variant from one row of the table
+
+    Args:
+        _header (list): The column names. The first is the variant name column.
+        _row (list): The cell values, as text
+    Returns:
+        (Variant)
+    """
+
+    cells = [ c.strip() for c in _row ]
+    cells.extend( [''] * (len(_header) - len(cells)) )
+
+    name = cells[0]
+    if not name:
+        raise VariantTableError('Every variant needs a name (first column)')
+
+    variant = Variant(name)
+    for column, text in zip(_header[1:], cells[1:]):
+        if not text:
+            continue
+
+        if column.startswith('construction:'):
+            variant.constructions[ column.split(':', 1)[1].strip() ] = text
+        elif column.startswith('glazing:'):
+            variant.glazing[ column.split(':', 1)[1].strip() ] = text
+        elif column == 'vent_unit':
+            variant.vent_unit = text
+        elif column == 'n50':
+            variant.n50 = _parse_number(text, column, name)
+        elif column.startswith('cell:') and '!' in column:
+            worksheet, address = column.split(':', 1)[1].split('!')
+            variant.cells[ (worksheet.strip(), address.strip()) ] = _parse_cell_value(text)
+        else:
+            raise VariantTableError('I do not understand the variant table column < {} >?\n'\
+                'Columns should be one of: construction:<Name>, glazing:<Name>, vent_unit, '\
+                'n50 or cell:<Worksheet>!<Range>'.format(column))
+
+    return variant
+
+def variants_from_rows(_rows):
+    """Builds the Variants from the table rows. The first row is the header """
+
+    rows = [ row for row in _rows if any( c.strip() for c in row ) ]
+    if not rows:
+        return []
+
+    header = [ c.strip() for c in rows[0] ]
+    variants = [ variant_from_row(header, row) for row in rows[1:] ]
+
+    names = [ v.name for v in variants ]
+    duplicates = sorted( set( n for n in names if names.count(n) > 1 ) )
+    if duplicates:
+        raise VariantTableError('Variant names must be unique. Found more than one of: {}'.format(duplicates))
+
+    return variants
+
+def read_variant_table(_path):
+    """Reads the Variants from a CSV file """
+
+    if sys.version_info[0] >= 3:
+        with io.open(_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+    else:
+        with open(_path, 'rb') as f:
+            rows = [ [ item.decode('utf-8-sig') for item in row ] for row in csv.reader(f) ]
+
+    return variants_from_rows(rows)
+
+def apply_cell_overrides(_diff, _overrides):
+    """Returns a new (worksheet, range, value) list with the overrides written over the top
+
+    Cells already in the list keep their position, any new ones go on the end.
+    """
+
+    positions = dict( ((item[0], item[1]), i) for i, item in enumerate(_diff) )
+
+    new_diff = list(_diff)
+    for worksheet, address, value in _overrides:
+        key = (worksheet, address)
+        if key in positions:
+            new_diff[ positions[key] ] = (worksheet, address, value)
+        else:
+            positions[key] = len(new_diff)
+            new_diff.append( (worksheet, address, value) )
+
+    return new_diff
+
+class SweepSummary:
+    """The results read back from each variant's PHPP, one row per variant """
+
+    def __init__(self, _fields=VERIFICATION_FIELDS):
+        self.fields = tuple(_fields)
+        self.rows = OrderedDict()  # {variant name: {'values': [...], 'file': path, 'status': 'OK' or the error}}
+
+    @property
+    def labels(self):
+        return [ field[0] for field in self.fields ]
+
+    def add(self, _name, _values=None, _file=None, _status='OK'):
+        values = list(_values) if _values is not None else [None] * len(self.fields)
+        self.rows[_name] = {'values': values, 'file': _file, 'status': _status}
+
+    def add_error(self, _name, _error, _file=None):
+        self.add(_name, None, _file, u'Error: {}'.format(_error))
+
+    def value(self, _name, _label):
+        return self.rows[_name]['values'][ self.labels.index(_label) ]
+
+    def as_table(self):
+        """A list of rows, starting with the header. ie: for a GH Panel or CSV """
+
+        table = [ ['variant'] + self.labels + ['status', 'file'] ]
+        for name, row in self.rows.items():
+            table.append( [name] + row['values'] + [row['status'], row['file']] )
+
+        return table
+
+    def write_csv(self, _path):
+        def text(_value):
+            return u'' if _value is None else u'{}'.format(_value)
+
+        table = self.as_table()
+        if sys.version_info[0] >= 3:
+            with io.open(_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                for row in table:
+                    writer.writerow( [ text(v) for v in row ] )
+        else:
+            with open(_path, 'wb') as f:
+                writer = csv.writer(f)
+                for row in table:
+                    writer.writerow( [ text(v).encode('utf-8') for v in row ] )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __unicode__(self):
+        return u"Sweep Summary | Variants: {}  |  Fields: {}".format(len(self.rows), len(self.fields))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_fields={!r})".format(
+               self.__class__.__name__,
+               self.fields)
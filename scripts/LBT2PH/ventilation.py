@@ -1,12 +1,16 @@
 from collections import namedtuple
 import re
-import random
 
-import rhinoscriptsyntax as rs
-import ghpythonlib.components as ghc
-import Rhino
-import Grasshopper.Kernel as ghK
-from System import Object
+try:
+    # Only there when run inside Rhino. Needed for reading the duct curves
+    import rhinoscriptsyntax as rs
+    import ghpythonlib.components as ghc
+    import Rhino
+    import Grasshopper.Kernel as ghK
+    from System import Object
+except ImportError:
+    rs = ghc = Rhino = ghK = None
+    Object = object
 
 from honeybee_energy.schedule.ruleset import ScheduleRuleset
 from honeybee_energy.lib.schedules import schedule_by_identifier
@@ -14,9 +18,19 @@ from ladybug.dt import Date
 
 import LBT2PH
 import LBT2PH.helpers
+import LBT2PH.schedule_cache
+import LBT2PH.histogram
+import LBT2PH.dict_codec
+import LBT2PH.identity
 
-reload( LBT2PH )
-reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.helpers )
+LBT2PH.dev_reload( LBT2PH.schedule_cache )
+LBT2PH.dev_reload( LBT2PH.histogram )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
+LBT2PH.dev_reload( LBT2PH.identity )
+
+from LBT2PH.dict_codec import DictCodec, Field, OBJECT, OBJECTS_BY_ID, OBJECTS
 
 class duct_input_handler:
     """Manages the varous types of inputs that the user might give for the ducts """
@@ -107,6 +121,10 @@ class duct_input_handler:
 
 
 class PHPP_Sys_Duct_Segment(Object):
+    __slots__ = ('length', 'width', 'insul_thick', 'insul_lambda')
+
+    id = LBT2PH.identity.ContentId('length', 'width', 'insul_thick', 'insul_lambda')
+
     def __init__(self, _len=1, _width=104, _i_thick=52, _i_lambda=0.04):
         """An individual duct segment. A duct is made of 1 or more segments.
 
@@ -117,32 +135,20 @@ class PHPP_Sys_Duct_Segment(Object):
             _i_lambda (float): The lambda condictivity of the segment's insualtion in W/mk
         """
         
-        self.id = random.randint(1000,9999)
         self.length = _len
         self.width = _width
         self.insul_thick = _i_thick
         self.insul_lambda = _i_lambda
 
-    def to_dict(self):
-        d = {}
-        d.update( { 'id':self.id} )
-        d.update( { 'length':self.length } )
-        d.update( { 'width':self.width } )
-        d.update( { 'insulation_thickness':self.insul_thick } )
-        d.update( { 'insulation_lambda':self.insul_lambda } )
-        
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-        new_segment = cls()
-        new_segment.id = _dict.get('id')
-        new_segment.length = _dict.get('length')
-        new_segment.width = _dict.get('width')
-        new_segment.insul_thick = _dict.get('insulation_thickness')
-        new_segment.insul_lambda = _dict.get('insulation_lambda')
-        
-        return new_segment
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('length'),
+        Field('width'),
+        Field('insulation_thickness', 'insul_thick'),
+        Field('insulation_lambda', 'insul_lambda'),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'PHPP Ventilation Duct-Segment Object'
@@ -161,12 +167,13 @@ class PHPP_Sys_Duct_Segment(Object):
 
 
 class PHPP_Sys_Duct(Object):
+    id = LBT2PH.identity.ContentId('segment_values')
+
     def __init__(self, _segments=[PHPP_Sys_Duct_Segment()] ):
         """A Single Duct Object representing a collection of Duct-Segments
 
         Args: _segments (list): A list of 'PHPP_Sys_Duct_Segment' objects 
         """
-        self.id = random.randint(1000,9999)
         self._segments = _segments
 
     def _len_weighted_avg(self, _attr):
@@ -192,6 +199,11 @@ class PHPP_Sys_Duct(Object):
             msg = 'Error: input for {} "segments" must be a list.'.format(self.__class__.__name__)
             raise Exception(msg)
     @property
+    def segment_values(self):
+        """The (length, width, insul. thickness, insul. lambda) of each segment """
+        return [ (seg.length, seg.width, seg.insul_thick, seg.insul_lambda) for seg in self._segments ]
+
+    @property
     def duct_length(self):       
         return sum(segment.length for segment in self._segments)
 
@@ -207,30 +219,12 @@ class PHPP_Sys_Duct(Object):
     def insulation_lambda(self):
         return self._len_weighted_avg('insul_lambda')
     
-    def to_dict(self):
-        d = {}
-
-        d.update( { 'id':self.id} )
-
-        seg_d = {}
-        for segment in self._segments:
-            seg_d.update( {segment.id: segment.to_dict()} )
-        d.update( { 'segments':seg_d} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-        new_obj = cls()
-        new_obj.id = _dict.get('id')
-
-        segments = []
-        for segment in _dict.get('segments', {}).values():
-            seg = PHPP_Sys_Duct_Segment.from_dict(segment)
-            segments.append(seg)
-        new_obj.segments = segments
-
-        return new_obj
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('segments', '_segments', 'segments', OBJECTS_BY_ID, PHPP_Sys_Duct_Segment),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __unicode__(self):
         return u'PHPP Ventilation Duct Object'
@@ -245,8 +239,9 @@ class PHPP_Sys_Duct(Object):
     
 
 class PHPP_Sys_VentUnit(Object):
+    id = LBT2PH.identity.ContentId('name', 'HR_eff', 'MR_eff', 'elec_eff', 'frost_temp', 'exterior')
+
     def __init__(self, _nm='97ud-Default HRV unit', _hr=0.75, _mr=0, _elec=0.45, _frsotT=-5, _ext=False):
-        self.id = random.randint(1000,9999)
         self._name = _nm
         self._HR_eff = _hr
         self._MR_eff = _mr
@@ -358,7 +353,6 @@ class PHPP_Sys_VentUnit(Object):
    
     @classmethod
     def from_dict(cls, _dict):
-        id = _dict['id']
         name = _dict['_name']
         hr = _dict['_HR_eff']
         mr = _dict['_MR_eff']
@@ -367,7 +361,6 @@ class PHPP_Sys_VentUnit(Object):
         ext = _dict['_exterior']
         
         new_vent_unit = cls(name, hr, mr, elec, frost_temp, ext)
-        new_vent_unit.id = id
 
         return new_vent_unit
 
@@ -389,6 +382,10 @@ class PHPP_Sys_VentUnit(Object):
 
 
 class PHPP_Sys_ExhaustVent(Object):
+    id = LBT2PH.identity.ContentId('name', 'vent_floor_area', 'vent_area_height', 'flow_rate_on',
+                                   'flow_rate_off', 'hours_per_day_on', 'days_per_week_on',
+                                   'holidays', 'duct_01', 'duct_02')
+
     def __init__(self, nm='Default_Exhaust_Vent',
                 airFlowRate_On=450,
                 airFlowRate_Off=25,
@@ -396,7 +393,6 @@ class PHPP_Sys_ExhaustVent(Object):
                 daysPerWeek_On=7,
                 default_duct=PHPP_Sys_Duct()):
         
-        self.id = random.randint(1000,9999)
         self._name = nm
         self.vent_floor_area = 10
         self.vent_area_height = 2.5
@@ -488,10 +484,11 @@ class PHPP_Sys_ExhaustVent(Object):
         default_duct = _dict['duct_01']
 
         new_exhaust_obj = cls(nm, airFlowRate_On, airFlowRate_Off, hrsPerDay_On, daysPerWeek_On, default_duct)
-        new_exhaust_obj.id = _dict['id']
         new_exhaust_obj.duct_01 = PHPP_Sys_Duct.from_dict(_dict['duct_01'])
         new_exhaust_obj.duct_02 = PHPP_Sys_Duct.from_dict(_dict['duct_02'])
         new_exhaust_obj.holidays = _dict['holidays']
+        new_exhaust_obj.vent_floor_area = _dict.get('vent_floor_area', 10)
+        new_exhaust_obj.vent_area_height = _dict.get('vent_area_height', 2.5)
 
         return new_exhaust_obj
 
@@ -515,8 +512,9 @@ class PHPP_Sys_ExhaustVent(Object):
 
 
 class PHPP_Sys_VentSchedule(Object):
+    id = LBT2PH.identity.ContentId('speed_high', 'time_high', 'speed_med', 'time_med', 'speed_low', 'time_low')
+
     def __init__(self, s_h=1.0, t_h=1.0, s_m=0.77, t_m=0.0, s_l=0.4, t_l=0.0):
-        self.id = random.randint(1000,9999)
         self.speed_high = s_h
         self.time_high = t_h
         self.speed_med = s_m
@@ -524,30 +522,17 @@ class PHPP_Sys_VentSchedule(Object):
         self.speed_low = s_l
         self.time_low = t_l
 
-    def to_dict(self):
-        d = {}
-        d.update( {'id':self.id} )
-        d.update( {'speed_high':self.speed_high} )
-        d.update( {'time_high':self.time_high} )
-        d.update( {'speed_med':self.speed_med} )
-        d.update( {'time_med':self.time_med} )
-        d.update( {'speed_low':self.speed_low} )
-        d.update( {'time_low':self.time_low} )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict):
-        new_sched = cls()
-        new_sched.id = _dict['id']
-        new_sched.speed_high = _dict['speed_high']
-        new_sched.time_high = _dict['time_high']
-        new_sched.speed_med = _dict['speed_med']
-        new_sched.time_med = _dict['time_med']
-        new_sched.speed_low = _dict['speed_low']
-        new_sched.time_low = _dict['time_low']
-
-        return new_sched
+    _codec = DictCodec(
+        Field('id', _set_attr=False),
+        Field('speed_high'),
+        Field('time_high'),
+        Field('speed_med'),
+        Field('time_med'),
+        Field('speed_low'),
+        Field('time_low'),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def check_total(self):
         total_time = self.time_high + self.time_med + self.time_low
@@ -574,6 +559,22 @@ class PHPP_Sys_VentSchedule(Object):
         return str(self)
 
 
+def vent_system_id(_ghenv, _system_name):
+    """The id for a ventilation system built by a GH component
+
+    The same on every solve, no matter what the system's values are. Two
+    different components with the same settings still give two systems.
+    See identity.component_id()
+
+    Args:
+        _ghenv: The GH component's 'ghenv'. May be None
+        _system_name (str): The ventilation system's name
+    Returns:
+        (str): The id
+    """
+
+    return LBT2PH.identity.component_id(_ghenv, 'PHPP_Sys_Ventilation', _system_name)
+
 class PHPP_Sys_Ventilation(Object):
     def __init__(self,
                 _ghenv=None,
@@ -584,7 +585,6 @@ class PHPP_Sys_Ventilation(Object):
                 _d02=PHPP_Sys_Duct(),
                 _exhaustObjs=[]):
         
-        self.system_id = random.randint(1000,9999)
         self.ghenv = _ghenv
         self.system_type = _system_type
         self.system_name = _systemName
@@ -594,6 +594,12 @@ class PHPP_Sys_Ventilation(Object):
         self.exhaust_vent_objs = _exhaustObjs
         self._phpp_ud_name = None
         
+        # Not a content id: the Spaces point to their system by this id (the
+        # 'phpp_vent_system_id') so it has to stay the same when the system's
+        # values change, and two separate systems with the same values are
+        # still two systems. See vent_system_id()
+        self.system_id = vent_system_id(_ghenv, self.system_name)
+        
         self.setVentSystemType(_ghenv)
     
     @property
@@ -633,37 +639,19 @@ class PHPP_Sys_Ventilation(Object):
                 pass
             self.system_type = '1-Balanced PH ventilation with HR'
     
-    def to_dict(self):
-        d = {}
-        d.update( {'system_id':self.system_id} )
-        d.update( {'system_type':self.system_type} )
-        d.update( {'system_name':self.system_name} )
-        d.update( {'vent_unit':self.vent_unit.to_dict()} )
-        d.update( {'duct_01': self.duct_01.to_dict()} )
-        d.update( {'duct_02': self.duct_02.to_dict()} )
-        if self.exhaust_vent_objs:
-            d.update( {'exhaust_vent_objs': [exhaust_obj.to_dict() for exhaust_obj in self.exhaust_vent_objs] } )
-
-        return d
-
-    @classmethod
-    def from_dict(cls, _dict, _ghenv=None):
-
-        exhaust_objs = []
-        for exhaust_system_dict in _dict.get('exhaust_vent_objs', []):
-            exhaust_objs.append( PHPP_Sys_ExhaustVent.from_dict(exhaust_system_dict) )
-
-        new_obj = cls()
-        new_obj.ghenv = _ghenv
-        new_obj.system_id = _dict.get('system_id')
-        new_obj.system_type = _dict.get('system_type')
-        new_obj.system_name = _dict.get('system_name')
-        new_obj.vent_unit = PHPP_Sys_VentUnit.from_dict(_dict.get('vent_unit') )
-        new_obj.duct_01 = PHPP_Sys_Duct.from_dict( _dict.get('duct_01') )
-        new_obj.duct_02 = PHPP_Sys_Duct.from_dict( _dict.get('duct_02') )
-        new_obj.exhaust_vent_objs = exhaust_objs
-        
-        return new_obj
+    _codec = DictCodec(
+        Field('system_id'),
+        Field('system_type'),
+        Field('system_name'),
+        Field('vent_unit', _kind=OBJECT, _type=PHPP_Sys_VentUnit),
+        Field('duct_01', _kind=OBJECT, _type=PHPP_Sys_Duct),
+        Field('duct_02', _kind=OBJECT, _type=PHPP_Sys_Duct),
+        Field('exhaust_vent_objs', _kind=OBJECTS, _type=PHPP_Sys_ExhaustVent, _skip_empty=True),
+        _context=('_ghenv',),
+        _new=lambda cls, _dict, _ghenv: cls(_ghenv),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     def __str__(self):
         return unicode(self).encode('utf-8')
@@ -707,30 +695,21 @@ def calc_room_vent_rates_from_HB(_hb_room, _ghenv):
 
     # Pull the Schedules from HB Room
     #---------------------------------------------------------------------------
-    week_start_day = 'Sunday'
-    holidays = None
-    start_date, end_date, timestep = Date(1, 1), Date(12, 31), 1
-
     hb_sched_occ = _hb_room.properties.energy.people.occupancy_schedule
     hb_sched_vent = _hb_room.properties.energy.ventilation.schedule
 
+    # Annual average schedule values. No schedule means always on (1.0)
+    avg_occ = 1.0
     if hb_sched_occ:
-        hb_sched_occ = schedule_by_identifier(hb_sched_occ.identifier)
-        
-        if isinstance(hb_sched_occ, ScheduleRuleset):
-            data_occ = hb_sched_occ.data_collection(
-                timestep, start_date, end_date, week_start_day, holidays, leap_year=False)
-    else:
-        data_occ = (1 for i in range(8760))
+        data_occ = SCHEDULE_CACHE.get(hb_sched_occ)
+        if data_occ:
+            avg_occ = data_occ.average
 
+    avg_vent = 1.0
     if hb_sched_vent:
-        hb_sched_vent = schedule_by_identifier(hb_sched_vent.identifier) 
-
-        if isinstance(hb_sched_vent, ScheduleRuleset):
-            data_vent = hb_sched_vent.data_collection(
-                timestep, start_date, end_date, week_start_day, holidays, leap_year=False)
-    else:
-        data_vent = (1 for i in range(8760))
+        data_vent = SCHEDULE_CACHE.get(hb_sched_vent)
+        if data_vent:
+            avg_vent = data_vent.average
 
     #---------------------------------------------------------------------------
     # Nominal (peak) flow rates (m3/h) based on the HB/EP Load values
@@ -774,8 +753,8 @@ def calc_room_vent_rates_from_HB(_hb_room, _ghenv):
     # Annual Average flow rates taking schedules into account
     #---------------------------------------------------------------------------
     total_nom_vent_flow = nom_vent_flow_per_area + nom_vent_flow_per_zone + nom_vent_flow_ach
-    annual_vent_flow_space = sum( total_nom_vent_flow * val for val in data_vent )/8760
-    annual_vent_flow_ppl = sum( nom_vent_flow_per_person * val for val in data_occ )/8760
+    annual_vent_flow_space = total_nom_vent_flow * avg_vent
+    annual_vent_flow_ppl = nom_vent_flow_per_person * avg_occ
     annual_vent_flow_total = annual_vent_flow_space + annual_vent_flow_ppl
 
     Output = namedtuple('Output', ['nominal', 'annual_avg'])
@@ -786,7 +765,7 @@ def calc_room_vent_rates_from_HB(_hb_room, _ghenv):
 def hb_schedule_to_data(_schedule_name):
         try:
             _schedule = schedule_by_identifier(_schedule_name)
-        except:
+        except ValueError:
             return None
         
         week_start_day = 'Sunday'
@@ -798,6 +777,53 @@ def hb_schedule_to_data(_schedule_name):
 
         return data
 
+def hb_schedule_values(_schedule, _timestep=1):
+    """Returns the hourly values for a full (non-leap) year for the HB Schedule, or None
+    
+    Used as the loader for the SCHEDULE_CACHE. Only ScheduleRulesets can be expanded.
+
+    Args:
+        _schedule: The HB Schedule, or the identifier of one in the HB schedule library
+    """
+
+    schedule = _schedule
+    if not hasattr(schedule, 'data_collection'):
+        try:
+            schedule = schedule_by_identifier(_schedule)
+        except ValueError:
+            print('Cannot find the schedule: "{}" in the HB schedule library.'\
+                ' It will be treated as always on.'.format(_schedule))
+            return None
+    
+    if not isinstance(schedule, ScheduleRuleset):
+        print('Cannot get the hourly values for schedule: "{}". Only ScheduleRulesets'\
+            ' are supported. It will be treated as always on.'.format(schedule.identifier))
+        return None
+
+    week_start_day = 'Sunday'
+    start_date, end_date = Date(1, 1), Date(12, 31)
+    holidays = None
+
+    data = schedule.data_collection(
+        _timestep, start_date, end_date, week_start_day, holidays, leap_year=False)
+
+    return data.values
+
+def schedule_cache_key(_schedule):
+    """The schedule's identifier and a hash of its contents
+
+    A schedule which is edited but keeps the same identifier gets a new key, so
+    it is expanded again rather than using the old values.
+    """
+
+    try:
+        return (_schedule.identifier, LBT2PH.identity.content_id(_schedule.to_dict()))
+    except AttributeError:
+        return _schedule  # An identifier
+
+# Shared by all the rooms / spaces, so each schedule is only expanded once.
+SCHEDULE_CACHE = LBT2PH.schedule_cache.ScheduleCache( hb_schedule_values, _key=schedule_cache_key )
+
 def calc_space_vent_rates(_space, _hb_room, _hb_room_tfa, _hb_room_peak_vent_rate, _ghenv):
     """Determine the Vent flowrate (m3/h) for each PHPP Room based on the EP/HB Values"""
 
@@ -825,43 +851,22 @@ def calc_space_vent_rates(_space, _hb_room, _hb_room_tfa, _hb_room_peak_vent_rat
 
 def generate_histogram(_data, _nbins):
     # Creates a dictionary Histogram of some data in n-bins
+    # The fraction of items in each bin, the avg value of the items in the bin
+    # See LBT2PH.histogram for the details. Constant data all goes in the top bin.
     
-    min_val = min(_data)
-    max_val = max(_data)
-    hist_bins = {} # The number of items in each bin
-    hist_vals = {} # The avg value for each bin
-    total = 0
-
-    # Initialize the dict
-    for k in range(_nbins+1):
-        hist_bins[k] = 0
-        hist_vals[k] = 0
-    
-    # Create the Histogram
-    for d in _data:
-        bin_number = int(_nbins * ((d - min_val) / (max_val - min_val)))
-        
-        hist_bins[bin_number] += 1
-        hist_vals[bin_number] += d
-        total += 1
-    
-    # Clean up / fix the data for output
-    for n in hist_vals.keys():
-        hist_vals[n] =  hist_vals[n] / hist_bins[n]
-    
-    for h in hist_bins.keys():
-        hist_bins[h] = float(hist_bins[h]) / total
-    
-    # The number of items in each bin, the avg value of the items in the bin
-    return hist_bins, hist_vals 
+    return LBT2PH.histogram.histogram(_data, _nbins)
 
 def calc_space_vent_schedule(_space, _hb_room, _hb_room_tfa):
     if _hb_room_tfa == 0:
         return None
 
     # Create a PHPP-Style 3-part sched from the EP data
-    occupancy_sched_name = _hb_room.properties.energy.people.occupancy_schedule.display_name
-    bins, vals = generate_histogram(hb_schedule_to_data(occupancy_sched_name).values, 2)
+    occupancy_sched_data = SCHEDULE_CACHE.get(_hb_room.properties.energy.people.occupancy_schedule)
+    if occupancy_sched_data:
+        bins, vals = occupancy_sched_data.reduce('histogram_2', lambda values: LBT2PH.histogram.histogram(values, 2))
+    else:
+        # Couldn't get the schedule's values: always on
+        bins, vals = LBT2PH.histogram.histogram([1.0], 2)
     room_sched_from_hb = PHPP_Sys_VentSchedule( vals[2], bins[2], vals[1], bins[1], vals[0], bins[0] )
     
     # Compute the Room % of Total TFA and Room's Ventilation Airflows
@@ -1,34 +1,71 @@
-import rhinoscriptsyntax as rs
-import Rhino
-import ghpythonlib.components as ghc
-import Grasshopper.Kernel as ghK
 import json
 import math
 from collections import namedtuple
-from itertools import izip
-from System import Object
+
+try:
+    from itertools import izip
+except ImportError:
+    izip = zip  # Python 3
+
+try:
+    # Only there when run inside Rhino. The window geometry (reveals, shading,
+    # the glazing surface...) needs them, the basic HB Aperture windows don't
+    import rhinoscriptsyntax as rs
+    import Rhino
+    import ghpythonlib.components as ghc
+    import Grasshopper.Kernel as ghK
+    from System import Object
+except ImportError:
+    rs = Rhino = ghc = ghK = None
+    Object = object
 
 import LBT2PH
 import LBT2PH.helpers
 import LBT2PH.helpers_geometry
 import LBT2PH.shading
+import LBT2PH.dict_codec
+
+LBT2PH.dev_reload(LBT2PH.helpers)
+LBT2PH.dev_reload(LBT2PH.helpers_geometry)
+LBT2PH.dev_reload( LBT2PH.shading )
+LBT2PH.dev_reload( LBT2PH.dict_codec )
 
-reload(LBT2PH.helpers)
-reload(LBT2PH.helpers_geometry)
-reload( LBT2PH.shading )
+from LBT2PH.dict_codec import DictCodec, Field, OBJECT
 
 try:  # import the core honeybee dependencies
     from ladybug_geometry.geometry3d.line import LineSegment3D
     from ladybug_geometry.geometry3d.face import Face3D
-    from ladybug_rhino.fromgeometry import from_face3d, from_linesegment3d
-    from ladybug_rhino.togeometry import to_face3d, to_point3d    
     from honeybee.aperture import Aperture
     from honeybee.typing import clean_and_id_ep_string
     from honeybee_energy.material.glazing import EnergyWindowMaterialSimpleGlazSys
 except ImportError as e:
     raise ImportError('\nFailed to import honeybee:\n\t{}'.format(e))
 
+try:
+    from ladybug_rhino.fromgeometry import from_face3d, from_linesegment3d
+    from ladybug_rhino.togeometry import to_face3d, to_point3d    
+except ImportError:
+    from_face3d = from_linesegment3d = to_face3d = to_point3d = None
+
 #-------------------------------------------------------------------------------
+def _edges_to_dict(_edges):
+    return { k:v.to_dict() for k, v in _edges._asdict().items() }
+
+def _edges_from_dict(_dict):
+    _dict = _dict or {}
+    return PHPP_Window.Output( *[LineSegment3D.from_dict(_dict.get(k)) for k in PHPP_Window.Output._fields] )
+
+def _face3d_dict(_rhino_srfc):
+    # Remeber, to_face3d returns a LIST of surfaces incase it triangulates
+    # so for now, just getitng the first one in that list to pass along
+    lbt_srfcs = to_face3d(_rhino_srfc)
+    return lbt_srfcs[0].to_dict() if lbt_srfcs else None
+
+def _rhino_surface(_dict):
+    if not _dict or from_face3d is None:
+        return None  # Or no Rhino (ie: CPython)
+    return from_face3d( Face3D.from_dict(_dict) )
+
 #-------------------------------------------------------------------------------
 class PHPP_Window(Object):
     '''A PHPP Style 'Window'.
@@ -56,7 +93,7 @@ class PHPP_Window(Object):
     __slots__ = ('quantity', 'aperture',
         '_tolerance', '_glazing_edge_lengths', '_window_edges', '_glazing_surface',
         '_shading_factor_winter', '_shading_factor_summer', 'shading_dimensions',
-        'name', 'frame', 'glazing', 'installs', 'install_depth', 'UD_glass_Name',
+        'frame', 'glazing', 'installs', 'install_depth', 'UD_glass_Name',
         'UD_frame_Name', 'variant_type' )
     
     Output = namedtuple('Output', ['Left', 'Right', 'Bottom', 'Top'])
@@ -422,40 +459,26 @@ class PHPP_Window(Object):
             rh_line = from_linesegment3d(_LB_line_segment)
             return ghc.Extrude( rh_line, ghc.Amplitude(_direction, _extrudeDepth) )
 
-    def to_dict(self):
-        d = {}
-
-        d.update( {'quantity':self.quantity} )
-        d.update( {'_tolerance':self._tolerance} )
-        d.update( {'aperture':self.aperture.to_dict()} )
-        d.update( {'_shading_factor_winter':self._shading_factor_winter } )
-        d.update( {'_shading_factor_summer':self._shading_factor_summer} )
-        d.update( {'install_depth':self.install_depth} )
-        d.update( {'variant_type':self.variant_type} )
-
-        _edges = {}
-        for k, v in self.window_edges._asdict().iteritems():
-            _edges.update( {k:v.to_dict()} )
-        d.update( {'_window_edges':_edges} )
-        d.update( {'_glazing_edge_lengths':self.glazing_edge_lengths})
-        
-        _glazing_srfc = to_face3d(self.glazing_surface)
-        if _glazing_srfc:
-            d.update( {'_glazing_surface':_glazing_srfc[0].to_dict()} )
-        
-        if self.frame:
-            d.update( {'_frame':self.frame.to_dict()} )
-
-        if self.glazing:
-            d.update( {'_glazing':self.glazing.to_dict()} )
-        
-        if self.installs:
-            d.update( {'_installs':self.installs.to_dict()} )
-
-        if self.shading_dimensions:
-            d.update( {'shading_dimensions':self.shading_dimensions.to_dict() } )
-
-        return d
+    # The Frame, Glazing and Installs classes are below, so those are looked up when read
+    _codec = DictCodec(
+        Field('quantity'),
+        Field('_tolerance'),
+        Field('aperture', _kind=OBJECT, _type=Aperture),
+        Field('_shading_factor_winter'),
+        Field('_shading_factor_summer'),
+        Field('install_depth'),
+        Field('variant_type'),
+        Field('_window_edges', 'window_edges', '_window_edges', _encode=_edges_to_dict, _decode=_edges_from_dict),
+        Field('_glazing_edge_lengths', 'glazing_edge_lengths', '_glazing_edge_lengths'),
+        Field('_glazing_surface', 'glazing_surface', '_glazing_surface',
+              _encode=_face3d_dict, _decode=_rhino_surface, _skip_empty=True),
+        Field('_frame', 'frame', _kind=OBJECT, _decode=lambda _d: PHPP_Frame.from_dict(_d), _skip_empty=True),
+        Field('_glazing', 'glazing', _kind=OBJECT, _decode=lambda _d: PHPP_Glazing.from_dict(_d), _skip_empty=True),
+        Field('_installs', 'installs', _kind=OBJECT, _decode=lambda _d: PHPP_Installs.from_dict(_d), _skip_empty=True),
+        Field('shading_dimensions', _kind=OBJECT, _type=LBT2PH.shading.PHPP_Shading_Dims, _skip_empty=True),
+        )
+    to_dict = _codec.to_dict_method()
+    from_dict = _codec.from_dict_method()
 
     @classmethod
     def from_aperture(cls, _aperture):
@@ -480,48 +503,6 @@ class PHPP_Window(Object):
 
         return window_obj
 
-    @classmethod
-    def from_dict(cls, _dict):
-        
-        new_obj = cls()
-        new_obj.quantity = _dict.get('quantity')
-        new_obj._tolerance = _dict.get('_tolerance')
-        new_obj.aperture = Aperture.from_dict( _dict.get('aperture') )
-        new_obj._shading_factor_winter =_dict.get('_shading_factor_winter')
-        new_obj._shading_factor_summer =_dict.get('_shading_factor_summer')
-        new_obj._glazing_edge_lengths = _dict.get('_glazing_edge_lengths')
-        new_obj.variant_type = _dict.get('variant_type')
-        new_obj.install_depth = _dict.get('install_depth')
-
-        #----
-        _edges = _dict.get('_window_edges', {})
-        _left = _edges.get('Left')
-        _left = LineSegment3D.from_dict( _left )
-
-        _right = _edges.get('Right')
-        _right = LineSegment3D.from_dict( _right )
-
-        _bottom = _edges.get('Bottom')
-        _bottom = LineSegment3D.from_dict( _bottom )
-
-        _top = _edges.get('Top')
-        _top = LineSegment3D.from_dict( _top )      
-        
-        new_obj._window_edges = cls.Output(_left, _right, _bottom, _top)
-
-        #----
-        _glazing_surface = _dict.get('_glazing_surface')
-        _glazing_surface = Face3D.from_dict(_glazing_surface)
-        _glazing_surface = from_face3d(_glazing_surface)
-        new_obj._glazing_surface = _glazing_surface
-
-        new_obj.frame = LBT2PH.windows.PHPP_Frame.from_dict( _dict.get('_frame') )
-        new_obj.glazing = LBT2PH.windows.PHPP_Glazing.from_dict( _dict.get('_glazing') )
-        new_obj.installs = LBT2PH.windows.PHPP_Installs.from_dict( _dict.get('_installs') )
-        new_obj.shading_dimensions = LBT2PH.shading.PHPP_Shading_Dims.from_dict( _dict.get('shading_dimensions') )        
-
-        return new_obj
-    
     def __unicode__(self):
         return u'A PHPP-Style Window Object: < {} >'.format(self.name)
     def __str__(self):
@@ -906,7 +887,7 @@ class PHPP_Installs(Object):
         return Output(self.install_L, self.install_R, self.install_B, self.install_T)
 
     def __iter__(self):
-        return self.values_as_list
+        return iter(self.values_as_list)
 
     def __len__(self):
         return len(self.values_as_list)
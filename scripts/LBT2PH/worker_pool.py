@@ -0,0 +1,98 @@
+"""A small thread pool for running the same job on a list of items.
+
+IronPython has no 'multiprocessing' (and no GIL), so plain threads are used
+to spread the work out over the CPU cores. Only use this for jobs which are
+safe to run off the main thread: file IO, zipping, parsing... NOT anything
+which touches the Rhino document, the Grasshopper components (ghc) or Excel (COM).
+"""
+
+import os
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+def default_workers():
+    """The number of CPU cores, or 4 if that can't be found """
+
+    try:
+        return os.cpu_count() or 4
+    except AttributeError:
+        pass
+
+    try:
+        import multiprocessing
+        return multiprocessing.cpu_count()
+    except (ImportError, NotImplementedError):
+        pass
+
+    try:
+        import System
+        return System.Environment.ProcessorCount
+    except ImportError:
+        return 4
+
+class WorkerError(Exception):
+    def __init__(self, _item, _error):
+        self.item = _item
+        self.error = _error
+        self.message = 'Error running the job for < {} >: {}'.format(_item, _error)
+        super(WorkerError, self).__init__(self.message)
+
+def run_pool(_job, _items, _max_workers=None):
+    """Runs _job(item) for each item, using up to _max_workers threads
+
+    Args:
+        _job (function): f(item) -> result
+        _items (list): The items to run the job on
+        _max_workers (int): Optional. The most threads to use. Default is the
+            number of CPU cores. 1 runs everything on the calling thread.
+    Returns:
+        (list): The results, in the same order as the _items
+    Raises:
+        WorkerError: For the first item (in order) whose job raised an
+            exception. All the other jobs are still run first.
+    """
+
+    items = list(_items)
+    results = [None] * len(items)
+    errors = [None] * len(items)
+
+    num_workers = min(_max_workers or default_workers(), len(items))
+
+    if num_workers <= 1:
+        for i, item in enumerate(items):
+            try:
+                results[i] = _job(item)
+            except Exception as e:
+                errors[i] = e
+    else:
+        work = queue.Queue()
+        for i in range(len(items)):
+            work.put(i)
+
+        def worker():
+            while True:
+                try:
+                    i = work.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results[i] = _job(items[i])
+                except Exception as e:
+                    errors[i] = e
+
+        threads = [ threading.Thread(target=worker) for _ in range(num_workers) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    for item, error in zip(items, errors):
+        if error is not None:
+            raise WorkerError(item, error)
+
+    return results
@@ -6,8 +6,15 @@ import scriptcontext as sc
 import clr
 clr.AddReferenceByName('Microsoft.Office.Interop.Excel')
 from System.Runtime.InteropServices import Marshal
+from System import Array, Object
 from Microsoft.Office.Interop import Excel
 
+import LBT2PH
+import LBT2PH.xl_diff
+
+LBT2PH.dev_reload( LBT2PH )
+LBT2PH.dev_reload( LBT2PH.xl_diff )
+
 class FileManager:
     """Methods used to create, copy and clean the PHPP files and paths """
     @staticmethod
@@ -110,6 +117,29 @@ class ExcelInstance:
         
         self.excel_app.ScreenUpdating = True
 
+    def write_block(self, _block, _color_index=None):
+        """Writes a whole xl_write.WriteBlock with a single 'Value2' assignment
+        
+        Args:
+            _block (xl_write.WriteBlock): The block of values to write
+            _color_index (int): Optional. If supplied, the block's Interior.ColorIndex
+                will be set as well (one more COM call for the whole block)
+        """
+        
+        xl_range = self.sheets_dict[_block.worksheet].Range[_block.range_address]
+        
+        if _block.cell_count == 1:
+            xl_range.Value2 = _block.values[0][0]
+        else:
+            xl_array = Array.CreateInstance(Object, _block.num_rows, _block.num_cols)
+            for i, row in enumerate(_block.values):
+                for j, value in enumerate(row):
+                    xl_array[i, j] = value
+            xl_range.Value2 = xl_array
+        
+        if _color_index is not None:
+            xl_range.Interior.ColorIndex = _color_index
+
     def save_and_quit(self):
         self.active_workbook = None
         self.active_workbook_name = ''
@@ -119,6 +149,13 @@ class ExcelInstance:
             self.excel_app.activeWorkbook.Close()
             self.excel_app.Quit()
             self.excel = None
+            
+            # Save the record of what was written, now that it's in the saved file
+            stores = sc.sticky.get('LBT2PH_xl_diff', {})
+            filename = getattr(self, 'filename', None)
+            store = stores.get( os.path.normcase(os.path.abspath(filename)) ) if filename else None
+            if store:
+                store.refresh_hash()
     
     def __unicode__(self):
         return u"Excel Instance | Active Worksheet: {}".format(self.active_workbook_name)
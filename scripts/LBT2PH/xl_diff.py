@@ -0,0 +1,284 @@
+"""Persistent record of the last values written to each PHPP workbook.
+
+Used by the 'XL Write to Workbook' component so that only the cells which have
+changed since the last write get sent to Excel, even after Rhino is restarted or
+with more than one PHPP open. The record is saved as a small json file next to
+the PHPP file and is keyed by the workbook's path and content hash, so if the
+workbook is changed by anything else (replaced, edited and saved by hand...) the
+record is thrown out and everything gets written again.
+
+Each worksheet also carries a digest of all its values, so worksheets which
+haven't changed at all are skipped without comparing any of their cells.
+"""
+
+import os
+import json
+import hashlib
+from collections import defaultdict
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = '_LBT2PH_cache.json'
+
+def cache_path(_workbook_path):
+    """The cache file for a workbook. ie: 'C:\\..\\MyPHPP.xlsx' -> 'C:\\..\\MyPHPP_LBT2PH_cache.json' """
+
+    return os.path.splitext(_workbook_path)[0] + CACHE_SUFFIX
+
+def file_hash(_filepath, _block_size=1<<20):
+    """Returns the sha1 hex digest of a file's contents, or None if it doesn't exist """
+
+    if not os.path.isfile(_filepath):
+        return None
+
+    sha = hashlib.sha1()
+    with open(_filepath, 'rb') as f:
+        block = f.read(_block_size)
+        while block:
+            sha.update(block)
+            block = f.read(_block_size)
+
+    return sha.hexdigest()
+
+def _json_value(_value):
+    """Only json-native values are kept as-is, anything else is stored as a string """
+
+    if _value is None or isinstance(_value, (bool, int, float)):
+        return _value
+    try:
+        return u'{}'.format(_value)
+    except UnicodeError:
+        return repr(_value)
+
+def sheet_digest(_cells):
+    """A hash of all the (range, value) items on a single worksheet
+
+    Args:
+        _cells (dict): {'A1': value, ...}
+    Returns:
+        (str): The hex digest
+    """
+
+    sha = hashlib.sha1()
+    for address in sorted(_cells):
+        sha.update( u'{}\x1f{!r}\x1e'.format(address, _cells[address]).encode('utf-8') )
+
+    return sha.hexdigest()
+
+class DiffStore:
+    """The last-written cell values for one PHPP workbook """
+
+    def __init__(self, _workbook_path):
+        self.workbook_path = os.path.normcase( os.path.abspath(_workbook_path) )
+        self.sheets = {}  # {'Sheet Name': {'digest': '...', 'cells': {'A1': value, ...}}, ...}
+        self.file_hash = None
+        self.file_stamp = None
+        self._pending = None
+
+    @property
+    def cache_path(self):
+        return cache_path(self.workbook_path)
+
+    def _current_stamp(self):
+        try:
+            stat = os.stat(self.workbook_path)
+            return [stat.st_size, stat.st_mtime]
+        except OSError:
+            return None
+
+    def _current_hash(self):
+        """Only re-hashes the workbook if its size or modified-time have changed """
+
+        stamp = self._current_stamp()
+        if self.file_hash and stamp == self.file_stamp:
+            return self.file_hash
+
+        return file_hash(self.workbook_path)
+
+    @classmethod
+    def load(cls, _workbook_path):
+        """Loads the stored record for the workbook, if there is a valid one.
+
+        If there isn't any record, or the workbook's content hash doesn't match
+        the one recorded, returns an empty store (so everything will be written)
+        """
+
+        store = cls(_workbook_path)
+
+        try:
+            with open(store.cache_path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return store
+
+        if data.get('version') != CACHE_VERSION:
+            return store
+        if os.path.normcase(data.get('workbook', '')) != store.workbook_path:
+            return store
+
+        store.file_hash = data.get('file_hash')
+        store.file_stamp = data.get('file_stamp')
+        if not store.file_hash or store._current_hash() != store.file_hash:
+            print('PHPP file < {} > has changed since the last write. Writing all values.'.format(store.workbook_path))
+            return cls(_workbook_path)
+
+        store.sheets = data.get('sheets', {})
+        return store
+
+    @classmethod
+    def from_stores(cls, _workbook_path, _stores):
+        """Returns the in-memory store for the workbook if there is one, otherwise loads it
+
+        Args:
+            _workbook_path (str): The full path to the PHPP workbook
+            _stores (dict): A dict to keep the stores in between solves, one per
+                workbook. ie: sc.sticky['LBT2PH_xl_diff']
+        Returns:
+            (DiffStore)
+        """
+
+        key = os.path.normcase( os.path.abspath(_workbook_path) )
+        if key not in _stores:
+            _stores[key] = cls.load(_workbook_path)
+
+        return _stores[key]
+
+    def is_valid(self):
+        """False if the workbook on disk has been changed since the record was made """
+
+        if not self.sheets:
+            return True
+        return self._current_hash() == self.file_hash
+
+    def diff(self, _items, _full=False):
+        """Finds the items which have changed since the last write
+
+        Call commit() once the returned items have actually been written.
+
+        Args:
+            _items (iterable): (worksheet name, range address, value) items to write
+            _full (bool): Default=False. If True, return all items, not just changes
+        Returns:
+            (list): (worksheet name, range address, value) items which need to be
+                written, with the values as they were passed in. Anything written
+                last time which is now gone is returned with a value of "" so it
+                gets cleared out.
+        """
+
+        if not self.is_valid():
+            print('PHPP file < {} > has changed since the last write. Writing all values.'.format(self.workbook_path))
+            self.sheets = {}
+
+        # Only the stored record (and so the digests) use the json values. The
+        # values written out to Excel are the ones which were passed in.
+        new_sheets = defaultdict(dict)
+        new_values = defaultdict(dict)
+        for worksheet, address, value in _items:
+            new_sheets[worksheet][address] = _json_value(value)
+            new_values[worksheet][address] = value
+
+        diff = []
+        pending = {}
+        for worksheet, cells in new_sheets.items():
+            digest = sheet_digest(cells)
+            pending[worksheet] = {'digest':digest, 'cells':cells}
+            values = new_values[worksheet]
+
+            old = self.sheets.get(worksheet)
+            if _full or not old:
+                diff.extend( (worksheet, address, value) for address, value in values.items() )
+                continue
+
+            if old.get('digest') == digest:
+                continue
+
+            old_cells = old.get('cells', {})
+            for address, value in cells.items():
+                if address not in old_cells or old_cells[address] != value:
+                    diff.append( (worksheet, address, values[address]) )
+            for address in old_cells:
+                if address not in cells:
+                    diff.append( (worksheet, address, '') )
+
+        for worksheet, old in self.sheets.items():
+            if worksheet not in new_sheets:
+                diff.extend( (worksheet, address, '') for address in old.get('cells', {}) )
+
+        self._pending = pending
+        return diff
+
+    def commit(self, _save=True, _not_written=None):
+        """Records the values from the last diff() as written
+
+        Args:
+            _save (bool): Default=True. Set False if the workbook itself hasn't been
+                saved yet (ie: written through Excel). The record should only be
+                saved to disk along with the workbook, otherwise closing Excel
+                without saving would leave a record of values that were never kept.
+                Call refresh_hash() once the workbook has been saved.
+            _not_written (iterable): Optional. The (worksheet name, range address)
+                of any items from the diff which could not be written. Their
+                record is left as it was, so they get written (or cleared) again
+                next time.
+        """
+
+        if self._pending is None:
+            return
+
+        changed_sheets = set()
+        for worksheet, address in _not_written or []:
+            old_cells = self.sheets.get(worksheet, {}).get('cells', {})
+            cells = self._pending.setdefault(worksheet, {'cells': {}})['cells']
+            if address in old_cells:
+                cells[address] = old_cells[address]
+            else:
+                cells.pop(address, None)
+            changed_sheets.add(worksheet)
+
+        for worksheet in changed_sheets:
+            self._pending[worksheet]['digest'] = sheet_digest(self._pending[worksheet]['cells'])
+
+        self.sheets = self._pending
+        self._pending = None
+        self._update_hash()
+
+        if _save:
+            self.save()
+
+    def _update_hash(self):
+        self.file_hash = self._current_hash()
+        self.file_stamp = self._current_stamp()
+
+    def refresh_hash(self):
+        """Re-hashes the workbook file (ie: after it is saved) and saves the record """
+
+        self._update_hash()
+        self.save()
+
+    def save(self):
+        data = {'version': CACHE_VERSION,
+                'workbook': self.workbook_path,
+                'file_hash': self.file_hash,
+                'file_stamp': self.file_stamp,
+                'sheets': self.sheets}
+
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(data, f)
+        except (IOError, OSError) as e:
+            print(e)
+            print('Could not save the write-cache file: < {} >'.format(self.cache_path))
+
+    def clear(self):
+        self.sheets = {}
+        self._pending = None
+        if os.path.isfile(self.cache_path):
+            os.remove(self.cache_path)
+
+    def __unicode__(self):
+        return u"PHPP Diff Store | Workbook: {}  |  Sheets: {}".format(self.workbook_path, len(self.sheets))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_workbook_path={!r})".format(
+               self.__class__.__name__,
+               self.workbook_path)
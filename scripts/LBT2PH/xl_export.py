@@ -0,0 +1,140 @@
+"""Save / load a list of PHPP_XL_Obj cells as JSON or CSV.
+
+Used by the headless conversion (LBT2PH.pipeline) to hand the PHPP cells off
+to something else: the .xlsx writer (LBT2PH.xlsx_writer), a later 'XL Write'
+or just a diff between two runs. Each cell is saved as a 'record':
+
+    {'group': 'Areas', 'worksheet': 'Areas', 'range': 'L41', 'value': 12.3}
+
+with the value already converted to the PHPP's units (SI or IP). The
+'group' is the name of the conversion step the cell came from.
+
+Note: nothing in here uses Rhino or Grasshopper.
+"""
+
+import io
+import csv
+import json
+import sys
+
+import LBT2PH.sheet_block
+
+FIELDS = ('group', 'worksheet', 'range', 'value')
+
+def xl_objects_to_records(_xl_objects_by_group, _unit='SI'):
+    """Turns the PHPP_XL_Objs into plain records, with the values in the PHPP's units
+
+    Args:
+        _xl_objects_by_group (dict): {group name: [PHPP_XL_Obj | SheetBlock, ...], ...} ie: from
+            pipeline.convert_model(). Use an OrderedDict to keep the order.
+        _unit (str): Default='SI'. The PHPP's units. 'SI' or 'IP'
+    Returns:
+        (list): The record dicts, in order
+    """
+
+    records = []
+    for group, xl_objects in _xl_objects_by_group.items():
+        for worksheet, address, value in LBT2PH.sheet_block.iter_cells(xl_objects, _unit):
+            records.append( {'group': group,
+                             'worksheet': worksheet,
+                             'range': address,
+                             'value': value} )
+
+    return records
+
+def records_to_diff(_records):
+    """(worksheet, range, value) items, ready for the XL writers """
+
+    return [ (r['worksheet'], r['range'], r['value']) for r in _records ]
+
+def _json_value(_value):
+    if _value is None or isinstance(_value, (bool, int, float)):
+        return _value
+    try:
+        return u'{}'.format(_value)
+    except UnicodeError:
+        return repr(_value)
+
+def write_json(_records, _path):
+    data = {'fields': list(FIELDS),
+            'cells': [ [ _json_value(r[f]) for f in FIELDS ] for r in _records ]}
+
+    with io.open(_path, 'w', encoding='utf-8') as f:
+        f.write( u'{}'.format(json.dumps(data, ensure_ascii=False, indent=0)) )
+
+def read_json(_path):
+    with io.open(_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    fields = data.get('fields', FIELDS)
+    return [ dict(zip(fields, cell)) for cell in data.get('cells', []) ]
+
+def _csv_value(_value):
+    """Numbers are read back as numbers, so text which looks like a number is tagged """
+
+    if _value is None:
+        return ''
+    if isinstance(_value, bool):
+        return 'TRUE' if _value else 'FALSE'
+    if isinstance(_value, (int, float)):
+        return repr(_value)
+    return u"'{}".format(_value)
+
+def _from_csv_value(_text):
+    if _text == '':
+        return None
+    if _text.startswith("'"):
+        return _text[1:]
+    if _text in ('TRUE', 'FALSE'):
+        return _text == 'TRUE'
+    try:
+        return int(_text)
+    except ValueError:
+        return float(_text)
+
+def write_csv(_records, _path):
+    """Text values are prefixed with a ' (same as in Excel) so they aren't read back as numbers """
+
+    if sys.version_info[0] >= 3:
+        with io.open(_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for r in _records:
+                writer.writerow( [r['group'], r['worksheet'], r['range'], _csv_value(r['value'])] )
+    else:
+        with open(_path, 'wb') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for r in _records:
+                row = [r['group'], r['worksheet'], r['range'], _csv_value(r['value'])]
+                writer.writerow( [ u'{}'.format(item).encode('utf-8') for item in row ] )
+
+def read_csv(_path):
+    if sys.version_info[0] >= 3:
+        with io.open(_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+    else:
+        with open(_path, 'rb') as f:
+            rows = [ [ item.decode('utf-8') for item in row ] for row in csv.reader(f) ]
+
+    records = []
+    for row in rows[1:]:
+        group, worksheet, address, value = row
+        records.append( {'group': group, 'worksheet': worksheet, 'range': address,
+                         'value': _from_csv_value(value)} )
+
+    return records
+
+def write_records(_records, _path):
+    """Saves the records as JSON or CSV, depending on the file extension """
+
+    if _path.lower().endswith('.csv'):
+        write_csv(_records, _path)
+    else:
+        write_json(_records, _path)
+
+def read_records(_path):
+    if _path.lower().endswith('.csv'):
+        return read_csv(_path)
+    else:
+        return read_json(_path)
@@ -0,0 +1,252 @@
+"""Write-planning for the 'XL Write to Workbook' component.
+
+Groups a flat (worksheet, range, value) diff into contiguous rectangular blocks
+so that each block can be written to Excel with a single 'Value2' assignment
+and a single formatting call, rather than one COM call per cell.
+
+Note: nothing in here talks to Excel, so it can be used by any writer backend.
+"""
+
+import re
+from collections import defaultdict
+
+ADDRESS_PATTERN = re.compile(r'^\$?([A-Za-z]{1,3})\$?(\d+)$')
+
+def column_to_number(_col):
+    """Excel column letters to a 1-based column number. ie: 'A'->1, 'AC'->29 """
+
+    num = 0
+    for char in _col.upper():
+        num = num * 26 + (ord(char) - ord('A') + 1)
+
+    return num
+
+def number_to_column(_num):
+    """1-based column number to Excel column letters. ie: 1->'A', 29->'AC' """
+
+    letters = ''
+    while _num > 0:
+        _num, remainder = divmod(_num - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+
+    return letters
+
+def split_address(_address):
+    """Returns (row, column-number) for a single-cell address like 'AC41'
+
+    Returns None for anything that isn't a single cell (named ranges, 'A1:B2', ...)
+    """
+
+    match = ADDRESS_PATTERN.match( str(_address).strip() )
+    if not match:
+        return None
+
+    col, row = match.groups()
+    return int(row), column_to_number(col)
+
+class WriteBlock:
+    """A rectangular, gap-free block of cells on a single worksheet """
+
+    def __init__(self, _worksheet, _first_row, _first_col, _values, _address=None):
+        """
+        Args:
+            _worksheet (str): The Name of the Worksheet to write to
+            _first_row (int): The 1-based row of the top-left cell
+            _first_col (int): The 1-based column number of the top-left cell
+            _values (list): A list of rows, each a list of cell values
+            _address (str): Optional. The original range address, used for any
+                items which could not be parsed as a single cell (named ranges, etc.)
+        """
+        self.worksheet = _worksheet
+        self.first_row = _first_row
+        self.first_col = _first_col
+        self.values = _values
+        self._address = _address
+
+    @property
+    def num_rows(self):
+        return len(self.values)
+
+    @property
+    def num_cols(self):
+        return len(self.values[0]) if self.values else 0
+
+    @property
+    def cell_count(self):
+        return self.num_rows * self.num_cols
+
+    def addresses(self):
+        """The address of each cell in the block, row by row """
+
+        if self._address:
+            return [self._address]
+
+        return [ '{}{}'.format(number_to_column(col), row)
+                 for row in range(self.first_row, self.first_row + self.num_rows)
+                 for col in range(self.first_col, self.first_col + self.num_cols) ]
+
+    @property
+    def range_address(self):
+        if self._address:
+            return self._address
+
+        top_left = '{}{}'.format(number_to_column(self.first_col), self.first_row)
+        if self.cell_count == 1:
+            return top_left
+
+        bottom_right = '{}{}'.format(number_to_column(self.first_col + self.num_cols - 1),
+                                     self.first_row + self.num_rows - 1)
+        return '{}:{}'.format(top_left, bottom_right)
+
+    def __unicode__(self):
+        return u"Write Block | Worksheet: {}  |  Range: {}  |  Cells: {}".format(
+            self.worksheet, self.range_address, self.cell_count)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_worksheet={!r}, _first_row={!r}, _first_col={!r}, _values={!r}, _address={!r})".format(
+               self.__class__.__name__,
+               self.worksheet,
+               self.first_row,
+               self.first_col,
+               self.values,
+               self._address)
+
+def _runs(_cells, _major, _minor):
+    """Yields maximal runs of consecutive cells along the minor axis
+
+    Returns: (major_index, minor_start, minor_end) for each run
+    """
+
+    by_major = defaultdict(list)
+    for cell in _cells:
+        by_major[cell[_major]].append(cell[_minor])
+
+    for major in sorted(by_major.keys()):
+        minors = sorted(by_major[major])
+        start = prev = minors[0]
+        for minor in minors[1:]:
+            if minor != prev + 1:
+                yield major, start, prev
+                start = minor
+            prev = minor
+        yield major, start, prev
+
+def _merge_runs(_cells, _major, _minor):
+    """Merges neighbouring runs with an identical span into rectangles
+
+    Returns: a list of (major_start, major_end, minor_start, minor_end)
+    """
+
+    open_rects = {} # (minor_start, minor_end) -> [major_start, major_end]
+    rects = []
+
+    for major, start, end in _runs(_cells, _major, _minor):
+        rect = open_rects.get( (start, end) )
+        if rect and rect[1] == major - 1:
+            rect[1] = major
+        else:
+            if rect:
+                rects.append( (rect[0], rect[1], start, end) )
+            open_rects[(start, end)] = [major, major]
+
+    for (start, end), rect in open_rects.items():
+        rects.append( (rect[0], rect[1], start, end) )
+
+    return rects
+
+def _blocks_for_sheet(_worksheet, _cells):
+    """Builds the fewest blocks for one sheet, trying both column-first and row-first merging
+
+    Args:
+        _worksheet (str): The worksheet name
+        _cells (dict): {(row, col): value, ...}
+    Returns:
+        (list): WriteBlock objects
+    """
+
+    # PHPP tables are mostly row-based (one item per row, several columns)
+    # so merging column-runs across neighbouring columns usually wins, but
+    # some (Components: glass, frames) are laid out the other way.
+    by_col = [ (r0, r1, c0, c1) for c0, c1, r0, r1 in _merge_runs(_cells, 1, 0) ]
+    by_row = _merge_runs(_cells, 0, 1)
+    rects = by_col if len(by_col) <= len(by_row) else by_row
+
+    blocks = []
+    for r0, r1, c0, c1 in sorted(rects):
+        values = [ [ _cells[(r, c)] for c in range(c0, c1 + 1) ] for r in range(r0, r1 + 1) ]
+        blocks.append( WriteBlock(_worksheet, r0, c0, values) )
+
+    return blocks
+
+class WritePlan:
+    """The set of WriteBlocks needed to write a diff, with some COM-call accounting """
+
+    def __init__(self, _blocks, _num_cells):
+        self.blocks = _blocks
+        self.num_cells = _num_cells
+
+    @classmethod
+    def from_diff(cls, _diff):
+        """Groups a (worksheet, range, value) diff into rectangular blocks per worksheet.
+
+        If the same cell shows up more than once, the last value wins (same as
+        writing each item in order). Anything which isn't a plain single-cell
+        address gets its own block and is written as-is.
+
+        Args:
+            _diff (list): A list of (worksheet name, range address, value) tuples
+        Returns:
+            (WritePlan)
+        """
+
+        sheets = defaultdict(dict)
+        sheet_order = []
+        unparsed = []
+
+        for worksheet, address, value in _diff:
+            cell = split_address(address)
+            if cell is None:
+                unparsed.append( WriteBlock(worksheet, None, None, [[value]], address) )
+                continue
+
+            if worksheet not in sheets:
+                sheet_order.append(worksheet)
+            sheets[worksheet][cell] = value
+
+        blocks = []
+        num_cells = len(unparsed)
+        for worksheet in sheet_order:
+            blocks.extend( _blocks_for_sheet(worksheet, sheets[worksheet]) )
+            num_cells += len(sheets[worksheet])
+        blocks.extend( unparsed )
+
+        return cls(blocks, num_cells)
+
+    @staticmethod
+    def _calls_per_write(_color):
+        return 2 if _color else 1
+
+    def com_calls(self, _color=True):
+        """The number of COM write calls needed when writing block-by-block """
+
+        return len(self.blocks) * self._calls_per_write(_color)
+
+    def com_calls_per_cell(self, _color=True):
+        """The number of COM write calls needed when writing cell-by-cell """
+
+        return self.num_cells * self._calls_per_write(_color)
+
+    def summary(self, _color=True):
+        return 'Wrote {} cells in {} blocks: {} COM calls (vs. {} writing cell-by-cell)'.format(
+            self.num_cells, len(self.blocks), self.com_calls(_color), self.com_calls_per_cell(_color))
+
+    def __unicode__(self):
+        return u"Write Plan | Blocks: {}  |  Cells: {}".format(len(self.blocks), self.num_cells)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}(_blocks={!r}, _num_cells={!r})".format(
+               self.__class__.__name__,
+               self.blocks,
+               self.num_cells)
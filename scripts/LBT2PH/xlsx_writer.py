@@ -0,0 +1,597 @@
+"""Headless PHPP writer: patches values straight into the .xlsx workbook XML.
+
+No Excel / COM is used, so this will run anywhere Python does (build servers,
+Linux, etc...). The source PHPP is copied part-by-part into the new file and only
+the worksheet XML parts which have changes are rewritten. Each of those is patched
+in a single forward pass, so everything else (formulas, styles, validation,
+named ranges...) is passed through untouched. The workbook is flagged for a full
+recalculation so Excel will update all the results the next time it is opened.
+
+The worksheets are patched as a stream: read a chunk at a time, one row at a
+time, and written to a temp file, so the memory used doesn't grow with the size
+of the worksheet. Only the largest single row, and all the changes to write,
+are ever held at once. In IronPython 2.7 (no ZipFile.open(..., 'w')) each part
+which isn't changed is still read in whole to copy it across, one at a time.
+
+Note: Values are written as numbers, inline strings or (for anything starting
+with '=') formulas, the same way Excel would interpret a 'Value2' write.
+"""
+
+import io
+import os
+import re
+import math
+import sys
+import codecs
+import shutil
+import zipfile
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from xml.sax.saxutils import escape
+
+import LBT2PH.xl_write
+import LBT2PH.sheet_block
+
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+ROW_RE = re.compile(r'<row\b([^>]*?)(/>|>(.*?)</row>)', re.S)
+CELL_RE = re.compile(r'<c\b([^>]*?)(/>|>(.*?)</c>)', re.S)
+ATTR_RE = r'\b{}="([^"]*)"'
+NUMBER_RE = re.compile(r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$')
+
+# Bytes read at a time when patching a worksheet, or copying a part across
+CHUNK_SIZE = 1024 * 1024
+
+# ZipFile.open(..., 'w') is only there from Python 3.6
+STREAMING_ZIP_WRITE = sys.version_info >= (3, 6)
+
+class XlsxWriteError(Exception):
+    def __init__(self, _msg):
+        self.message = _msg
+        super(XlsxWriteError, self).__init__(self.message)
+
+def _get_attr(_attrs, _name):
+    match = re.search(ATTR_RE.format(_name), _attrs)
+    return match.group(1) if match else None
+
+def _drop_attr(_attrs, _name):
+    return re.sub(r'\s+{}="[^"]*"'.format(_name), '', _attrs)
+
+def _is_finite(_value):
+    """False for NaN and +/- infinity (numbers or numeric strings): a .xlsx cell can't hold them """
+
+    if isinstance(_value, bool) or _value is None:
+        return True
+
+    try:
+        if isinstance(_value, (int, float)):
+            number = float(_value)
+        elif NUMBER_RE.match(u'{}'.format(_value)):
+            number = float(u'{}'.format(_value))
+        else:
+            return True
+    except OverflowError:
+        return False
+
+    return not (math.isnan(number) or math.isinf(number))
+
+def _cell_xml(_ref, _style, _value):
+    """Returns the '<c>' element for a new value, keeping the cell's existing style """
+
+    style = ' s="{}"'.format(_style) if _style is not None else ''
+
+    if _value is None or _value == '':
+        return u'<c r="{}"{}/>'.format(_ref, style)
+
+    if isinstance(_value, bool):
+        return u'<c r="{}"{} t="b"><v>{}</v></c>'.format(_ref, style, int(_value))
+
+    if isinstance(_value, (int, float)):
+        return u'<c r="{}"{}><v>{!r}</v></c>'.format(_ref, style, _value)
+
+    text = u'{}'.format(_value)
+
+    if NUMBER_RE.match(text):
+        # Excel would convert a numeric string written to Value2 into a number
+        return u'<c r="{}"{}><v>{!r}</v></c>'.format(_ref, style, float(text))
+
+    if text.startswith('='):
+        return u'<c r="{}"{}><f>{}</f></c>'.format(_ref, style, escape(text[1:]))
+
+    return u'<c r="{}"{} t="inlineStr"><is><t xml:space="preserve">{}</t></is></c>'.format(
+                _ref, style, escape(text))
+
+class _SheetPatch:
+    """Writes a set of {(row, col): value} updates into a single worksheet XML part """
+
+    def __init__(self, _updates):
+        self.rows = defaultdict(dict)
+        for (row, col), value in _updates.items():
+            self.rows[row][col] = value
+
+        self.formulas_replaced = False
+        self.skipped = []
+
+    def _new_row(self, _row_num):
+        cells = self.rows[_row_num]
+        body = u''.join( _cell_xml(self._ref(_row_num, c), None, cells[c]) for c in sorted(cells) )
+        return u'<row r="{}">{}</row>'.format(_row_num, body)
+
+    @staticmethod
+    def _ref(_row, _col):
+        return u'{}{}'.format(LBT2PH.xl_write.number_to_column(_col), _row)
+
+    def _patch_cell(self, _row_num, _col, _attrs, _content, _original):
+        """Returns the patched cell XML, or the original if the cell can't be changed safely """
+
+        ref = self._ref(_row_num, _col)
+        content = _content or u''
+
+        if '<f' in content:
+            f_tag = re.search(r'<f\b[^>]*>', content) or re.search(r'<f\b[^>]*/>', content)
+            if f_tag and 'ref="' in f_tag.group(0):
+                # Master cell of a shared or array formula. Other cells depend
+                # on it, so overwriting it would corrupt the workbook.
+                self.skipped.append(ref)
+                return _original
+            self.formulas_replaced = True
+
+        return _cell_xml(ref, _get_attr(_attrs, 's'), self.rows[_row_num][_col])
+
+    def _patch_row(self, _row_num, _attrs, _body):
+        updates = self.rows[_row_num]
+        pending = sorted(updates)
+        i = 0
+        out = []
+        pos = 0
+
+        for cell in CELL_RE.finditer(_body or u''):
+            attrs, content = cell.group(1), cell.group(3)
+            cell_ref = _get_attr(attrs, 'r')
+            col = LBT2PH.xl_write.split_address(cell_ref)[1] if cell_ref else None
+
+            out.append(_body[pos:cell.start()])
+            pos = cell.end()
+
+            while i < len(pending) and col is not None and pending[i] < col:
+                out.append( _cell_xml(self._ref(_row_num, pending[i]), None, updates[pending[i]]) )
+                i += 1
+
+            if i < len(pending) and pending[i] == col:
+                out.append( self._patch_cell(_row_num, col, attrs, content, cell.group(0)) )
+                i += 1
+            else:
+                out.append( cell.group(0) )
+
+        out.append( (_body or u'')[pos:] )
+        for c in pending[i:]:
+            out.append( _cell_xml(self._ref(_row_num, c), None, updates[c]) )
+
+        # 'spans' is only an optimization hint, drop it since the cells may have changed
+        attrs = _drop_attr(_attrs, 'spans')
+        return u'<row{}>{}</row>'.format(attrs, u''.join(out))
+
+    def apply(self, _xml):
+        """Same as apply_stream(), for a worksheet XML string. Returns the patched XML """
+
+        target = io.BytesIO()
+        self.apply_stream(io.BytesIO(_xml.encode('utf-8')), target)
+        return target.getvalue().decode('utf-8')
+
+    def apply_stream(self, _source, _target, _chunk_size=CHUNK_SIZE):
+        """Single forward pass over the <sheetData>, patching / inserting rows in order
+
+        The worksheet XML is read and written a chunk at a time (up to the end
+        of the last whole row in the chunk), so the memory used doesn't depend
+        on the size of the worksheet. Once all the rows have been written, the
+        rest is copied across as it is.
+
+        Args:
+            _source: The worksheet XML, a binary file-like object open for reading
+            _target: A binary file-like object to write the patched XML to
+            _chunk_size (int): The number of bytes to read at a time
+        """
+
+        reader = _XmlReader(_source, _chunk_size)
+        write = lambda _text: _target.write(_text.encode('utf-8'))
+
+        # Everything up to and including the '<sheetData ...>' tag
+        start = reader.find(u'<sheetData')
+        if start == -1:
+            raise XlsxWriteError('No <sheetData> found in worksheet XML?')
+        open_end = reader.find(u'>', start) + 1
+        empty = reader.char(open_end - 2) == u'/'
+        if empty:
+            # '<sheetData/>'
+            write(reader.take(start) + u'<sheetData>')
+            reader.take(open_end - start)
+        else:
+            write(reader.take(open_end))
+
+        self._pending = sorted(self.rows)
+        self._next = 0
+        self._row_num = 0
+
+        while not empty:
+            body_end = reader.find_loaded(u'</sheetData>')
+            if body_end != -1:
+                write( self._patch_rows(reader.take(body_end)) )
+                break
+
+            rows_end = reader.rfind_loaded(u'</row>')
+            if rows_end != -1:
+                write( self._patch_rows(reader.take(rows_end + len(u'</row>'))) )
+
+            if not reader.read_more():
+                raise XlsxWriteError('No </sheetData> found in worksheet XML?')
+
+        for row_num in self._pending[self._next:]:
+            write( self._new_row(row_num) )
+
+        if empty:
+            write(u'</sheetData>')
+
+        # The rest of the worksheet, as it is
+        while True:
+            write(reader.take())
+            if not reader.read_more():
+                break
+
+    def _patch_rows(self, _body):
+        """Patches the whole rows in part of the <sheetData>. Carries on from the last part """
+
+        pending = self._pending
+        if self._next == len(pending):
+            return _body
+
+        out = []
+        pos = 0
+        for row in ROW_RE.finditer(_body):
+            attrs = row.group(1)
+            r = _get_attr(attrs, 'r')
+            self._row_num = int(r) if r else self._row_num + 1
+
+            if pending[self._next] > self._row_num:
+                continue
+
+            out.append(_body[pos:row.start()])
+            pos = row.start()
+
+            while self._next < len(pending) and pending[self._next] < self._row_num:
+                out.append( self._new_row(pending[self._next]) )
+                self._next += 1
+
+            if self._next < len(pending) and pending[self._next] == self._row_num:
+                out.append( self._patch_row(self._row_num, attrs, row.group(3)) )
+                self._next += 1
+                pos = row.end()
+
+            if self._next == len(pending):
+                break
+
+        out.append(_body[pos:])
+        return u''.join(out)
+
+class _XmlReader:
+    """Reads a stream of UTF-8 XML a chunk at a time, only keeping what hasn't been taken yet
+
+    All the indexes are counted from the start of what hasn't been taken.
+    """
+
+    def __init__(self, _stream, _chunk_size=CHUNK_SIZE):
+        self.stream = _stream
+        self.chunk_size = _chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u''
+        self.pos = 0
+
+    def read_more(self):
+        """Adds the next chunk. Returns False at the end of the stream """
+
+        data = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(data, final=not data)
+        self.pos = 0
+        return bool(data)
+
+    def __len__(self):
+        return len(self.buffer) - self.pos
+
+    def char(self, _index):
+        return self.buffer[self.pos + _index]
+
+    def find(self, _text, _start=0):
+        """Index of _text, reading more until it's found. -1 if it never is """
+
+        while True:
+            index = self.buffer.find(_text, self.pos + _start)
+            if index != -1:
+                return index - self.pos
+            # A match could start in the last few characters
+            _start = max(_start, len(self) - len(_text) + 1)
+            if not self.read_more():
+                return -1
+
+    def find_loaded(self, _text):
+        """Index of the first _text in what's already been read. -1 if it isn't there """
+
+        index = self.buffer.find(_text, self.pos)
+        return index - self.pos if index != -1 else -1
+
+    def rfind_loaded(self, _text):
+        """Index of the last _text in what's already been read. -1 if it isn't there """
+
+        index = self.buffer.rfind(_text, self.pos)
+        return index - self.pos if index != -1 else -1
+
+    def take(self, _end=None):
+        """Returns the first _end characters (default: all there is so far), and moves past them """
+
+        end = len(self) if _end is None else _end
+        text = self.buffer[self.pos:self.pos + end]
+        self.pos += end
+        return text
+
+class XlsxWorkbook:
+    """Read / write access to the cell values of an .xlsx file, without Excel """
+
+    def __init__(self, _filepath):
+        if not os.path.isfile(_filepath):
+            raise XlsxWriteError('Cannot find the PHPP file: < {} >'.format(_filepath))
+
+        self.filepath = _filepath
+        self._shared_strings = None
+
+        with zipfile.ZipFile(self.filepath) as zf:
+            self.sheet_paths = self._find_sheet_paths(zf)
+
+    @staticmethod
+    def _find_sheet_paths(_zf):
+        """Returns a dict of {'Worksheet Name': 'xl/worksheets/sheetN.xml', ...} """
+
+        workbook = ET.fromstring( _zf.read('xl/workbook.xml') )
+        rels = ET.fromstring( _zf.read('xl/_rels/workbook.xml.rels') )
+
+        targets = {}
+        for rel in rels.findall('{%s}Relationship' % NS_PKG_REL):
+            target = rel.get('Target')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = 'xl/' + target
+            targets[rel.get('Id')] = target
+
+        sheet_paths = {}
+        for sheet in workbook.iter('{%s}sheet' % NS_MAIN):
+            sheet_paths[sheet.get('name')] = targets.get( sheet.get('{%s}id' % NS_REL) )
+
+        return sheet_paths
+
+    @property
+    def sheet_names(self):
+        return list(self.sheet_paths.keys())
+
+    def _get_shared_strings(self, _zf):
+        if self._shared_strings is None:
+            self._shared_strings = []
+            if 'xl/sharedStrings.xml' in _zf.namelist():
+                sst = ET.fromstring( _zf.read('xl/sharedStrings.xml') )
+                for si in sst.findall('{%s}si' % NS_MAIN):
+                    text = u''.join( t.text or u'' for t in si.iter('{%s}t' % NS_MAIN) )
+                    self._shared_strings.append( text )
+
+        return self._shared_strings
+
+    def read_value(self, _worksheet, _address):
+        """Returns the stored (last calculated) value of a single cell, like 'Value2' would
+
+        Args:
+            _worksheet (str): The Worksheet name
+            _address (str): The cell address. ie: 'B3'
+        Returns:
+            (float | str | bool | None): The cell value
+        """
+
+        sheet_path = self.sheet_paths.get(_worksheet)
+        if not sheet_path:
+            raise XlsxWriteError('Worksheet "{}" not found in < {} >'.format(_worksheet, self.filepath))
+
+        ref = _address.replace('$', '').upper()
+        with zipfile.ZipFile(self.filepath) as zf:
+            xml = zf.read(sheet_path).decode('utf-8')
+            for cell in CELL_RE.finditer(xml):
+                attrs, content = cell.group(1), cell.group(3) or u''
+                if _get_attr(attrs, 'r') != ref:
+                    continue
+
+                cell_type = _get_attr(attrs, 't')
+                if cell_type == 'inlineStr':
+                    return u''.join( re.findall(r'<t\b[^>]*>(.*?)</t>', content, re.S) )
+
+                value = re.search(r'<v>(.*?)</v>', content, re.S)
+                if not value:
+                    return None
+                value = value.group(1)
+
+                if cell_type == 's':
+                    return self._get_shared_strings(zf)[int(value)]
+                elif cell_type == 'b':
+                    return value == '1'
+                elif cell_type in ('str', 'e'):
+                    return value
+                else:
+                    return float(value)
+
+        return None
+
+    def unit_type(self):
+        """Looks at !Data:B3 to find version number. Returns 'SI' or 'IP' unit type """
+
+        try:
+            version = self.read_value('Data', 'B3')
+        except XlsxWriteError:
+            version = None
+
+        if version and 'IP' in str(version):
+            return 'IP'
+        return 'SI'
+
+    def write(self, _diff, _target_path):
+        """Writes a (worksheet, range, value) diff into a copy of the workbook
+
+        Args:
+            _diff (list): A list of (worksheet name, range address, value) tuples
+            _target_path (str): The path to save the new PHPP file to. May be the
+                same as the source file.
+        Returns:
+            (list): The (worksheet, range) of any items which could not be written.
+                Including any NaN / infinite values: those cells are left as they were.
+        """
+
+        updates = defaultdict(dict)
+        skipped = []
+        for worksheet, address, value in _diff:
+            cell = LBT2PH.xl_write.split_address(address)
+            if worksheet not in self.sheet_paths or cell is None:
+                skipped.append( (worksheet, address) )
+                continue
+            if not _is_finite(value):
+                print('Cannot write the value "{}" to {}:{}, leaving the cell as it is.'.format(value, worksheet, address))
+                skipped.append( (worksheet, address) )
+                continue
+            updates[self.sheet_paths[worksheet]][cell] = value
+
+        patched = {}        # {part name: new bytes, or None to leave it out}
+        patched_sheets = {} # {part name: temp file with the patched worksheet XML}
+        formulas_replaced = False
+        try:
+            with zipfile.ZipFile(self.filepath) as zf:
+                for sheet_path, sheet_updates in updates.items():
+                    patch = _SheetPatch(sheet_updates)
+                    patched_sheets[sheet_path] = self._patch_sheet(zf, sheet_path, patch)
+
+                    formulas_replaced = formulas_replaced or patch.formulas_replaced
+                    sheet_name = [k for k, v in self.sheet_paths.items() if v == sheet_path][0]
+                    skipped.extend( (sheet_name, ref) for ref in patch.skipped )
+
+                patched['xl/workbook.xml'] = self._set_full_calc( zf.read('xl/workbook.xml').decode('utf-8') ).encode('utf-8')
+
+                if formulas_replaced and 'xl/calcChain.xml' in zf.namelist():
+                    # Excel will rebuild the calc-chain, but a stale one makes it 'repair' the file
+                    patched['xl/calcChain.xml'] = None
+                    patched['[Content_Types].xml'] = re.sub(r'<Override\b[^>]*?calcChain\.xml[^>]*?/>', '',
+                        zf.read('[Content_Types].xml').decode('utf-8')).encode('utf-8')
+                    patched['xl/_rels/workbook.xml.rels'] = re.sub(r'<Relationship\b[^>]*?calcChain\.xml[^>]*?/>', '',
+                        zf.read('xl/_rels/workbook.xml.rels').decode('utf-8')).encode('utf-8')
+
+                temp_path = self._write_temp(zf, patched, patched_sheets, _target_path)
+        finally:
+            for sheet_temp_path in patched_sheets.values():
+                os.remove(sheet_temp_path)
+
+        # Only once the source is closed: it may also be the target, and Windows
+        # won't replace a file which is still open
+        self._replace(temp_path, _target_path)
+
+        return skipped
+
+    @staticmethod
+    def _set_full_calc(_xml):
+        """Flags the workbook so Excel does a full recalculation when it is next opened """
+
+        calc_pr = re.search(r'<calcPr\b[^>]*?/?>', _xml)
+        if calc_pr:
+            tag = _drop_attr(calc_pr.group(0), 'fullCalcOnLoad')
+            tag = re.sub(r'^<calcPr', '<calcPr fullCalcOnLoad="1"', tag)
+            return _xml[:calc_pr.start()] + tag + _xml[calc_pr.end():]
+
+        # calcPr must come after any of these, if they exist
+        insert_at = 0
+        for pattern in (r'</sheets>', r'</functionGroups>|<functionGroups\b[^>]*/>',
+                        r'</externalReferences>', r'</definedNames>'):
+            match = re.search(pattern, _xml)
+            if match:
+                insert_at = max(insert_at, match.end())
+
+        return _xml[:insert_at] + u'<calcPr fullCalcOnLoad="1"/>' + _xml[insert_at:]
+
+    @staticmethod
+    def _patch_sheet(_zf, _sheet_path, _patch):
+        """Streams the patched worksheet XML into a temp file. Returns the temp file's path """
+
+        fd, temp_path = tempfile.mkstemp(suffix='.xml')
+        try:
+            with os.fdopen(fd, 'wb') as f_out:
+                with _zf.open(_sheet_path) as f_in:
+                    _patch.apply_stream(f_in, f_out)
+        except:
+            os.remove(temp_path)
+            raise
+
+        return temp_path
+
+    @staticmethod
+    def _copy_part(_zf_source, _info, _zf_out):
+        """Copies one part across unchanged, a chunk at a time where the zipfile module allows it """
+
+        if STREAMING_ZIP_WRITE:
+            with _zf_source.open(_info) as f_in:
+                with _zf_out.open(_info, 'w') as f_out:
+                    shutil.copyfileobj(f_in, f_out, CHUNK_SIZE)
+        else:
+            # IronPython 2.7: the whole part is read in (one part at a time)
+            _zf_out.writestr(_info, _zf_source.read(_info.filename))
+
+    def _write_temp(self, _zf_source, _patched, _patched_sheets, _target_path):
+        """Writes the new workbook next to the target. Returns the temp file's path """
+
+        target_dir = os.path.dirname( os.path.abspath(_target_path) )
+        if not os.path.isdir(target_dir):
+            os.makedirs(target_dir)
+
+        # Always write to a temp file first, so the source can also be the target
+        temp_path = _target_path + '.tmp'
+        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zf_out:
+            for info in _zf_source.infolist():
+                if info.filename in _patched_sheets:
+                    zf_out.write(_patched_sheets[info.filename], info.filename)
+                elif info.filename in _patched:
+                    data = _patched[info.filename]
+                    if data is not None:
+                        zf_out.writestr(info, data)
+                else:
+                    self._copy_part(_zf_source, info, zf_out)
+
+        return temp_path
+
+    @staticmethod
+    def _replace(_temp_path, _target_path):
+        if os.path.isfile(_target_path):
+            os.remove(_target_path)
+        os.rename(_temp_path, _target_path)
+
+def diff_from_xl_objects(_xl_objects, _unit_type='SI'):
+    """Converts a list of to_excel.PHPP_XL_Obj / sheet_block.SheetBlock into (worksheet, range, value) items """
+
+    return list( LBT2PH.sheet_block.iter_cells(_xl_objects, _unit_type) )
+
+def write_xl_objects(_source_path, _target_path, _xl_objects, _unit_type=None):
+    """Writes the PHPP_XL_Obj lists built by to_excel.build_* to a new PHPP file, without Excel
+
+    Args:
+        _source_path (str): The path to the source (template) PHPP file
+        _target_path (str): The path to save the new PHPP file to
+        _xl_objects (list): A flat list of to_excel.PHPP_XL_Obj / sheet_block.SheetBlock items
+        _unit_type (str): Optional. 'SI' or 'IP'. If not supplied, will read the
+            PHPP version from the source file's 'Data' worksheet
+    Returns:
+        (list): The (worksheet, range) of any items which could not be written
+    """
+
+    workbook = XlsxWorkbook(_source_path)
+    unit_type = _unit_type or workbook.unit_type()
+    print('Using "{}" Units'.format(unit_type))
+
+    return workbook.write( diff_from_xl_objects(_xl_objects, unit_type), _target_path )
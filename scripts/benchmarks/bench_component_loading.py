@@ -0,0 +1,163 @@
+"""Module loading cost of a '2PHPP Convert LBT Model' component solve.
+
+The component can't be solved outside of Grasshopper, so this walks through
+the 'import' / 'dev_reload' lines of the component and of the
+LBT2PH modules in order, the same way IronPython runs them, and counts how
+many module bodies get run on the first (cold) solve and on every solve after
+that (warm). IronPython has no .pyc cache, so each run of a module body means
+compiling its source again: the time to compile() each module is used as the
+cost of running it.
+
+    before: every reload() always runs
+    after:  DEV_MODE = False
+
+A module loaded with LBT2PH.lazy_import() is only imported once it is used:
+the component only uses LBT2PH.pipeline when there is a model to convert, so
+the cold solve is also shown with nothing connected to _HB_model.
+
+The PHPP climate station table is read from its data file (not compiled) the
+first time it is needed, the time for that is shown as well.
+
+Run from the 'scripts' folder:  python benchmarks/bench_component_loading.py
+"""
+
+import io
+import os
+import re
+import sys
+from timeit import default_timer
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.join(SCRIPTS, 'LBT2PH')
+COMPONENT = os.path.join(os.path.dirname(SCRIPTS), 'ghuser_py', 'LBT2PH 2PHPP Convert LBT Model.py')
+
+sys.path.insert(0, SCRIPTS)
+import LBT2PH.climate
+
+STATEMENT = re.compile(r"^\s*(?:(import)\s+(LBT2PH(?:\.\w+)?)\s*$"
+                       r"|(?:LBT2PH\.dev_)?(reload)\(\s*(LBT2PH(?:\.\w+)?|\w+)\s*\)"
+                       r"|(\w+)\s*=\s*LBT2PH\.(lazy)_import\(\s*'(LBT2PH\.\w+)'\s*\))", re.M)
+DOCSTRING = re.compile(r'""".*?"""', re.S)
+
+def read(_path):
+    with io.open(_path, 'rb') as f:
+        return f.read()
+
+def statements(_source):
+    """The ('import'|'reload'|'lazy', module name) items, in order
+
+    A reload() of a lazy module's variable is turned into a reload of the module.
+    """
+
+    items = []
+    lazy_names = {}
+    code = DOCSTRING.sub('', _source.decode('utf-8', 'replace'))
+    for m in STATEMENT.finditer(code):
+        groups = [ g for g in m.groups() if g ]
+        if 'lazy' in groups:
+            variable, kind, name = groups
+            lazy_names[variable] = name
+        else:
+            kind, name = groups
+            name = lazy_names.get(name, name)
+        if name.startswith('LBT2PH'):
+            items.append( (kind, name) )
+    return items
+
+def compile_ms(_source, _repeat=5):
+    best = None
+    for _ in range(_repeat):
+        t0 = default_timer()
+        compile(_source, '<module>', 'exec')
+        t = default_timer() - t0
+        best = t if best is None else min(best, t)
+    return best * 1000
+
+class Session:
+    """One Rhino session: modules stay loaded between solves """
+
+    def __init__(self, _modules, _dev_mode):
+        self.modules = _modules  # {name: (statements, compile ms)}
+        self.dev_mode = _dev_mode
+        self.loaded = set()
+        self.lazy = set()
+        self.runs = 0
+        self.ms = 0.0
+
+    def import_module(self, _name):
+        if '.' in _name:
+            self.import_module('LBT2PH')
+        if _name not in self.loaded:
+            self.loaded.add(_name)
+            self.run(_name)
+
+    def run(self, _name):
+        stmts, ms = self.modules[_name]
+        self.runs += 1
+        self.ms += ms
+        self.run_statements(stmts)
+
+    def run_statements(self, _stmts):
+        for kind, name in _stmts:
+            if kind == 'import':
+                self.import_module(name)
+            elif kind == 'lazy':
+                self.lazy.add(name)
+            elif kind == 'reload':
+                if name in self.lazy and name not in self.loaded:
+                    continue  # Not imported yet, nothing to reload
+                # __versions__ is always reloaded by the components, it is tiny
+                if self.dev_mode or name == 'LBT2PH.__versions__':
+                    self.run(name)
+
+    def solve(self, _component_stmts, _model=True):
+        """Run the component's lines. With a model connected, its lazy modules get used """
+
+        runs, ms = self.runs, self.ms
+        self.run_statements(_component_stmts)
+        if _model:
+            for name in sorted(self.lazy):
+                self.import_module(name)
+        return self.runs - runs, self.ms - ms
+
+def load_modules():
+    modules = {}
+    for file_name in os.listdir(PACKAGE):
+        if not file_name.endswith('.py') or file_name.startswith(('test_', '._')):
+            continue
+        name = 'LBT2PH' if file_name == '__init__.py' else 'LBT2PH.' + file_name[:-3]
+        source = read(os.path.join(PACKAGE, file_name))
+        modules[name] = (statements(source), compile_ms(source))
+    return modules
+
+def main():
+    modules = load_modules()
+    component = statements(read(COMPONENT))
+
+    print('Module bodies run (and compiled) per "2PHPP Convert LBT Model" solve')
+    print('{:<40} {:>14} {:>14}'.format('', 'cold', 'warm'))
+    results = {}
+    for label, dev_mode in [('before: always reload', True),
+                            ('after:  DEV_MODE = False', False)]:
+        session = Session(modules, dev_mode)
+        cold = session.solve(component)
+        warm = session.solve(component)
+        results[label] = (cold, warm)
+        print('{:<40} {:>4} / {:>6.1f} ms {:>4} / {:>6.1f} ms'.format(label, cold[0], cold[1], warm[0], warm[1]))
+
+    no_model = Session(modules, False).solve(component, _model=False)
+    print('{:<40} {:>4} / {:>6.1f} ms'.format('after:  no _HB_model connected', no_model[0], no_model[1]))
+
+    t0 = default_timer()
+    LBT2PH.climate.ClimateStationTable.load()
+    print('\nClimate station table: {:.1f} ms to read. Only the first time it is needed.'.format(
+        (default_timer() - t0) * 1000))
+
+    before = results['before: always reload']
+    after = results['after:  DEV_MODE = False']
+    assert after[1][0] < before[1][0]
+    print('Warm solve: {} -> {} module runs ({:.1f} -> {:.1f} ms compile)'.format(
+        before[1][0], after[1][0], before[1][1], after[1][1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""to_dict() / from_dict(): hand-written vs. DictCodec, and writing back to the user_data.
+
+Part 1 times the round trip of a PHPP DHW tank (the hand-written methods, as
+they were, against the compiled DictCodec ones).
+
+Part 2 times putting one changed PHPP item back into a model's 'phpp'
+user_data (500 rooms worth of spaces): deepcopy() of the whole thing, as
+helpers.add_to_HB_model does, against share_unchanged() which only makes new
+dicts along the path that changed.
+
+Run from the 'scripts' folder:  python benchmarks/bench_dict_codec.py
+"""
+
+import os
+import sys
+from copy import deepcopy
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LBT2PH.dhw
+import LBT2PH.dict_codec
+
+NUM_ROUND_TRIPS = 20000
+NUM_ROOMS = 500
+
+class HandWrittenTank(LBT2PH.dhw.PHPP_DHW_tank):
+    def to_dict(self):
+        d = {}
+
+        d.update( {'id':self.id} )
+        d.update( {'type':self.type } )
+        d.update( {'solar':self.solar} )
+        d.update( {'hl_rate':self.hl_rate} )
+        d.update( {'vol':self.vol} )
+        d.update( {'stndbyFrac':self.stndbyFrac} )
+        d.update( {'location':self.location} )
+        d.update( {'location_t':self.location_t} )
+
+        return d
+
+    @classmethod
+    def from_dict(cls, _dict):
+        if not _dict:
+            return None
+
+        new_obj = cls()
+
+        new_obj.id = _dict.get('id')
+        new_obj.type = _dict.get('type')
+        new_obj.solar = _dict.get('solar')
+        new_obj.hl_rate = _dict.get('hl_rate')
+        new_obj.vol = _dict.get('vol')
+        new_obj.stndbyFrac = _dict.get('stndbyFrac')
+        new_obj.location = _dict.get('location')
+        new_obj.location_t = _dict.get('location_t')
+
+        return new_obj
+
+def time_round_trips(_cls):
+    d = _cls('1-DHW and heating', True, 2.1, 200).to_dict()
+    t0 = default_timer()
+    for _ in range(NUM_ROUND_TRIPS):
+        d = _cls.from_dict(d).to_dict()
+    return default_timer() - t0
+
+def model_user_data():
+    spaces = {}
+    for i in range(NUM_ROOMS):
+        spaces['space-{}'.format(i)] = {
+            'id': 'space-{}'.format(i), 'space_name': 'Room {}'.format(i), 'space_number': str(i),
+            'volumes': { 'vol-{}-{}'.format(i, j): {
+                'id': 'vol-{}-{}'.format(i, j), 'volume_height': 2.5,
+                'tfa_surfaces': { 'tfa-{}'.format(k): {'id': 'tfa-{}'.format(k), 'area_gross': 10.0,
+                    'tfa_factor': 1.0, 'vertices': [[0.0, 0.0, 0.0], [3.0, 0.0, 0.0], [3.0, 3.0, 0.0]]}
+                    for k in range(4) } } for j in range(2) } }
+    return {'phpp': {'spaces': spaces, 'dhw_systems': {}, 'settings': {'climate': 'US0055c'}}}
+
+def main():
+    print('Round trip (from_dict + to_dict) x {}'.format(NUM_ROUND_TRIPS))
+    hand = time_round_trips(HandWrittenTank)
+    codec = time_round_trips(LBT2PH.dhw.PHPP_DHW_tank)
+    print('  hand-written: {:7.1f} ms'.format(hand * 1000))
+    print('  DictCodec:    {:7.1f} ms  ({:.1f}x)'.format(codec * 1000, hand / codec))
+
+    user_data = model_user_data()
+    new_spaces = deepcopy(user_data['phpp']['spaces'])
+    new_spaces['space-7']['volumes']['vol-7-0']['volume_height'] = 3.0
+
+    t0 = default_timer()
+    copied = deepcopy(user_data)
+    copied['phpp']['spaces'] = new_spaces
+    copy_s = default_timer() - t0
+
+    t0 = default_timer()
+    shared = dict(user_data['phpp'])
+    shared['spaces'] = LBT2PH.dict_codec.share_unchanged(new_spaces, user_data['phpp']['spaces'])
+    share_s = default_timer() - t0
+
+    assert shared['spaces'] == copied['phpp']['spaces']
+    reused = sum(shared['spaces'][k] is user_data['phpp']['spaces'][k] for k in shared['spaces'])
+    print('\nWrite one changed space back to a {} room user_data'.format(NUM_ROOMS))
+    print('  deepcopy:        {:7.1f} ms'.format(copy_s * 1000))
+    print('  share_unchanged: {:7.1f} ms  ({} of {} spaces shared with the old user_data)'.format(
+        share_s * 1000, reused, NUM_ROOMS))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Cost of turning hourly schedules into PHPP 3-speed histograms.
+
+Builds 1,000 synthetic 8760-hour schedules and bins each one into 3 bins
+(nbins=2) with the original multi-pass generate_histogram() and with
+LBT2PH.histogram. Most are 'stepped' schedules made of a few values, like the
+HB library schedules. Some have every hour different, as a worst case.
+
+Run from the 'scripts' folder:  python benchmarks/bench_histogram.py
+"""
+
+import os
+import sys
+import random
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LBT2PH.histogram
+
+NUM_SCHEDULES = 1000
+NUM_CONTINUOUS = 50
+LEVELS = [0.0, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+def original_histogram(_data, _nbins):
+    """The original ventilation.generate_histogram() """
+
+    min_val = min(_data)
+    max_val = max(_data)
+    hist_bins = {}
+    hist_vals = {}
+    total = 0
+    for k in range(_nbins+1):
+        hist_bins[k] = 0
+        hist_vals[k] = 0
+    for d in _data:
+        bin_number = int(_nbins * ((d - min_val) / (max_val - min_val)))
+        hist_bins[bin_number] += 1
+        hist_vals[bin_number] += d
+        total += 1
+    for n in hist_vals.keys():
+        hist_vals[n] = hist_vals[n] / hist_bins[n] if hist_bins[n] else 0.0
+    for h in hist_bins.keys():
+        hist_bins[h] = float(hist_bins[h]) / total
+    return hist_bins, hist_vals
+
+def build_schedules():
+    random.seed(0)
+    schedules = []
+    for i in range(NUM_SCHEDULES - NUM_CONTINUOUS):
+        day = [ random.choice(LEVELS) for hour in range(24) ]
+        day[0], day[12] = 0.0, 1.0  # Be sure min and max are different
+        schedules.append( (day * 366)[:8760] )
+    for i in range(NUM_CONTINUOUS):
+        schedules.append( [ random.random() for hour in range(8760) ] )
+    return schedules
+
+def timed(_func, _repeat=3):
+    best = None
+    for _ in range(_repeat):
+        start = default_timer()
+        result = _func()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    schedules = build_schedules()
+
+    t_old, r_old = timed(lambda: [ original_histogram(s, 2) for s in schedules ])
+    t_new, r_new = timed(lambda: [ LBT2PH.histogram.histogram(s, 2) for s in schedules ])
+
+    for (old_fractions, old_means), (new_fractions, new_means) in zip(r_old, r_new):
+        assert old_fractions == new_fractions, 'Results do not match!'
+        assert all( abs(old_means[k] - new_means[k]) < 1e-9 for k in old_means ), 'Results do not match!'
+
+    print('{} schedules x 8760 hours ({} with every hour different), best of 3'.format(NUM_SCHEDULES, NUM_CONTINUOUS))
+    for name, t in (('generate_histogram()', t_old), ('LBT2PH.histogram', t_new)):
+        print('  {:<22} {:8.1f} ms total  {:8.3f} ms/schedule  ({:5.1f}x)'.format(
+            name, t * 1000, t / NUM_SCHEDULES * 1000, t_old / t))
+
+if __name__ == '__main__':
+    main()
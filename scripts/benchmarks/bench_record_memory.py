@@ -0,0 +1,102 @@
+"""Peak memory (RSS) of the PHPP objects made by a large model conversion: __dict__ vs. __slots__.
+
+A 2000 room model's worth of the objects the conversion makes the most of:
+PHPP_Surface, TFA_Surface, PHPP_XL_Obj, PHPP_ThermalBridge, PHPP_Sys_Duct_Segment
+and PHPP_DHW_Pipe_Segment, all held at once (the same as the Convert component's
+outputs). Each version is built in its own Python process and the process' peak
+RSS (less what it was using before building anything) is what gets shown.
+
+    before: a __dict__ on every object, random.randint() ids
+    after:  __slots__, identity.content_id() ids
+
+Most of the classes import Rhino / Grasshopper, so the objects here are made
+from stand-in classes with the same attributes. The PHPP_DHW_Pipe_Segment's
+attributes are read from the real class.
+
+Uses the 'resource' module, so no Windows. Run from the 'scripts' folder:
+python benchmarks/bench_record_memory.py
+"""
+
+import os
+import sys
+import random
+import resource
+import subprocess
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS)
+import LBT2PH.dhw
+import LBT2PH.identity
+
+NUM_ROOMS = 2000
+
+# (class name, attributes, number per room)
+RECORDS = [
+    ('PHPP_Surface', ('lbt_srfc', 'HostZoneName', 'HostZoneID', 'scene_north_vector', 'ghenv',
+                      'UD_Srfc_Name', 'orientations', 'orientation_index',
+                      'Factor_Shading', 'Factor_Absorptivity', 'Factor_Emissivity'), 8),
+    ('TFA_Surface', ('_inset', '_neighbors', '_area_gross', '_depth',
+                     'id', 'surface', 'host_room_name', 'params', 'sub_surfaces'), 4),
+    ('PHPP_XL_Obj', ('Worksheet', 'Range', 'Value', 'Unit_SI', 'Unit_IP'), 40),
+    ('PHPP_ThermalBridge', ('id', 'typename', 'length', '_group_number', '_fRsi', '_psi_value'), 2),
+    ('PHPP_Sys_Duct_Segment', ('length', 'width', 'insul_thick', 'insul_lambda'), 1),
+    ('PHPP_DHW_Pipe_Segment', LBT2PH.dhw.PHPP_DHW_Pipe_Segment.__slots__, 1),
+]
+
+def record_class(_name, _attrs, _slots):
+    if _slots:
+        return type(_name, (object,), {'__slots__': tuple(_attrs)})
+    return type(_name, (object,), {})
+
+def build(_slots):
+    """All the objects for the model. Values are roughly what the real ones hold """
+
+    new_id = LBT2PH.identity.content_id if _slots else (lambda *_parts: random.randint(1000, 9999))
+    objects = []
+    for name, attrs, per_room in RECORDS:
+        cls = record_class(name, attrs, _slots)
+        for i in range(NUM_ROOMS * per_room):
+            obj = cls()
+            for attr in attrs:
+                setattr(obj, attr, None)
+            if 'id' in attrs:
+                obj.id = new_id(name, i)
+            if name == 'PHPP_XL_Obj':
+                obj.Worksheet = 'Additional Vent'
+                obj.Range = 'D{}'.format(i)
+                obj.Value = float(i)
+                obj.Unit_SI = 'M2'
+                obj.Unit_IP = 'FT2'
+            objects.append(obj)
+    return objects
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == 'darwin' else rss / 1e3  # bytes on macOS, KB elsewhere
+
+def child(_version):
+    before = peak_rss_mb()
+    objects = build(_version == 'after')
+    print('{} {}'.format(len(objects), peak_rss_mb() - before))
+
+def run(_version):
+    out = subprocess.check_output([sys.executable, os.path.abspath(__file__), _version], cwd=SCRIPTS)
+    count, mb = out.decode('utf-8').split()
+    return int(count), float(mb)
+
+def main():
+    assert not hasattr(LBT2PH.dhw.PHPP_DHW_Pipe_Segment(), '__dict__')
+
+    count, old = run('before')
+    _, new = run('after')
+
+    print('{} objects for a {} room model, peak RSS'.format(count, NUM_ROOMS))
+    print('  __dict__:  {:7.1f} MB'.format(old))
+    print('  __slots__: {:7.1f} MB'.format(new))
+    print('  {:.1f}x less memory'.format(old / new))
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
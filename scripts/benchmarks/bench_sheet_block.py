@@ -0,0 +1,104 @@
+"""Building the 'Areas' table: one PHPP_XL_Obj per cell vs. one SheetBlock.
+
+Builds the 'Areas' rows for a synthetic model with 5,000 opaque surfaces
+(10 cells each) both ways and compares the time to build them, the memory
+they hold on to (Python 3 tracemalloc) and the time to turn them into
+the rectangular Excel write blocks.
+
+Run from the 'scripts' folder:  python benchmarks/bench_sheet_block.py
+"""
+
+import os
+import sys
+import tracemalloc
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LBT2PH.sheet_block
+import LBT2PH.xl_write
+import LBT2PH.unit_conversion
+
+NUM_SURFACES = 5000
+COLUMNS = ['L', 'M', 'P', ('V', 'M2', 'FT2'), 'AC', 'AG', 'AH', 'AJ', 'AK', 'AL']
+
+class XlObj:
+    """The same attributes and unit conversion as to_excel.PHPP_XL_Obj """
+
+    converters = LBT2PH.unit_conversion.PHPP_XL_CONVERTERS
+
+    def __init__(self, _shtNm, _rangeAddress, _val, _unitSI=None, _unitIP='SI'):
+        self.Worksheet = _shtNm
+        self.Range = _rangeAddress
+        self.Value = _val
+        self.Unit_SI = _unitSI
+        self.Unit_IP = _unitIP
+
+    def getWorksheet(self, _units='SI'):
+        return LBT2PH.sheet_block.worksheet_name(self.Worksheet, _units)
+
+    @classmethod
+    def getValues(cls, _xl_objects, _targetUnit='SI'):
+        values = []
+        for obj in _xl_objects:
+            if obj.Unit_SI:
+                target = obj.Unit_IP if _targetUnit == 'IP' else obj.Unit_SI
+                values.append( cls.converters.convert(obj.Value, obj.Unit_SI, target) )
+            else:
+                values.append(obj.Value)
+        return values
+
+def surface_rows():
+    for i in range(NUM_SURFACES):
+        yield ('Surface {}'.format(i), 8, 1, 10.0 + i % 7, '{}-Ext Wall'.format(i % 5),
+               i % 360, 90, 0.75, 0.6, 0.9)
+
+def build_objects():
+    """The old build_areas(): a formatted address and an object per cell """
+
+    objs = []
+    for count, row in enumerate(surface_rows()):
+        for spec, value in zip(COLUMNS, row):
+            letter, units = (spec[0], spec[1:]) if isinstance(spec, tuple) else (spec, ())
+            objs.append( XlObj('Areas', '{}{}'.format(letter, 41 + count), value, *units) )
+    return objs
+
+def build_block():
+    block = LBT2PH.sheet_block.SheetBlock('Areas', 41, COLUMNS)
+    for row in surface_rows():
+        block.add_row(*row)
+    return [block]
+
+def measure(_build):
+    tracemalloc.start()
+    t0 = default_timer()
+    items = _build()
+    seconds = default_timer() - t0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return items, seconds, memory
+
+def main():
+    print('"Areas" table for {} surfaces ({} cells)'.format(NUM_SURFACES, NUM_SURFACES * len(COLUMNS)))
+    print('{:<24} {:>10} {:>10} {:>14} {:>8}'.format('', 'build', 'memory', 'write blocks', 'blocks'))
+
+    results = {}
+    for label, build in [('PHPP_XL_Obj per cell', build_objects), ('SheetBlock', build_block)]:
+        items, build_s, memory = measure(build)
+
+        t0 = default_timer()
+        if label == 'SheetBlock':
+            plan = LBT2PH.sheet_block.write_plan(items, 'IP')
+        else:
+            plan = LBT2PH.xl_write.WritePlan.from_diff( list(LBT2PH.sheet_block.iter_cells(items, 'IP')) )
+        plan_s = default_timer() - t0
+
+        results[label] = (build_s, memory, plan)
+        print('{:<24} {:>7.1f} ms {:>7.2f} MB {:>11.1f} ms {:>8}'.format(
+            label, build_s * 1000, memory / 1e6, plan_s * 1000, len(plan.blocks)))
+
+    old, new = results['PHPP_XL_Obj per cell'], results['SheetBlock']
+    assert old[2].num_cells == new[2].num_cells
+    print('\nMemory held: {:.1f}x less'.format(old[1] / float(new[1])))
+
+if __name__ == '__main__':
+    main()
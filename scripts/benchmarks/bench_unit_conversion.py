@@ -0,0 +1,86 @@
+"""Per-cell unit conversion cost: eval() vs. the precompiled converters.
+
+Builds a synthetic 20,000 cell export (the same unit mix as a typical model)
+and converts it to IP units the old way (a string + eval() per cell), one cell
+at a time with the compiled converters, and a column at a time.
+
+Run from the 'scripts' folder:  python benchmarks/bench_unit_conversion.py
+"""
+
+import os
+import sys
+import random
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LBT2PH.unit_conversion
+
+NUM_CELLS = 20000
+UNITS = [('M2', 'FT2'), ('M', 'FT'), ('W/MK', 'BTU/HR-FT-F'), ('W/M2K', 'HR-FT2-F/BTU'),
+         ('C', 'F'), ('M3/H', 'CFM'), ('MM', 'IN'), (None, 'SI')]
+
+def eval_convert(_value, _unit_si, _target_unit):
+    """The original PHPP_XL_Obj.getValue """
+
+    if not _unit_si:
+        return _value
+    try:
+        schema = LBT2PH.unit_conversion.PHPP_XL_SCHEMA.get(_unit_si, {'SI':1})
+        conversionFactor = schema.get(_target_unit, 1)
+        return eval( str(_value)+str(conversionFactor) )
+    except:
+        return _value
+
+def build_cells():
+    random.seed(0)
+    cells = []
+    for i in range(NUM_CELLS):
+        unit_si, unit_ip = UNITS[i % len(UNITS)]
+        value = 'Name {}'.format(i) if unit_si is None else random.uniform(0.1, 100)
+        cells.append( (value, unit_si, unit_ip) )
+    return cells
+
+def timed(_func, _repeat=5):
+    best = None
+    for _ in range(_repeat):
+        start = default_timer()
+        result = _func()
+        elapsed = default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    cells = build_cells()
+    registry = LBT2PH.unit_conversion.PHPP_XL_CONVERTERS
+
+    def run_eval():
+        return [ eval_convert(v, si, ip) for v, si, ip in cells ]
+
+    def run_compiled():
+        return [ v if not si else registry.convert(v, si, ip) for v, si, ip in cells ]
+
+    def run_columns():
+        columns = {}
+        for i, (v, si, ip) in enumerate(cells):
+            columns.setdefault((si, ip), []).append(i)
+        out = [None] * len(cells)
+        for (si, ip), indexes in columns.items():
+            values = [ cells[i][0] for i in indexes ]
+            converted = values if not si else registry.convert_column(values, si, ip)
+            for i, v in zip(indexes, converted):
+                out[i] = v
+        return out
+
+    t_eval, r_eval = timed(run_eval)
+    t_compiled, r_compiled = timed(run_compiled)
+    t_columns, r_columns = timed(run_columns)
+
+    assert r_eval == r_compiled == r_columns, 'Results do not match!'
+
+    print('{} cells, best of 5'.format(NUM_CELLS))
+    for name, t in (('eval() per cell', t_eval), ('compiled per cell', t_compiled), ('compiled by column', t_columns)):
+        print('  {:<20} {:8.2f} ms total  {:8.3f} us/cell  ({:5.1f}x)'.format(
+            name, t * 1000, t / NUM_CELLS * 1e6, t_eval / t))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""helpers.add_to_HB_model: deepcopy of the whole user_data vs. copy-on-write.
+
+A chain of 10 components, each duplicating a 500-room model and writing one
+'phpp' item to its user_data (the Setup, Thermal Bridges, Vent, DHW...
+components). Every component's output model stays alive, the same as in a
+Grasshopper definition, so the memory is what the 10 models hold on to.
+HB's duplicate() only makes a shallow copy of the user_data.
+
+Run from the 'scripts' folder:  python benchmarks/bench_user_data.py
+"""
+
+import os
+import sys
+import tracemalloc
+from copy import deepcopy
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LBT2PH.dict_codec
+from bench_dict_codec import model_user_data, NUM_ROOMS
+
+def deepcopy_add(_user_data, _key, _dict, _write='update'):
+    """The original add_to_HB_model(), without the HB object """
+
+    user_data = deepcopy( _user_data )
+    if not user_data:
+        if _key == 'phpp':
+            return {'phpp': _dict }
+        else:
+            return {'phpp': { _key: _dict} }
+
+    try:
+        if _write == 'update':
+            user_data['phpp'][_key].update( _dict )
+        elif _write == 'overwrite':
+            user_data['phpp'][_key] = _dict
+    except KeyError as e:
+        try:
+            user_data['phpp'].update( {_key:_dict } )
+        except KeyError:
+            user_data = {'phpp':{_key:_dict }}
+
+    return user_data
+
+def component_writes():
+    """(key, dict, write) for each component in the chain """
+
+    room = deepcopy( model_user_data()['phpp']['spaces']['space-7'] )
+    room['space_name'] = 'Kitchen'
+    return [
+        ('settings', {'phpp_version': '9.6'}, 'update'),
+        ('climate', {'id': 'US0055c', 'name': 'New York'}, 'update'),
+        ('tb', {'tb-1': {'length': 12.0, 'psi': 0.01}}, 'update'),
+        ('vent_system', {'system_name': 'ERV-1'}, 'update'),
+        ('dhw_systems', {'dhw-1': {'system_name': 'DHW'}}, 'update'),
+        ('summ_vent', {'day_ach': 0.3}, 'overwrite'),
+        ('occupancy', {'num_units': 1}, 'update'),
+        ('appliances', {'dishwasher': {'nominal_demand': 1.1}}, 'update'),
+        ('ground', {'floor-1': {'type': 'slab'}}, 'update'),
+        ('spaces', {'space-7': room}, 'update'),
+    ]
+
+def chain(_add, _models):
+    for key, d, write in component_writes():
+        user_data = dict( _models[-1] )  # HB duplicate()
+        _models.append( _add(user_data, key, d, write) )
+    return _models
+
+def run_chain(_add):
+    models = [ model_user_data() ]
+    t0 = default_timer()
+    chain(_add, models)
+    seconds = default_timer() - t0
+
+    # Measured separately, tracemalloc slows everything down. Only counts
+    # what the 10 new models add on top of the original one.
+    models = [ model_user_data() ]
+    tracemalloc.start()
+    models = chain(_add, models)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return models[-1], seconds, memory
+
+def main():
+    print('10 component chain on a {} room model'.format(NUM_ROOMS))
+    old, old_s, old_mem = run_chain(deepcopy_add)
+    new, new_s, new_mem = run_chain(LBT2PH.dict_codec.updated_user_data)
+    assert old == new
+
+    print('  deepcopy:      {:7.1f} ms  {:7.2f} MB held'.format(old_s * 1000, old_mem / 1e6))
+    print('  copy-on-write: {:7.1f} ms  {:7.2f} MB held'.format(new_s * 1000, new_mem / 1e6))
+    print('  {:.0f}x faster, {:.0f}x less memory'.format(old_s / new_s, old_mem / float(new_mem)))
+
+if __name__ == '__main__':
+    main()